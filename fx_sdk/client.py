@@ -1,12 +1,21 @@
 import logging
 import json
 import os
+import copy
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from decimal import Decimal
-from typing import Optional, Union, Dict, Any, List
+from typing import Optional, Union, Dict, Any, Iterable, List, Callable, Hashable, Iterator, Tuple
 
 from web3 import Web3
 from web3.contract import Contract
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from eth_abi import decode as abi_decode
 from eth_account import Account
+from eth_account.messages import encode_typed_data
 from eth_account.signers.local import LocalAccount
 
 # Try to import optional dependencies
@@ -24,6 +33,26 @@ except ImportError:
 
 from . import constants
 from . import utils
+from .subscriptions import NewHeadsSubscription, is_websocket_url
+from .gas import FeeOracle, GasProfileCache, URGENCY_PERCENTILES
+from .watchers import ProtocolMetricsSnapshot, MetricThreshold
+from .curve_index import CurveRegistryIndex
+from .numeric import FixedPoint
+from .permit import PERMIT_ABI, PERMIT_TYPEHASH, permit_domain_separator, permit_typed_data
+from .safe import CALL, DELEGATE_CALL, ZERO_ADDRESS, encode_multisend_transactions, safe_transaction_hash
+from .rewards import (
+    CONVEX_VAULT_CLAIM, GAUGE_CLAIM, REBALANCE_POOL_CLAIM, GaugeRewardProjector, RewardClaim
+)
+from .voting import GaugeSweep, GaugeVoteState, VeLock, VotingPowerCalculator
+from .portfolio import PortfolioAsset, PortfolioTable
+from .positions import (
+    LIQUIDATE,
+    PositionCandidate,
+    PositionIndex,
+    PositionRecord,
+    classify_health,
+    rank_candidates
+)
 from .exceptions import (
     FXProtocolError,
     TransactionFailedError,
@@ -36,6 +65,178 @@ from .exceptions import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("fx_sdk")
 
+# Multicall3 aggregate3 plus the block and balance helpers used to pin snapshots
+MULTICALL3_ABI = [
+    {"inputs": [{"components": [{"name": "target", "type": "address"}, {"name": "allowFailure", "type": "bool"}, {"name": "callData", "type": "bytes"}], "name": "calls", "type": "tuple[]"}], "name": "aggregate3", "outputs": [{"components": [{"name": "success", "type": "bool"}, {"name": "returnData", "type": "bytes"}], "name": "returnData", "type": "tuple[]"}], "stateMutability": "payable", "type": "function"},
+    {"inputs": [], "name": "getBlockNumber", "outputs": [{"name": "blockNumber", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getCurrentBlockTimestamp", "outputs": [{"name": "timestamp", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "addr", "type": "address"}], "name": "getEthBalance", "outputs": [{"name": "balance", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+]
+
+# Read functions sampled by get_protocol_metrics_snapshot()
+PROTOCOL_METRICS_ABI = [
+    {"constant": True, "inputs": [], "name": "getCurrentNav", "outputs": [{"name": "_baseNav", "type": "uint256"}, {"name": "_fNav", "type": "uint256"}, {"name": "_xNav", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "getNav", "outputs": [{"name": "_fNav", "type": "uint256"}, {"name": "_xNav", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "totalBaseToken", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "collateralRatio", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "leverageRatio", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "isActive", "outputs": [{"name": "", "type": "bool"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "debtCeiling", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "totalDebt", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
+]
+
+# Convex f(x) pool registry: pool id -> user -> vault
+CONVEX_POOL_REGISTRY_ABI = [
+    {"inputs": [{"name": "", "type": "uint256"}, {"name": "", "type": "address"}], "name": "vaultMap", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+]
+
+# Size of the fixed reward_tokens array in Curve liquidity gauges
+CURVE_GAUGE_MAX_REWARDS = 8
+
+# Most coins a Curve pool can hold (stableswap-ng)
+CURVE_POOL_MAX_COINS = 8
+
+# f(x) v2 pool position reads (positions are ERC721 tokens of each pool)
+FX_POOL_POSITION_ABI = [
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "getPosition", "outputs": [{"name": "rawColls", "type": "uint256"}, {"name": "rawDebts", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "getPositionDebtRatio", "outputs": [{"name": "debtRatio", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "ownerOf", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getRebalanceRatios", "outputs": [{"name": "debtRatio", "type": "uint256"}, {"name": "bonusRatio", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getLiquidateRatios", "outputs": [{"name": "debtRatio", "type": "uint256"}, {"name": "bonusRatio", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "priceOracle", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+]
+
+# f(x) v2 price oracle: the collateral price used for rebalances and liquidations
+FX_PRICE_ORACLE_ABI = [
+    {"inputs": [], "name": "getLiquidatePrice", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+]
+
+# Pool Manager events that touch a position; each indexes (pool, position)
+POSITION_EVENT_TOPICS = tuple(
+    Web3.to_hex(Web3.keccak(text=signature))
+    for signature in (
+        "Operate(address,uint256,int256,int256,uint256)",
+        "RebalancePosition(address,uint256,uint256,uint256,uint256)",
+        "LiquidatePosition(address,uint256,uint256,uint256,uint256)",
+    )
+)
+
+# f(x) V1 rebalance pools expose claimable(account, token); the bundled ABI omits it
+REBALANCE_POOL_CLAIMABLE_ABI = [
+    {"inputs": [{"name": "_account", "type": "address"}, {"name": "_token", "type": "address"}], "name": "claimable", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+]
+
+# Safe MultiSend / MultiSendCallOnly
+SAFE_MULTISEND_ABI = [
+    {"inputs": [{"name": "transactions", "type": "bytes"}], "name": "multiSend", "outputs": [], "stateMutability": "payable", "type": "function"},
+]
+
+# Safe views needed to hash a Safe transaction for signing
+SAFE_ABI = [
+    {"inputs": [], "name": "nonce", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "domainSeparator", "outputs": [{"name": "", "type": "bytes32"}], "stateMutability": "view", "type": "function"},
+]
+
+# ERC20 Transfer(address indexed from, address indexed to, uint256 value)
+TRANSFER_EVENT_TOPIC = Web3.to_hex(Web3.keccak(text="Transfer(address,address,uint256)"))
+
+# ERC20 Approval(address indexed owner, address indexed spender, uint256 value)
+APPROVAL_EVENT_TOPIC = Web3.to_hex(Web3.keccak(text="Approval(address,address,uint256)"))
+
+# PoolManager.rebalance is overloaded by tick (int16) and by position (uint32);
+# small position ids would otherwise resolve to the tick variant
+REBALANCE_POSITION_SIGNATURE = "rebalance(address,address,uint32,uint256,uint256)"
+
+# Working supply views of Curve-style (snake_case) and f(x) (camelCase) gauges,
+# plus plain stake balances as a last resort
+GAUGE_WORKING_SUPPLY_ABI = [
+    {"inputs": [{"name": "arg0", "type": "address"}], "name": "working_balances", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "working_supply", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "account", "type": "address"}], "name": "workingBalanceOf", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "workingSupply", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "totalSupply", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+]
+
+# Revert markers of a transferFrom() short on allowance: OpenZeppelin 4 / most
+# tokens' reason strings, and OpenZeppelin 5's ERC20InsufficientAllowance selector
+ALLOWANCE_REVERT_MARKERS = ("allowance", Web3.keccak(text="ERC20InsufficientAllowance(address,uint256,uint256)")[:4].hex())
+
+# Node errors that reject a transaction's gas limit before it is broadcast
+GAS_LIMIT_REJECTION_MARKERS = ("gas too low", "gas limit too low", "exceeds block gas limit")
+
+# Gauge types whose weights are read up front by get_gauge_controller_sweep()
+GAUGE_TYPE_PROBE = 4
+
+# Gas budgeted per balanceOf inside aggregate3 (cold account + cold slot + overhead)
+SCAN_GAS_PER_CALL = 10_000
+
+
+def _abi_type_string(abi_param: Dict[str, Any]) -> str:
+    """Collapse an ABI input/output entry into a type string, expanding tuples."""
+    abi_type = abi_param["type"]
+    if abi_type.startswith("tuple"):
+        components = ",".join(_abi_type_string(c) for c in abi_param["components"])
+        return f"({components}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def _checksum_abi_value(abi_param: Dict[str, Any], value: Any) -> Any:
+    """
+    Checksum every address in a decoded ABI value, as `.call()` returns them.
+    
+    eth_abi decodes addresses in lowercase; arrays come back as lists and
+    structs as tuples, also matching `.call()`.
+    """
+    abi_type = abi_param["type"]
+    if abi_type.endswith("]"):
+        element = dict(abi_param, type=abi_type[:abi_type.rindex("[")])
+        return [_checksum_abi_value(element, item) for item in value]
+    if abi_type == "tuple":
+        return tuple(_checksum_abi_value(c, item) for c, item in zip(abi_param["components"], value))
+    if abi_type == "address":
+        return utils.to_checksum_address(value)
+    return value
+
+
+def _error_mentions(error: Exception, markers: Tuple[str, ...]) -> bool:
+    """Whether an error's message (in any of its args) contains one of `markers`."""
+    message = " ".join(str(arg) for arg in (error.args or (error,))).lower()
+    return any(marker in message for marker in markers)
+
+
+def _is_allowance_revert(error: Exception) -> bool:
+    """Whether a failed gas estimate reverted on a missing token allowance."""
+    return _error_mentions(error, ALLOWANCE_REVERT_MARKERS)
+
+
+def _is_gas_limit_rejection(error: Exception) -> bool:
+    """Whether the node refused a transaction because of its gas limit."""
+    return _error_mentions(error, GAS_LIMIT_REJECTION_MARKERS)
+
+
+def _stake_share(results: List[Any]) -> Optional[Decimal]:
+    """Share of a gauge's working supply from (balance, supply) pairs, first readable pair wins."""
+    for balance, supply in zip(results[0::2], results[1::2]):
+        if balance is not None and supply is not None:
+            return Decimal(balance) / Decimal(supply) if supply else Decimal(0)
+    return None
+
+
+def _block_cached(method):
+    """
+    Cache a read method's result until the next block header arrives.
+
+    Only active while a newHeads subscription is running; otherwise every call
+    goes to the node as before.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self._get_block_cached(key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+
 class ProtocolClient:
     """
     The main client for interacting with the f(x) Protocol.
@@ -57,13 +258,15 @@ class ProtocolClient:
         private_key: Optional[str] = None,
         abi_dir: Optional[str] = None,
         log_level: int = logging.INFO,
-        use_browser_wallet: bool = False
+        use_browser_wallet: bool = False,
+        ws_url: Optional[str] = None
     ):
         """
         Initialize the ProtocolClient.
         
         Args:
-            rpc_url: The RPC URL for the Ethereum network.
+            rpc_url: The RPC URL for the Ethereum network. ws:// and wss:// URLs use a
+                    WebSocket provider and also start a newHeads subscription.
             private_key: Optional private key for signing transactions. If not provided,
                        the client will attempt to discover credentials from environment
                        variables, .env files, Colab secrets, or browser wallets.
@@ -71,6 +274,9 @@ class ProtocolClient:
             log_level: Logging level (default logging.INFO).
             use_browser_wallet: If True, attempt to connect to a browser-injected wallet (MetaMask, etc.).
                               Requires running in a browser environment with Web3 wallet extension.
+            ws_url: Optional WebSocket URL used only for the newHeads subscription, so reads can
+                   stay on an HTTP rpc_url. While subscribed, block-pinned read caches are
+                   invalidated on each new block and receipt waits are event-driven.
         """
         logger.setLevel(log_level)
         
@@ -89,12 +295,12 @@ class ProtocolClient:
                 # For Node.js-like environments, you'd use window.ethereum
                 self.w3 = Web3()  # Will be set by browser provider
                 logger.warning("Browser wallet connection requires additional setup. Falling back to RPC provider.")
-                self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+                self.w3 = Web3(self._make_provider(rpc_url))
             except Exception as e:
                 logger.warning(f"Browser wallet not available: {e}. Using RPC provider.")
-                self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+                self.w3 = Web3(self._make_provider(rpc_url))
         else:
-            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+            self.w3 = Web3(self._make_provider(rpc_url))
         
         try:
             is_connected = self.w3.is_connected()
@@ -136,8 +342,102 @@ class ProtocolClient:
             self.abi_dir = abi_dir
             
         self.contracts: Dict[str, Contract] = {}
+        self.multicall_chunk_size = 500
+        # Gas the provider allows per eth_call (geth's default RPCGasCap)
+        self.eth_call_gas_cap = 50_000_000
         self._load_contracts()
 
+        # Values that never change on-chain, cached for the client's lifetime
+        self._token_decimals_cache: Dict[str, int] = {}
+        self._vault_fields_cache: Dict[str, Dict[str, Any]] = {}
+        self._curve_pool_layout_cache: Dict[str, Dict[str, Any]] = {}
+        self._curve_gauge_meta_cache: Dict[str, Dict[str, Any]] = {}
+        # Raw allowances by (owner, token, spender), kept current by the client's
+        # own writes and sync_allowance_cache()
+        self._allowance_cache: Dict[Tuple[str, str, str], int] = {}
+        self._allowance_sync_block: Optional[int] = None
+        # EIP-712 (name, version) of permit tokens, None for tokens without EIP-2612
+        self._permit_domain_cache: Dict[str, Optional[Tuple[str, str]]] = {}
+        # Active reward tokens of f(x) liquidity gauges, checked on every claim plan
+        self._gauge_reward_tokens_cache: Dict[str, List[str]] = {}
+        self._convex_reward_pool_cache: Dict[str, Dict[str, Any]] = {}
+        # Only changed by governance; clear to pick up a new oracle
+        self._pool_price_oracle_cache: Dict[str, str] = {}
+        self._gauge_type_count = 0
+
+        # Booster poolInfo by pool id, as (fetched_at, poolInfo). Only the
+        # shutdown flag can change, so active pools are re-read after
+        # convex_pool_info_max_age seconds and shut-down pools never are.
+        self._convex_pool_info_cache: Dict[int, Tuple[float, List[Any]]] = {}
+        self.convex_pool_info_max_age = 3600.0
+
+        # Block-pinned read cache, driven by the newHeads subscription
+        self._block_cache: Dict[Hashable, Any] = {}
+        self._block_cache_lock = threading.RLock()
+        self._head_condition = threading.Condition()
+        self._latest_head: Optional[Dict[str, Any]] = None
+        self._latest_head_at = 0.0
+        # Heads older than this many seconds (a few block times) are treated as
+        # absent, so reads go to the node while the stream is stalled
+        self.max_head_age = 36.0
+        self._block_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._head_subscription: Optional[NewHeadsSubscription] = None
+
+        # Collects deferred builds while build_transactions_batch() is running
+        self._tx_batch_state = threading.local()
+
+        # EIP-1559 fees from a feeHistory sample refreshed once per block
+        self.fee_urgency = "standard"
+
+        # Optional learned gas limits for repeated writes (assign a GasProfileCache to enable)
+        self.gas_profiles: Optional[GasProfileCache] = None
+
+        # Writers sign EIP-2612 permits instead of waiting on approvals (deadline in seconds)
+        self.use_permit = True
+        self.permit_deadline = 1800
+
+        # Curve registry mappings for the f(x) pool set, loaded on first lookup;
+        # a failed load is retried after curve_registry_index_retry_delay seconds
+        self.curve_registry_index = CurveRegistryIndex()
+        self._curve_registry_index_loaded = False
+        self._curve_registry_index_failed_at: Optional[float] = None
+        self.curve_registry_index_retry_delay = 300.0
+
+        # Pool Manager positions discovered from events (see sync_position_index())
+        self.position_index = PositionIndex()
+        self.position_index_start_block = 0
+        self.log_block_range = 10_000
+        self.fee_oracle = FeeOracle(
+            self.w3,
+            latest_block=lambda: (self._fresh_head() or {}).get("number")
+        )
+
+        subscription_url = ws_url or (rpc_url if is_websocket_url(rpc_url) else None)
+        if subscription_url:
+            self.start_block_subscription(subscription_url)
+
+    def _make_provider(self, rpc_url: str):
+        """
+        Create the Web3 provider for an RPC URL.
+        
+        HTTP(S) URLs use HTTPProvider; ws:// and wss:// URLs use the synchronous
+        WebSocket provider shipped with the installed Web3 version.
+        """
+        if not is_websocket_url(rpc_url):
+            return Web3.HTTPProvider(rpc_url)
+        
+        # Web3 v6 exposes WebsocketProvider; v7 renamed it LegacyWebSocketProvider
+        provider_class = getattr(Web3, "WebsocketProvider", None)
+        if provider_class is None:
+            try:
+                from web3 import LegacyWebSocketProvider as provider_class
+            except ImportError:
+                raise ConfigurationError(
+                    "This Web3 version has no synchronous WebSocket provider. "
+                    "Use an HTTP rpc_url and pass the WebSocket URL as ws_url instead."
+                )
+        return provider_class(rpc_url)
+
     def _discover_wallet_credentials(
         self, 
         explicit_key: Optional[str] = None,
@@ -206,6 +506,10 @@ class ProtocolClient:
         # Supporting
         self.multipath_converter = self._get_contract("multipath_converter", constants.MULTI_PATH_CONVERTER)
         self.steth_gateway = self._get_contract("steth_gateway", constants.STETH_GATEWAY)
+        self.multicall = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.MULTICALL3),
+            abi=MULTICALL3_ABI
+        )
 
     def _get_contract(self, name: str, address: str) -> Contract:
         """
@@ -232,8 +536,271 @@ class ProtocolClient:
             # This prevents initialization errors while ABIs are being added
             return self.w3.eth.contract(address=checksum_address, abi=[])
 
+    # --- Block Subscription Methods ---
+
+    def start_block_subscription(self, ws_url: str):
+        """
+        Subscribe to newHeads over a WebSocket connection.
+
+        While the subscription is running, block-pinned reads (NAV, collateral
+        ratios, balances, ...) are served from cache until the next block arrives,
+        and receipt waits wake up on new blocks instead of sleep-polling.
+
+        Args:
+            ws_url: WebSocket RPC URL (ws:// or wss://).
+        """
+        self.stop_block_subscription()
+        self._head_subscription = NewHeadsSubscription(
+            ws_url, self._on_new_head, on_disconnect=self._on_head_stream_lost
+        )
+        self._head_subscription.start()
+        logger.info(f"Subscribed to newHeads at {ws_url}")
+
+    def stop_block_subscription(self):
+        """Stop the newHeads subscription and drop the block-pinned cache."""
+        subscription = self._head_subscription
+        self._head_subscription = None
+        if subscription is not None:
+            subscription.stop()
+        with self._head_condition:
+            self._latest_head = None
+            self._head_condition.notify_all()
+        self.clear_block_cache()
+
+    def close(self):
+        """Release background resources held by the client."""
+        self.stop_block_subscription()
+
+    def add_block_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback invoked with each new block header.
+
+        Args:
+            callback: Function taking the parsed header dict (number, hash, timestamp, ...).
+        """
+        self._block_listeners.append(callback)
+
+    def remove_block_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Unregister a callback added with add_block_listener()."""
+        if callback in self._block_listeners:
+            self._block_listeners.remove(callback)
+
+    @property
+    def latest_block_number(self) -> int:
+        """Latest block number, from the subscription if available, else from the node."""
+        head = self._fresh_head()
+        if head is not None and head.get("number") is not None:
+            return head["number"]
+        return self.w3.eth.block_number
+
+    def clear_block_cache(self):
+        """Drop all block-pinned cached reads."""
+        with self._block_cache_lock:
+            self._block_cache.clear()
+
+    def _on_new_head(self, head: Dict[str, Any]):
+        """Handle a new block header from the subscription."""
+        with self._block_cache_lock:
+            self._block_cache.clear()
+            with self._head_condition:
+                self._latest_head = head
+                self._latest_head_at = time.monotonic()
+                self._head_condition.notify_all()
+
+        for callback in list(self._block_listeners):
+            try:
+                callback(head)
+            except Exception as e:
+                logger.warning(f"Block listener failed: {e}")
+
+    def _on_head_stream_lost(self):
+        """Forget the last head when the subscription drops, until a new one arrives."""
+        with self._block_cache_lock:
+            self._block_cache.clear()
+            with self._head_condition:
+                self._latest_head = None
+                self._head_condition.notify_all()
+
+    def _fresh_head(self) -> Optional[Dict[str, Any]]:
+        """The latest subscribed head, or None if there is none or it is older than `max_head_age`."""
+        head = self._latest_head
+        if self._head_subscription is None or head is None:
+            return None
+        if time.monotonic() - self._latest_head_at > self.max_head_age:
+            return None
+        return head
+
+    def _get_block_cached(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return a cached read for the current block, loading it on a miss.
+
+        Without an active subscription, or while its last head is stale, there
+        is no reliable way to know when a block changes, so the loader is
+        always called.
+        """
+        head = self._fresh_head()
+        if head is None:
+            return loader()
+
+        with self._block_cache_lock:
+            if self._latest_head is head and key in self._block_cache:
+                return copy.deepcopy(self._block_cache[key])
+
+        value = loader()
+
+        with self._block_cache_lock:
+            # Only pin the value if no new block arrived while loading
+            if self._latest_head is head:
+                self._block_cache[key] = value
+        return copy.deepcopy(value)
+
+    def _wait_for_transaction_receipt(self, tx_hash, timeout: float = 120) -> Any:
+        """
+        Wait for a transaction receipt.
+
+        With a newHeads subscription the receipt is checked once per new block;
+        otherwise this falls back to Web3's polling wait.
+
+        Raises:
+            TimeExhausted: If no receipt is available within the timeout.
+        """
+        if self._head_subscription is None:
+            return self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            seen_head = self._latest_head
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                if receipt is not None:
+                    return receipt
+            except TransactionNotFound:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeExhausted(
+                    f"Transaction {tx_hash!r} is not in the chain after {timeout} seconds"
+                )
+            if self._head_subscription is None:
+                return self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=remaining)
+            # Without a fresh head the stream may be down: re-check about once a second
+            wait_timeout = self.max_head_age if self._fresh_head() is not None else 1.0
+            self._wait_for_next_head(seen_head, min(remaining, wait_timeout))
+
+    def _wait_for_next_head(self, seen_head: Optional[Dict[str, Any]], timeout: float) -> bool:
+        """
+        Block until a head newer than `seen_head` arrives.
+
+        Returns:
+            bool: True if a new head arrived, False on timeout or if the
+            subscription was stopped.
+        """
+        with self._head_condition:
+            self._head_condition.wait_for(
+                lambda: self._latest_head is not seen_head or self._head_subscription is None,
+                timeout
+            )
+            return self._latest_head is not seen_head and self._latest_head is not None
+
+    # --- Multicall Methods ---
+
+    def _multicall(
+        self,
+        calls: List[Any],
+        block_identifier: Union[str, int] = "latest",
+        chunk_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Execute many read calls through Multicall3 `aggregate3`.
+        
+        Args:
+            calls: Bound contract functions, e.g. `token.functions.balanceOf(addr)`.
+            block_identifier: Block to read at (default 'latest').
+            chunk_size: Maximum calls per aggregate3 request (defaults to
+                       `self.multicall_chunk_size`).
+            
+        Returns:
+            List with one decoded result per call, in order. Calls that revert or
+            return undecodable data yield None. Single-output functions are
+            unwrapped like `.call()` does.
+        """
+        if not calls:
+            return []
+        
+        chunk_size = chunk_size or self.multicall_chunk_size
+        results = []
+        for start in range(0, len(calls), chunk_size):
+            chunk = calls[start:start + chunk_size]
+            try:
+                payload = [
+                    (utils.to_checksum_address(fn.address), True, fn._encode_transaction_data())
+                    for fn in chunk
+                ]
+                raw_results = list(self.multicall.functions.aggregate3(payload).call(
+                    block_identifier=block_identifier
+                ))
+            except Exception as e:
+                raise ContractCallError(f"Multicall failed: {str(e)}")
+            if len(raw_results) != len(chunk):
+                raise ContractCallError(
+                    f"Multicall returned {len(raw_results)} results for {len(chunk)} calls"
+                )
+            
+            for fn, (success, return_data) in zip(chunk, raw_results):
+                results.append(self._decode_call_result(fn, success, return_data))
+        return results
+
+    def _decode_call_result(self, contract_function, success: bool, return_data: bytes) -> Any:
+        """Decode one aggregate3 result using the function's ABI outputs."""
+        if not success or not return_data:
+            return None
+        outputs = contract_function.abi.get("outputs", [])
+        output_types = [_abi_type_string(output) for output in outputs]
+        try:
+            decoded = abi_decode(output_types, bytes(return_data))
+        except Exception as e:
+            logger.debug(f"Could not decode {contract_function.fn_name} result: {e}")
+            return None
+        decoded = [
+            _checksum_abi_value(output, value) if "address" in output_type else value
+            for output, output_type, value in zip(outputs, output_types, decoded)
+        ]
+        if len(decoded) == 1:
+            return decoded[0]
+        return list(decoded)
+
+    def _get_token_decimals_batch(self, token_addresses: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Resolve ERC20 decimals for many tokens, once per unique token.
+        
+        Decimals are immutable, so resolved values are cached for the lifetime
+        of the client and only unknown tokens are fetched (in one multicall).
+        
+        Args:
+            token_addresses: Token addresses (duplicates are fine).
+            
+        Returns:
+            Dict mapping checksum token address to decimals, or None if the
+            token's decimals() call failed.
+        """
+        tokens = list(dict.fromkeys(utils.to_checksum_address(t) for t in token_addresses))
+        missing = [t for t in tokens if t not in self._token_decimals_cache]
+        
+        if missing:
+            results = self._multicall([
+                self._get_contract("erc20", token).functions.decimals()
+                for token in missing
+            ])
+            for token, decimals in zip(missing, results):
+                if decimals is not None:
+                    self._token_decimals_cache[token] = decimals
+        
+        return {token: self._token_decimals_cache.get(token) for token in tokens}
+
     # --- Generic Read Methods ---
 
+    @_block_cached
     def get_token_balance(self, token_address: str, account_address: Optional[str] = None) -> Decimal:
         """
         Get the human-readable balance of a token for an account.
@@ -264,6 +831,7 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get balance: {str(e)}")
 
+    @_block_cached
     def get_token_total_supply(self, token_address: str) -> Decimal:
         """Get the total supply of a token."""
         contract = self.w3.eth.contract(
@@ -299,12 +867,171 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get allowance: {str(e)}")
 
+    # --- Allowance Cache ---
+
+    def load_allowances(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        owner: Optional[str] = None
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Read raw allowances in one multicall and cache them.
+        
+        `curve_swap()`, `curve_add_liquidity()` and `deposit_to_convex_vault()`
+        check allowances against this cache. Entries are decremented as the
+        client's own writes spend them, set from its own approvals and permits,
+        and reconciled with Approval events by sync_allowance_cache().
+        
+        Args:
+            pairs: (token, spender) pairs to read.
+            owner: Owner address (defaults to the client's).
+            
+        Returns:
+            Raw allowance by (token, spender), as checksummed addresses.
+        
+        Raises:
+            ConfigurationError: If no owner address is available.
+        
+        Example:
+            client.load_allowances([(constants.FXUSD, pool), (lp_token, vault)])
+            # ...later, e.g. once per block
+            client.sync_allowance_cache()
+        """
+        owner = owner or self.address
+        if not owner:
+            raise ConfigurationError("Owner address required to load allowances.")
+        owner = utils.to_checksum_address(owner)
+        pairs = list(dict.fromkeys(
+            (utils.to_checksum_address(token), utils.to_checksum_address(spender)) for token, spender in pairs
+        ))
+        if not pairs:
+            return {}
+        
+        if self._allowance_sync_block is None:
+            # Events from this block on are replayed by sync_allowance_cache()
+            self._allowance_sync_block = self.w3.eth.block_number
+        keys = [(owner, token, spender) for token, spender in pairs]
+        return {key[1:]: raw_allowance for key, raw_allowance in self._read_allowances(keys).items()}
+
+    def _read_allowances(self, keys: List[Tuple[str, str, str]], block_identifier: Union[str, int] = "latest") -> Dict[Tuple[str, str, str], int]:
+        """Read (owner, token, spender) allowances in one multicall into the cache; unreadable entries are dropped."""
+        calls = [self._get_contract("erc20", token).functions.allowance(owner, spender) for owner, token, spender in keys]
+        allowances = {}
+        for key, raw_allowance in zip(keys, self._multicall_or_each(calls, block_identifier=block_identifier)):
+            if raw_allowance is None:
+                self._allowance_cache.pop(key, None)
+                continue
+            self._allowance_cache[key] = raw_allowance
+            allowances[key] = raw_allowance
+        return allowances
+
+    def sync_allowance_cache(self, to_block: Optional[int] = None) -> int:
+        """
+        Reconcile cached allowances with Approval events.
+        
+        Approval events of the cached tokens for the cached owners since the
+        last sync are read with one log query per `self.log_block_range`
+        blocks. The events only mark which cached entries changed: those are
+        re-read with one `allowance()` multicall at `to_block`, since tokens
+        that spend allowances in `transferFrom()` without emitting Approval
+        would leave an event's value stale.
+        
+        Args:
+            to_block: Block to sync up to (defaults to the current block).
+            
+        Returns:
+            Number of cached entries re-read.
+        
+        Raises:
+            ContractCallError: If a log query fails.
+        """
+        if not self._allowance_cache or self._allowance_sync_block is None:
+            return 0
+        if to_block is None:
+            to_block = self.w3.eth.block_number
+        
+        tokens = list(dict.fromkeys(token for _, token, _ in self._allowance_cache))
+        owner_topics = list(dict.fromkeys(
+            "0x" + "00" * 12 + owner[2:].lower() for owner, _, _ in self._allowance_cache
+        ))
+        
+        touched = {}
+        step = max(1, self.log_block_range)
+        for range_start in range(self._allowance_sync_block + 1, to_block + 1, step):
+            try:
+                logs = self.w3.eth.get_logs({
+                    "address": tokens,
+                    "topics": [APPROVAL_EVENT_TOPIC, owner_topics],
+                    "fromBlock": range_start,
+                    "toBlock": min(range_start + step - 1, to_block),
+                })
+            except Exception as e:
+                raise ContractCallError(f"Failed to get Approval events: {str(e)}")
+            
+            for log in logs:
+                key = (
+                    utils.to_checksum_address("0x" + bytes(log["topics"][1])[-20:].hex()),
+                    utils.to_checksum_address(log["address"]),
+                    utils.to_checksum_address("0x" + bytes(log["topics"][2])[-20:].hex()),
+                )
+                if key in self._allowance_cache:
+                    touched[key] = None
+        
+        if touched:
+            self._read_allowances(list(touched), block_identifier=to_block)
+        self._allowance_sync_block = max(self._allowance_sync_block, to_block)
+        return len(touched)
+
+    def clear_allowance_cache(self):
+        """Forget all cached allowances."""
+        self._allowance_cache.clear()
+        self._allowance_sync_block = None
+
+    def _get_raw_allowance(self, token_address: str, spender_address: str, required: int = 0) -> int:
+        """
+        Cached raw allowance of the client's address.
+        
+        Missing entries, and cached values below `required`, are read from the
+        chain (an approval made elsewhere may not be synced yet).
+        """
+        key = (self.address, utils.to_checksum_address(token_address), utils.to_checksum_address(spender_address))
+        cached = self._allowance_cache.get(key)
+        if cached is not None and cached >= required:
+            return cached
+        allowances = self.load_allowances([key[1:]])
+        if key[1:] not in allowances:
+            raise ContractCallError(f"Failed to get allowance of {key[1]} for {key[2]}")
+        return allowances[key[1:]]
+
+    def _set_cached_allowance(self, token_address: str, spender_address: str, raw_amount: Optional[int]):
+        """Write an allowance of the client's address through to the cache (None forgets it)."""
+        key = (self.address, utils.to_checksum_address(token_address), utils.to_checksum_address(spender_address))
+        if raw_amount is None:
+            self._allowance_cache.pop(key, None)
+        else:
+            self._allowance_cache[key] = raw_amount
+
+    def _spend_cached_allowances(self, spends: List[Tuple[str, str, int]], succeeded: bool):
+        """Update cached allowances after a write that spends them."""
+        for token_address, spender_address, raw_amount in spends:
+            key = (self.address, utils.to_checksum_address(token_address), utils.to_checksum_address(spender_address))
+            cached = self._allowance_cache.get(key)
+            if cached is None:
+                continue
+            if not succeeded:
+                # The write may or may not have been mined; re-read next time
+                del self._allowance_cache[key]
+            elif cached != 2**256 - 1:
+                # Standard ERC20s do not decrement unlimited allowances
+                self._allowance_cache[key] = max(cached - raw_amount, 0)
+
     # --- V2 Product-Specific Read Methods ---
 
     def get_fxusd_total_supply(self) -> Decimal:
         """Get the total supply of fxUSD."""
         return self.get_token_total_supply(constants.FXUSD)
 
+    @_block_cached
     def get_steth_price(self) -> Decimal:
         """Get the current stETH price from the oracle."""
         contract = self.w3.eth.contract(
@@ -335,6 +1062,7 @@ class ProtocolClient:
 
     # --- V1 Legacy Read Methods ---
 
+    @_block_cached
     def get_v1_nav(self) -> Dict[str, Decimal]:
         """
         Get the Net Asset Value (NAV) for V1 fETH and xETH.
@@ -349,6 +1077,7 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get V1 NAV: {str(e)}")
 
+    @_block_cached
     def get_v1_collateral_ratio(self) -> Decimal:
         """
         Get the current collateral ratio of the V1 market.
@@ -419,6 +1148,7 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get reserve pool bonus ratio: {str(e)}")
 
+    @_block_cached
     def get_steth_treasury_info(self) -> Dict[str, Any]:
         """Get information from the stETH Treasury."""
         contract = self._get_contract("steth_treasury", constants.STETH_TREASURY_PROXY)
@@ -431,6 +1161,7 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get stETH treasury info: {str(e)}")
 
+    @_block_cached
     def get_treasury_nav(self) -> Dict[str, Decimal]:
         """Get Net Asset Values from the treasury."""
         contract = self._get_contract("steth_treasury", constants.STETH_TREASURY_PROXY)
@@ -457,6 +1188,143 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get market info: {str(e)}")
 
+    # --- Protocol Metrics Watcher ---
+
+    def get_protocol_metrics_snapshot(self, block_identifier: Union[str, int] = "latest") -> ProtocolMetricsSnapshot:
+        """
+        Read treasury NAV, V1 NAV and collateral ratio, stETH treasury info and
+        peg keeper status in a single multicall.
+
+        This replaces the ~10 sequential calls made by get_treasury_nav(),
+        get_v1_nav(), get_v1_collateral_ratio(), get_steth_treasury_info() and
+        get_peg_keeper_info().
+
+        Args:
+            block_identifier: Block to read at (default 'latest').
+
+        Returns:
+            ProtocolMetricsSnapshot: All metrics pinned to one block. Metrics whose
+            call reverted are None.
+        """
+        treasury = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.STETH_TREASURY_PROXY),
+            abi=PROTOCOL_METRICS_ABI
+        )
+        market = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.MARKET_PROXY),
+            abi=PROTOCOL_METRICS_ABI
+        )
+        peg_keeper = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.PEG_KEEPER),
+            abi=PROTOCOL_METRICS_ABI
+        )
+
+        (
+            block_number, timestamp,
+            treasury_nav, total_base_token, treasury_cr, leverage_ratio,
+            v1_nav, v1_cr,
+            peg_active, debt_ceiling, total_debt
+        ) = self._multicall([
+            self.multicall.functions.getBlockNumber(),
+            self.multicall.functions.getCurrentBlockTimestamp(),
+            treasury.functions.getCurrentNav(),
+            treasury.functions.totalBaseToken(),
+            treasury.functions.collateralRatio(),
+            treasury.functions.leverageRatio(),
+            market.functions.getNav(),
+            market.functions.collateralRatio(),
+            peg_keeper.functions.isActive(),
+            peg_keeper.functions.debtCeiling(),
+            peg_keeper.functions.totalDebt(),
+        ], block_identifier=block_identifier)
+
+        if block_number is None:
+            raise ContractCallError("Failed to read block number from Multicall3.")
+
+        def to_decimal(raw: Optional[int]) -> Optional[Decimal]:
+            return utils.wei_to_decimal(raw, 18) if raw is not None else None
+
+        return ProtocolMetricsSnapshot(
+            block_number=block_number,
+            timestamp=timestamp,
+            treasury_base_nav=to_decimal(treasury_nav[0]) if treasury_nav else None,
+            treasury_f_nav=to_decimal(treasury_nav[1]) if treasury_nav else None,
+            treasury_x_nav=to_decimal(treasury_nav[2]) if treasury_nav else None,
+            treasury_total_base_token=to_decimal(total_base_token),
+            treasury_collateral_ratio=to_decimal(treasury_cr),
+            treasury_leverage_ratio=to_decimal(leverage_ratio),
+            v1_f_nav=to_decimal(v1_nav[0]) if v1_nav else None,
+            v1_x_nav=to_decimal(v1_nav[1]) if v1_nav else None,
+            v1_collateral_ratio=to_decimal(v1_cr),
+            peg_keeper_active=peg_active,
+            peg_keeper_debt_ceiling=to_decimal(debt_ceiling),
+            peg_keeper_total_debt=to_decimal(total_debt),
+        )
+
+    def watch_protocol_metrics(
+        self,
+        thresholds: Optional[List[MetricThreshold]] = None,
+        poll_interval: float = 12.0,
+        emit_unchanged: bool = False,
+        max_snapshots: Optional[int] = None
+    ) -> Iterator[ProtocolMetricsSnapshot]:
+        """
+        Stream protocol metric snapshots, one multicall per block.
+
+        With a newHeads subscription the watcher wakes on each new block;
+        otherwise it polls every `poll_interval` seconds. Snapshots are only
+        yielded when a metric changed (unless `emit_unchanged` is True), and
+        threshold rules are evaluated on every new block.
+
+        Args:
+            thresholds: Optional MetricThreshold rules with callbacks.
+            poll_interval: Seconds between polls without a subscription, and the
+                          maximum wait for a new head with one.
+            emit_unchanged: Yield a snapshot for every new block, even if unchanged.
+            max_snapshots: Stop after this many snapshots (default: run forever).
+
+        Yields:
+            ProtocolMetricsSnapshot: Snapshot for each block where metrics changed.
+
+        Example:
+            rule = MetricThreshold("v1_collateral_ratio", below=Decimal("1.3"), callback=alert)
+            for snapshot in client.watch_protocol_metrics(thresholds=[rule]):
+                print(snapshot.block_number, snapshot.treasury_f_nav)
+        """
+        last_block = None
+        last_metrics = None
+        emitted = 0
+
+        while max_snapshots is None or emitted < max_snapshots:
+            seen_head = self._latest_head
+            try:
+                snapshot = self.get_protocol_metrics_snapshot()
+            except ContractCallError as e:
+                logger.warning(f"Failed to read protocol metrics: {e}")
+                snapshot = None
+
+            if snapshot is not None and snapshot.block_number != last_block:
+                last_block = snapshot.block_number
+
+                for rule in thresholds or []:
+                    try:
+                        rule.check(snapshot)
+                    except Exception as e:
+                        logger.warning(f"Threshold callback for {rule.metric} failed: {e}")
+
+                metrics = snapshot.metrics()
+                if emit_unchanged or metrics != last_metrics:
+                    last_metrics = metrics
+                    emitted += 1
+                    yield snapshot
+                    if max_snapshots is not None and emitted >= max_snapshots:
+                        return
+
+            if self._head_subscription is not None:
+                self._wait_for_next_head(seen_head, poll_interval)
+            else:
+                time.sleep(poll_interval)
+
     def get_fxusd_balance(self, account_address: Optional[str] = None) -> Decimal:
         """Get the fxUSD balance of an account."""
         return self.get_token_balance(constants.FXUSD, account_address)
@@ -558,6 +1426,53 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get veFXN locked info: {str(e)}")
 
+    def get_vefxn_locks(self, account_addresses: List[str]) -> Dict[str, VeLock]:
+        """
+        Read the veFXN locks of many accounts in one multicall.
+        
+        Without Multicall3, locks are read one account at a time.
+        
+        Args:
+            account_addresses: Account addresses.
+            
+        Returns:
+            Dict mapping checksum account address to its VeLock (amount 0 if
+            the account has no lock).
+        
+        Raises:
+            ContractCallError: If a lock cannot be read.
+        """
+        accounts = list(dict.fromkeys(utils.to_checksum_address(a) for a in account_addresses))
+        calls = [self.vefxn.functions.locked(account) for account in accounts]
+        results = self._multicall_or_each(calls)
+        
+        locks = {}
+        for account, locked in zip(accounts, results):
+            if locked is None:
+                raise ContractCallError(f"Failed to get veFXN locked info for {account}")
+            locks[account] = VeLock(amount=int(locked[0]), end=int(locked[1]))
+        return locks
+
+    def get_vefxn_power_calculator(self, account_addresses: List[str]) -> VotingPowerCalculator:
+        """
+        Build an offline veFXN voting power calculator for many accounts.
+        
+        Locks are read once (see `get_vefxn_locks()`); power at any timestamp
+        is then computed locally, matching `balanceOf(account, timestamp)`
+        until an account changes its lock.
+        
+        Args:
+            account_addresses: Account addresses.
+            
+        Returns:
+            VotingPowerCalculator: Calculator over the accounts' locks.
+        
+        Example:
+            calculator = client.get_vefxn_power_calculator(accounts)
+            print(calculator.total_power_at(int(time.time()) + 30 * 86400))
+        """
+        return VotingPowerCalculator(self.get_vefxn_locks(account_addresses))
+
     def get_gauge_weight(self, gauge_address: str) -> Decimal:
         """Get the relative weight of a gauge in the controller."""
         try:
@@ -581,6 +1496,132 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get gauge relative weight: {str(e)}")
 
+
+    def get_gauge_controller_sweep(
+        self,
+        gauge_addresses: Optional[Union[Dict[str, str], List[str]]] = None,
+        account_address: Optional[str] = None
+    ) -> GaugeSweep:
+        """
+        Read weight, relative weight and type of many gauges in one request.
+        
+        Type weights and the controller's total weight are read in the same
+        Multicall3 request. With an account, its veFXN lock, current votes
+        (power, slope, last vote time) and its share of each gauge's working
+        supply are included too, so `GaugeSweep.optimize_votes()` runs offline.
+        Without Multicall3, values are read one call at a time.
+        
+        Args:
+            gauge_addresses: Gauges as {label: address} or a list of addresses
+                            (defaults to `constants.GAUGES`).
+            account_address: Optional voter whose votes and positions to include.
+            
+        Returns:
+            GaugeSweep: Gauge states by label, plus account data if requested.
+        
+        Example:
+            sweep = client.get_gauge_controller_sweep(account_address=treasury)
+            allocation = sweep.optimize_votes()
+            for label, bps in allocation.vote_changes(sweep.current_votes()):
+                client.vote_for_gauge_weight(sweep.gauges[label].gauge, bps)
+        """
+        if gauge_addresses is None:
+            gauge_addresses = constants.GAUGES
+        if isinstance(gauge_addresses, dict):
+            gauges = [(label, utils.to_checksum_address(a)) for label, a in gauge_addresses.items()]
+        else:
+            gauges = [(utils.to_checksum_address(a), utils.to_checksum_address(a)) for a in gauge_addresses]
+        account = utils.to_checksum_address(account_address) if account_address else None
+        
+        controller = self.gauge_controller.functions
+        type_ids = list(range(max(self._gauge_type_count, GAUGE_TYPE_PROBE)))
+        calls = [
+            self.multicall.functions.getCurrentBlockTimestamp(),
+            controller.get_total_weight(),
+            controller.n_gauge_types(),
+        ]
+        calls.extend(controller.get_type_weight(type_id) for type_id in type_ids)
+        if account:
+            calls.extend([controller.vote_user_power(account), self.vefxn.functions.locked(account)])
+        
+        per_gauge = 3 + (8 if account else 0)
+        for _, gauge_address in gauges:
+            calls.extend([
+                controller.get_gauge_weight(gauge_address),
+                controller.gauge_relative_weight(gauge_address),
+                controller.gauge_types(gauge_address),
+            ])
+            if account:
+                gauge = self.w3.eth.contract(address=gauge_address, abi=GAUGE_WORKING_SUPPLY_ABI).functions
+                calls.extend([
+                    controller.vote_user_slopes(account, gauge_address),
+                    controller.last_user_vote(account, gauge_address),
+                    gauge.working_balances(account),
+                    gauge.working_supply(),
+                    gauge.workingBalanceOf(account),
+                    gauge.workingSupply(),
+                    gauge.balanceOf(account),
+                    gauge.totalSupply(),
+                ])
+        
+        results = self._multicall_or_each(calls)
+        timestamp, total_weight, n_types = results[:3]
+        type_weights = dict(zip(type_ids, results[3:3 + len(type_ids)]))
+        offset = 3 + len(type_ids)
+        
+        if n_types is not None:
+            self._gauge_type_count = n_types
+            missing_types = [type_id for type_id in range(n_types) if type_id not in type_weights]
+            if missing_types:
+                extra = self._multicall_or_each([controller.get_type_weight(t) for t in missing_types])
+                type_weights.update(zip(missing_types, extra))
+        
+        user_power_used, lock = 0, None
+        if account:
+            user_power_used, locked = results[offset:offset + 2]
+            user_power_used = user_power_used or 0
+            if locked is not None:
+                lock = VeLock(amount=int(locked[0]), end=int(locked[1]))
+            offset += 2
+        
+        states = {}
+        for i, (label, gauge_address) in enumerate(gauges):
+            row = results[offset + i * per_gauge:offset + (i + 1) * per_gauge]
+            weight, relative_weight, gauge_type = row[:3]
+            type_weight = type_weights.get(gauge_type) if gauge_type is not None else None
+            state = GaugeVoteState(
+                gauge=gauge_address,
+                label=label,
+                gauge_type=gauge_type,
+                weight=utils.wei_to_decimal(weight) if weight is not None else None,
+                relative_weight=utils.wei_to_decimal(relative_weight) if relative_weight is not None else None,
+                type_weight=utils.wei_to_decimal(type_weight) if type_weight is not None else None,
+            )
+            if account:
+                slopes, last_vote = row[3:5]
+                if slopes is not None:
+                    state.user_slope, state.user_power, state.user_vote_end = (int(v) for v in slopes)
+                state.last_user_vote = last_vote or 0
+                state.stake_share = _stake_share(row[5:])
+            states[label] = state
+        
+        return GaugeSweep(
+            timestamp=timestamp if timestamp is not None else int(time.time()),
+            total_weight=utils.wei_to_decimal(total_weight, 36) if total_weight is not None else None,
+            gauges=states,
+            account=account,
+            lock=lock,
+            user_power_used=user_power_used,
+        )
+
+    def _multicall_or_each(self, calls: List[Any], block_identifier: Union[str, int] = "latest") -> List[Any]:
+        """Run calls through Multicall3, or one by one if it is unavailable."""
+        try:
+            return self._multicall(calls, block_identifier=block_identifier)
+        except ContractCallError as e:
+            logger.debug(f"Multicall failed: {e}. Executing calls individually.")
+            return self._call_each(calls, block_identifier=block_identifier)
+
     def get_claimable_rewards(self, gauge_address: str, token_address: str, account_address: Optional[str] = None) -> Decimal:
         """Get claimable rewards from a gauge."""
         target_address = account_address or self.address
@@ -612,6 +1653,16 @@ class ProtocolClient:
         Returns:
             Dict[str, Decimal]: Map of token names to balances.
         """
+        balances = {}
+        for name, address in self._protocol_tokens().items():
+            try:
+                balances[name] = self.get_token_balance(address, account_address)
+            except Exception:
+                balances[name] = Decimal(0)
+        return balances
+
+    def _protocol_tokens(self) -> Dict[str, str]:
+        """Protocol token names and addresses covered by get_all_balances()."""
         tokens = {
             "fxUSD": constants.FXUSD,
             "fETH": constants.FETH,
@@ -626,22 +1677,10 @@ class ProtocolClient:
             "xstETH": constants.XSTETH,
             "xfrxETH": constants.XFRXETH,
         }
-        
-        balances = {}
-        for name, address in tokens.items():
-            try:
-                balances[name] = self.get_token_balance(address, account_address)
-            except Exception:
-                balances[name] = Decimal(0)
-                
-        # Handle arUSD separately since it might be missing
+        # arUSD might be missing from constants
         if hasattr(constants, 'ARUSD'):
-            try:
-                balances["arUSD"] = self.get_token_balance(constants.ARUSD, account_address)
-            except Exception:
-                balances["arUSD"] = Decimal(0)
-                
-        return balances
+            tokens["arUSD"] = constants.ARUSD
+        return tokens
 
     def get_all_gauge_balances(self, account_address: Optional[str] = None) -> Dict[str, Decimal]:
         """
@@ -655,25 +1694,285 @@ class ProtocolClient:
                 balances[name] = Decimal(0)
         return balances
 
-    def build_mint_via_treasury_transaction(
+    # --- Portfolio Scan Methods ---
+
+    def scan_portfolios(
         self,
-        base_in: Union[int, float, Decimal, str],
-        recipient: Optional[str] = None,
-        option: int = 0,
-        from_address: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Build unsigned transaction for minting via treasury."""
-        contract = self._get_contract("steth_treasury", constants.STETH_TREASURY_PROXY)
-        target_recipient = recipient or from_address or self.address
+        accounts: Iterable[str],
+        tokens: Optional[Union[Dict[str, str], List[str]]] = None,
+        gauges: Optional[Union[Dict[str, str], List[str]]] = None,
+        vault_pools: Optional[Union[Dict[str, int], List[int]]] = None,
+        block_identifier: Optional[Union[str, int]] = None,
+        gas_cap: Optional[int] = None,
+        gas_per_call: int = SCAN_GAS_PER_CALL,
+        max_workers: int = 4
+    ) -> Iterator[Tuple[str, Dict[str, Optional[Decimal]]]]:
+        """
+        Stream balances for many accounts across a set of tokens, gauges and vaults.
+        
+        The (account x asset) matrix is packed into Multicall3 requests holding
+        as many whole accounts as fit in `gas_cap`, run concurrently and pinned
+        to one block. Results are yielded as each request completes, so rows
+        do not arrive in input order. A request the provider rejects is split
+        in half and retried. Convex vaults need a second multicall per request
+        (vault lookup, then the vault's gauge balance).
+        
+        With no asset arguments, the tokens of `get_all_balances()` and all
+        `constants.GAUGES` are scanned.
         
-        if not target_recipient:
-            raise FXProtocolError("Recipient address required.")
+        Args:
+            accounts: Account addresses (any iterable; consumed lazily).
+            tokens: ERC20 tokens as {label: address} or a list of addresses.
+            gauges: Liquidity gauges as {label: address} or a list of addresses.
+            vault_pools: Convex pools as {label: pool_id} or a list of pool ids
+                        (labelled with their CONVEX_POOLS key).
+            block_identifier: Block to read at (defaults to the current block).
+            gas_cap: Gas allowed per eth_call (defaults to `self.eth_call_gas_cap`).
+            gas_per_call: Gas budgeted per balance read.
+            max_workers: Maximum concurrent multicall requests.
+            
+        Returns:
+            Iterator of (account, {label: balance}) pairs. A balance is None if
+            its call failed.
         
-        raw_base_in = utils.decimal_to_wei(base_in, 18)
-        function_call = contract.functions.mint(raw_base_in, utils.to_checksum_address(target_recipient), option)
-        return self._build_unsigned_transaction(function_call, from_address=from_address or target_recipient, default_gas=200000)
+        Raises:
+            ContractCallError: If a single account's reads cannot be executed.
+        
+        Example:
+            for account, balances in client.scan_portfolios(addresses, tokens={"fxUSD": constants.FXUSD}):
+                print(account, balances["fxUSD"])
+        """
+        assets = self._portfolio_assets(tokens, gauges, vault_pools)
+        if block_identifier is None:
+            block_identifier = self.w3.eth.block_number
+        yield from self._iter_portfolio_scan(
+            accounts, assets, block_identifier,
+            self._portfolio_accounts_per_chunk(assets, gas_cap, gas_per_call), max_workers
+        )
 
-    def mint_via_treasury(self, base_in: Union[int, float, Decimal, str], recipient: Optional[str] = None, option: int = 0) -> str:
+    def scan_portfolios_table(
+        self,
+        accounts: Iterable[str],
+        tokens: Optional[Union[Dict[str, str], List[str]]] = None,
+        gauges: Optional[Union[Dict[str, str], List[str]]] = None,
+        vault_pools: Optional[Union[Dict[str, int], List[int]]] = None,
+        block_identifier: Optional[Union[str, int]] = None,
+        gas_cap: Optional[int] = None,
+        gas_per_call: int = SCAN_GAS_PER_CALL,
+        max_workers: int = 4
+    ) -> PortfolioTable:
+        """
+        Scan balances for many accounts into a columnar table.
+        
+        Takes the same arguments as `scan_portfolios()`.
+        
+        Returns:
+            PortfolioTable: One row per account and one column per asset label,
+            tagged with the block number that was read.
+        
+        Example:
+            table = client.scan_portfolios_table(addresses)
+            df = pandas.DataFrame(table.to_dict())
+        """
+        assets = self._portfolio_assets(tokens, gauges, vault_pools)
+        if block_identifier is None:
+            block_identifier = self.w3.eth.block_number
+        table = PortfolioTable(
+            [asset.label for asset in assets],
+            block_number=block_identifier if isinstance(block_identifier, int) else None
+        )
+        table.extend(self._iter_portfolio_scan(
+            accounts, assets, block_identifier,
+            self._portfolio_accounts_per_chunk(assets, gas_cap, gas_per_call), max_workers
+        ))
+        return table
+
+    def _portfolio_assets(
+        self,
+        tokens: Optional[Union[Dict[str, str], List[str]]],
+        gauges: Optional[Union[Dict[str, str], List[str]]],
+        vault_pools: Optional[Union[Dict[str, int], List[int]]]
+    ) -> List[PortfolioAsset]:
+        """Normalize scan arguments into labelled assets."""
+        if tokens is None and gauges is None and vault_pools is None:
+            tokens = self._protocol_tokens()
+            gauges = constants.GAUGES
+        
+        assets = []
+        for kind, spec in (("token", tokens), ("gauge", gauges)):
+            items = spec.items() if isinstance(spec, dict) else ((address, address) for address in spec or [])
+            for label, address in items:
+                assets.append(PortfolioAsset(label, kind, address=utils.to_checksum_address(address)))
+        
+        if isinstance(vault_pools, dict):
+            pool_items = vault_pools.items()
+        else:
+            pool_keys: Dict[int, str] = {}
+            for pool_key, pool_info in constants.CONVEX_POOLS.items():
+                pool_keys.setdefault(pool_info["pool_id"], pool_key)
+            pool_items = ((pool_keys.get(pool_id, f"convex_{pool_id}"), pool_id) for pool_id in vault_pools or [])
+        for label, pool_id in pool_items:
+            assets.append(PortfolioAsset(label, "vault", pool_id=int(pool_id)))
+        
+        labels = [asset.label for asset in assets]
+        if len(set(labels)) != len(labels):
+            raise FXProtocolError(f"Duplicate asset labels in portfolio scan: {labels}")
+        if not assets:
+            raise FXProtocolError("No tokens, gauges or vault pools to scan.")
+        return assets
+
+    def _portfolio_accounts_per_chunk(self, assets: List[PortfolioAsset], gas_cap: Optional[int], gas_per_call: int) -> int:
+        """Whole accounts whose reads fit in one eth_call under the gas cap."""
+        calls_per_chunk = (gas_cap or self.eth_call_gas_cap) // max(1, gas_per_call)
+        return max(1, calls_per_chunk // len(assets))
+
+    def _iter_portfolio_scan(
+        self,
+        accounts: Iterable[str],
+        assets: List[PortfolioAsset],
+        block_identifier: Union[str, int],
+        accounts_per_chunk: int,
+        max_workers: int
+    ) -> Iterator[Tuple[str, Dict[str, Optional[Decimal]]]]:
+        """Run scan chunks concurrently, yielding rows as chunks complete."""
+        balance_assets = [asset for asset in assets if asset.kind != "vault"]
+        # Contracts are built once per asset, not once per call
+        contracts = {asset.label: self._get_contract("erc20", asset.address) for asset in balance_assets}
+        decimals = self._get_token_decimals_batch([asset.address for asset in balance_assets])
+        registry = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.CONVEX_VAULT_REGISTRY),
+            abi=CONVEX_POOL_REGISTRY_ABI
+        )
+        
+        def chunks() -> Iterator[List[str]]:
+            chunk = []
+            for account in accounts:
+                chunk.append(utils.to_checksum_address(account))
+                if len(chunk) == accounts_per_chunk:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        def scan(chunk: List[str]) -> List[Tuple[str, Dict[str, Optional[Decimal]]]]:
+            return self._scan_portfolio_chunk(chunk, assets, contracts, decimals, registry, block_identifier)
+        
+        max_workers = max(1, max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Only max_workers chunks are in flight, so huge account lists stream
+            pending = set()
+            for chunk in chunks():
+                pending.add(executor.submit(scan, chunk))
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def _scan_portfolio_chunk(
+        self,
+        accounts: List[str],
+        assets: List[PortfolioAsset],
+        contracts: Dict[str, Contract],
+        decimals: Dict[str, Optional[int]],
+        registry: Contract,
+        block_identifier: Union[str, int]
+    ) -> List[Tuple[str, Dict[str, Optional[Decimal]]]]:
+        """Read one chunk of accounts, splitting it in half if the request fails."""
+        try:
+            return self._read_portfolio_chunk(accounts, assets, contracts, decimals, registry, block_identifier)
+        except ContractCallError as e:
+            if len(accounts) == 1:
+                raise
+            logger.debug(f"Portfolio scan of {len(accounts)} accounts failed: {e}. Splitting the request.")
+            middle = len(accounts) // 2
+            return (
+                self._scan_portfolio_chunk(accounts[:middle], assets, contracts, decimals, registry, block_identifier)
+                + self._scan_portfolio_chunk(accounts[middle:], assets, contracts, decimals, registry, block_identifier)
+            )
+
+    def _read_portfolio_chunk(
+        self,
+        accounts: List[str],
+        assets: List[PortfolioAsset],
+        contracts: Dict[str, Contract],
+        decimals: Dict[str, Optional[int]],
+        registry: Contract,
+        block_identifier: Union[str, int]
+    ) -> List[Tuple[str, Dict[str, Optional[Decimal]]]]:
+        """Multicall implementation of one portfolio scan chunk."""
+        calls = []
+        for account in accounts:
+            for asset in assets:
+                if asset.kind == "vault":
+                    calls.append(registry.functions.vaultMap(asset.pool_id, account))
+                else:
+                    calls.append(contracts[asset.label].functions.balanceOf(account))
+        results = self._multicall(calls, block_identifier=block_identifier, chunk_size=len(calls))
+        
+        rows = []
+        vault_lookups = []
+        width = len(assets)
+        for i, account in enumerate(accounts):
+            balances: Dict[str, Optional[Decimal]] = {}
+            for asset, result in zip(assets, results[i * width:(i + 1) * width]):
+                if asset.kind != "vault":
+                    token_decimals = decimals.get(asset.address)
+                    balances[asset.label] = (
+                        None if result is None or token_decimals is None
+                        else utils.wei_to_decimal(result, token_decimals)
+                    )
+                elif result is None:
+                    balances[asset.label] = None
+                elif int(result, 16) == 0:
+                    balances[asset.label] = Decimal(0)
+                else:
+                    vault_lookups.append((balances, asset.label, utils.to_checksum_address(result)))
+            rows.append((account, balances))
+        
+        if vault_lookups:
+            fields = self._resolve_convex_vault_fields([vault for _, _, vault in vault_lookups])
+            gauge_calls = []
+            pending = []
+            for balances, label, vault_address in vault_lookups:
+                vault_fields = fields.get(vault_address)
+                gauge_address = vault_fields["gauge_address"] if vault_fields else None
+                if not gauge_address or int(gauge_address, 16) == 0:
+                    balances[label] = None
+                    continue
+                gauge = self._get_contract("curve_gauge", gauge_address)
+                gauge_calls.append(gauge.functions.balanceOf(vault_address))
+                pending.append((balances, label, vault_fields["staking_token_decimals"]))
+            
+            if gauge_calls:
+                raw_balances = self._multicall(gauge_calls, block_identifier=block_identifier, chunk_size=len(gauge_calls))
+                for (balances, label, token_decimals), raw_balance in zip(pending, raw_balances):
+                    balances[label] = None if raw_balance is None else utils.wei_to_decimal(raw_balance, token_decimals)
+        
+        return rows
+
+    def build_mint_via_treasury_transaction(
+        self,
+        base_in: Union[int, float, Decimal, str],
+        recipient: Optional[str] = None,
+        option: int = 0,
+        from_address: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build unsigned transaction for minting via treasury."""
+        contract = self._get_contract("steth_treasury", constants.STETH_TREASURY_PROXY)
+        target_recipient = recipient or from_address or self.address
+        
+        if not target_recipient:
+            raise FXProtocolError("Recipient address required.")
+        
+        raw_base_in = utils.decimal_to_wei(base_in, 18)
+        function_call = contract.functions.mint(raw_base_in, utils.to_checksum_address(target_recipient), option)
+        return self._build_unsigned_transaction(function_call, from_address=from_address or target_recipient, default_gas=200000)
+
+    def mint_via_treasury(self, base_in: Union[int, float, Decimal, str], recipient: Optional[str] = None, option: int = 0) -> str:
         """
         Mint fToken and/or xToken via the Treasury.
         
@@ -766,6 +2065,36 @@ class ProtocolClient:
         contract = self._get_contract("steth_treasury", constants.STETH_TREASURY_PROXY)
         return self._build_and_send_transaction(contract.functions.initializeV2(sample_interval))
 
+    # --- Fee Methods ---
+
+    def get_fee_estimates(self) -> Dict[str, Any]:
+        """
+        Get suggested EIP-1559 fees for each urgency level.
+        
+        Fees come from an `eth_feeHistory` sample cached for the current block.
+        Writers and `build_*` methods use the level in `client.fee_urgency`
+        ('standard' by default).
+        
+        Returns:
+            Dict with `base_fee_gwei` and, per urgency level ('low', 'standard',
+            'high'), `max_fee_gwei` and `max_priority_fee_gwei`. On chains without
+            EIP-1559 each level contains `gas_price_gwei` instead.
+        """
+        estimates: Dict[str, Any] = {}
+        base_fee = self.fee_oracle.get_base_fee()
+        estimates["base_fee_gwei"] = utils.wei_to_decimal(base_fee, 9) if base_fee is not None else None
+        
+        for urgency in URGENCY_PERCENTILES:
+            params = self.fee_oracle.get_fee_params(urgency)
+            if "gasPrice" in params:
+                estimates[urgency] = {"gas_price_gwei": utils.wei_to_decimal(params["gasPrice"], 9)}
+            else:
+                estimates[urgency] = {
+                    "max_fee_gwei": utils.wei_to_decimal(params["maxFeePerGas"], 9),
+                    "max_priority_fee_gwei": utils.wei_to_decimal(params["maxPriorityFeePerGas"], 9),
+                }
+        return estimates
+
     # --- Write Methods ---
 
     def _build_unsigned_transaction(
@@ -792,28 +2121,36 @@ class ProtocolClient:
         if not from_addr:
             raise FXProtocolError("From address required. Provide from_address parameter or initialize client with private key.")
         
+        pending = getattr(self._tx_batch_state, "pending", None)
+        if pending is not None:
+            # Inside build_transactions_batch(): filled in once the batch is resolved
+            placeholder: Dict[str, Any] = {}
+            pending.append((placeholder, contract_function, utils.to_checksum_address(from_addr), value, default_gas))
+            return placeholder
+        
         try:
             gas_estimate = contract_function.estimate_gas({'from': utils.to_checksum_address(from_addr), 'value': value})
         except Exception as e:
             logger.warning(f"Gas estimation failed: {e}. Using default {default_gas}.")
             gas_estimate = default_gas
         
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000  # 20 gwei default
+        fee_params = self.fee_oracle.get_fee_params(self.fee_urgency)
         
         nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(from_addr))
         
         transaction = contract_function.build_transaction({
             'from': utils.to_checksum_address(from_addr),
             'gas': gas_estimate,
-            'gasPrice': gas_price,
+            **fee_params,
             'nonce': nonce,
             'chainId': self.w3.eth.chain_id,
             'value': value
         })
         
+        return self._format_unsigned_transaction(transaction)
+
+    def _format_unsigned_transaction(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a built transaction to the fields returned by build_* methods."""
         return {
             "to": transaction['to'],
             "data": transaction['data'],
@@ -826,7 +2163,229 @@ class ProtocolClient:
             "chainId": transaction['chainId']
         }
 
-    def _build_and_send_transaction(self, contract_function, value: int = 0) -> str:
+    def build_transactions_batch(
+        self,
+        requests: List[Tuple[str, Dict[str, Any]]],
+        from_address: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build many unsigned transactions while sharing node lookups.
+        
+        Each request names a `build_*_transaction` method and its keyword
+        arguments. Fee data and chain id are fetched once, the starting nonce
+        once per sender, and all gas estimates are sent as a single JSON-RPC
+        batch. Nonces are then assigned sequentially in request order.
+        
+        Gas for a transaction that depends on an earlier one in the batch (e.g.
+        a deposit after an approve) cannot be estimated before the earlier one is
+        mined, so it falls back to the builder's default gas.
+        
+        Args:
+            requests: List of (builder_name, kwargs) tuples.
+            from_address: Default sender, passed to builders that accept
+                         `from_address` when the request does not set it.
+            
+        Returns:
+            List of transaction dicts, in request order.
+            
+        Example:
+            txs = client.build_transactions_batch([
+                ("build_transfer_transaction", {"token_address": FXN, "recipient_address": a, "amount": 10}),
+                ("build_transfer_transaction", {"token_address": FXN, "recipient_address": b, "amount": 20}),
+            ], from_address=custody_address)
+        """
+        pending: List[Tuple[Dict[str, Any], Any, str, int, int]] = []
+        transactions = []
+        
+        self._tx_batch_state.pending = pending
+        try:
+            for builder_name, kwargs in requests:
+                builder = getattr(self, builder_name, None)
+                if not builder_name.startswith("build_") or not callable(builder):
+                    raise FXProtocolError(f"Unknown transaction builder: {builder_name}")
+                
+                kwargs = dict(kwargs)
+                if from_address and "from_address" in inspect.signature(builder).parameters:
+                    kwargs.setdefault("from_address", from_address)
+                transactions.append(builder(**kwargs))
+        finally:
+            self._tx_batch_state.pending = None
+        
+        self._resolve_transaction_batch(pending)
+        return transactions
+
+    def _resolve_transaction_batch(self, pending: List[Tuple[Dict[str, Any], Any, str, int, int]]):
+        """Fill in deferred transactions collected by build_transactions_batch()."""
+        if not pending:
+            return
+        
+        fee_params = self.fee_oracle.get_fee_params(self.fee_urgency)
+        chain_id = self.w3.eth.chain_id
+        
+        # Start from the pending nonce so queued transactions are not reused
+        next_nonce: Dict[str, int] = {}
+        for _, _, from_addr, _, _ in pending:
+            if from_addr not in next_nonce:
+                next_nonce[from_addr] = self.w3.eth.get_transaction_count(from_addr, 'pending')
+        
+        gas_estimates = self._estimate_gas_batch([
+            (contract_function, {'from': from_addr, 'value': value}, default_gas)
+            for _, contract_function, from_addr, value, default_gas in pending
+        ])
+        
+        for (placeholder, contract_function, from_addr, value, _), gas in zip(pending, gas_estimates):
+            transaction = contract_function.build_transaction({
+                'from': from_addr,
+                'gas': gas,
+                **fee_params,
+                'nonce': next_nonce[from_addr],
+                'chainId': chain_id,
+                'value': value
+            })
+            next_nonce[from_addr] += 1
+            placeholder.update(self._format_unsigned_transaction(transaction))
+
+    def _estimate_gas_batch(self, estimates: List[Tuple[Any, Dict[str, Any], int]]) -> List[int]:
+        """
+        Estimate gas for many calls in one JSON-RPC batch.
+        
+        If the provider does not support batching, or any estimate in the batch
+        reverts, each call is estimated individually and failures use their
+        default gas.
+        
+        Args:
+            estimates: List of (contract_function, tx_params, default_gas).
+            
+        Returns:
+            List of gas limits, in order.
+        """
+        try:
+            with self.w3.batch_requests() as batch:
+                for contract_function, tx_params, _ in estimates:
+                    batch.add(contract_function.estimate_gas(tx_params))
+                return [int(gas) for gas in batch.execute()]
+        except Exception as e:
+            logger.debug(f"Batched gas estimation failed: {e}. Estimating individually.")
+        
+        results = []
+        for contract_function, tx_params, default_gas in estimates:
+            try:
+                results.append(contract_function.estimate_gas(tx_params))
+            except Exception as e:
+                logger.warning(f"Gas estimation failed: {e}. Using default {default_gas}.")
+                results.append(default_gas)
+        return results
+
+    def build_safe_multisend_transaction(
+        self,
+        transactions: List[Dict[str, Any]],
+        safe_address: Optional[str] = None,
+        call_only: Optional[bool] = None,
+        multisend_address: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Bundle several unsigned transactions into one Safe MultiSend transaction.
+        
+        Takes the dicts returned by `build_*_transaction` methods (or
+        build_transactions_batch()) and packs their `to`, `value` and `data`
+        into one `multiSend` call that the Safe delegatecalls, so the whole
+        bundle needs one signature round and one on-chain transaction. Each
+        entry is a CALL unless it sets `operation` to DELEGATE_CALL. Nonce,
+        gas and fee fields of the inputs are ignored.
+        
+        The Safe pays the bundled values from its own balance, so the Safe
+        transaction's own `value` is 0 and `total_value` reports the sum.
+        With `safe_address`, the Safe's nonce, domain separator and ETH
+        balance are read in one multicall and the EIP-712 `safe_tx_hash` to
+        sign is included.
+        
+        Args:
+            transactions: Unsigned transaction dicts, in execution order.
+            safe_address: Optional Safe to prepare the transaction for.
+            call_only: Use MultiSendCallOnly (defaults to True unless an entry
+                      is a delegatecall).
+            multisend_address: Override the MultiSend contract address.
+            
+        Returns:
+            Dict with the Safe transaction fields (`to`, `value`, `data`,
+            `operation`, `safeTxGas`, `baseGas`, `gasPrice`, `gasToken`,
+            `refundReceiver`), plus `total_value`, `transaction_count` and,
+            with `safe_address`, `safe_nonce` and `safe_tx_hash`.
+        
+        Raises:
+            FXProtocolError: If the bundle is empty, mixes chains, or puts a
+            delegatecall in a call-only bundle.
+        
+        Example:
+            txs = [
+                client.build_approve_transaction(lp_token, vault, amount, from_address=safe),
+                client.build_deposit_to_convex_vault_transaction(vault, amount, from_address=safe),
+            ]
+            safe_tx = client.build_safe_multisend_transaction(txs, safe_address=safe)
+            # Propose safe_tx to the Safe Transaction Service, signed over safe_tx["safe_tx_hash"]
+        """
+        if not transactions:
+            raise FXProtocolError("No transactions to bundle.")
+        
+        chain_ids = {tx["chainId"] for tx in transactions if tx.get("chainId") is not None}
+        if len(chain_ids) > 1:
+            raise FXProtocolError(f"Cannot bundle transactions for different chains: {sorted(chain_ids)}")
+        
+        has_delegate_call = any(tx.get("operation", CALL) == DELEGATE_CALL for tx in transactions)
+        if call_only is None:
+            call_only = not has_delegate_call
+        if call_only and has_delegate_call:
+            raise FXProtocolError("MultiSendCallOnly cannot execute delegatecalls; use call_only=False.")
+        if multisend_address is None:
+            multisend_address = constants.SAFE_MULTISEND_CALL_ONLY if call_only else constants.SAFE_MULTISEND
+        
+        multisend = self.w3.eth.contract(address=utils.to_checksum_address(multisend_address), abi=SAFE_MULTISEND_ABI)
+        data = multisend.functions.multiSend(encode_multisend_transactions(transactions))._encode_transaction_data()
+        total_value = sum(int(tx.get("value") or 0) for tx in transactions)
+        
+        safe_tx: Dict[str, Any] = {
+            "to": multisend.address,
+            "value": 0,
+            "data": data,
+            "operation": DELEGATE_CALL,
+            "safeTxGas": 0,
+            "baseGas": 0,
+            "gasPrice": 0,
+            "gasToken": ZERO_ADDRESS,
+            "refundReceiver": ZERO_ADDRESS,
+            "total_value": total_value,
+            "transaction_count": len(transactions),
+        }
+        
+        if safe_address:
+            safe_address = utils.to_checksum_address(safe_address)
+            safe = self.w3.eth.contract(address=safe_address, abi=SAFE_ABI)
+            calls = [
+                safe.functions.nonce(),
+                safe.functions.domainSeparator(),
+                self.multicall.functions.getEthBalance(safe_address),
+            ]
+            nonce, domain_separator, balance = self._multicall_or_each(calls)
+            if nonce is None or domain_separator is None:
+                raise ContractCallError(f"Failed to read Safe state: {safe_address}")
+            if balance is not None and balance < total_value:
+                logger.warning(
+                    f"Safe {safe_address} holds {utils.wei_to_decimal(balance)} ETH but the bundle sends "
+                    f"{utils.wei_to_decimal(total_value)} ETH."
+                )
+            safe_tx["safe_nonce"] = nonce
+            safe_tx["safe_tx_hash"] = Web3.to_hex(safe_transaction_hash(domain_separator, safe_tx, nonce))
+        
+        return safe_tx
+
+    def _build_and_send_transaction(
+        self,
+        contract_function,
+        value: int = 0,
+        nonce: Optional[int] = None,
+        default_gas: Optional[int] = None,
+        wait: bool = True
+    ) -> str:
         """
         Internal helper to build, sign, and send a transaction.
         
@@ -835,6 +2394,11 @@ class ProtocolClient:
         Args:
             contract_function: The contract function to call.
             value: Optional ETH value to send with the transaction (in Wei).
+            nonce: Nonce to use instead of the account's transaction count
+                  (for transactions queued behind unmined ones).
+            default_gas: Gas limit to use if estimation reverts on a missing
+                        allowance that a pending permit grants.
+            wait: Wait for the receipt and raise if the transaction failed.
             
         Returns:
             str: The transaction hash.
@@ -849,37 +2413,66 @@ class ProtocolClient:
         if not self.address:
             raise ConfigurationError("No account address available for transaction.")
 
-        nonce = self.w3.eth.get_transaction_count(self.address)
+        if nonce is None:
+            nonce = self.w3.eth.get_transaction_count(self.address)
         
         tx_params = {
             'from': self.address,
             'nonce': nonce,
             'value': value,
-            'gasPrice': self.w3.eth.gas_price
+            **self.fee_oracle.get_fee_params(self.fee_urgency)
         }
 
+        profile_key = None
+        cached_gas = None
+        if self.gas_profiles is not None:
+            profile_key = self.gas_profiles.key_for(contract_function, value)
+            cached_gas = self.gas_profiles.get(profile_key)
+
         try:
-            # Estimate gas
-            tx_params['gas'] = contract_function.estimate_gas(tx_params)
-            
-            # Build transaction
-            built_tx = contract_function.build_transaction(tx_params)
-            
-            # Sign and send based on wallet type
-            if self.use_browser_wallet:
-                # Browser wallet: send_transaction prompts user in browser
-                # The provider (MetaMask, etc.) handles signing
-                tx_hash = self.w3.eth.send_transaction(built_tx)
+            # Use a learned gas limit when available, otherwise estimate
+            if cached_gas:
+                tx_params['gas'] = cached_gas
             else:
-                # Private key: sign locally and send raw transaction
-                signed_tx = self.w3.eth.account.sign_transaction(built_tx, self.account.key)
-                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                tx_params['gas'] = self._estimate_gas_or_default(contract_function, tx_params, default_gas)
+            
+            try:
+                tx_hash = self._send_built_transaction(contract_function.build_transaction(tx_params))
+            except Exception as e:
+                # Only a rejected gas limit means nothing was broadcast; user rejections,
+                # timeouts and "already known" must not resend on the same nonce
+                if not cached_gas or not _is_gas_limit_rejection(e):
+                    raise
+                # The node rejected the cached limit; estimate live and retry with the same nonce
+                logger.warning(f"Cached gas limit {cached_gas} rejected: {e}. Re-estimating.")
+                self.gas_profiles.invalidate(profile_key)
+                cached_gas = None
+                tx_params['gas'] = self._estimate_gas_or_default(contract_function, tx_params, default_gas)
+                tx_hash = self._send_built_transaction(contract_function.build_transaction(tx_params))
+            
+            if not wait:
+                return tx_hash.hex()
             
             # Wait for receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self._wait_for_transaction_receipt(tx_hash)
+            
+            if receipt.status != 1 and cached_gas:
+                # May have run out of gas on the cached limit
+                self.gas_profiles.invalidate(profile_key)
+                if receipt.gasUsed >= cached_gas:
+                    # Out of gas: the nonce is spent, so resend once on the next one with a live estimate
+                    logger.warning(f"Transaction {tx_hash.hex()} ran out of gas on cached limit {cached_gas}. Re-estimating.")
+                    cached_gas = None
+                    tx_params['nonce'] = self.w3.eth.get_transaction_count(self.address, 'pending')
+                    tx_params['gas'] = self._estimate_gas_or_default(contract_function, tx_params, default_gas)
+                    tx_hash = self._send_built_transaction(contract_function.build_transaction(tx_params))
+                    receipt = self._wait_for_transaction_receipt(tx_hash)
             
             if receipt.status != 1:
                 raise TransactionFailedError(f"Transaction failed: {tx_hash.hex()}")
+            
+            if profile_key is not None:
+                self.gas_profiles.record(profile_key, receipt.gasUsed)
                 
             return tx_hash.hex()
             
@@ -888,6 +2481,222 @@ class ProtocolClient:
                 raise
             raise TransactionFailedError(f"Failed to send transaction: {str(e)}")
 
+    def _estimate_gas_or_default(self, contract_function, tx_params: Dict[str, Any], default_gas: Optional[int]) -> int:
+        """
+        Estimate gas, falling back to `default_gas` (if given) when the estimate
+        reverts on a missing allowance, i.e. one a pending permit will grant.
+        
+        Any other estimation failure is raised, so writes that would revert for
+        another reason are not broadcast.
+        """
+        try:
+            return contract_function.estimate_gas(tx_params)
+        except Exception as e:
+            if default_gas is None or not _is_allowance_revert(e):
+                raise
+            logger.warning(f"Gas estimation failed: {e}. Using default {default_gas}.")
+            return default_gas
+
+    def _send_built_transaction(self, built_tx: Dict[str, Any]):
+        """Sign (or hand to the browser wallet) and broadcast a built transaction."""
+        if self.use_browser_wallet:
+            # Browser wallet: send_transaction prompts user in browser
+            # The provider (MetaMask, etc.) handles signing
+            return self.w3.eth.send_transaction(built_tx)
+        
+        # Private key: sign locally and send raw transaction
+        signed_tx = self.w3.eth.account.sign_transaction(built_tx, self.account.key)
+        return self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+
+    # --- Permit Methods ---
+
+    def supports_permit(self, token_address: str) -> bool:
+        """
+        Whether a token accepts EIP-2612 permits.
+        
+        The token's name, version and DOMAIN_SEPARATOR are read in one
+        multicall and the result is cached for the client's lifetime. Tokens
+        whose domain separator cannot be reproduced, or that use a different
+        permit signature (e.g. DAI), are reported as unsupported.
+        """
+        return self._get_permit_domain(token_address) is not None
+
+    def _get_permit_domain(self, token_address: str) -> Optional[Tuple[str, str]]:
+        """(name, version) of an EIP-2612 token's EIP-712 domain, or None."""
+        token_address = utils.to_checksum_address(token_address)
+        if token_address in self._permit_domain_cache:
+            return self._permit_domain_cache[token_address]
+        
+        token = self.w3.eth.contract(address=token_address, abi=PERMIT_ABI).functions
+        calls = [token.name(), token.version(), token.DOMAIN_SEPARATOR(), token.PERMIT_TYPEHASH()]
+        try:
+            name, version, domain_separator, typehash = self._multicall_or_each(calls)
+            chain_id = self.w3.eth.chain_id
+        except Exception as e:
+            logger.debug(f"Could not read permit domain of {token_address}: {e}")
+            return None
+        
+        domain = None
+        if name is not None and domain_separator is not None and (typehash is None or bytes(typehash) == PERMIT_TYPEHASH):
+            # Tokens without version() use "1" in their domain
+            for candidate in ([version] if version is not None else ["1"]):
+                if permit_domain_separator(name, candidate, chain_id, token_address) == bytes(domain_separator):
+                    domain = (name, candidate)
+        self._permit_domain_cache[token_address] = domain
+        return domain
+
+    def sign_permit(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: Union[int, float, Decimal, str],
+        deadline: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Sign an EIP-2612 permit off-chain.
+        
+        Args:
+            token_address: Token that supports permits.
+            spender_address: Address allowed to spend.
+            amount: Human-readable amount. Use 'max' for unlimited.
+            deadline: Unix time the permit expires (defaults to
+                     `permit_deadline` seconds from now).
+            
+        Returns:
+            Dict with `token`, `owner`, `spender`, `value`, `nonce`,
+            `deadline`, `v`, `r` and `s`, ready for build_permit_transaction().
+        
+        Raises:
+            ConfigurationError: If no private key is available.
+            FXProtocolError: If the token does not support permits.
+        
+        Example:
+            permit = client.sign_permit(constants.FXUSD, router, 1000)
+            tx = client.build_permit_transaction(permit, from_address=relayer)
+        """
+        token_address = utils.to_checksum_address(token_address)
+        if str(amount).lower() == 'max':
+            raw_amount = 2**256 - 1
+        else:
+            decimals = self._get_contract("erc20", token_address).functions.decimals().call()
+            raw_amount = utils.decimal_to_wei(amount, decimals)
+        return self._sign_permit(token_address, utils.to_checksum_address(spender_address), raw_amount, deadline)
+
+    def _sign_permit(self, token_address: str, spender_address: str, raw_amount: int, deadline: Optional[int] = None) -> Dict[str, Any]:
+        """sign_permit() for a raw amount."""
+        if not self.account:
+            raise ConfigurationError("Private key required to sign permits.")
+        domain = self._get_permit_domain(token_address)
+        if domain is None:
+            raise FXProtocolError(f"Token {token_address} does not support EIP-2612 permits.")
+        
+        token = self.w3.eth.contract(address=token_address, abi=PERMIT_ABI)
+        nonce = token.functions.nonces(self.address).call()
+        if deadline is None:
+            deadline = int(time.time()) + self.permit_deadline
+        signed = self.account.sign_message(encode_typed_data(full_message=permit_typed_data(
+            domain[0], domain[1], self.w3.eth.chain_id, token_address,
+            self.address, spender_address, raw_amount, nonce, deadline
+        )))
+        return {
+            "token": token_address,
+            "owner": self.address,
+            "spender": spender_address,
+            "value": raw_amount,
+            "nonce": nonce,
+            "deadline": deadline,
+            "v": signed.v,
+            "r": signed.r.to_bytes(32, "big"),
+            "s": signed.s.to_bytes(32, "big"),
+        }
+
+    def _permit_function(self, permit: Dict[str, Any]):
+        """token.permit() call for a signed permit."""
+        token = self.w3.eth.contract(address=utils.to_checksum_address(permit["token"]), abi=PERMIT_ABI)
+        return token.functions.permit(
+            utils.to_checksum_address(permit["owner"]),
+            utils.to_checksum_address(permit["spender"]),
+            permit["value"],
+            permit["deadline"],
+            permit["v"],
+            permit["r"],
+            permit["s"],
+        )
+
+    def build_permit_transaction(self, permit: Dict[str, Any], from_address: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build unsigned transaction submitting a signed permit.
+        
+        Any account can submit a permit, e.g. a relayer or a Safe bundling it
+        with the call that spends the allowance.
+        
+        Args:
+            permit: Output of sign_permit().
+            from_address: Address that will send the transaction (defaults to the client's).
+        """
+        return self._build_unsigned_transaction(
+            self._permit_function(permit), from_address=from_address, default_gas=100000
+        )
+
+    def _grant_allowances(self, shortfalls: List[Tuple[str, str, int]]) -> Optional[int]:
+        """
+        Raise allowances for an upcoming write, preferring permits.
+        
+        For tokens that support EIP-2612 (when `use_permit` is on and a private
+        key is available) a permit is signed off-chain and submitted without
+        waiting for its receipt. Other tokens are approved and their receipts
+        awaited, as before.
+        
+        Args:
+            shortfalls: (token, spender, raw amount) for each allowance that is too low.
+            
+        Returns:
+            The nonce for the write that spends the allowances if permits are
+            still pending (its gas cannot be estimated until they are mined),
+            otherwise None.
+        """
+        permits = []
+        for token_address, spender_address, raw_amount in shortfalls:
+            token_address = utils.to_checksum_address(token_address)
+            spender_address = utils.to_checksum_address(spender_address)
+            if self.use_permit and self.account and self.supports_permit(token_address):
+                permits.append(self._sign_permit(token_address, spender_address, raw_amount))
+                continue
+            approve_tx = self._build_and_send_transaction(
+                self._get_contract("erc20", token_address).functions.approve(spender_address, raw_amount)
+            )
+            self._set_cached_allowance(token_address, spender_address, raw_amount)
+            logger.info(f"Approval transaction for {token_address}: {approve_tx}")
+        
+        if not permits:
+            return None
+        nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+        for permit in permits:
+            permit_tx = self._build_and_send_transaction(
+                self._permit_function(permit), nonce=nonce, default_gas=100000, wait=False
+            )
+            # Mined before the write that follows it, which re-reads the cache if it fails
+            self._set_cached_allowance(permit["token"], permit["spender"], permit["value"])
+            logger.info(f"Permit transaction for {permit['token']}: {permit_tx}")
+            nonce += 1
+        return nonce
+
+    def _send_spending_allowances(
+        self,
+        contract_function,
+        spends: List[Tuple[str, str, int]],
+        nonce: Optional[int] = None,
+        default_gas: Optional[int] = None
+    ) -> str:
+        """Send a write and update the cached allowances it spends."""
+        try:
+            tx_hash = self._build_and_send_transaction(contract_function, nonce=nonce, default_gas=default_gas)
+        except Exception:
+            self._spend_cached_allowances(spends, succeeded=False)
+            raise
+        self._spend_cached_allowances(spends, succeeded=True)
+        return tx_hash
+
     def build_approve_transaction(
         self,
         token_address: str,
@@ -932,39 +2741,7 @@ class ProtocolClient:
             raw_amount
         )
         
-        try:
-            gas_estimate = function_call.estimate_gas({'from': utils.to_checksum_address(from_addr)})
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}. Using default.")
-            gas_estimate = 50000
-        
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000
-        
-        nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(from_addr))
-        
-        transaction = function_call.build_transaction({
-            'from': utils.to_checksum_address(from_addr),
-            'gas': gas_estimate,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
-            'value': 0
-        })
-        
-        return {
-            "to": transaction['to'],
-            "data": transaction['data'],
-            "value": transaction.get('value', 0),
-            "gas": transaction['gas'],
-            "gasPrice": transaction.get('gasPrice'),
-            "maxFeePerGas": transaction.get('maxFeePerGas'),
-            "maxPriorityFeePerGas": transaction.get('maxPriorityFeePerGas'),
-            "nonce": transaction['nonce'],
-            "chainId": transaction['chainId']
-        }
+        return self._build_unsigned_transaction(function_call, from_address=from_addr, default_gas=50000)
 
     def approve(self, token_address: str, spender_address: str, amount: Union[int, float, Decimal, str]) -> str:
         """
@@ -993,7 +2770,9 @@ class ProtocolClient:
             decimals = contract.functions.decimals().call()
             raw_amount = utils.decimal_to_wei(amount, decimals)
         
-        return self._build_and_send_transaction(contract.functions.approve(spender_address, raw_amount))
+        tx_hash = self._build_and_send_transaction(contract.functions.approve(spender_address, raw_amount))
+        self._set_cached_allowance(token_address, spender_address, raw_amount)
+        return tx_hash
 
     def build_transfer_transaction(
         self,
@@ -1035,39 +2814,7 @@ class ProtocolClient:
             raw_amount
         )
         
-        try:
-            gas_estimate = function_call.estimate_gas({'from': utils.to_checksum_address(from_addr)})
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}. Using default.")
-            gas_estimate = 65000
-        
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000
-        
-        nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(from_addr))
-        
-        transaction = function_call.build_transaction({
-            'from': utils.to_checksum_address(from_addr),
-            'gas': gas_estimate,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
-            'value': 0
-        })
-        
-        return {
-            "to": transaction['to'],
-            "data": transaction['data'],
-            "value": transaction.get('value', 0),
-            "gas": transaction['gas'],
-            "gasPrice": transaction.get('gasPrice'),
-            "maxFeePerGas": transaction.get('maxFeePerGas'),
-            "maxPriorityFeePerGas": transaction.get('maxPriorityFeePerGas'),
-            "nonce": transaction['nonce'],
-            "chainId": transaction['chainId']
-        }
+        return self._build_unsigned_transaction(function_call, from_address=from_addr, default_gas=65000)
 
     def transfer(self, token_address: str, recipient_address: str, amount: Union[int, float, Decimal, str]) -> str:
         """
@@ -1134,43 +2881,7 @@ class ProtocolClient:
             raw_min_out
         )
         
-        # Estimate gas
-        try:
-            gas_estimate = function_call.estimate_gas({'from': utils.to_checksum_address(target_recipient)})
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}. Using default.")
-            gas_estimate = 200000  # Default estimate
-        
-        # Get current gas price
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000  # 20 gwei default
-        
-        # Get nonce
-        nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(target_recipient))
-        
-        # Build transaction
-        transaction = function_call.build_transaction({
-            'from': utils.to_checksum_address(target_recipient),
-            'gas': gas_estimate,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
-            'value': 0
-        })
-        
-        return {
-            "to": transaction['to'],
-            "data": transaction['data'],
-            "value": transaction.get('value', 0),
-            "gas": transaction['gas'],
-            "gasPrice": transaction.get('gasPrice'),
-            "maxFeePerGas": transaction.get('maxFeePerGas'),
-            "maxPriorityFeePerGas": transaction.get('maxPriorityFeePerGas'),
-            "nonce": transaction['nonce'],
-            "chainId": transaction['chainId']
-        }
+        return self._build_unsigned_transaction(function_call, from_address=target_recipient, default_gas=200000)
 
     def mint_f_token(self, market_address: str, base_in: Union[int, float, Decimal, str], recipient: Optional[str] = None, min_f_token_out: Union[int, float, Decimal, str] = 0) -> str:
         """
@@ -1222,39 +2933,7 @@ class ProtocolClient:
             raw_min_out
         )
         
-        try:
-            gas_estimate = function_call.estimate_gas({'from': utils.to_checksum_address(target_recipient)})
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}. Using default.")
-            gas_estimate = 200000
-        
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000
-        
-        nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(target_recipient))
-        
-        transaction = function_call.build_transaction({
-            'from': utils.to_checksum_address(target_recipient),
-            'gas': gas_estimate,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
-            'value': 0
-        })
-        
-        return {
-            "to": transaction['to'],
-            "data": transaction['data'],
-            "value": transaction.get('value', 0),
-            "gas": transaction['gas'],
-            "gasPrice": transaction.get('gasPrice'),
-            "maxFeePerGas": transaction.get('maxFeePerGas'),
-            "maxPriorityFeePerGas": transaction.get('maxPriorityFeePerGas'),
-            "nonce": transaction['nonce'],
-            "chainId": transaction['chainId']
-        }
+        return self._build_unsigned_transaction(function_call, from_address=target_recipient, default_gas=200000)
 
     def mint_x_token(self, market_address: str, base_in: Union[int, float, Decimal, str], recipient: Optional[str] = None, min_x_token_out: Union[int, float, Decimal, str] = 0) -> str:
         """
@@ -1301,39 +2980,7 @@ class ProtocolClient:
             raw_min_x_out
         )
         
-        try:
-            gas_estimate = function_call.estimate_gas({'from': utils.to_checksum_address(target_recipient)})
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}. Using default.")
-            gas_estimate = 250000
-        
-        try:
-            gas_price = self.w3.eth.gas_price
-        except Exception:
-            gas_price = 20000000000
-        
-        nonce = self.w3.eth.get_transaction_count(utils.to_checksum_address(target_recipient))
-        
-        transaction = function_call.build_transaction({
-            'from': utils.to_checksum_address(target_recipient),
-            'gas': gas_estimate,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.w3.eth.chain_id,
-            'value': 0
-        })
-        
-        return {
-            "to": transaction['to'],
-            "data": transaction['data'],
-            "value": transaction.get('value', 0),
-            "gas": transaction['gas'],
-            "gasPrice": transaction.get('gasPrice'),
-            "maxFeePerGas": transaction.get('maxFeePerGas'),
-            "maxPriorityFeePerGas": transaction.get('maxPriorityFeePerGas'),
-            "nonce": transaction['nonce'],
-            "chainId": transaction['chainId']
-        }
+        return self._build_unsigned_transaction(function_call, from_address=target_recipient, default_gas=250000)
 
     def mint_both_tokens(self, market_address: str, base_in: Union[int, float, Decimal, str], recipient: Optional[str] = None, min_f_token_out: Union[int, float, Decimal, str] = 0, min_x_token_out: Union[int, float, Decimal, str] = 0) -> str:
         """
@@ -1499,30 +3146,295 @@ class ProtocolClient:
         Claim rewards from a liquidity gauge.
         
         Args:
-            gauge_address: The address of the gauge.
-            account: Optional account address to claim for.
+            gauge_address: The address of the gauge.
+            account: Optional account address to claim for.
+        """
+        gauge = self._get_contract("liquidity_gauge", gauge_address)
+        target_account = account or self.address
+        if not target_account:
+            raise FXProtocolError("No account address provided or available in client.")
+            
+        return self._build_and_send_transaction(gauge.functions.claim(target_account))
+
+    def claim_all_gauge_rewards(
+        self,
+        prices: Optional[Dict[str, Union[Decimal, float, str]]] = None,
+        min_value_ratio: Union[Decimal, float, str] = 1,
+        wait: bool = True
+    ) -> List[str]:
+        """
+        Claim rewards from all configured gauges that have something to claim.
+        
+        Claimable amounts are checked in one multicall; gauges with nothing
+        claimable, or (with `prices`) with rewards worth less than the gas,
+        are skipped. The remaining claims are sent back to back with local
+        nonces. See plan_reward_claims() and send_reward_claims().
+        
+        Args:
+            prices: ETH value of one reward token, by token address.
+            min_value_ratio: Minimum reward value per unit of gas cost.
+            wait: Wait for the receipts and return only successful claims.
+        
+        Returns:
+            List[str]: Transaction hashes of the claims.
+        """
+        plan = self.plan_reward_claims(
+            gauges=list(constants.GAUGES.values()), prices=prices, min_value_ratio=min_value_ratio
+        )
+        for claim in plan:
+            if not claim.selected:
+                logger.info(f"Skipping gauge {claim.target}: {claim.reason}")
+        return self.send_reward_claims(plan, wait=wait)
+
+    def plan_reward_claims(
+        self,
+        gauges: Optional[List[str]] = None,
+        convex_vaults: Optional[List[str]] = None,
+        rebalance_pools: Optional[Dict[str, List[str]]] = None,
+        prices: Optional[Dict[str, Union[Decimal, float, str]]] = None,
+        min_value_ratio: Union[Decimal, float, str] = 1,
+        account_address: Optional[str] = None
+    ) -> List[RewardClaim]:
+        """
+        Check claimable rewards and decide which claims are worth their gas.
+        
+        Claimable amounts of all gauges, Convex vaults and V1 rebalance pools
+        are read in one multicall (gauges whose active reward token list is
+        not cached yet need one more), and the gas of every non-empty claim is
+        estimated in one JSON-RPC batch. A claim is selected when its rewards,
+        priced in ETH with `prices`, are worth at least `min_value_ratio` times
+        its gas cost at the fee oracle's current fees. Claims with rewards but
+        no priced reward token are selected, since their value is unknown.
+        
+        Args:
+            gauges: f(x) liquidity gauge addresses.
+            convex_vaults: The account's Convex vault addresses.
+            rebalance_pools: Reward tokens to claim, by V1 rebalance pool address.
+            prices: ETH value of one reward token, by token address.
+            min_value_ratio: Minimum reward value per unit of gas cost.
+            account_address: Claiming account (defaults to connected wallet).
+            
+        Returns:
+            List[RewardClaim]: One entry per target, in argument order.
+        
+        Example:
+            plan = client.plan_reward_claims(gauges=list(constants.GAUGES.values()), prices={constants.FXN: "0.01"})
+            for claim in plan:
+                print(claim.target, claim.value, claim.gas_cost, claim.selected)
+            tx_hashes = client.send_reward_claims(plan)
         """
-        gauge = self._get_contract("liquidity_gauge", gauge_address)
-        target_account = account or self.address
+        target_account = account_address or self.address
         if not target_account:
             raise FXProtocolError("No account address provided or available in client.")
+        account = utils.to_checksum_address(target_account)
+        token_prices = {
+            utils.to_checksum_address(token): Decimal(str(price)) for token, price in (prices or {}).items()
+        }
+        
+        targets = [(GAUGE_CLAIM, utils.to_checksum_address(g), None) for g in (gauges or [])]
+        targets.extend((CONVEX_VAULT_CLAIM, utils.to_checksum_address(v), None) for v in (convex_vaults or []))
+        targets.extend(
+            (REBALANCE_POOL_CLAIM, utils.to_checksum_address(pool), [utils.to_checksum_address(t) for t in tokens])
+            for pool, tokens in (rebalance_pools or {}).items()
+        )
+        raw_amounts = self._read_claimable_rewards(targets, account)
+        
+        decimals = self._get_token_decimals_batch([t for amounts in raw_amounts for t in (amounts or {})])
+        claims = []
+        for (kind, target, tokens), amounts in zip(targets, raw_amounts):
+            claim = RewardClaim(
+                kind=kind, target=target, amounts={}, gas=0, gas_cost=Decimal(0), tokens=tokens, account=account
+            )
+            if amounts is None:
+                claim.reason = "claimable amounts could not be read"
+            else:
+                claim.amounts = {
+                    token: utils.wei_to_decimal(amount, decimals.get(utils.to_checksum_address(token)) or 18)
+                    for token, amount in amounts.items()
+                }
+                if not any(claim.amounts.values()):
+                    claim.reason = "nothing to claim"
+            claims.append(claim)
+        
+        pending = [claim for claim in claims if claim.reason is None]
+        if not pending:
+            return claims
+        
+        gas_estimates = self._estimate_gas_batch([
+            (self._reward_claim_function(claim, account), {'from': account, 'value': 0}, 200000)
+            for claim in pending
+        ])
+        fee_params = self.fee_oracle.get_fee_params(self.fee_urgency)
+        if "gasPrice" in fee_params:
+            gas_price = fee_params["gasPrice"]
+        else:
+            base_fee = self.fee_oracle.get_base_fee() or 0
+            gas_price = min(base_fee + fee_params["maxPriorityFeePerGas"], fee_params["maxFeePerGas"])
+        
+        min_ratio = Decimal(str(min_value_ratio))
+        for claim, gas in zip(pending, gas_estimates):
+            claim.gas = gas
+            claim.gas_cost = utils.wei_to_decimal(gas * gas_price, 18)
+            priced = [(t, a) for t, a in claim.amounts.items() if utils.to_checksum_address(t) in token_prices]
+            if priced:
+                claim.value = sum(a * token_prices[utils.to_checksum_address(t)] for t, a in priced)
+                if claim.value < claim.gas_cost * min_ratio:
+                    claim.reason = "rewards worth less than gas"
+                    continue
+            claim.selected = True
+        return claims
+
+    def send_reward_claims(self, claims: List[RewardClaim], wait: bool = True) -> List[str]:
+        """
+        Send the selected claims of a plan without waiting between them.
+        
+        Fees, chain id and the starting nonce are fetched once, nonces are
+        assigned locally, and every transaction is broadcast before any
+        receipt is awaited. If a broadcast fails, later claims are not sent
+        (they would be stuck behind the missing nonce).
+        
+        Args:
+            claims: Plan from plan_reward_claims().
+            wait: Wait for the receipts and return only successful claims.
             
-        return self._build_and_send_transaction(gauge.functions.claim(target_account))
-
-    def claim_all_gauge_rewards(self) -> List[str]:
-        """
-        Claim rewards from all configured gauges.
+        Returns:
+            List[str]: Transaction hashes, in plan order.
+        
+        Raises:
+            ConfigurationError: If no private key or browser wallet is available.
+            FXProtocolError: If a selected claim was planned for another account
+                (Convex and rebalance pool rewards can only be claimed by their owner).
         """
+        if not self.account and not self.use_browser_wallet:
+            raise ConfigurationError(
+                "Private key or browser wallet required for write operations. "
+                "Provide a private key, set FX_PROTOCOL_PRIVATE_KEY environment variable, "
+                "or use use_browser_wallet=True with a browser wallet extension."
+            )
+        if not self.address:
+            raise ConfigurationError("No account address available for transaction.")
+        
+        selected = [claim for claim in claims if claim.selected]
+        if not selected:
+            return []
+        sender = utils.to_checksum_address(self.address)
+        for claim in selected:
+            if claim.account and utils.to_checksum_address(claim.account) != sender:
+                raise FXProtocolError(
+                    f"Claim on {claim.target} was planned for {claim.account}, not the connected wallet {sender}."
+                )
+        
+        fee_params = self.fee_oracle.get_fee_params(self.fee_urgency)
+        chain_id = self.w3.eth.chain_id
+        nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+        
+        sent = []
+        for claim in selected:
+            logger.info(f"Claiming rewards from {claim.kind} {claim.target}")
+            try:
+                tx_hash = self._send_built_transaction(self._reward_claim_function(claim, self.address).build_transaction({
+                    'from': self.address,
+                    'gas': claim.gas,
+                    **fee_params,
+                    'nonce': nonce,
+                    'chainId': chain_id,
+                    'value': 0
+                }))
+            except Exception as e:
+                logger.warning(f"Failed to send claim for {claim.target}: {str(e)}. Not sending later claims.")
+                break
+            nonce += 1
+            sent.append((claim, tx_hash))
+        
+        if not wait:
+            return [tx_hash.hex() for _, tx_hash in sent]
+        
         tx_hashes = []
-        for name, address in constants.GAUGES.items():
+        for claim, tx_hash in sent:
             try:
-                logger.info(f"Claiming rewards for gauge: {name}")
-                tx_hash = self.claim_gauge_rewards(address)
-                tx_hashes.append(tx_hash)
+                receipt = self._wait_for_transaction_receipt(tx_hash)
             except Exception as e:
-                logger.warning(f"Failed to claim rewards for gauge {name}: {str(e)}")
+                logger.warning(f"Failed to get receipt for claim on {claim.target}: {str(e)}")
+                continue
+            if receipt.status != 1:
+                logger.warning(f"Claim on {claim.target} failed: {tx_hash.hex()}")
+                continue
+            tx_hashes.append(tx_hash.hex())
         return tx_hashes
 
+    def _read_claimable_rewards(
+        self,
+        targets: List[Tuple[str, str, Optional[List[str]]]],
+        account: str
+    ) -> List[Optional[Dict[str, int]]]:
+        """
+        Raw claimable amounts by reward token for (kind, target, tokens) claims.
+        
+        Returns None for targets whose reads fail.
+        """
+        calls = []
+        layouts = []
+        for kind, target, tokens in targets:
+            if kind == GAUGE_CLAIM:
+                gauge = self._get_contract("liquidity_gauge", target).functions
+                tokens = self._gauge_reward_tokens_cache.get(target, [])
+                target_calls = [gauge.getActiveRewardTokens()]
+                target_calls.extend(gauge.claimable(account, token) for token in tokens)
+            elif kind == CONVEX_VAULT_CLAIM:
+                target_calls = [self._get_contract("convex_vault", target).functions.earned()]
+            else:
+                pool = self.w3.eth.contract(address=target, abi=REBALANCE_POOL_CLAIMABLE_ABI).functions
+                target_calls = [pool.claimable(account, token) for token in tokens]
+            layouts.append((kind, target, tokens, len(target_calls)))
+            calls.extend(target_calls)
+        
+        results = iter(self._multicall_or_each(calls))
+        amounts: List[Optional[Dict[str, int]]] = []
+        stale = []
+        for i, (kind, target, tokens, n_calls) in enumerate(layouts):
+            values = [next(results) for _ in range(n_calls)]
+            if kind == GAUGE_CLAIM:
+                active = values[0]
+                if active is None:
+                    amounts.append(None)
+                    continue
+                # Cached tokens are passed back as call arguments, which must be checksummed
+                active = [utils.to_checksum_address(token) for token in active]
+                if active != tokens:
+                    # Reward tokens were (un)registered since the list was cached
+                    self._gauge_reward_tokens_cache[target] = active
+                    stale.append(i)
+                    amounts.append(None)
+                    continue
+                values = values[1:]
+            elif kind == CONVEX_VAULT_CLAIM:
+                if values[0] is None:
+                    amounts.append(None)
+                    continue
+                tokens = [utils.to_checksum_address(token) for token in values[0][0]]
+                values = list(values[0][1])
+            amounts.append(None if None in values else dict(zip(tokens, values)))
+        
+        if stale:
+            calls = []
+            for i in stale:
+                gauge = self._get_contract("liquidity_gauge", targets[i][1]).functions
+                calls.extend(gauge.claimable(account, token) for token in self._gauge_reward_tokens_cache[targets[i][1]])
+            results = iter(self._multicall_or_each(calls))
+            for i in stale:
+                tokens = self._gauge_reward_tokens_cache[targets[i][1]]
+                values = [next(results) for _ in tokens]
+                amounts[i] = None if None in values else dict(zip(tokens, values))
+        return amounts
+
+    def _reward_claim_function(self, claim: RewardClaim, account: str):
+        """Contract function that claims a planned reward."""
+        if claim.kind == GAUGE_CLAIM:
+            return self._get_contract("liquidity_gauge", claim.target).functions.claim(account)
+        if claim.kind == CONVEX_VAULT_CLAIM:
+            return self._get_contract("convex_vault", claim.target).functions.getReward(True)
+        return self._get_contract("rebalance_pool", claim.target).functions.claim(claim.tokens)
+
     def build_operate_position_transaction(
         self,
         pool_address: str,
@@ -1577,9 +3489,16 @@ class ProtocolClient:
         pool_address: str,
         position_id: int,
         receiver: Optional[str] = None,
-        from_address: Optional[str] = None
+        from_address: Optional[str] = None,
+        max_fxusd: Union[int, float, Decimal, str] = 0,
+        max_stable: Union[int, float, Decimal, str] = 0
     ) -> Dict[str, Any]:
-        """Build unsigned transaction for rebalancing a V2 position."""
+        """
+        Build unsigned transaction for rebalancing a V2 position.
+        
+        `max_fxusd` and `max_stable` cap the fxUSD and stable token the
+        keeper spends, as in `rebalance_position()`.
+        """
         from_addr = from_address or self.address
         target_receiver = receiver or from_addr
         
@@ -1587,12 +3506,10 @@ class ProtocolClient:
             raise FXProtocolError("From address and receiver required.")
         
         contract = self._get_contract("pool_manager", constants.POOL_MANAGER)
-        # For rebalance, we typically use max values - these might need to be parameters
-        # Using 0 as defaults (contract will use available amounts)
-        raw_fxusd = 0
-        raw_stable = 0
+        raw_fxusd = utils.decimal_to_wei(max_fxusd, 18)
+        raw_stable = utils.decimal_to_wei(max_stable, 18)
         
-        function_call = contract.functions.rebalance(
+        function_call = contract.get_function_by_signature(REBALANCE_POSITION_SIGNATURE)(
             utils.to_checksum_address(pool_address),
             utils.to_checksum_address(target_receiver),
             position_id,
@@ -1610,7 +3527,7 @@ class ProtocolClient:
         raw_stable = utils.decimal_to_wei(max_stable, 18)
         
         return self._build_and_send_transaction(
-            contract.functions.rebalance(
+            contract.get_function_by_signature(REBALANCE_POSITION_SIGNATURE)(
                 utils.to_checksum_address(pool_address),
                 utils.to_checksum_address(receiver),
                 position_id,
@@ -1624,9 +3541,16 @@ class ProtocolClient:
         pool_address: str,
         position_id: int,
         receiver: Optional[str] = None,
-        from_address: Optional[str] = None
+        from_address: Optional[str] = None,
+        max_fxusd: Union[int, float, Decimal, str] = 0,
+        max_stable: Union[int, float, Decimal, str] = 0
     ) -> Dict[str, Any]:
-        """Build unsigned transaction for liquidating a V2 position."""
+        """
+        Build unsigned transaction for liquidating a V2 position.
+        
+        `max_fxusd` and `max_stable` cap the fxUSD and stable token the
+        keeper spends, as in `liquidate_position()`.
+        """
         from_addr = from_address or self.address
         target_receiver = receiver or from_addr
         
@@ -1634,9 +3558,8 @@ class ProtocolClient:
             raise FXProtocolError("From address and receiver required.")
         
         contract = self._get_contract("pool_manager", constants.POOL_MANAGER)
-        # For liquidation, using max values (0 = use all available)
-        raw_fxusd = 0
-        raw_stable = 0
+        raw_fxusd = utils.decimal_to_wei(max_fxusd, 18)
+        raw_stable = utils.decimal_to_wei(max_stable, 18)
         
         function_call = contract.functions.liquidate(
             utils.to_checksum_address(pool_address),
@@ -1693,6 +3616,327 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get position info: {str(e)}")
 
+    # --- Position Index Methods ---
+
+    def sync_position_index(self, to_block: Optional[int] = None, from_block: Optional[int] = None) -> int:
+        """
+        Discover Pool Manager positions from events since the last sync.
+        
+        Operate, RebalancePosition and LiquidatePosition logs are read in
+        ranges of `self.log_block_range` blocks, starting after
+        `position_index.last_block` (or at `position_index_start_block` on the
+        first sync). Touched positions are marked for the next
+        `refresh_positions()`.
+        
+        Args:
+            to_block: Last block to index (defaults to the current block).
+            from_block: First block to index, overriding the saved progress.
+            
+        Returns:
+            int: Number of newly discovered positions.
+        
+        Raises:
+            ContractCallError: If a log query fails (progress up to the failing
+            range is kept).
+        """
+        index = self.position_index
+        if to_block is None:
+            to_block = self.w3.eth.block_number
+        if from_block is None:
+            from_block = index.last_block + 1 if index.last_block is not None else self.position_index_start_block
+        
+        manager = utils.to_checksum_address(constants.POOL_MANAGER)
+        step = max(1, self.log_block_range)
+        discovered = 0
+        for range_start in range(from_block, to_block + 1, step):
+            range_end = min(range_start + step - 1, to_block)
+            try:
+                logs = self.w3.eth.get_logs({
+                    "address": manager,
+                    "topics": [list(POSITION_EVENT_TOPICS)],
+                    "fromBlock": range_start,
+                    "toBlock": range_end,
+                })
+            except Exception as e:
+                raise ContractCallError(f"Failed to get Pool Manager events: {str(e)}")
+            
+            for log in logs:
+                # Operate, RebalancePosition and LiquidatePosition all index (pool, position)
+                topics = log["topics"]
+                pool_address = utils.to_checksum_address("0x" + bytes(topics[1])[-20:].hex())
+                position_id = int.from_bytes(bytes(topics[2]), "big")
+                if index.record_event(pool_address, position_id, log["blockNumber"]):
+                    discovered += 1
+            index.last_block = range_end
+        return discovered
+
+    def refresh_positions(self, block_identifier: Optional[Union[str, int]] = None) -> int:
+        """
+        Refresh collateral, debt, debt ratio and owner for indexed positions.
+        
+        Open positions and positions touched since their last refresh are read
+        in one multicall (chunked by `multicall_chunk_size`) pinned to one
+        block, together with each pool's rebalance and liquidation debt ratios.
+        Without Multicall3, positions are read one call at a time.
+        
+        Args:
+            block_identifier: Block to read at (defaults to the current block).
+            
+        Returns:
+            int: Number of positions refreshed.
+        """
+        records = self.position_index.to_refresh()
+        if not records:
+            return 0
+        if block_identifier is None:
+            block_identifier = self.w3.eth.block_number
+        
+        pools = list(dict.fromkeys(utils.to_checksum_address(record.pool) for record in records))
+        contracts = {pool: self.w3.eth.contract(address=pool, abi=FX_POOL_POSITION_ABI) for pool in pools}
+        calls = []
+        for pool in pools:
+            calls.extend([
+                contracts[pool].functions.getRebalanceRatios(),
+                contracts[pool].functions.getLiquidateRatios(),
+            ])
+        for record in records:
+            pool_contract = contracts[utils.to_checksum_address(record.pool)]
+            calls.extend([
+                pool_contract.functions.getPosition(record.position_id),
+                pool_contract.functions.getPositionDebtRatio(record.position_id),
+                pool_contract.functions.ownerOf(record.position_id),
+            ])
+        
+        results = self._multicall_or_each(calls, block_identifier=block_identifier)
+        
+        thresholds = {}
+        for i, pool in enumerate(pools):
+            rebalance, liquidate = results[i * 2:i * 2 + 2]
+            thresholds[pool] = (
+                utils.wei_to_decimal(rebalance[0]) if rebalance else None,
+                utils.wei_to_decimal(liquidate[0]) if liquidate else None,
+            )
+            self.position_index.record_pool_thresholds(pool, *thresholds[pool])
+        
+        block_number = block_identifier if isinstance(block_identifier, int) else None
+        offset = len(pools) * 2
+        refreshed = 0
+        for i, record in enumerate(records):
+            position, debt_ratio, owner = results[offset + i * 3:offset + i * 3 + 3]
+            if position is None:
+                logger.debug(f"Failed to refresh position {record.position_id} in pool {record.pool}")
+                continue
+            pool = utils.to_checksum_address(record.pool)
+            ratio = utils.wei_to_decimal(debt_ratio) if debt_ratio is not None else None
+            self.position_index.update(PositionRecord(
+                pool=pool,
+                position_id=record.position_id,
+                owner=owner,
+                collateral=utils.wei_to_decimal(position[0]),
+                debt=utils.wei_to_decimal(position[1]),
+                debt_ratio=ratio,
+                health=classify_health(ratio, *thresholds[pool]),
+                block_number=block_number,
+                last_event_block=record.last_event_block,
+            ))
+            refreshed += 1
+        return refreshed
+
+    def get_pool_liquidation_prices(self, pool_addresses: List[str]) -> Dict[str, Optional[Decimal]]:
+        """
+        Get the collateral price each f(x) v2 pool uses for rebalances and liquidations.
+        
+        Each pool's price oracle address is cached after the first lookup;
+        prices are then read from all oracles in one multicall.
+        
+        Args:
+            pool_addresses: Pool addresses.
+            
+        Returns:
+            Dict mapping checksum pool address to the oracle's liquidation
+            price, or None if it could not be read.
+        """
+        pools = list(dict.fromkeys(utils.to_checksum_address(p) for p in pool_addresses))
+        missing = [pool for pool in pools if pool not in self._pool_price_oracle_cache]
+        if missing:
+            oracles = self._multicall([
+                self.w3.eth.contract(address=pool, abi=FX_POOL_POSITION_ABI).functions.priceOracle()
+                for pool in missing
+            ])
+            for pool, oracle in zip(missing, oracles):
+                if oracle is not None and int(oracle, 16) != 0:
+                    self._pool_price_oracle_cache[pool] = utils.to_checksum_address(oracle)
+        
+        priced = [pool for pool in pools if pool in self._pool_price_oracle_cache]
+        raw_prices = self._multicall([
+            self.w3.eth.contract(
+                address=self._pool_price_oracle_cache[pool], abi=FX_PRICE_ORACLE_ABI
+            ).functions.getLiquidatePrice()
+            for pool in priced
+        ])
+        prices = dict(zip(priced, raw_prices))
+        return {
+            pool: utils.wei_to_decimal(prices[pool]) if prices.get(pool) is not None else None
+            for pool in pools
+        }
+
+    def find_position_candidates(
+        self,
+        top_n: int = 10,
+        prices: Optional[Dict[str, Union[float, Decimal, str]]] = None,
+        sync: bool = True,
+        build_transactions: bool = True,
+        receiver: Optional[str] = None,
+        from_address: Optional[str] = None,
+        cap_margin: Union[float, Decimal, str] = "0.01"
+    ) -> List[PositionCandidate]:
+        """
+        Rank open positions that can be rebalanced or liquidated.
+        
+        Brings the position index up to date, loads every open position and
+        its pool's liquidation price and thresholds, and recomputes all debt
+        ratios in one vectorized pass (NumPy when installed, otherwise a
+        Python loop). Unsigned rebalance/liquidate transactions for the top
+        candidates are built together with `build_transactions_batch()`.
+        
+        When a pool's oracle cannot be read, the price implied by the
+        positions' on-chain debt ratios is used instead.
+        
+        Args:
+            top_n: Number of candidates to build transactions for.
+            prices: Optional collateral price overrides by pool address, e.g.
+                   to test a price drop.
+            sync: Run `sync_position_index()` and `refresh_positions()` first.
+            build_transactions: Prebuild transactions for the top candidates.
+            receiver: Receiver of the rebalance/liquidation proceeds
+                     (defaults to the sender).
+            from_address: Keeper address (defaults to the client's address).
+            cap_margin: Slippage margin over each candidate's debt for the
+                       fxUSD the prebuilt transaction may spend, e.g. 0.01
+                       for 1%. Stable token spending is capped at 0.
+            
+        Returns:
+            List[PositionCandidate]: Liquidation candidates first, then
+            rebalance candidates, each by debt ratio (highest first). The first
+            `top_n` carry their `transaction`.
+        
+        Example:
+            for candidate in client.find_position_candidates(top_n=5):
+                print(candidate.action, candidate.position_id, candidate.debt_ratio)
+                client.w3.eth.send_transaction(candidate.transaction)
+        """
+        if sync:
+            self.sync_position_index()
+            self.refresh_positions()
+        
+        records = self.position_index.query()
+        pools = list(dict.fromkeys(utils.to_checksum_address(record.pool) for record in records))
+        overrides = {
+            utils.to_checksum_address(pool): Decimal(str(price)) for pool, price in (prices or {}).items()
+        }
+        
+        live_pools = [pool for pool in pools if pool not in overrides]
+        try:
+            live_prices = self.get_pool_liquidation_prices(live_pools) if live_pools else {}
+        except ContractCallError as e:
+            logger.debug(f"Batched oracle price read failed: {e}. Using prices implied by debt ratios.")
+            live_prices = {}
+        
+        pool_prices: Dict[str, Optional[Decimal]] = {}
+        for pool in pools:
+            price = overrides.get(pool, live_prices.get(pool))
+            if price is None:
+                price = self._implied_pool_price(pool, records)
+            pool_prices[pool.lower()] = price
+        
+        candidates = rank_candidates(records, pool_prices, self.position_index.pool_thresholds())
+        
+        top = candidates[:max(0, top_n)]
+        if build_transactions and top:
+            margin = 1 + Decimal(str(cap_margin))
+            requests = []
+            for candidate in top:
+                builder_name = (
+                    "build_liquidate_position_transaction" if candidate.action == LIQUIDATE
+                    else "build_rebalance_position_transaction"
+                )
+                requests.append((builder_name, {
+                    "pool_address": candidate.pool,
+                    "position_id": candidate.position_id,
+                    "receiver": receiver,
+                    "max_fxusd": (candidate.debt or Decimal(0)) * margin,
+                    "max_stable": 0,
+                }))
+            transactions = self.build_transactions_batch(requests, from_address=from_address)
+            for candidate, transaction in zip(top, transactions):
+                candidate.transaction = transaction
+        return candidates
+
+    def _implied_pool_price(self, pool_address: str, records: List[PositionRecord]) -> Optional[Decimal]:
+        """Median collateral price implied by a pool's on-chain debt ratios."""
+        pool_key = pool_address.lower()
+        implied = sorted(
+            record.debt / (record.collateral * record.debt_ratio)
+            for record in records
+            if record.pool.lower() == pool_key and record.collateral and record.debt and record.debt_ratio
+        )
+        if not implied:
+            return None
+        return implied[len(implied) // 2]
+
+    def get_indexed_positions(
+        self,
+        owner: Optional[str] = None,
+        pool_address: Optional[str] = None,
+        health: Optional[str] = None,
+        min_debt_ratio: Optional[Union[float, Decimal, str]] = None,
+        max_debt_ratio: Optional[Union[float, Decimal, str]] = None,
+        include_closed: bool = False
+    ) -> List[PositionRecord]:
+        """
+        Query positions from the local position index.
+        
+        Call `sync_position_index()` and `refresh_positions()` first to bring
+        the index up to date.
+        
+        Args:
+            owner: Only positions owned by this address.
+            pool_address: Only positions in this pool.
+            health: "healthy", "rebalance" or "liquidate".
+            min_debt_ratio: Only positions with at least this debt ratio.
+            max_debt_ratio: Only positions with at most this debt ratio.
+            include_closed: Include positions without collateral or debt.
+            
+        Returns:
+            List[PositionRecord]: Matching positions, highest debt ratio first.
+        
+        Example:
+            client.sync_position_index()
+            client.refresh_positions()
+            for position in client.get_indexed_positions(health="rebalance"):
+                print(position.pool, position.position_id, position.debt_ratio)
+        """
+        return self.position_index.query(
+            owner=owner,
+            pool=pool_address,
+            health=health,
+            min_debt_ratio=Decimal(str(min_debt_ratio)) if min_debt_ratio is not None else None,
+            max_debt_ratio=Decimal(str(max_debt_ratio)) if max_debt_ratio is not None else None,
+            include_closed=include_closed,
+        )
+
+    def _call_each(self, calls: List[Any], block_identifier: Union[str, int] = "latest") -> List[Any]:
+        """Execute read calls one by one, with None for calls that fail (the multicall fallback)."""
+        results = []
+        for fn in calls:
+            try:
+                results.append(fn.call(block_identifier=block_identifier))
+            except Exception as e:
+                logger.debug(f"{fn.fn_name} call failed: {e}")
+                results.append(None)
+        return results
+
+    @_block_cached
     def get_peg_keeper_info(self) -> Dict[str, Any]:
         """Get the current status from the Peg Keeper."""
         contract = self._get_contract("peg_keeper", constants.PEG_KEEPER)
@@ -2229,7 +4473,7 @@ class ProtocolClient:
         
         # Wait for transaction confirmation to get the vault address
         try:
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            receipt = self._wait_for_transaction_receipt(tx_hash, timeout=120)
             
             # Try to extract vault address from the transaction receipt
             vault_address = self.get_convex_vault_address_from_tx(tx_hash)
@@ -2469,6 +4713,8 @@ class ProtocolClient:
             )
         
         # Get staking token address and check balance
+        next_nonce = None
+        staking_token = None
         try:
             staking_token = vault.functions.stakingToken().call()
             staking_token_contract = self.w3.eth.contract(
@@ -2488,17 +4734,11 @@ class ProtocolClient:
                 )
             
             # Check and approve if needed
-            allowance = staking_token_contract.functions.allowance(
-                self.address, vault_address
-            ).call()
+            allowance = self._get_raw_allowance(staking_token, vault_address, raw_amount)
             
             if allowance < raw_amount:
                 logger.info(f"Approving {amount} tokens for vault deposit...")
-                self.approve(
-                    token_address=staking_token,
-                    spender_address=vault_address,
-                    amount=amount
-                )
+                next_nonce = self._grant_allowances([(staking_token, vault_address, raw_amount)])
         except InsufficientBalanceError:
             raise
         except Exception as e:
@@ -2506,13 +4746,16 @@ class ProtocolClient:
             # Default to 18 decimals if we can't determine
             raw_amount = utils.decimal_to_wei(amount, 18)
         
+        # With a permit still pending the deposit cannot be estimated yet
+        default_gas = 400000 if next_nonce is not None else None
+        spends = [(staking_token, vault_address, raw_amount)] if staking_token else []
         if manage:
-            return self._build_and_send_transaction(
-                vault.functions.deposit(raw_amount, True)
+            return self._send_spending_allowances(
+                vault.functions.deposit(raw_amount, True), spends, nonce=next_nonce, default_gas=default_gas
             )
         else:
-            return self._build_and_send_transaction(
-                vault.functions.deposit(raw_amount)
+            return self._send_spending_allowances(
+                vault.functions.deposit(raw_amount), spends, nonce=next_nonce, default_gas=default_gas
             )
 
     def withdraw_from_convex_vault(
@@ -3045,17 +5288,20 @@ class ProtocolClient:
     def get_all_user_vaults(
         self,
         user_address: Optional[str] = None,
-        from_block: int = 0
+        from_block: int = 0,
+        max_workers: int = 4
     ) -> Dict[int, Optional[str]]:
         """
         Get all Convex vault addresses for a user across all known pools.
         
-        This method queries all pools in the CONVEX_POOLS registry to find
-        vault addresses for the specified user.
+        This method looks up the user's vault for every pool in the CONVEX_POOLS
+        registry with a single multicall to the pool registry's `vaultMap`.
+        Pools whose lookup fails fall back to event queries, run concurrently.
         
         Args:
             user_address: User's wallet address (defaults to client's address)
-            from_block: Block number to start searching from (0 = from genesis)
+            from_block: Block number to start searching from for the event fallback
+            max_workers: Maximum concurrent event queries in the fallback
         
         Returns:
             Dictionary mapping pool_id to vault_address (None if vault doesn't exist)
@@ -3068,23 +5314,44 @@ class ProtocolClient:
         if not target_address:
             raise FXProtocolError("No user address provided or available in client.")
         
-        vaults = {}
+        target_address = utils.to_checksum_address(target_address)
+        pool_ids = list(dict.fromkeys(pool_info["pool_id"] for pool_info in constants.CONVEX_POOLS.values()))
         
-        # Query all pools in the registry
-        for pool_key, pool_info in constants.CONVEX_POOLS.items():
-            pool_id = pool_info["pool_id"]
-            try:
-                vault_address = self.get_convex_vault_address(
-                    target_address,
-                    pool_id,
-                    from_block
-                )
-                vaults[pool_id] = vault_address
-            except Exception as e:
-                logger.debug(f"Error querying vault for pool {pool_id}: {e}")
+        registry = self.w3.eth.contract(
+            address=utils.to_checksum_address(constants.CONVEX_VAULT_REGISTRY),
+            abi=CONVEX_POOL_REGISTRY_ABI
+        )
+        try:
+            results = self._multicall([
+                registry.functions.vaultMap(pool_id, target_address) for pool_id in pool_ids
+            ])
+        except ContractCallError as e:
+            logger.debug(f"Batched vault lookup failed: {e}. Falling back to event queries.")
+            results = [None] * len(pool_ids)
+        
+        vaults: Dict[int, Optional[str]] = {}
+        unresolved = []
+        for pool_id, vault_address in zip(pool_ids, results):
+            if vault_address is None:
+                unresolved.append(pool_id)
+            elif int(vault_address, 16) == 0:
                 vaults[pool_id] = None
+            else:
+                vaults[pool_id] = utils.to_checksum_address(vault_address)
+        
+        if unresolved:
+            def lookup(pool_id: int) -> Optional[str]:
+                try:
+                    return self.get_convex_vault_address(target_address, pool_id, from_block)
+                except Exception as e:
+                    logger.debug(f"Error querying vault for pool {pool_id}: {e}")
+                    return None
+            
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for pool_id, vault_address in zip(unresolved, executor.map(lookup, unresolved)):
+                    vaults[pool_id] = vault_address
         
-        return vaults
+        return {pool_id: vaults.get(pool_id) for pool_id in pool_ids}
     
     def get_convex_pool_info(self, pool_id: Optional[int] = None, pool_key: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -3154,6 +5421,55 @@ class ProtocolClient:
             result[pool_key]["pool_key"] = pool_key
         return result
     
+    def _resolve_convex_vault_fields(self, vault_addresses: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve the immutable fields of many Convex vaults.
+        
+        A vault's owner, gauge and staking token are fixed when it is created,
+        so they are fetched once (one multicall for the vault fields, one for
+        any unknown staking token decimals) and cached for the client's lifetime.
+        
+        Args:
+            vault_addresses: Vault addresses.
+            
+        Returns:
+            Dict mapping checksum vault address to a dict with owner,
+            gauge_address, staking_token and staking_token_decimals, or None if
+            the address is not a valid vault.
+        """
+        vaults = list(dict.fromkeys(utils.to_checksum_address(v) for v in vault_addresses))
+        missing = [v for v in vaults if v not in self._vault_fields_cache]
+        
+        if missing:
+            calls = []
+            for vault_address in missing:
+                vault = self._get_contract("convex_vault", vault_address)
+                calls.extend([
+                    vault.functions.owner(),
+                    vault.functions.gaugeAddress(),
+                    vault.functions.stakingToken(),
+                ])
+            results = self._multicall(calls)
+            
+            resolved = {}
+            for i, vault_address in enumerate(missing):
+                owner, gauge_address, staking_token = results[i * 3:i * 3 + 3]
+                if owner is None or staking_token is None:
+                    continue
+                resolved[vault_address] = {
+                    "owner": owner,
+                    "gauge_address": gauge_address,
+                    "staking_token": staking_token,
+                }
+            
+            decimals = self._get_token_decimals_batch([f["staking_token"] for f in resolved.values()])
+            for vault_address, fields in resolved.items():
+                fields["staking_token_decimals"] = decimals[utils.to_checksum_address(fields["staking_token"])]
+                if fields["staking_token_decimals"] is not None:
+                    self._vault_fields_cache[vault_address] = fields
+        
+        return {v: self._vault_fields_cache.get(v) for v in vaults}
+
     def get_vault_balances_batch(
         self,
         vault_addresses: List[str]
@@ -3161,6 +5477,10 @@ class ProtocolClient:
         """
         Get balances for multiple vaults in a single batch query.
         
+        Immutable vault fields (gauge, staking token, decimals) come from a cache;
+        all gauge balances are then read in one multicall. If Multicall3 is
+        unavailable, vaults are queried one by one.
+        
         Args:
             vault_addresses: List of vault addresses to query
         
@@ -3172,6 +5492,11 @@ class ProtocolClient:
             balances = client.get_vault_balances_batch(vaults)
             # Returns: {"0x...": Decimal("100"), "0x...": Decimal("50"), ...}
         """
+        try:
+            return self._get_vault_balances_multicall(vault_addresses)
+        except ContractCallError as e:
+            logger.debug(f"Batched vault balance query failed: {e}. Querying vaults individually.")
+        
         balances = {}
         for vault_address in vault_addresses:
             try:
@@ -3181,6 +5506,50 @@ class ProtocolClient:
                 logger.warning(f"Failed to get balance for vault {vault_address}: {e}")
                 balances[vault_address] = Decimal("0")
         return balances
+
+    def _get_vault_balances_multicall(
+        self,
+        vault_addresses: List[str],
+        failed_as_none: bool = False
+    ) -> Dict[str, Optional[Decimal]]:
+        """
+        Multicall implementation of get_vault_balances_batch().
+        
+        Unreadable balances are reported as zero, or as None with failed_as_none=True.
+        """
+        fields = self._resolve_convex_vault_fields(vault_addresses)
+        
+        # Group vaults by gauge so each gauge contract is built once
+        by_gauge: Dict[str, List[str]] = {}
+        for vault_address, vault_fields in fields.items():
+            if vault_fields is None:
+                continue
+            gauge_address = vault_fields["gauge_address"]
+            if not gauge_address or int(gauge_address, 16) == 0:
+                continue
+            by_gauge.setdefault(utils.to_checksum_address(gauge_address), []).append(vault_address)
+        
+        calls = []
+        order = []
+        for gauge_address, vaults in by_gauge.items():
+            gauge = self._get_contract("curve_gauge", gauge_address)
+            for vault_address in vaults:
+                calls.append(gauge.functions.balanceOf(vault_address))
+                order.append(vault_address)
+        
+        raw_balances = dict(zip(order, self._multicall(calls)))
+        
+        balances = {}
+        for vault_address in vault_addresses:
+            checksum_vault = utils.to_checksum_address(vault_address)
+            vault_fields = fields.get(checksum_vault)
+            raw_balance = raw_balances.get(checksum_vault)
+            if vault_fields is None or raw_balance is None:
+                logger.warning(f"Failed to get balance for vault {vault_address}: invalid vault or gauge")
+                balances[vault_address] = None if failed_as_none else Decimal("0")
+                continue
+            balances[vault_address] = utils.wei_to_decimal(raw_balance, vault_fields["staking_token_decimals"])
+        return balances
     
     def get_vault_rewards_batch(
         self,
@@ -3189,6 +5558,10 @@ class ProtocolClient:
         """
         Get rewards for multiple vaults in a single batch query.
         
+        All earned() calls go out in one multicall and reward token decimals are
+        resolved once per unique token (and cached). If Multicall3 is
+        unavailable, vaults are queried one by one.
+        
         Args:
             vault_addresses: List of vault addresses to query
         
@@ -3203,6 +5576,11 @@ class ProtocolClient:
             #   ...
             # }
         """
+        try:
+            return self._get_vault_rewards_multicall(vault_addresses)
+        except ContractCallError as e:
+            logger.debug(f"Batched vault rewards query failed: {e}. Querying vaults individually.")
+        
         rewards = {}
         for vault_address in vault_addresses:
             try:
@@ -3212,18 +5590,80 @@ class ProtocolClient:
                 logger.warning(f"Failed to get rewards for vault {vault_address}: {e}")
                 rewards[vault_address] = {"token_addresses": [], "amounts": {}}
         return rewards
+
+    def _get_vault_rewards_multicall(
+        self,
+        vault_addresses: List[str],
+        validate: bool = True,
+        failed_as_none: bool = False
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Multicall implementation of get_vault_rewards_batch().
+        
+        With validate=False the vault fields lookup is skipped, for vaults that
+        are already known to exist (e.g. read from the pool registry).
+        Unreadable rewards are reported as empty, or as None with failed_as_none=True.
+        """
+        if validate:
+            fields = self._resolve_convex_vault_fields(vault_addresses)
+            valid_vaults = [v for v, vault_fields in fields.items() if vault_fields is not None]
+        else:
+            valid_vaults = list(dict.fromkeys(utils.to_checksum_address(v) for v in vault_addresses))
+        
+        earned_results = self._multicall([
+            self._get_contract("convex_vault", vault_address).functions.earned()
+            for vault_address in valid_vaults
+        ])
+        earned = dict(zip(valid_vaults, earned_results))
+        
+        # Vaults of the same pool share reward tokens; resolve each token once
+        all_tokens = [
+            token
+            for result in earned.values() if result is not None
+            for token in result[0]
+        ]
+        decimals = self._get_token_decimals_batch(all_tokens)
+        
+        rewards = {}
+        for vault_address in vault_addresses:
+            result = earned.get(utils.to_checksum_address(vault_address))
+            if result is None:
+                logger.warning(f"Failed to get rewards for vault {vault_address}: invalid vault or earned() failed")
+                rewards[vault_address] = None if failed_as_none else {"token_addresses": [], "amounts": {}}
+                continue
+            
+            token_addresses, amounts = list(result[0]), result[1]
+            reward_dict = {}
+            for token_addr, amount in zip(token_addresses, amounts):
+                token_decimals = decimals.get(utils.to_checksum_address(token_addr))
+                # Default to 18 decimals if we can't get it
+                reward_dict[token_addr] = utils.wei_to_decimal(amount, token_decimals if token_decimals is not None else 18)
+            
+            rewards[vault_address] = {
+                "token_addresses": token_addresses,
+                "amounts": reward_dict
+            }
+        return rewards
     
     def get_user_vaults_summary(
         self,
         user_address: Optional[str] = None,
-        from_block: int = 0
+        from_block: int = 0,
+        max_workers: int = 4
     ) -> Dict[str, Any]:
         """
         Get a comprehensive summary of all user's Convex vaults including balances and rewards.
         
+        The summary is built in stages: vault discovery (one multicall), then
+        two overlapping pipelines on a worker pool - vault metadata followed by
+        gauge balances, and earned() followed by reward token decimals. Immutable
+        vault metadata and token decimals are cached, so repeat summaries need
+        about two round-trips.
+        
         Args:
             user_address: User's wallet address (defaults to client's address)
             from_block: Block number to start searching from (0 = from genesis)
+            max_workers: Maximum concurrent requests
         
         Returns:
             Dictionary with:
@@ -3232,8 +5672,8 @@ class ProtocolClient:
             - vaults: Dictionary mapping pool_id to vault information
                 - vault_address: Vault address (None if not found)
                 - pool_info: Pool information
-                - balance: Staked balance (if vault exists)
-                - rewards: Claimable rewards (if vault exists)
+                - balance: Staked balance (if vault exists; None if it could not be read)
+                - rewards: Claimable rewards (if vault exists; None if they could not be read)
         
         Example:
             summary = client.get_user_vaults_summary()
@@ -3246,17 +5686,34 @@ class ProtocolClient:
         if not target_address:
             raise FXProtocolError("No user address provided or available in client.")
         
-        # Get all vault addresses
-        vault_addresses = self.get_all_user_vaults(target_address, from_block)
+        # Stage 1: discover vaults
+        vault_addresses = self.get_all_user_vaults(target_address, from_block, max_workers=max_workers)
+        existing_vaults = [addr for addr in vault_addresses.values() if addr is not None]
+        
+        # Stage 2: metadata + balances and rewards, overlapped
+        balances: Dict[str, Optional[Decimal]] = {}
+        rewards: Dict[str, Optional[Dict[str, Any]]] = {}
+        if existing_vaults:
+            with ThreadPoolExecutor(max_workers=max(1, min(2, max_workers))) as executor:
+                # Failed reads stay None, as in the per-vault path, rather than looking like empty vaults
+                balances_future = executor.submit(self._get_vault_balances_multicall, existing_vaults, True)
+                rewards_future = executor.submit(self._get_vault_rewards_multicall, existing_vaults, False, True)
+                try:
+                    balances = balances_future.result()
+                except ContractCallError as e:
+                    logger.debug(f"Error getting vault balances: {e}")
+                try:
+                    rewards = rewards_future.result()
+                except ContractCallError as e:
+                    logger.debug(f"Error getting vault rewards: {e}")
         
         # Build summary
         summary = {
             "user_address": target_address,
-            "total_vaults": sum(1 for addr in vault_addresses.values() if addr is not None),
+            "total_vaults": len(existing_vaults),
             "vaults": {}
         }
         
-        # Get detailed information for each vault
         for pool_id, vault_address in vault_addresses.items():
             vault_data = {
                 "vault_address": vault_address,
@@ -3271,32 +5728,233 @@ class ProtocolClient:
             except Exception as e:
                 logger.debug(f"Error getting pool info for pool {pool_id}: {e}")
             
-            # Get balance and rewards if vault exists
-            if vault_address:
-                try:
-                    vault_data["balance"] = self.get_convex_vault_balance(vault_address)
-                    vault_data["rewards"] = self.get_convex_vault_rewards(vault_address)
-                except Exception as e:
-                    logger.debug(f"Error getting vault data for {vault_address}: {e}")
+            if vault_address:
+                vault_data["balance"] = balances.get(vault_address)
+                vault_data["rewards"] = rewards.get(vault_address)
+            
+            summary["vaults"][pool_id] = vault_data
+        
+        return summary
+    
+    # --- APY Calculation Methods ---
+    # NOTE: APY calculation methods have been removed in v0.3.0 due to complexity and accuracy issues.
+    # Convex and Curve APY calculations require historical data and multiple sources that
+    # are difficult to accurately replicate on-chain. Users should refer to Convex/Curve
+    # websites for official APY values.
+    
+    # Removed methods (v0.3.0):
+    # - get_convex_pool_apy
+    # - get_convex_vault_apy
+    # - get_all_convex_pools_apy
+    # - get_curve_gauge_apy
+    # - get_all_curve_gauges_apy
+    
+    # --- Pool Information Queries ---
+    
+    def _get_convex_pool_info_data(self, pool_id: int) -> List[Any]:
+        """
+        Booster poolInfo(pool_id): [lptoken, token, gauge, crvRewards, stash, shutdown].
+        
+        Served from the poolInfo cache while fresh (see refresh_convex_pool_info()).
+        """
+        cached = self._convex_pool_info_cache.get(pool_id)
+        if cached is not None and self._is_convex_pool_info_fresh(cached):
+            return list(cached[1])
+        
+        booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
+        pool_info_data = list(booster.functions.poolInfo(pool_id).call())
+        self._convex_pool_info_cache[pool_id] = (time.monotonic(), pool_info_data)
+        return list(pool_info_data)
+    
+    def _is_convex_pool_info_fresh(self, entry: Tuple[float, List[Any]]) -> bool:
+        """Whether a cached poolInfo entry can be reused (shut-down pools never reopen)."""
+        fetched_at, pool_info_data = entry
+        return bool(pool_info_data[5]) or time.monotonic() - fetched_at < self.convex_pool_info_max_age
+    
+    def refresh_convex_pool_info(
+        self,
+        pool_ids: Optional[List[int]] = None,
+        force: bool = False
+    ) -> Dict[int, bool]:
+        """
+        Re-read Booster poolInfo for many pools in one multicall.
+        
+        poolInfo addresses never change and a pool's shutdown flag only ever
+        flips to True, so by default only active pools whose entry is older
+        than `convex_pool_info_max_age` are re-read.
+        
+        Args:
+            pool_ids: Convex pool IDs (defaults to all pools in the registry)
+            force: Re-read every pool, including fresh and shut-down ones
+        
+        Returns:
+            Dictionary mapping pool_id to its shutdown flag (pools whose
+            poolInfo call failed are omitted)
+        
+        Example:
+            shutdown = client.refresh_convex_pool_info(force=True)
+            print([pool_id for pool_id, is_shutdown in shutdown.items() if is_shutdown])
+        """
+        if pool_ids is None:
+            pool_ids = [pool_info["pool_id"] for pool_info in constants.CONVEX_POOLS.values()]
+        pool_ids = list(dict.fromkeys(pool_ids))
+        
+        stale = [
+            pool_id for pool_id in pool_ids
+            if force
+            or pool_id not in self._convex_pool_info_cache
+            or not self._is_convex_pool_info_fresh(self._convex_pool_info_cache[pool_id])
+        ]
+        if stale:
+            booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
+            results = self._multicall([booster.functions.poolInfo(pool_id) for pool_id in stale])
+            fetched_at = time.monotonic()
+            for pool_id, pool_info_data in zip(stale, results):
+                if pool_info_data is not None:
+                    self._convex_pool_info_cache[pool_id] = (fetched_at, list(pool_info_data))
+        
+        return {
+            pool_id: bool(self._convex_pool_info_cache[pool_id][1][5])
+            for pool_id in pool_ids
+            if pool_id in self._convex_pool_info_cache
+        }
+    
+    def get_convex_pools_overview(
+        self,
+        pool_ids: Optional[List[int]] = None,
+        include_rewards: bool = True
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get TVL and reward data for many Convex pools at once.
+        
+        Stale poolInfo entries are refreshed in one multicall, then every
+        pool's total supply (and reward rate and period) is read in a second.
+        Staking and reward tokens are immutable, so they and their decimals
+        are cached after the first sweep, which then takes a single multicall.
+        
+        Args:
+            pool_ids: Convex pool IDs (defaults to all pools in the registry)
+            include_rewards: Whether to include reward token, rate and period
+        
+        Returns:
+            Dictionary mapping pool_id to pool data:
+            - gauge_address, base_reward_pool, shutdown
+            - tvl: Total staked (Decimal), tvl_raw: Total staked in wei
+            - reward_token, reward_rate (Decimal per second), reward_period_finish,
+              rewards_active (if include_rewards)
+            Pools whose poolInfo call failed are omitted; TVL and reward fields
+            are None where their calls failed.
+        
+        Example:
+            overview = client.get_convex_pools_overview()
+            for pool_id, pool in overview.items():
+                print(f"Pool {pool_id}: {pool['tvl']} staked, active={pool['rewards_active']}")
+        """
+        if pool_ids is None:
+            pool_ids = [pool_info["pool_id"] for pool_info in constants.CONVEX_POOLS.values()]
+        pool_ids = list(dict.fromkeys(pool_ids))
+        
+        self.refresh_convex_pool_info(pool_ids)
+        
+        pools = []
+        for pool_id in pool_ids:
+            if pool_id not in self._convex_pool_info_cache:
+                logger.warning(f"Failed to get pool info for pool {pool_id}")
+                continue
+            pool_info_data = self._convex_pool_info_cache[pool_id][1]
+            reward_pool_address = pool_info_data[3]
+            if int(reward_pool_address, 16) == 0:
+                reward_pool_address = None
+            else:
+                reward_pool_address = utils.to_checksum_address(reward_pool_address)
+            pools.append((pool_id, pool_info_data, reward_pool_address))
+        
+        # One multicall for dynamic fields plus any uncached staking/reward tokens
+        calls = []
+        layouts = []
+        if include_rewards:
+            calls.append(self.multicall.functions.getCurrentBlockTimestamp())
+        for _, _, reward_pool_address in pools:
+            if reward_pool_address is None:
+                layouts.append([])
+                continue
+            reward_pool = self._get_contract("convex_base_reward_pool", reward_pool_address)
+            cached = self._convex_reward_pool_cache.get(reward_pool_address, {})
+            fields = {"totalSupply": reward_pool.functions.totalSupply()}
+            if "staking_token" not in cached:
+                fields["stakingToken"] = reward_pool.functions.stakingToken()
+            if include_rewards:
+                fields["rewardRate"] = reward_pool.functions.rewardRate()
+                fields["periodFinish"] = reward_pool.functions.periodFinish()
+                if "reward_token" not in cached:
+                    fields["rewardToken"] = reward_pool.functions.rewardToken()
+            layouts.append(list(fields))
+            calls.extend(fields.values())
+        
+        results = iter(self._multicall(calls))
+        timestamp = next(results) if include_rewards else None
+        
+        pool_results = []
+        for (_, _, reward_pool_address), names in zip(pools, layouts):
+            values = {name: next(results) for name in names}
+            if reward_pool_address is not None:
+                cached = self._convex_reward_pool_cache.setdefault(reward_pool_address, {})
+                if values.get("stakingToken"):
+                    cached["staking_token"] = values["stakingToken"]
+                if values.get("rewardToken"):
+                    cached["reward_token"] = values["rewardToken"]
+            pool_results.append(values)
+        
+        tokens = []
+        for _, _, reward_pool_address in pools:
+            if reward_pool_address is None:
+                continue
+            cached = self._convex_reward_pool_cache[reward_pool_address]
+            tokens.append(cached.get("staking_token"))
+            if include_rewards:
+                tokens.append(cached.get("reward_token"))
+        tokens = [token for token in tokens if token]
+        decimals_map = self._get_token_decimals_batch(tokens)
+        
+        def to_decimal(raw: Optional[int], token: Optional[str]) -> Optional[Decimal]:
+            if raw is None or token is None:
+                return None
+            token_decimals = decimals_map.get(utils.to_checksum_address(token))
+            return utils.wei_to_decimal(raw, token_decimals) if token_decimals is not None else None
+        
+        overview = {}
+        for (pool_id, pool_info_data, reward_pool_address), values in zip(pools, pool_results):
+            cached = self._convex_reward_pool_cache.get(reward_pool_address, {}) if reward_pool_address else {}
+            staking_token = cached.get("staking_token")
+            total_supply = values.get("totalSupply")
+            
+            pool = {
+                "pool_id": pool_id,
+                "gauge_address": pool_info_data[2],
+                "base_reward_pool": reward_pool_address,
+                "shutdown": bool(pool_info_data[5]),
+                "staking_token": staking_token,
+                "tvl": to_decimal(total_supply, staking_token),
+                "tvl_raw": total_supply,
+            }
             
-            summary["vaults"][pool_id] = vault_data
-        
-        return summary
-    
-    # --- APY Calculation Methods ---
-    # NOTE: APY calculation methods have been removed in v0.3.0 due to complexity and accuracy issues.
-    # Convex and Curve APY calculations require historical data and multiple sources that
-    # are difficult to accurately replicate on-chain. Users should refer to Convex/Curve
-    # websites for official APY values.
-    
-    # Removed methods (v0.3.0):
-    # - get_convex_pool_apy
-    # - get_convex_vault_apy
-    # - get_all_convex_pools_apy
-    # - get_curve_gauge_apy
-    # - get_all_curve_gauges_apy
-    
-    # --- Pool Information Queries ---
+            if include_rewards:
+                reward_token = cached.get("reward_token")
+                period_finish = values.get("periodFinish")
+                pool.update({
+                    "reward_token": reward_token,
+                    "reward_rate": to_decimal(values.get("rewardRate"), reward_token),
+                    "reward_period_finish": period_finish,
+                    "rewards_active": (
+                        period_finish > timestamp
+                        if period_finish is not None and timestamp is not None
+                        else None
+                    ),
+                })
+            
+            overview[pool_id] = pool
+        
+        return overview
     
     def get_convex_pool_details(
         self,
@@ -3340,9 +5998,8 @@ class ProtocolClient:
         
         # Get live data from Convex Booster
         try:
-            booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
             # poolInfo returns: [lptoken, token, gauge, crvRewards, stash, shutdown]
-            pool_info_data = booster.functions.poolInfo(pool_id).call()
+            pool_info_data = self._get_convex_pool_info_data(pool_id)
             
             result.update({
                 "lptoken": pool_info_data[0],
@@ -3420,8 +6077,7 @@ class ProtocolClient:
             print(f"Pool 37 TVL: {tvl} tokens")
         """
         try:
-            booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
-            pool_info_data = booster.functions.poolInfo(pool_id).call()
+            pool_info_data = self._get_convex_pool_info_data(pool_id)
             base_reward_pool_address = pool_info_data[3]
             
             if base_reward_pool_address == "0x0000000000000000000000000000000000000000":
@@ -3455,8 +6111,7 @@ class ProtocolClient:
         may be available through extra reward contracts (stash).
         """
         try:
-            booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
-            pool_info_data = booster.functions.poolInfo(pool_id).call()
+            pool_info_data = self._get_convex_pool_info_data(pool_id)
             base_reward_pool_address = pool_info_data[3]
             
             if base_reward_pool_address == "0x0000000000000000000000000000000000000000":
@@ -3486,8 +6141,7 @@ class ProtocolClient:
             print(f"Pool 37 Gauge: {gauge}")
         """
         try:
-            booster = self._get_contract("convex_booster", constants.CONVEX_BOOSTER)
-            pool_info_data = booster.functions.poolInfo(pool_id).call()
+            pool_info_data = self._get_convex_pool_info_data(pool_id)
             gauge_address = pool_info_data[2]
             
             if gauge_address == "0x0000000000000000000000000000000000000000":
@@ -3503,6 +6157,9 @@ class ProtocolClient:
         """
         Get TVL for all Convex pools in the registry.
         
+        Uses get_convex_pools_overview(), so a warm client reads every pool's
+        TVL in one multicall (falls back to per-pool queries without Multicall3).
+        
         Returns:
             Dictionary mapping pool_id to TVL (None if unavailable)
         
@@ -3512,6 +6169,15 @@ class ProtocolClient:
                 if tvl:
                     print(f"Pool {pool_id}: {tvl} TVL")
         """
+        try:
+            overview = self.get_convex_pools_overview(include_rewards=False)
+            return {
+                pool_info["pool_id"]: overview.get(pool_info["pool_id"], {}).get("tvl")
+                for pool_info in constants.CONVEX_POOLS.values()
+            }
+        except ContractCallError as e:
+            logger.debug(f"Batched TVL query failed: {e}. Querying pools individually.")
+        
         tvls = {}
         
         for pool_key, pool_info in constants.CONVEX_POOLS.items():
@@ -3563,10 +6229,16 @@ class ProtocolClient:
     
     # --- Curve Finance Methods ---
     
+    @_block_cached
     def get_curve_pool_info(self, pool_address: str) -> Dict[str, Any]:
         """
         Get information about a Curve pool.
         
+        The pool layout (coins, decimals, LP token) never changes, so it is
+        cached after the first call and later calls read balances, virtual
+        price, A and fee in a single multicall. Pools with up to
+        `CURVE_POOL_MAX_COINS` coins are supported.
+        
         Args:
             pool_address: Curve pool contract address
         
@@ -3590,16 +6262,27 @@ class ProtocolClient:
         if not self.w3.is_address(pool_address):
             raise ContractCallError(f"Invalid pool address: {pool_address}")
         
+        try:
+            results = self._multicall(self._curve_pool_info_calls(pool_address))
+        except ContractCallError as e:
+            logger.debug(f"Batched pool info query failed: {e}. Querying pool calls individually.")
+            return self._get_curve_pool_info_serial(pool_address)
+        
+        self._learn_curve_pool_layouts([(pool_address, results)])
+        return self._build_curve_pool_info(pool_address, results)
+    
+    def _get_curve_pool_info_serial(self, pool_address: str) -> Dict[str, Any]:
+        """get_curve_pool_info() with one call per field, for nodes without Multicall3."""
         pool = self._get_contract("curve_pool", pool_address)
         
         try:
             # Get basic pool info
             lp_token = pool.functions.token().call()
             
-            # Get coins (for 2-coin pools)
+            # Get coins until the pool runs out of them
             coins = []
             balances = []
-            for i in range(2):  # Most f(x) pools are 2-coin pools
+            for i in range(CURVE_POOL_MAX_COINS):
                 try:
                     coin = pool.functions.coins(i).call()
                     balance = pool.functions.balances(i).call()
@@ -3666,6 +6349,125 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get pool info: {str(e)}")
     
+    def _curve_pool_info_calls(self, pool_address: str) -> List[Any]:
+        """
+        Calls read by _build_curve_pool_info(), for use in a multicall.
+        
+        Pools with a cached layout only need their dynamic fields (virtual
+        price, A, fee and one balance per coin). Unknown pools also probe
+        token() and every coins(i)/balances(i) slot; slots past the last coin
+        revert and come back as None.
+        """
+        pool = self._get_contract("curve_pool", pool_address)
+        calls = [
+            pool.functions.get_virtual_price(),
+            pool.functions.A(),
+            pool.functions.fee(),
+        ]
+        layout = self._curve_pool_layout_cache.get(utils.to_checksum_address(pool_address))
+        if layout is not None:
+            calls.extend(pool.functions.balances(i) for i in range(layout["n_coins"]))
+            return calls
+        
+        calls.append(pool.functions.token())
+        for i in range(CURVE_POOL_MAX_COINS):
+            calls.extend([pool.functions.coins(i), pool.functions.balances(i)])
+        return calls
+    
+    def _learn_curve_pool_layouts(self, pool_results: List[Tuple[str, List[Any]]]):
+        """
+        Cache the layout of pools read with the discovery calls.
+        
+        Decimals for every new coin and LP token are resolved in one batch.
+        Pools without any readable coin are left uncached.
+        
+        Args:
+            pool_results: (pool address, results) pairs for the calls from
+                         _curve_pool_info_calls().
+        """
+        discovered = {}
+        for pool_address, results in pool_results:
+            pool_address = utils.to_checksum_address(pool_address)
+            if pool_address in self._curve_pool_layout_cache or len(results) != 4 + 2 * CURVE_POOL_MAX_COINS:
+                continue
+            
+            coins = []
+            for i in range(4, len(results), 2):
+                coin, balance = results[i], results[i + 1]
+                if coin is None or int(coin, 16) == 0 or balance is None:
+                    break
+                coins.append(coin)
+            if not coins:
+                continue
+            
+            # stableswap-ng pools have no token(): the pool is its own LP token
+            lp_token = results[3] if results[3] and int(results[3], 16) != 0 else pool_address
+            discovered[pool_address] = (coins, lp_token)
+        
+        if not discovered:
+            return
+        
+        decimals_map = self._get_token_decimals_batch([
+            token for coins, lp_token in discovered.values() for token in coins + [lp_token]
+        ])
+        
+        def token_decimals(token: str) -> int:
+            dec = decimals_map.get(utils.to_checksum_address(token))
+            return dec if dec is not None else 18
+        
+        for pool_address, (coins, lp_token) in discovered.items():
+            self._curve_pool_layout_cache[pool_address] = {
+                "n_coins": len(coins),
+                "coins": coins,
+                "decimals": [token_decimals(coin) for coin in coins],
+                "lp_token": lp_token,
+                "lp_decimals": token_decimals(lp_token),
+            }
+    
+    def _build_curve_pool_info(self, pool_address: str, results: List[Any]) -> Dict[str, Any]:
+        """
+        Assemble get_curve_pool_info()'s result from multicall results.
+        
+        Args:
+            pool_address: Pool address (its layout must be cached).
+            results: Results for the calls from _curve_pool_info_calls().
+        
+        Raises:
+            ContractCallError: If the pool's layout could not be determined.
+        """
+        pool_address = utils.to_checksum_address(pool_address)
+        layout = self._curve_pool_layout_cache.get(pool_address)
+        if layout is None:
+            raise ContractCallError(f"Failed to get pool info: no coins found for {pool_address}")
+        
+        virtual_price, A, fee = results[:3]
+        n_coins = layout["n_coins"]
+        if len(results) == 3 + n_coins:
+            balances = results[3:]
+        else:
+            # Discovery results interleave coins(i) and balances(i)
+            balances = results[5:5 + 2 * n_coins:2]
+        if any(balance is None for balance in balances):
+            raise ContractCallError(f"Failed to get pool info: balances() failed for {pool_address}")
+        
+        decimals = list(layout["decimals"])
+        balances_decimal = utils.wei_to_decimal_list(balances, decimals)
+        
+        result = {
+            "pool_address": pool_address,
+            "coins": list(layout["coins"]),
+            "balances": list(balances),
+            "balances_decimal": [float(b) for b in balances_decimal],
+            "decimals": decimals,
+            "lp_token": layout["lp_token"],
+            "virtual_price": virtual_price,
+            "A": A,
+            "fee": fee,
+        }
+        if virtual_price:
+            result["virtual_price_decimal"] = float(utils.wei_to_decimal(virtual_price, layout["lp_decimals"]))
+        return result
+    
     def get_curve_pool_balances(self, pool_address: str) -> List[Decimal]:
         """
         Get token balances for a Curve pool.
@@ -3681,6 +6483,9 @@ class ProtocolClient:
             print(f"Token 0: {balances[0]}, Token 1: {balances[1]}")
         """
         pool_info = self.get_curve_pool_info(pool_address)
+        if "balances" in pool_info and "decimals" in pool_info:
+            # Convert the raw balances exactly rather than via the float fields
+            return utils.wei_to_decimal_list(pool_info["balances"], pool_info["decimals"])
         return [Decimal(str(b)) for b in pool_info["balances_decimal"]]
     
     def get_curve_pool_virtual_price(self, pool_address: str) -> Decimal:
@@ -3795,6 +6600,9 @@ class ProtocolClient:
         """
         Find Curve pool address from LP token address.
         
+        Answered from `curve_registry_index` when possible; registry results
+        for other LP tokens are added to it.
+        
         Args:
             lp_token: LP token address
         
@@ -3809,13 +6617,22 @@ class ProtocolClient:
         if not self.w3.is_address(lp_token):
             raise ContractCallError(f"Invalid LP token address: {lp_token}")
         
+        self._ensure_curve_registry_index()
+        found, pool_address = self.curve_registry_index.pool_from_lp_token(lp_token)
+        if found:
+            return pool_address
+        
+        answered = False
         try:
             # Try Meta Registry first (more comprehensive)
             meta_registry = self._get_contract("curve_meta_registry", constants.CURVE_META_REGISTRY)
             pool_address = meta_registry.functions.get_pool_from_lp_token(lp_token).call()
+            answered = True
             
             if pool_address != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(pool_address)
+                pool_address = utils.to_checksum_address(pool_address)
+                self.curve_registry_index.record_lp_token(lp_token, pool_address)
+                return pool_address
         except Exception:
             pass
         
@@ -3823,18 +6640,32 @@ class ProtocolClient:
             # Fallback to main registry
             registry = self._get_contract("curve_registry", constants.CURVE_REGISTRY)
             pool_address = registry.functions.get_pool_from_lp_token(lp_token).call()
+            answered = True
             
             if pool_address != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(pool_address)
+                pool_address = utils.to_checksum_address(pool_address)
+                self.curve_registry_index.record_lp_token(lp_token, pool_address)
+                return pool_address
         except Exception:
             pass
         
+        if answered:
+            self.curve_registry_index.record_lp_token(lp_token, None)
         return None
     
     def find_curve_pool(self, token_a: str, token_b: str) -> Optional[str]:
         """
         Find a Curve pool for a token pair.
         
+        f(x) pools in `curve_registry_index` holding both tokens are returned
+        without a registry query; registry results for other pairs are added
+        to the index.
+        
+        Note: this prefers f(x) pools. Where several pools hold the pair, the
+        result can differ from the registries' `find_pool_for_coins(a, b, 0)`,
+        which picks the first pool in registry order; call the registry
+        directly when that ordering matters.
+        
         Args:
             token_a: First token address
             token_b: Second token address
@@ -3853,13 +6684,22 @@ class ProtocolClient:
         if not all(self.w3.is_address(addr) for addr in [token_a, token_b]):
             raise ContractCallError("Invalid token address provided")
         
+        self._ensure_curve_registry_index()
+        found, pool_address = self.curve_registry_index.pool_for_coins(token_a, token_b)
+        if found:
+            return pool_address
+        
+        answered = False
         try:
             # Try Meta Registry first
             meta_registry = self._get_contract("curve_meta_registry", constants.CURVE_META_REGISTRY)
             pool_address = meta_registry.functions.find_pool_for_coins(token_a, token_b).call()
+            answered = True
             
             if pool_address != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(pool_address)
+                pool_address = utils.to_checksum_address(pool_address)
+                self.curve_registry_index.record_pair(token_a, token_b, pool_address)
+                return pool_address
         except Exception:
             pass
         
@@ -3867,12 +6707,17 @@ class ProtocolClient:
             # Fallback to main registry
             registry = self._get_contract("curve_registry", constants.CURVE_REGISTRY)
             pool_address = registry.functions.find_pool_for_coins(token_a, token_b).call()
+            answered = True
             
             if pool_address != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(pool_address)
+                pool_address = utils.to_checksum_address(pool_address)
+                self.curve_registry_index.record_pair(token_a, token_b, pool_address)
+                return pool_address
         except Exception:
             pass
         
+        if answered:
+            self.curve_registry_index.record_pair(token_a, token_b, None)
         return None
     
     # --- Curve Gauge Read Methods ---
@@ -3881,6 +6726,9 @@ class ProtocolClient:
         """
         Get information about a Curve gauge.
         
+        Uses the batched loader behind get_curve_gauges_info_batch(), so the
+        LP token and reward token list are cached after the first call.
+        
         Args:
             gauge_address: Curve gauge contract address
         
@@ -3903,6 +6751,18 @@ class ProtocolClient:
         if not self.w3.is_address(gauge_address):
             raise ContractCallError(f"Invalid gauge address: {gauge_address}")
         
+        try:
+            infos = self._load_curve_gauge_infos([gauge_address])
+        except ContractCallError as e:
+            logger.debug(f"Batched gauge info query failed: {e}. Querying gauge calls individually.")
+            return self._get_curve_gauge_info_serial(gauge_address)
+        
+        if gauge_address not in infos:
+            raise ContractCallError(f"Failed to get gauge info: gauge calls failed for {gauge_address}")
+        return infos[gauge_address]
+    
+    def _get_curve_gauge_info_serial(self, gauge_address: str) -> Dict[str, Any]:
+        """get_curve_gauge_info() with one call per field, for nodes without Multicall3."""
         gauge = self._get_contract("curve_gauge", gauge_address)
         
         try:
@@ -3957,6 +6817,182 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get gauge info: {str(e)}")
     
+    def get_curve_gauges_info_batch(self, gauge_addresses: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get information about many Curve gauges at once.
+        
+        Reads every gauge's total supply, reward count and kill status in one
+        multicall. The LP token and reward token list rarely change, so they
+        are cached; reward data for cached lists is read in the same multicall
+        and only gauges whose reward count changed (or that were never loaded)
+        need a second round for their token list and a third for its reward
+        data.
+        
+        Args:
+            gauge_addresses: Gauge addresses (defaults to all gauges in `constants.GAUGES`)
+        
+        Returns:
+            Dictionary mapping gauge addresses to the same dicts as
+            get_curve_gauge_info(). Gauges whose calls fail are omitted.
+        
+        Example:
+            gauges = client.get_curve_gauges_info_batch()
+            for gauge, info in gauges.items():
+                print(f"{gauge}: {info['reward_count']} rewards, killed={info['is_killed']}")
+        """
+        if gauge_addresses is None:
+            gauge_addresses = list(constants.GAUGES.values())
+        
+        gauges = list(dict.fromkeys(utils.to_checksum_address(g) for g in gauge_addresses))
+        for gauge_address in gauges:
+            if not self.w3.is_address(gauge_address):
+                raise ContractCallError(f"Invalid gauge address: {gauge_address}")
+        
+        try:
+            return self._load_curve_gauge_infos(gauges)
+        except ContractCallError as e:
+            logger.debug(f"Batched gauge info query failed: {e}. Querying gauges individually.")
+        
+        infos = {}
+        for gauge_address in gauges:
+            try:
+                infos[gauge_address] = self._get_curve_gauge_info_serial(gauge_address)
+            except Exception as e:
+                logger.warning(f"Failed to get info for gauge {gauge_address}: {e}")
+        return infos
+    
+    def _load_curve_gauge_infos(self, gauges: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Multicall implementation of get_curve_gauges_info_batch().
+        
+        Args:
+            gauges: Checksum gauge addresses.
+        
+        Raises:
+            ContractCallError: If a multicall fails.
+        """
+        # Round 1: dynamic fields, plus reward data for cached token lists, or the
+        # LP token and every reward_tokens slot (a fixed-size array) for uncached gauges
+        calls = []
+        layouts = []
+        for gauge_address in gauges:
+            gauge = self._get_contract("curve_gauge", gauge_address)
+            meta = self._curve_gauge_meta_cache.get(gauge_address)
+            gauge_calls = [
+                gauge.functions.totalSupply(),
+                gauge.functions.reward_count(),
+                gauge.functions.is_killed(),
+            ]
+            if meta is None:
+                gauge_calls.append(gauge.functions.lp_token())
+                gauge_calls.extend(gauge.functions.reward_tokens(i) for i in range(CURVE_GAUGE_MAX_REWARDS))
+            else:
+                gauge_calls.extend(gauge.functions.reward_data(token) for token in meta["reward_tokens"])
+            layouts.append((gauge_address, meta, len(gauge_calls)))
+            calls.extend(gauge_calls)
+        
+        results = iter(self._multicall(calls))
+        
+        state = {}
+        for gauge_address, meta, n_calls in layouts:
+            gauge_results = [next(results) for _ in range(n_calls)]
+            total_supply, reward_count, is_killed = gauge_results[:3]
+            if total_supply is None or reward_count is None or is_killed is None:
+                logger.warning(f"Failed to get info for gauge {gauge_address}: gauge calls failed")
+                continue
+            
+            if meta is None:
+                lp_token = gauge_results[3]
+                if lp_token is None:
+                    logger.warning(f"Failed to get info for gauge {gauge_address}: lp_token() failed")
+                    continue
+                lp_token = utils.to_checksum_address(lp_token)
+                reward_tokens, reward_data = None, None
+                if reward_count <= CURVE_GAUGE_MAX_REWARDS:
+                    reward_tokens = self._curve_reward_token_list(gauge_address, lp_token, gauge_results[4:4 + reward_count], reward_count)
+            else:
+                lp_token = meta["lp_token"]
+                reward_tokens, reward_data = meta["reward_tokens"], gauge_results[3:]
+                if len(reward_tokens) != reward_count:
+                    # Rewards were added since the list was cached
+                    reward_tokens, reward_data = None, None
+            state[gauge_address] = [lp_token, total_supply, reward_count, is_killed, reward_tokens, reward_data]
+        
+        # Token lists of cached gauges whose reward count changed since (rare)
+        stale = [gauge_address for gauge_address, entry in state.items() if entry[4] is None]
+        if stale:
+            calls = []
+            for gauge_address in stale:
+                gauge = self._get_contract("curve_gauge", gauge_address)
+                calls.extend(gauge.functions.reward_tokens(i) for i in range(state[gauge_address][2]))
+            results = iter(self._multicall(calls))
+            for gauge_address in stale:
+                entry = state[gauge_address]
+                tokens = [next(results) for _ in range(entry[2])]
+                entry[4] = self._curve_reward_token_list(gauge_address, entry[0], tokens, entry[2])
+        
+        # Round 2: reward data for the newly listed tokens
+        unread = [gauge_address for gauge_address, entry in state.items() if entry[5] is None]
+        if unread:
+            calls = []
+            for gauge_address in unread:
+                gauge = self._get_contract("curve_gauge", gauge_address)
+                calls.extend(gauge.functions.reward_data(token) for token in state[gauge_address][4])
+            results = iter(self._multicall(calls))
+            for gauge_address in unread:
+                state[gauge_address][5] = [next(results) for _ in state[gauge_address][4]]
+        
+        decimals_map = self._get_token_decimals_batch([entry[0] for entry in state.values()])
+        
+        infos = {}
+        for gauge_address, (lp_token, total_supply, reward_count, is_killed, reward_tokens, reward_data) in state.items():
+            lp_decimals = decimals_map.get(utils.to_checksum_address(lp_token))
+            if lp_decimals is None:
+                logger.warning(f"Failed to get info for gauge {gauge_address}: LP token decimals() failed")
+                continue
+            
+            infos[gauge_address] = {
+                "gauge_address": gauge_address,
+                "lp_token": lp_token,
+                "total_supply": total_supply,
+                "total_supply_decimal": float(utils.wei_to_decimal(total_supply, lp_decimals)),
+                "reward_count": reward_count,
+                "reward_tokens": list(reward_tokens),
+                "is_killed": is_killed,
+                "reward_data": [
+                    {
+                        "token": token,
+                        "distributor": data[1],
+                        "period_finish": data[2],
+                        "rate": data[3],
+                        "last_update": data[4],
+                        "integral": data[5],
+                    }
+                    for token, data in zip(reward_tokens, reward_data)
+                    if data is not None
+                ],
+            }
+        return infos
+    
+    def _curve_reward_token_list(self, gauge_address: str, lp_token: str, tokens: List[Any], reward_count: int) -> List[str]:
+        """
+        Reward tokens from reward_tokens(i) results, up to the first failed slot.
+        
+        Complete lists are cached with the gauge's LP token.
+        """
+        reward_tokens = []
+        for token in tokens:
+            if token is None:
+                break
+            # Cached tokens are passed back to reward_data(), which needs checksummed addresses
+            reward_tokens.append(utils.to_checksum_address(token))
+        if len(reward_tokens) == reward_count:
+            self._curve_gauge_meta_cache[gauge_address] = {
+                "lp_token": lp_token,
+                "reward_tokens": list(reward_tokens),
+            }
+        return reward_tokens
+    
     def get_curve_gauge_balance(self, gauge_address: str, user_address: Optional[str] = None) -> Decimal:
         """
         Get staked LP token balance in a Curve gauge.
@@ -4064,10 +7100,223 @@ class ProtocolClient:
         except Exception as e:
             raise ContractCallError(f"Failed to get gauge rewards: {str(e)}")
     
+    def get_gauge_reward_projectors(
+        self,
+        gauge_addresses: List[str],
+        user_address: Optional[str] = None
+    ) -> Dict[str, GaugeRewardProjector]:
+        """
+        Snapshot reward accrual of an account in many Curve gauges at once.
+        
+        Each gauge's total supply, the account's balance and, per reward
+        token, `reward_data`, `reward_integral_for` and `claimable_reward` are
+        read in one multicall, in one block. The returned projectors compute
+        claimable amounts for any later timestamp without further calls; use
+        `sync_gauge_reward_projectors()` to re-read only the ones that went
+        stale. Reward token lists come from the gauge metadata cache of
+        `get_curve_gauges_info_batch()`.
+        
+        Args:
+            gauge_addresses: Curve gauge addresses.
+            user_address: Account address (defaults to connected wallet).
+            
+        Returns:
+            Dictionary mapping gauge addresses to projectors. Gauges whose
+            calls fail are omitted.
+        
+        Example:
+            projectors = client.get_gauge_reward_projectors(gauges, user_address="0x...")
+            for gauge, projector in projectors.items():
+                print(gauge, projector.claimable_at(int(time.time())))
+        """
+        target_address = user_address or self.address
+        if not target_address:
+            raise FXProtocolError("No account address provided or available in client.")
+        user_address = utils.to_checksum_address(target_address)
+        gauges = list(dict.fromkeys(utils.to_checksum_address(g) for g in gauge_addresses))
+        
+        missing = [g for g in gauges if g not in self._curve_gauge_meta_cache]
+        infos = self.get_curve_gauges_info_batch(missing) if missing else {}
+        reward_tokens = {}
+        for gauge_address in gauges:
+            meta = infos.get(gauge_address) or self._curve_gauge_meta_cache.get(gauge_address)
+            if meta is None:
+                logger.warning(f"Failed to get reward tokens for gauge {gauge_address}")
+                continue
+            # Tokens are passed back as call arguments, which must be checksummed
+            reward_tokens[gauge_address] = [utils.to_checksum_address(token) for token in meta["reward_tokens"]]
+        
+        calls = [self.multicall.functions.getBlockNumber(), self.multicall.functions.getCurrentBlockTimestamp()]
+        for gauge_address, tokens in reward_tokens.items():
+            gauge = self._get_contract("curve_gauge", gauge_address).functions
+            calls.extend([gauge.totalSupply(), gauge.balanceOf(user_address), gauge.reward_count()])
+            for token in tokens:
+                calls.extend([
+                    gauge.reward_data(token),
+                    gauge.reward_integral_for(token, user_address),
+                    gauge.claimable_reward(user_address, token),
+                ])
+        
+        try:
+            results = self._multicall(calls)
+        except ContractCallError as e:
+            logger.debug(f"Batched reward snapshot failed: {e}. Reading gauges individually.")
+            block_number = self.w3.eth.block_number
+            results = self._call_each(calls, block_number)
+            results[0] = block_number
+        
+        block_number, timestamp = results[0], results[1]
+        if timestamp is None:
+            timestamp = self.w3.eth.get_block(block_number)["timestamp"]
+        decimals = self._get_token_decimals_batch([t for tokens in reward_tokens.values() for t in tokens])
+        
+        projectors = {}
+        changed = []
+        results = iter(results[2:])
+        for gauge_address, tokens in reward_tokens.items():
+            total_supply, balance, reward_count = next(results), next(results), next(results)
+            token_results = {token: (next(results), next(results), next(results)) for token in tokens}
+            if reward_count is not None and reward_count != len(tokens):
+                if gauge_address in infos:
+                    logger.warning(f"Failed to snapshot rewards for gauge {gauge_address}: incomplete reward token list")
+                else:
+                    # Rewards were added since the token list was cached
+                    self._curve_gauge_meta_cache.pop(gauge_address, None)
+                    changed.append(gauge_address)
+                continue
+            if total_supply is None or balance is None or any(None in values for values in token_results.values()):
+                logger.warning(f"Failed to snapshot rewards for gauge {gauge_address}: gauge calls failed")
+                continue
+            projectors[gauge_address] = GaugeRewardProjector.from_snapshot(
+                gauge=gauge_address,
+                account=user_address,
+                balance=balance,
+                total_supply=total_supply,
+                timestamp=timestamp,
+                block_number=block_number,
+                reward_data={token: values[0] for token, values in token_results.items()},
+                integrals_for={token: values[1] for token, values in token_results.items()},
+                claimable={token: values[2] for token, values in token_results.items()},
+                decimals={token: decimals.get(token) or 18 for token in tokens},
+            )
+        
+        if changed:
+            projectors.update(self.get_gauge_reward_projectors(changed, user_address))
+        return projectors
+    
+    def get_gauge_reward_projector(self, gauge_address: str, user_address: Optional[str] = None) -> GaugeRewardProjector:
+        """
+        Snapshot reward accrual of an account in one Curve gauge.
+        
+        Args:
+            gauge_address: Curve gauge contract address
+            user_address: User address (defaults to connected wallet)
+        
+        Returns:
+            GaugeRewardProjector for the gauge.
+        
+        Example:
+            projector = client.get_gauge_reward_projector(gauge, user_address="0x...")
+            print(projector.claimable_at(projector.timestamp + 86400))
+        """
+        gauge_address = utils.to_checksum_address(gauge_address)
+        projectors = self.get_gauge_reward_projectors([gauge_address], user_address)
+        if gauge_address not in projectors:
+            raise ContractCallError(f"Failed to snapshot rewards for gauge {gauge_address}")
+        return projectors[gauge_address]
+    
+    def sync_gauge_reward_projectors(
+        self,
+        projectors: Dict[Any, GaugeRewardProjector],
+        to_block: Optional[int] = None
+    ) -> Dict[Any, GaugeRewardProjector]:
+        """
+        Re-snapshot only the reward projectors whose inputs changed.
+        
+        Gauge events (deposits, withdrawals, transfers, checkpoints) and
+        reward token transfers into the gauges since each snapshot are read
+        with two log queries per `self.log_block_range` blocks, for all
+        gauges together. Projectors touched by an event, or past a reward
+        period end, are re-read in one batch per account; the others are
+        kept as they are.
+        
+        Args:
+            projectors: Projectors to check, under any keys.
+            to_block: Block to check up to (defaults to the current block).
+            
+        Returns:
+            Dictionary with the same keys and up-to-date projectors.
+        
+        Raises:
+            ContractCallError: If a log query fails.
+        
+        Example:
+            projectors = client.get_gauge_reward_projectors(gauges)
+            while True:
+                time.sleep(60)
+                projectors = client.sync_gauge_reward_projectors(projectors)
+                totals = {g: p.claimable_at(int(time.time())) for g, p in projectors.items()}
+        """
+        if not projectors:
+            return {}
+        head = self.w3.eth.get_block(to_block if to_block is not None else "latest")
+        to_block, now = head["number"], head["timestamp"]
+        
+        by_gauge: Dict[str, List[GaugeRewardProjector]] = {}
+        for projector in projectors.values():
+            by_gauge.setdefault(projector.gauge.lower(), []).append(projector)
+        gauges = [utils.to_checksum_address(g) for g in by_gauge]
+        tokens = list(dict.fromkeys(
+            utils.to_checksum_address(token) for p in projectors.values() for token in p.rewards
+        ))
+        gauge_topics = ["0x" + "00" * 12 + g[2:].lower() for g in by_gauge]
+        
+        from_block = min(p.block_number for p in projectors.values()) + 1
+        step = max(1, self.log_block_range)
+        for range_start in range(from_block, to_block + 1, step):
+            block_range = {"fromBlock": range_start, "toBlock": min(range_start + step - 1, to_block)}
+            try:
+                logs = list(self.w3.eth.get_logs({"address": gauges, **block_range}))
+                if tokens:
+                    # Reward top-ups (deposit_reward_token) transfer tokens to the gauge
+                    logs.extend(self.w3.eth.get_logs({
+                        "address": tokens,
+                        "topics": [TRANSFER_EVENT_TOPIC, None, gauge_topics],
+                        **block_range,
+                    }))
+            except Exception as e:
+                raise ContractCallError(f"Failed to get gauge events: {str(e)}")
+            
+            for log in logs:
+                gauge = log["address"].lower()
+                if gauge not in by_gauge:
+                    gauge = "0x" + bytes(log["topics"][2])[-20:].hex()
+                for projector in by_gauge.get(gauge, []):
+                    if log["blockNumber"] > projector.block_number:
+                        projector.invalidate()
+        
+        stale: Dict[str, List[str]] = {}
+        for projector in projectors.values():
+            if projector.is_stale(now):
+                stale.setdefault(projector.account, []).append(projector.gauge)
+        
+        refreshed = {}
+        for account, stale_gauges in stale.items():
+            for gauge_address, projector in self.get_gauge_reward_projectors(stale_gauges, account).items():
+                refreshed[(account.lower(), gauge_address.lower())] = projector
+        
+        return {
+            key: refreshed.get((projector.account.lower(), projector.gauge.lower()), projector)
+            for key, projector in projectors.items()
+        }
+    
     def get_curve_gauge_from_pool(self, pool_address: str) -> Optional[str]:
         """
         Find Curve gauge address from pool address.
         
+        Answered from `curve_registry_index` when possible; registry results
+        for other pools are added to it.
+        
         Args:
             pool_address: Curve pool contract address
         
@@ -4082,13 +7331,22 @@ class ProtocolClient:
         if not self.w3.is_address(pool_address):
             raise ContractCallError(f"Invalid pool address: {pool_address}")
         
+        self._ensure_curve_registry_index()
+        found, gauge_address = self.curve_registry_index.gauge_from_pool(pool_address)
+        if found:
+            return gauge_address
+        
+        answered = False
         try:
             # Try Meta Registry first
             meta_registry = self._get_contract("curve_meta_registry", constants.CURVE_META_REGISTRY)
             gauge_address = meta_registry.functions.get_gauge(pool_address).call()
+            answered = True
             
             if gauge_address != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(gauge_address)
+                gauge_address = utils.to_checksum_address(gauge_address)
+                self.curve_registry_index.record_gauge(pool_address, gauge_address)
+                return gauge_address
         except Exception:
             pass
         
@@ -4096,15 +7354,126 @@ class ProtocolClient:
             # Fallback to main registry
             registry = self._get_contract("curve_registry", constants.CURVE_REGISTRY)
             gauges = registry.functions.get_gauges(pool_address).call()
+            answered = True
             
             # get_gauges returns (gauges, types)
             if gauges and len(gauges) > 0 and gauges[0] != "0x0000000000000000000000000000000000000000":
-                return utils.to_checksum_address(gauges[0])
+                gauge_address = utils.to_checksum_address(gauges[0])
+                self.curve_registry_index.record_gauge(pool_address, gauge_address)
+                return gauge_address
         except Exception:
             pass
         
+        if answered:
+            self.curve_registry_index.record_gauge(pool_address, None)
         return None
     
+    def refresh_curve_registry_index(self) -> int:
+        """
+        Index the registry mappings of every f(x) Curve pool.
+        
+        Only LP tokens that are not indexed yet (or had no registered pool)
+        are looked up, in one multicall, followed by one multicall for the
+        gauge and coins of each newly found pool. Lookup methods load the
+        index on first use, so calling this is only needed to pick up pools
+        added since.
+        
+        Returns:
+            Number of pools added to the index
+        
+        Example:
+            added = client.refresh_curve_registry_index()
+            print(f"Indexed {added} new pools")
+        """
+        lp_tokens = list(dict.fromkeys(
+            utils.to_checksum_address(pool_data["lp_token"])
+            for pool_data in self.get_curve_pools_from_registry().values()
+            if pool_data.get("lp_token")
+        ))
+        pending = self.curve_registry_index.unresolved_lp_tokens(lp_tokens)
+        if not pending:
+            return 0
+        
+        calls = self._curve_lp_lookup_calls(pending)
+        pools = self._record_curve_lp_lookups(pending, self._multicall(calls))
+        if not pools:
+            return 0
+        
+        meta_registry = self._get_contract("curve_meta_registry", constants.CURVE_META_REGISTRY)
+        registry = self._get_contract("curve_registry", constants.CURVE_REGISTRY)
+        calls = []
+        for pool_address in pools:
+            calls.extend([
+                meta_registry.functions.get_gauge(pool_address),
+                registry.functions.get_gauges(pool_address),
+                meta_registry.functions.get_coins(pool_address),
+                registry.functions.get_coins(pool_address),
+            ])
+        results = self._multicall(calls)
+        
+        def non_zero(addresses):
+            return [utils.to_checksum_address(a) for a in addresses or [] if a and int(a, 16) != 0]
+        
+        for i, pool_address in enumerate(pools):
+            meta_gauge, registry_gauges, meta_coins, registry_coins = results[i * 4:i * 4 + 4]
+            gauges = non_zero([meta_gauge] + list((registry_gauges or [[]])[0]))
+            if meta_gauge is not None or registry_gauges is not None:
+                self.curve_registry_index.record_gauge(pool_address, gauges[0] if gauges else None)
+            coins = non_zero(meta_coins) or non_zero(registry_coins)
+            if coins:
+                self.curve_registry_index.record_coins(pool_address, coins)
+        
+        return len(pools)
+    
+    def _ensure_curve_registry_index(self):
+        """Load the registry index on first use; a failed load is retried after a backoff."""
+        if self._curve_registry_index_loaded:
+            return
+        failed_at = self._curve_registry_index_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < self.curve_registry_index_retry_delay:
+            return
+        try:
+            self.refresh_curve_registry_index()
+        except ContractCallError as e:
+            logger.debug(f"Could not build Curve registry index: {e}. Using live registry lookups.")
+            self._curve_registry_index_failed_at = time.monotonic()
+            return
+        self._curve_registry_index_loaded = True
+        self._curve_registry_index_failed_at = None
+    
+    def _curve_lp_lookup_calls(self, lp_tokens: List[str]) -> List[Any]:
+        """Meta Registry and main registry get_pool_from_lp_token() calls for each LP token."""
+        meta_registry = self._get_contract("curve_meta_registry", constants.CURVE_META_REGISTRY)
+        registry = self._get_contract("curve_registry", constants.CURVE_REGISTRY)
+        calls = []
+        for lp_token in lp_tokens:
+            calls.append(meta_registry.functions.get_pool_from_lp_token(lp_token))
+            calls.append(registry.functions.get_pool_from_lp_token(lp_token))
+        return calls
+    
+    def _record_curve_lp_lookups(self, lp_tokens: List[str], results: List[Any]) -> List[str]:
+        """
+        Record results of _curve_lp_lookup_calls() in the registry index.
+        
+        Returns:
+            Pools found, in LP token order.
+        """
+        pools = []
+        for i, lp_token in enumerate(lp_tokens):
+            candidates = results[i * 2:i * 2 + 2]
+            pool_address = None
+            for candidate in candidates:
+                if candidate and int(candidate, 16) != 0:
+                    pool_address = utils.to_checksum_address(candidate)
+                    break
+            if pool_address is None and all(candidate is None for candidate in candidates):
+                # Neither registry answered; leave it for a later lookup
+                continue
+            self.curve_registry_index.record_lp_token(lp_token, pool_address)
+            if pool_address is not None:
+                pools.append(pool_address)
+        return list(dict.fromkeys(pools))
+    
     # --- Curve Write Methods ---
     
     def curve_swap(
@@ -4184,20 +7553,19 @@ class ProtocolClient:
                 out_decimals = token_out_contract.functions.decimals().call()
                 min_amount_out_wei = utils.decimal_to_wei(Decimal(str(min_amount_out)), out_decimals)
             
-            # Check and approve token if needed
-            allowance = token_in_contract.functions.allowance(self.address, pool_address).call()
+            # Check and approve token if needed (by permit where supported)
+            next_nonce = None
+            allowance = self._get_raw_allowance(token_in, pool_address, amount_in_wei)
             if allowance < amount_in_wei:
-                approve_tx = self._build_and_send_transaction(
-                    token_in_contract.functions.approve(pool_address, amount_in_wei)
-                )
-                logger.info(f"Approval transaction: {approve_tx}")
-                # Wait for approval confirmation
-                self.w3.eth.wait_for_transaction_receipt(approve_tx)
+                next_nonce = self._grant_allowances([(token_in, pool_address, amount_in_wei)])
             
             # Execute swap
             swap_func = pool.functions.exchange(coin_i, coin_j, amount_in_wei, min_amount_out_wei)
             
-            return self._build_and_send_transaction(swap_func)
+            return self._send_spending_allowances(
+                swap_func, [(token_in, pool_address, amount_in_wei)],
+                nonce=next_nonce, default_gas=300000 if next_nonce is not None else None
+            )
             
         except Exception as e:
             raise ContractCallError(f"Failed to execute swap: {str(e)}")
@@ -4273,22 +7641,20 @@ class ProtocolClient:
                 lp_decimals = lp_token_contract.functions.decimals().call()
                 min_lp_tokens_wei = utils.decimal_to_wei(Decimal(str(min_lp_tokens)), lp_decimals)
             
-            # Check and approve tokens if needed
-            for i, coin in enumerate(coins):
-                coin_contract = self._get_contract("erc20", coin)
-                allowance = coin_contract.functions.allowance(self.address, pool_address).call()
-                if allowance < amounts_wei[i]:
-                    approve_tx = self._build_and_send_transaction(
-                        coin_contract.functions.approve(pool_address, amounts_wei[i])
-                    )
-                    logger.info(f"Approval transaction for {coin}: {approve_tx}")
-                    # Wait for approval confirmation
-                    self.w3.eth.wait_for_transaction_receipt(approve_tx)
+            # Check and approve tokens if needed (by permit where supported)
+            spends = [(coin, pool_address, amounts_wei[i]) for i, coin in enumerate(coins) if amounts_wei[i] > 0]
+            shortfalls = [
+                spend for spend in spends
+                if self._get_raw_allowance(spend[0], pool_address, spend[2]) < spend[2]
+            ]
+            next_nonce = self._grant_allowances(shortfalls) if shortfalls else None
             
             # Add liquidity
             add_liq_func = pool.functions.add_liquidity(amounts_wei, min_lp_tokens_wei)
             
-            return self._build_and_send_transaction(add_liq_func)
+            return self._send_spending_allowances(
+                add_liq_func, spends, nonce=next_nonce, default_gas=400000 if next_nonce is not None else None
+            )
             
         except Exception as e:
             raise ContractCallError(f"Failed to add liquidity: {str(e)}")
@@ -4368,7 +7734,7 @@ class ProtocolClient:
                 )
                 logger.info(f"Approval transaction: {approve_tx}")
                 # Wait for approval confirmation
-                self.w3.eth.wait_for_transaction_receipt(approve_tx)
+                self._wait_for_transaction_receipt(approve_tx)
             
             # Remove liquidity
             remove_liq_func = pool.functions.remove_liquidity(lp_token_amount_wei, min_amounts_wei)
@@ -4429,7 +7795,7 @@ class ProtocolClient:
                 )
                 logger.info(f"Approval transaction: {approve_tx}")
                 # Wait for approval confirmation
-                self.w3.eth.wait_for_transaction_receipt(approve_tx)
+                self._wait_for_transaction_receipt(approve_tx)
             
             # Stake LP tokens
             if claim_rewards:
@@ -4700,6 +8066,11 @@ class ProtocolClient:
         # Get all Curve pools from registry
         curve_pools = self.get_curve_pools_from_registry()
         
+        try:
+            return self._get_user_curve_positions_multicall(user_address, curve_pools, include_pool_info)
+        except ContractCallError as e:
+            logger.debug(f"Batched Curve positions query failed: {e}. Querying pools individually.")
+        
         positions = []
         total_staked = Decimal("0")
         total_rewards = {}
@@ -4763,5 +8134,162 @@ class ProtocolClient:
             "positions": positions,
         }
     
+    def _get_user_curve_positions_multicall(
+        self,
+        user_address: str,
+        curve_pools: Dict[str, Dict[str, Any]],
+        include_pool_info: bool
+    ) -> Dict[str, Any]:
+        """
+        Multicall implementation of get_user_curve_positions_summary().
+        
+        Phase 1 reads every gauge's balance, LP token and reward token list (plus
+        LP token -> pool lookups missing from the registry index) in one
+        multicall. Phase 2 reads claimable rewards and pool info for the
+        non-zero positions only in a second multicall. Token decimals and pool
+        lookups are cached, so only a cold client needs extra round-trips for
+        them.
+        """
+        pools = [
+            (pool_key, pool_data, utils.to_checksum_address(pool_data["fx_gauge"]))
+            for pool_key, pool_data in curve_pools.items()
+            if pool_data.get("fx_gauge")
+        ]
+        
+        # Phase 1: balances, LP tokens and reward tokens for every gauge
+        calls = []
+        for _, _, gauge_address in pools:
+            gauge = self._get_contract("curve_gauge", gauge_address)
+            calls.append(gauge.functions.balanceOf(user_address))
+            calls.append(gauge.functions.lp_token())
+            calls.extend(gauge.functions.reward_tokens(i) for i in range(CURVE_GAUGE_MAX_REWARDS))
+        
+        lookup_lp_tokens = []
+        if include_pool_info:
+            lookup_lp_tokens = [
+                lp_token
+                for lp_token in dict.fromkeys(
+                    utils.to_checksum_address(pool_data["lp_token"])
+                    for _, pool_data, _ in pools
+                    if pool_data.get("lp_token")
+                )
+                if not self.curve_registry_index.pool_from_lp_token(lp_token)[0]
+            ]
+            calls.extend(self._curve_lp_lookup_calls(lookup_lp_tokens))
+        
+        results = self._multicall(calls)
+        
+        per_gauge = 2 + CURVE_GAUGE_MAX_REWARDS
+        gauge_state = []
+        for index, (pool_key, pool_data, gauge_address) in enumerate(pools):
+            chunk = results[index * per_gauge:(index + 1) * per_gauge]
+            raw_balance, lp_token = chunk[0], chunk[1]
+            reward_tokens = []
+            for token in chunk[2:]:
+                if token is None or int(token, 16) == 0:
+                    break
+                reward_tokens.append(token)
+            gauge_state.append((pool_key, pool_data, gauge_address, raw_balance, lp_token, reward_tokens))
+        
+        self._record_curve_lp_lookups(lookup_lp_tokens, results[len(pools) * per_gauge:])
+        
+        for pool_key, _, _, raw_balance, _, _ in gauge_state:
+            if raw_balance is None:
+                logger.warning(f"Failed to get position for pool {pool_key}: balanceOf failed")
+        
+        active = [state for state in gauge_state if state[3] and state[4] is not None]
+        decimals_map = self._get_token_decimals_batch(
+            [state[4] for state in active] + [token for state in active for token in state[5]]
+        )
+        
+        # Phase 2: rewards and pool info for non-zero positions only
+        calls = []
+        for _, _, gauge_address, _, _, reward_tokens in active:
+            gauge = self._get_contract("curve_gauge", gauge_address)
+            calls.extend(gauge.functions.claimable_reward(user_address, token) for token in reward_tokens)
+        
+        pool_calls = []
+        if include_pool_info:
+            for _, pool_data, _, _, _, _ in active:
+                lp_token = pool_data.get("lp_token")
+                pool_address = self.curve_registry_index.pool_from_lp_token(lp_token)[1] if lp_token else None
+                info_calls = self._curve_pool_info_calls(pool_address) if pool_address else []
+                pool_calls.append((pool_address, len(info_calls)))
+                calls.extend(info_calls)
+        
+        results = self._multicall(calls)
+        
+        # Claimable rewards come first, then each pool's info calls
+        claimable_results = iter(results)
+        rewards_by_gauge = []
+        for _, _, _, _, _, reward_tokens in active:
+            rewards = {}
+            for token in reward_tokens:
+                claimable = next(claimable_results)
+                token_decimals = decimals_map.get(utils.to_checksum_address(token))
+                if claimable is None or token_decimals is None:
+                    rewards[token] = FixedPoint.zero()
+                else:
+                    rewards[token] = FixedPoint(claimable, token_decimals)
+            rewards_by_gauge.append(rewards)
+        
+        pool_infos = [None] * len(active)
+        if include_pool_info:
+            raw_pool_results = [
+                [next(claimable_results) for _ in range(n_calls)]
+                for _, n_calls in pool_calls
+            ]
+            
+            self._learn_curve_pool_layouts([
+                (pool_address, raw)
+                for (pool_address, _), raw in zip(pool_calls, raw_pool_results) if raw
+            ])
+            for i, ((pool_address, _), raw) in enumerate(zip(pool_calls, raw_pool_results)):
+                if not raw:
+                    continue
+                try:
+                    pool_infos[i] = self._build_curve_pool_info(pool_address, raw)
+                except ContractCallError as e:
+                    logger.debug(f"Error getting pool info for {pool_address}: {e}")
+        
+        # Amounts stay integer-backed until they are converted for the result
+        positions = []
+        total_staked = FixedPoint.zero()
+        total_rewards: Dict[str, FixedPoint] = {}
+        
+        for (pool_key, pool_data, gauge_address, raw_balance, lp_token, _), rewards, pool_info in zip(
+            active, rewards_by_gauge, pool_infos
+        ):
+            lp_decimals = decimals_map.get(utils.to_checksum_address(lp_token))
+            staked = FixedPoint(raw_balance, lp_decimals if lp_decimals is not None else 18)
+            
+            position = {
+                "pool_id": pool_data.get("pool_id"),
+                "pool_name": pool_data.get("name", "Unknown"),
+                "pool_key": pool_key,
+                "gauge_address": gauge_address,
+                "lp_token": pool_data.get("lp_token"),
+                "staked": float(staked),
+                "rewards": {token: float(amount) for token, amount in rewards.items()},
+            }
+            
+            if pool_info:
+                position["pool_info"] = pool_info
+            
+            positions.append(position)
+            total_staked += staked
+            
+            # Aggregate rewards
+            for token, amount in rewards.items():
+                total_rewards[token] = total_rewards.get(token, FixedPoint.zero(amount.decimals)) + amount
+        
+        return {
+            "user_address": user_address,
+            "total_gauges": len(positions),
+            "total_staked": float(total_staked),
+            "total_rewards": {token: float(amount) for token, amount in total_rewards.items()},
+            "positions": positions,
+        }
+    
 
 
@@ -140,6 +140,14 @@ CVXFXN_TOKEN = "0x183395DbD0B5e93323a7286D1973150697FFFCB3"
 CVXFXN_DEPOSIT = "0x56B3c8eF8A095f8637B6A84942aA898326B82b91"  # Deposit contract for converting FXN to cvxFXN
 CVXFXN_STAKE = "0xEC60Cd4a5866fb3B0DD317A46d3B474a24e06beF"  # Stake contract for staking cvxFXN
 
+# Multicall3 (same address on all major EVM chains)
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Safe MultiSend v1.3.0 (same address on all major EVM chains). The call-only
+# variant rejects delegatecalls, so bundled transactions cannot change the Safe itself
+SAFE_MULTISEND = "0xA238CBeb142c10Ef7Ad8442C6D1f9E89e07e7761"
+SAFE_MULTISEND_CALL_ONLY = "0x40A2aCCbd92BCA938b02010E17A5b8929b49130D"
+
 # Convex Pools (f(x) Protocol related)
 # Note: Pools are differentiated by both the staked token AND what they redeem to
 # Format: {staked_token}_{redeems_to} for unique identification
@@ -633,5 +641,7 @@ CONTRACTS = {
     "cvxFXN": CVXFXN_TOKEN,
     "cvxFXN_Deposit": CVXFXN_DEPOSIT,
     "cvxFXN_Stake": CVXFXN_STAKE,
+    # Infrastructure
+    "Multicall3": MULTICALL3,
 }
 
@@ -0,0 +1,147 @@
+"""
+Local index of Curve registry mappings for the f(x) Protocol SDK.
+
+Maps LP tokens to pools and pools to their LP token, gauge and coins, so
+registry lookups that almost never change can be answered from memory.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _key(address: str) -> str:
+    """Case-insensitive dictionary key for an address."""
+    return address.lower()
+
+
+def _pair_key(token_a: str, token_b: str) -> Tuple[str, str]:
+    """Order-independent key for a token pair."""
+    return tuple(sorted((_key(token_a), _key(token_b))))
+
+
+class CurveRegistryIndex:
+    """
+    Cached pool <-> LP token <-> gauge <-> coins mappings.
+
+    Lookups return `(found, value)` so that a registry miss (stored as None)
+    can be told apart from an address that was never looked up. Addresses are
+    returned as they were recorded (checksummed by ProtocolClient).
+
+    The index can be persisted between sessions with `to_dict()` and
+    `from_dict()`.
+
+    Example:
+        with open("curve_index.json", "w") as f:
+            json.dump(client.curve_registry_index.to_dict(), f)
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._pools: Dict[str, str] = {}
+        self._lp_to_pool: Dict[str, Optional[str]] = {}
+        self._pool_to_lp: Dict[str, str] = {}
+        self._pool_to_gauge: Dict[str, Optional[str]] = {}
+        self._pool_to_coins: Dict[str, List[str]] = {}
+        self._pair_to_pool: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lp_to_pool)
+
+    def pool_from_lp_token(self, lp_token: str) -> Tuple[bool, Optional[str]]:
+        """Pool for an LP token."""
+        key = _key(lp_token)
+        return key in self._lp_to_pool, self._lp_to_pool.get(key)
+
+    def lp_token_from_pool(self, pool_address: str) -> Tuple[bool, Optional[str]]:
+        """LP token of a pool."""
+        key = _key(pool_address)
+        return key in self._pool_to_lp, self._pool_to_lp.get(key)
+
+    def gauge_from_pool(self, pool_address: str) -> Tuple[bool, Optional[str]]:
+        """Gauge of a pool."""
+        key = _key(pool_address)
+        return key in self._pool_to_gauge, self._pool_to_gauge.get(key)
+
+    def coins_from_pool(self, pool_address: str) -> Tuple[bool, Optional[List[str]]]:
+        """Coins of a pool."""
+        coins = self._pool_to_coins.get(_key(pool_address))
+        return coins is not None, list(coins) if coins is not None else None
+
+    def pool_for_coins(self, token_a: str, token_b: str) -> Tuple[bool, Optional[str]]:
+        """
+        Pool for a token pair.
+
+        Pairs resolved by a registry query are returned first; otherwise the
+        first indexed pool (in recording order) holding both coins is used.
+        That pool is not necessarily the one the registry's
+        `find_pool_for_coins(a, b, 0)` returns when several pools share the
+        pair, and it is not recorded as the registry's answer.
+        """
+        pair = _pair_key(token_a, token_b)
+        if pair in self._pair_to_pool:
+            return True, self._pair_to_pool[pair]
+        with self._lock:
+            for pool_key, coins in self._pool_to_coins.items():
+                if set(pair) <= {_key(coin) for coin in coins}:
+                    return True, self._pools.get(pool_key, pool_key)
+        return False, None
+
+    def unresolved_lp_tokens(self, lp_tokens: Iterable[str]) -> List[str]:
+        """LP tokens that were never looked up or whose lookup found no pool."""
+        return [lp for lp in lp_tokens if self._lp_to_pool.get(_key(lp)) is None]
+
+    def record_lp_token(self, lp_token: str, pool_address: Optional[str]):
+        """Record the pool for an LP token (None if the registries have none)."""
+        with self._lock:
+            self._lp_to_pool[_key(lp_token)] = pool_address
+            if pool_address is not None:
+                self._pools[_key(pool_address)] = pool_address
+                self._pool_to_lp[_key(pool_address)] = lp_token
+
+    def record_gauge(self, pool_address: str, gauge_address: Optional[str]):
+        """Record the gauge for a pool (None if the registries have none)."""
+        with self._lock:
+            self._pool_to_gauge[_key(pool_address)] = gauge_address
+
+    def record_coins(self, pool_address: str, coins: List[str]):
+        """Record the coins of a pool."""
+        with self._lock:
+            self._pools[_key(pool_address)] = pool_address
+            self._pool_to_coins[_key(pool_address)] = list(coins)
+
+    def record_pair(self, token_a: str, token_b: str, pool_address: Optional[str]):
+        """Record the registry's pool for a token pair."""
+        with self._lock:
+            self._pair_to_pool[_pair_key(token_a, token_b)] = pool_address
+
+    def clear(self):
+        """Forget all mappings."""
+        with self._lock:
+            for mapping in (self._pools, self._lp_to_pool, self._pool_to_lp, self._pool_to_gauge,
+                            self._pool_to_coins, self._pair_to_pool):
+                mapping.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index to JSON-compatible data."""
+        with self._lock:
+            return {
+                "pools": dict(self._pools),
+                "lp_to_pool": dict(self._lp_to_pool),
+                "pool_to_lp": dict(self._pool_to_lp),
+                "pool_to_gauge": dict(self._pool_to_gauge),
+                "pool_to_coins": {pool: list(coins) for pool, coins in self._pool_to_coins.items()},
+                "pair_to_pool": [[a, b, pool] for (a, b), pool in self._pair_to_pool.items()],
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CurveRegistryIndex":
+        """Restore an index saved with `to_dict()`."""
+        index = cls()
+        index._pools.update(data.get("pools", {}))
+        index._lp_to_pool.update(data.get("lp_to_pool", {}))
+        index._pool_to_lp.update(data.get("pool_to_lp", {}))
+        index._pool_to_gauge.update(data.get("pool_to_gauge", {}))
+        index._pool_to_coins.update({pool: list(coins) for pool, coins in data.get("pool_to_coins", {}).items()})
+        index._pair_to_pool.update({(a, b): pool for a, b, pool in data.get("pair_to_pool", [])})
+        return index
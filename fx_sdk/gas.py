@@ -0,0 +1,234 @@
+"""
+Fee and gas-limit estimation for the f(x) Protocol SDK.
+
+Derives EIP-1559 `maxFeePerGas` / `maxPriorityFeePerGas` from a cached
+`eth_feeHistory` sample instead of querying `gas_price` for every transaction,
+and learns gas limits for repeated calls from their receipts.
+"""
+
+import logging
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .exceptions import ContractCallError, ConfigurationError
+
+logger = logging.getLogger("fx_sdk")
+
+# Reward percentile sampled from eth_feeHistory for each urgency level
+URGENCY_PERCENTILES: Dict[str, int] = {
+    "low": 10,
+    "standard": 50,
+    "high": 90,
+}
+
+# Headroom over the next base fee, as (numerator, denominator). The base fee can
+# rise 12.5% per full block, so "low" covers one block and "high" roughly six.
+BASE_FEE_MULTIPLIERS: Dict[str, Tuple[int, int]] = {
+    "low": (9, 8),
+    "standard": (3, 2),
+    "high": (2, 1),
+}
+
+
+class FeeOracle:
+    """
+    EIP-1559 fee suggestions from a cached `eth_feeHistory` sample.
+
+    The history is fetched at most once per block: when a block number source
+    is available (e.g. a newHeads subscription) the sample is refreshed when a
+    newer block arrives, and in any case after `max_age` seconds, so a block
+    source that stops advancing cannot pin an old sample.
+
+    Chains or nodes without `eth_feeHistory` fall back to legacy `gasPrice`.
+    """
+
+    def __init__(
+        self,
+        w3,
+        block_count: int = 10,
+        max_age: float = 12.0,
+        min_priority_fee: int = 10**7,
+        latest_block: Optional[Callable[[], Optional[int]]] = None
+    ):
+        """
+        Initialize the oracle.
+
+        Args:
+            w3: Web3 instance.
+            block_count: Number of recent blocks sampled by eth_feeHistory.
+            max_age: Seconds a sample stays valid when no block source is known.
+            min_priority_fee: Floor for the suggested priority fee, in Wei.
+            latest_block: Optional callable returning the latest known block number.
+        """
+        self.w3 = w3
+        self.block_count = block_count
+        self.max_age = max_age
+        self.min_priority_fee = min_priority_fee
+        self.latest_block = latest_block
+
+        self._lock = threading.Lock()
+        self._sample: Optional[Dict[str, Any]] = None
+        self._sampled_at = 0.0
+
+    def invalidate(self):
+        """Drop the cached sample so the next call refetches it."""
+        with self._lock:
+            self._sample = None
+
+    def get_fee_params(self, urgency: str = "standard") -> Dict[str, int]:
+        """
+        Fee fields for a transaction.
+
+        Args:
+            urgency: One of 'low', 'standard' or 'high'.
+
+        Returns:
+            Dict with `maxFeePerGas` and `maxPriorityFeePerGas`, or `gasPrice`
+            when the node does not support EIP-1559.
+
+        Raises:
+            ConfigurationError: If the urgency level is unknown.
+            ContractCallError: If no fee data could be fetched.
+        """
+        if urgency not in URGENCY_PERCENTILES:
+            raise ConfigurationError(
+                f"Unknown fee urgency '{urgency}'. Use one of: {', '.join(URGENCY_PERCENTILES)}"
+            )
+
+        sample = self._get_sample()
+        if "gasPrice" in sample:
+            return {"gasPrice": sample["gasPrice"]}
+        return dict(sample["fees"][urgency])
+
+    def get_base_fee(self) -> Optional[int]:
+        """Projected base fee of the next block in Wei (None on legacy chains)."""
+        return self._get_sample().get("baseFeePerGas")
+
+    def _is_fresh(self, sample: Dict[str, Any]) -> bool:
+        """Whether the cached sample still describes the latest block (and is at most max_age old)."""
+        if time.monotonic() - self._sampled_at >= self.max_age:
+            return False
+        latest = self.latest_block() if self.latest_block else None
+        if latest is not None and sample.get("newestBlock") is not None:
+            return sample["newestBlock"] >= latest
+        return True
+
+    def _get_sample(self) -> Dict[str, Any]:
+        """Return the cached fee sample, refreshing it if stale."""
+        with self._lock:
+            if self._sample is not None and self._is_fresh(self._sample):
+                return self._sample
+
+            try:
+                sample = self._sample_fee_history()
+            except Exception as e:
+                logger.debug(f"eth_feeHistory unavailable: {e}. Falling back to gasPrice.")
+                try:
+                    sample = {"gasPrice": self.w3.eth.gas_price}
+                except Exception as legacy_error:
+                    raise ContractCallError(f"Failed to fetch fee data: {str(legacy_error)}")
+
+            self._sample = sample
+            self._sampled_at = time.monotonic()
+            return sample
+
+    def _sample_fee_history(self) -> Dict[str, Any]:
+        """Fetch eth_feeHistory and derive fees for each urgency level."""
+        levels = list(URGENCY_PERCENTILES)
+        history = self.w3.eth.fee_history(
+            self.block_count, "latest", [URGENCY_PERCENTILES[level] for level in levels]
+        )
+
+        # The last entry is the base fee of the next (pending) block
+        base_fee = int(history["baseFeePerGas"][-1])
+        rewards = [block_rewards for block_rewards in history.get("reward") or [] if block_rewards]
+        oldest_block = history.get("oldestBlock")
+
+        fees = {}
+        for index, level in enumerate(levels):
+            samples = [int(block_rewards[index]) for block_rewards in rewards]
+            priority_fee = int(statistics.median(samples)) if samples else 0
+            priority_fee = max(priority_fee, self.min_priority_fee)
+
+            numerator, denominator = BASE_FEE_MULTIPLIERS[level]
+            fees[level] = {
+                "maxFeePerGas": base_fee * numerator // denominator + priority_fee,
+                "maxPriorityFeePerGas": priority_fee,
+            }
+
+        return {
+            "baseFeePerGas": base_fee,
+            "newestBlock": int(oldest_block) + len(history["baseFeePerGas"]) - 2 if oldest_block is not None else None,
+            "fees": fees,
+        }
+
+
+class GasProfileCache:
+    """
+    Learned gas limits for repeated contract calls.
+
+    Profiles are keyed by contract address, function selector and the length
+    of any array/bytes arguments, and are learned from the `gasUsed` of
+    successful receipts. The suggested limit is the largest recent `gasUsed`
+    plus a safety margin, which lets writers skip `eth_estimateGas`.
+
+    Example:
+        client.gas_profiles = GasProfileCache(margin=0.25)
+    """
+
+    def __init__(self, margin: float = 0.25, max_samples: int = 5):
+        """
+        Initialize the cache.
+
+        Args:
+            margin: Fraction added on top of the largest recent gasUsed.
+            max_samples: Number of recent receipts kept per profile.
+        """
+        self.margin = margin
+        self.max_samples = max_samples
+
+        self._lock = threading.Lock()
+        self._samples: Dict[Hashable, List[int]] = {}
+
+    @staticmethod
+    def key_for(contract_function, value: int = 0) -> Hashable:
+        """
+        Profile key for a bound contract function.
+
+        Calls to the same function differ in gas mainly with the size of
+        dynamic arguments (e.g. the reward token list of a claim), so array,
+        bytes and string argument lengths are part of the key.
+        """
+        selector = contract_function._encode_transaction_data()[:10]
+        shape = tuple(
+            len(arg) if isinstance(arg, (list, tuple, bytes, str)) else None
+            for arg in getattr(contract_function, "args", None) or ()
+        )
+        return (contract_function.address.lower(), selector.lower(), shape, bool(value))
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Suggested gas limit for a profile, or None if it has not been learned."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples:
+                return None
+            return int(max(samples) * (1 + self.margin))
+
+    def record(self, key: Hashable, gas_used: int):
+        """Record the gasUsed of a successful transaction."""
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(int(gas_used))
+            del samples[:-self.max_samples]
+
+    def invalidate(self, key: Hashable):
+        """Forget a profile so the next call estimates live."""
+        with self._lock:
+            self._samples.pop(key, None)
+
+    def clear(self):
+        """Forget all profiles."""
+        with self._lock:
+            self._samples.clear()
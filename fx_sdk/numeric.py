@@ -0,0 +1,268 @@
+"""
+Exact fixed-point arithmetic for token amounts.
+
+On-chain amounts are uint256 integers with a per-token number of decimals.
+Converting them through the global `decimal` context rounds to 28 significant
+digits, so this module converts under a dedicated context wide enough for any
+uint256 and precomputes the powers of ten.
+
+`FixedPoint` keeps the raw integer and its decimals, so sums and comparisons
+in loops stay in integer arithmetic. Convert to Decimal once, at the API
+boundary, with `to_decimal()`.
+"""
+
+from decimal import Context, Decimal, ROUND_DOWN
+from typing import Any, Iterable, List, Union
+
+# uint256 values have at most 78 digits; 100 leaves room for signed results
+EXACT_CONTEXT = Context(prec=100, rounding=ROUND_DOWN)
+
+# Precomputed 10**decimals, as ints and Decimals, for every ERC20 decimals value
+MAX_DECIMALS = 77
+SCALE_FACTORS = tuple(10**d for d in range(MAX_DECIMALS + 1))
+DECIMAL_SCALE_FACTORS = tuple(Decimal(scale) for scale in SCALE_FACTORS)
+
+_divide = EXACT_CONTEXT.divide
+_multiply = EXACT_CONTEXT.multiply
+
+
+def scale_factor(decimals: int) -> int:
+    """
+    Return 10**decimals, from the precomputed table when possible.
+
+    Args:
+        decimals: Token decimals.
+
+    Returns:
+        int: The scale factor.
+    """
+    if 0 <= decimals <= MAX_DECIMALS:
+        return SCALE_FACTORS[decimals]
+    return 10**decimals
+
+
+def to_decimal(raw: int, decimals: int = 18) -> Decimal:
+    """
+    Convert a raw integer amount to a Decimal without rounding.
+
+    Args:
+        raw: The amount in the token's smallest unit.
+        decimals: The number of decimals for the token (default 18).
+
+    Returns:
+        Decimal: The exact human-readable value.
+    """
+    if 0 <= decimals <= MAX_DECIMALS:
+        return _divide(Decimal(raw), DECIMAL_SCALE_FACTORS[decimals])
+    return _divide(Decimal(raw), Decimal(scale_factor(decimals)))
+
+
+def to_decimal_many(raws: Iterable[int], decimals: int = 18) -> List[Decimal]:
+    """
+    Convert many raw amounts with the same decimals to Decimals without rounding.
+
+    Args:
+        raws: Amounts in the token's smallest unit.
+        decimals: The number of decimals for the token (default 18).
+
+    Returns:
+        List[Decimal]: The exact human-readable values, in order.
+    """
+    if 0 <= decimals <= MAX_DECIMALS:
+        divisor = DECIMAL_SCALE_FACTORS[decimals]
+    else:
+        divisor = Decimal(scale_factor(decimals))
+    divide = _divide
+    return [divide(Decimal(raw), divisor) for raw in raws]
+
+
+def to_raw(value: Union[int, float, Decimal, str], decimals: int = 18) -> int:
+    """
+    Convert a human-readable amount to the token's smallest unit.
+
+    Digits beyond `decimals` are truncated toward zero. Floats are converted
+    through their shortest string representation.
+
+    Args:
+        value: The human-readable value.
+        decimals: The number of decimals for the token (default 18).
+
+    Returns:
+        int: The raw amount.
+    """
+    if isinstance(value, int):
+        return value * scale_factor(decimals)
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    if 0 <= decimals <= MAX_DECIMALS:
+        scaled = _multiply(value, DECIMAL_SCALE_FACTORS[decimals])
+    else:
+        scaled = _multiply(value, Decimal(scale_factor(decimals)))
+    return int(scaled)
+
+
+class FixedPoint:
+    """
+    An exact token amount backed by an integer.
+
+    Arithmetic between amounts with different decimals is carried out at the
+    larger number of decimals. Multiplication and division by another
+    FixedPoint keep the left operand's decimals and truncate toward zero,
+    like Solidity.
+
+    Example:
+        total = sum((FixedPoint(raw, 18) for raw in raw_balances), FixedPoint.zero(18))
+        print(total.to_decimal())
+    """
+
+    __slots__ = ("raw", "decimals")
+
+    def __init__(self, raw: int, decimals: int = 18):
+        """
+        Initialize an amount.
+
+        Args:
+            raw: The amount in the token's smallest unit.
+            decimals: The number of decimals for the token (default 18).
+        """
+        self.raw = int(raw)
+        self.decimals = decimals
+
+    @classmethod
+    def zero(cls, decimals: int = 18) -> "FixedPoint":
+        """A zero amount."""
+        return cls(0, decimals)
+
+    @classmethod
+    def from_value(cls, value: Union[int, float, Decimal, str], decimals: int = 18) -> "FixedPoint":
+        """Create an amount from a human-readable value (see `to_raw()`)."""
+        return cls(to_raw(value, decimals), decimals)
+
+    def to_decimal(self) -> Decimal:
+        """Exact Decimal value."""
+        return to_decimal(self.raw, self.decimals)
+
+    def rescale(self, decimals: int) -> "FixedPoint":
+        """The same amount at another number of decimals (truncating when reducing)."""
+        if decimals == self.decimals:
+            return self
+        if decimals > self.decimals:
+            return FixedPoint(self.raw * scale_factor(decimals - self.decimals), decimals)
+        return FixedPoint(_truncating_div(self.raw, scale_factor(self.decimals - decimals)), decimals)
+
+    def _align(self, other: Any):
+        """Raw values of self and other at a common number of decimals."""
+        if isinstance(other, FixedPoint):
+            decimals = max(self.decimals, other.decimals)
+            return self.rescale(decimals).raw, other.rescale(decimals).raw, decimals
+        if isinstance(other, int):
+            return self.raw, other * scale_factor(self.decimals), self.decimals
+        return NotImplemented
+
+    def __add__(self, other: Any) -> "FixedPoint":
+        aligned = self._align(other)
+        if aligned is NotImplemented:
+            return NotImplemented
+        a, b, decimals = aligned
+        return FixedPoint(a + b, decimals)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> "FixedPoint":
+        aligned = self._align(other)
+        if aligned is NotImplemented:
+            return NotImplemented
+        a, b, decimals = aligned
+        return FixedPoint(a - b, decimals)
+
+    def __rsub__(self, other: Any) -> "FixedPoint":
+        aligned = self._align(other)
+        if aligned is NotImplemented:
+            return NotImplemented
+        a, b, decimals = aligned
+        return FixedPoint(b - a, decimals)
+
+    def __mul__(self, other: Any) -> "FixedPoint":
+        if isinstance(other, FixedPoint):
+            return FixedPoint(_truncating_div(self.raw * other.raw, scale_factor(other.decimals)), self.decimals)
+        if isinstance(other, int):
+            return FixedPoint(self.raw * other, self.decimals)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "FixedPoint":
+        if isinstance(other, FixedPoint):
+            return FixedPoint(_truncating_div(self.raw * scale_factor(other.decimals), other.raw), self.decimals)
+        if isinstance(other, int):
+            return FixedPoint(_truncating_div(self.raw, other), self.decimals)
+        return NotImplemented
+
+    def __neg__(self) -> "FixedPoint":
+        return FixedPoint(-self.raw, self.decimals)
+
+    def __abs__(self) -> "FixedPoint":
+        return FixedPoint(abs(self.raw), self.decimals)
+
+    def __bool__(self) -> bool:
+        return self.raw != 0
+
+    def _compare_raw(self, other: Any):
+        aligned = self._align(other)
+        if aligned is NotImplemented:
+            if isinstance(other, Decimal):
+                return self.to_decimal(), other
+            return NotImplemented
+        return aligned[0], aligned[1]
+
+    def __eq__(self, other: Any) -> bool:
+        pair = self._compare_raw(other)
+        return NotImplemented if pair is NotImplemented else pair[0] == pair[1]
+
+    def __lt__(self, other: Any) -> bool:
+        pair = self._compare_raw(other)
+        return NotImplemented if pair is NotImplemented else pair[0] < pair[1]
+
+    def __le__(self, other: Any) -> bool:
+        pair = self._compare_raw(other)
+        return NotImplemented if pair is NotImplemented else pair[0] <= pair[1]
+
+    def __gt__(self, other: Any) -> bool:
+        pair = self._compare_raw(other)
+        return NotImplemented if pair is NotImplemented else pair[0] > pair[1]
+
+    def __ge__(self, other: Any) -> bool:
+        pair = self._compare_raw(other)
+        return NotImplemented if pair is NotImplemented else pair[0] >= pair[1]
+
+    def __hash__(self) -> int:
+        return hash(self.to_decimal())
+
+    def __float__(self) -> float:
+        return self.raw / scale_factor(self.decimals)
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self) -> str:
+        return f"FixedPoint({self.raw}, {self.decimals})"
+
+
+def fixed_sum(amounts: Iterable[FixedPoint], decimals: int = 18) -> FixedPoint:
+    """
+    Sum amounts exactly.
+
+    Args:
+        amounts: FixedPoint amounts (any decimals).
+        decimals: Decimals of the result when `amounts` is empty.
+
+    Returns:
+        FixedPoint: The total.
+    """
+    return sum(amounts, FixedPoint.zero(decimals))
+
+
+def _truncating_div(a: int, b: int) -> int:
+    """Integer division rounding toward zero, like Solidity."""
+    quotient = abs(a) // abs(b)
+    return quotient if (a >= 0) == (b >= 0) else -quotient
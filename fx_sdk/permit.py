@@ -0,0 +1,98 @@
+"""
+EIP-2612 permits.
+
+A permit is an EIP-712 signature over
+`Permit(owner, spender, value, nonce, deadline)` that lets anyone set an
+allowance with `token.permit(...)`, so an approval no longer has to be its
+own transaction signed and mined before the action that spends it.
+"""
+
+from typing import Any, Dict
+
+from eth_abi import encode
+from web3 import Web3
+
+from . import utils
+
+PERMIT_TYPEHASH = Web3.keccak(
+    text="Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)"
+)
+
+EIP712_DOMAIN_TYPEHASH = Web3.keccak(
+    text="EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+)
+
+# EIP-2612 views and permit(), plus the optional PERMIT_TYPEHASH getter used to
+# rule out DAI-style permits with a different signature
+PERMIT_ABI = [
+    {"inputs": [], "name": "name", "outputs": [{"name": "", "type": "string"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "version", "outputs": [{"name": "", "type": "string"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "DOMAIN_SEPARATOR", "outputs": [{"name": "", "type": "bytes32"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "PERMIT_TYPEHASH", "outputs": [{"name": "", "type": "bytes32"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "owner", "type": "address"}], "name": "nonces", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}, {"name": "value", "type": "uint256"}, {"name": "deadline", "type": "uint256"}, {"name": "v", "type": "uint8"}, {"name": "r", "type": "bytes32"}, {"name": "s", "type": "bytes32"}], "name": "permit", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+]
+
+
+def permit_domain_separator(name: str, version: str, chain_id: int, token_address: str) -> bytes:
+    """EIP-712 domain separator of an EIP-2612 token."""
+    return bytes(Web3.keccak(encode(
+        ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+        [
+            EIP712_DOMAIN_TYPEHASH,
+            Web3.keccak(text=name),
+            Web3.keccak(text=version),
+            chain_id,
+            utils.to_checksum_address(token_address),
+        ],
+    )))
+
+
+def permit_typed_data(
+    name: str,
+    version: str,
+    chain_id: int,
+    token_address: str,
+    owner: str,
+    spender: str,
+    value: int,
+    nonce: int,
+    deadline: int
+) -> Dict[str, Any]:
+    """
+    EIP-712 typed data of a permit, for `eth_account.messages.encode_typed_data()`.
+
+    Returns:
+        Dict with `types`, `primaryType`, `domain` and `message`.
+    """
+    return {
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+            "Permit": [
+                {"name": "owner", "type": "address"},
+                {"name": "spender", "type": "address"},
+                {"name": "value", "type": "uint256"},
+                {"name": "nonce", "type": "uint256"},
+                {"name": "deadline", "type": "uint256"},
+            ],
+        },
+        "primaryType": "Permit",
+        "domain": {
+            "name": name,
+            "version": version,
+            "chainId": chain_id,
+            "verifyingContract": utils.to_checksum_address(token_address),
+        },
+        "message": {
+            "owner": utils.to_checksum_address(owner),
+            "spender": utils.to_checksum_address(spender),
+            "value": value,
+            "nonce": nonce,
+            "deadline": deadline,
+        },
+    }
@@ -0,0 +1,106 @@
+"""
+Asset specifications and a columnar result table for multi-account scans.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import utils
+
+
+@dataclass(frozen=True)
+class PortfolioAsset:
+    """
+    One column of a portfolio scan.
+
+    `kind` is "token" or "gauge" (read with `balanceOf(account)` on `address`)
+    or "vault" (the account's Convex vault for pool `pool_id`, read from the
+    vault's gauge).
+    """
+    label: str
+    kind: str
+    address: Optional[str] = None
+    pool_id: Optional[int] = None
+
+
+class PortfolioTable:
+    """
+    Scan results stored column by column.
+
+    Each row is an account and each column an asset label. A balance is None
+    when its call failed, so failures are not mistaken for empty balances.
+    `to_dict()` returns plain lists that can be passed to
+    `pandas.DataFrame(...)` directly.
+
+    Example:
+        table = client.scan_portfolios_table(addresses)
+        print(table.totals()["fxUSD"])
+    """
+
+    def __init__(self, labels: Iterable[str], block_number: Optional[int] = None):
+        """
+        Initialize an empty table.
+
+        Args:
+            labels: Asset labels, one column each.
+            block_number: Block the balances were read at.
+        """
+        self.block_number = block_number
+        self.accounts: List[str] = []
+        self.columns: Dict[str, List[Optional[Decimal]]] = {label: [] for label in labels}
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    @property
+    def labels(self) -> List[str]:
+        """Asset labels, in column order."""
+        return list(self.columns)
+
+    def append(self, account: str, balances: Dict[str, Optional[Decimal]]):
+        """Add an account's balances (labels missing from `balances` are None)."""
+        self.accounts.append(account)
+        for label, column in self.columns.items():
+            column.append(balances.get(label))
+
+    def extend(self, rows: Iterable[Tuple[str, Dict[str, Optional[Decimal]]]]):
+        """Add `(account, balances)` rows, e.g. straight from `scan_portfolios()`."""
+        for account, balances in rows:
+            self.append(account, balances)
+
+    def row(self, account: str) -> Dict[str, Optional[Decimal]]:
+        """Balances of one account."""
+        index = self.accounts.index(account)
+        return {label: column[index] for label, column in self.columns.items()}
+
+    def totals(self) -> Dict[str, Decimal]:
+        """Exact sum of every column, skipping failed reads."""
+        return {
+            label: sum((value for value in column if value is not None), Decimal(0))
+            for label, column in self.columns.items()
+        }
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Columns as lists, with the accounts under the "account" key."""
+        data: Dict[str, List[Any]] = {"account": list(self.accounts)}
+        for label, column in self.columns.items():
+            data[label] = list(column)
+        return data
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Columns as NumPy float64 arrays (failed reads become NaN).
+
+        Returns:
+            Dict mapping asset label to a numpy.ndarray.
+
+        Raises:
+            ConfigurationError: If NumPy is not installed.
+        """
+        utils._require_numpy()
+        nan = float("nan")
+        return {
+            label: utils.np.array([nan if value is None else float(value) for value in column], dtype=utils.np.float64)
+            for label, column in self.columns.items()
+        }
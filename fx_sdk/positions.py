@@ -0,0 +1,360 @@
+"""
+Local index of f(x) v2 Pool Manager positions.
+
+Positions are discovered from Pool Manager events and their collateral, debt,
+debt ratio and owner are refreshed in batches by ProtocolClient. The index is
+an in-memory table that can be filtered by pool, owner and health.
+`rank_candidates()` recomputes debt ratios for many positions at once
+(vectorized with NumPy when it is installed) to find rebalance and
+liquidation candidates.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from . import utils
+
+HEALTHY = "healthy"
+REBALANCE = "rebalance"
+LIQUIDATE = "liquidate"
+
+
+def _key(pool_address: str, position_id: int) -> Tuple[str, int]:
+    """Case-insensitive dictionary key for a position."""
+    return pool_address.lower(), int(position_id)
+
+
+@dataclass
+class PositionRecord:
+    """
+    State of one position, as of `block_number`.
+
+    `debt_ratio` is debt value over collateral value; `health` compares it to
+    the pool's rebalance and liquidation debt ratios. Fields are None until
+    the position has been refreshed.
+    """
+    pool: str
+    position_id: int
+    owner: Optional[str] = None
+    collateral: Optional[Decimal] = None
+    debt: Optional[Decimal] = None
+    debt_ratio: Optional[Decimal] = None
+    health: Optional[str] = None
+    block_number: Optional[int] = None
+    last_event_block: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the position holds collateral or debt (unknown counts as open)."""
+        if self.collateral is None or self.debt is None:
+            return True
+        return self.collateral > 0 or self.debt > 0
+
+
+def classify_health(
+    debt_ratio: Optional[Decimal],
+    rebalance_ratio: Optional[Decimal],
+    liquidate_ratio: Optional[Decimal]
+) -> Optional[str]:
+    """
+    Classify a debt ratio against a pool's thresholds.
+
+    Returns:
+        "liquidate", "rebalance" or "healthy", or None if anything is unknown.
+    """
+    if debt_ratio is None or rebalance_ratio is None or liquidate_ratio is None:
+        return None
+    if debt_ratio >= liquidate_ratio:
+        return LIQUIDATE
+    if debt_ratio >= rebalance_ratio:
+        return REBALANCE
+    return HEALTHY
+
+
+@dataclass
+class PositionCandidate:
+    """
+    A position that can be rebalanced or liquidated.
+
+    `debt_ratio` is recomputed from the position's collateral and debt at
+    `price`; `threshold` is the pool ratio it crossed. `transaction` holds the
+    prebuilt unsigned transaction when one was requested.
+    """
+    pool: str
+    position_id: int
+    action: str
+    debt_ratio: float
+    threshold: float
+    price: float
+    owner: Optional[str] = None
+    collateral: Optional[Decimal] = None
+    debt: Optional[Decimal] = None
+    transaction: Optional[Dict[str, Any]] = None
+
+
+def rank_candidates(
+    records: List["PositionRecord"],
+    prices: Dict[str, Optional[Decimal]],
+    thresholds: Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]]
+) -> List[PositionCandidate]:
+    """
+    Find rebalance and liquidation candidates among positions.
+
+    Debt ratios are recomputed as debt / (collateral * price) for every
+    position in one pass. Positions whose pool price or thresholds are unknown
+    are skipped.
+
+    Args:
+        records: Refreshed positions.
+        prices: Collateral price in debt units, keyed by lower-case pool address.
+        thresholds: (rebalance ratio, liquidation ratio), keyed by lower-case
+                   pool address.
+
+    Returns:
+        List[PositionCandidate]: Liquidation candidates first, then rebalance
+        candidates, each ordered by debt ratio (highest first).
+    """
+    records = [r for r in records if r.collateral is not None and r.debt is not None]
+    if not records:
+        return []
+
+    nan = float("nan")
+
+    def column(values):
+        return [nan if value is None else float(value) for value in values]
+
+    pools = [record.pool.lower() for record in records]
+    colls = column(record.collateral for record in records)
+    debts = column(record.debt for record in records)
+    price = column(prices.get(pool) for pool in pools)
+    rebalance = column(thresholds.get(pool, (None, None))[0] for pool in pools)
+    liquidate = column(thresholds.get(pool, (None, None))[1] for pool in pools)
+
+    if utils.NUMPY_AVAILABLE:
+        ratios, actions, order = _rank_arrays(colls, debts, price, rebalance, liquidate)
+    else:
+        ratios, actions, order = _rank_lists(colls, debts, price, rebalance, liquidate)
+
+    candidates = []
+    for i in order:
+        record = records[i]
+        action = LIQUIDATE if actions[i] == 2 else REBALANCE
+        candidates.append(PositionCandidate(
+            pool=record.pool,
+            position_id=record.position_id,
+            action=action,
+            debt_ratio=ratios[i],
+            threshold=liquidate[i] if action == LIQUIDATE else rebalance[i],
+            price=price[i],
+            owner=record.owner,
+            collateral=record.collateral,
+            debt=record.debt,
+        ))
+    return candidates
+
+
+def _rank_arrays(colls, debts, price, rebalance, liquidate):
+    """NumPy implementation of the ranking pass."""
+    np = utils.np
+    colls, debts, price = np.array(colls), np.array(debts), np.array(price)
+    rebalance, liquidate = np.array(rebalance), np.array(liquidate)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = debts / (colls * price)
+        # Comparisons with NaN (unknown price or threshold) are False
+        actions = np.where(ratios >= liquidate, 2, np.where(ratios >= rebalance, 1, 0))
+    selected = np.flatnonzero(actions)
+    order = selected[np.lexsort((-ratios[selected], -actions[selected]))]
+    return ratios.tolist(), actions.tolist(), order.tolist()
+
+
+def _rank_lists(colls, debts, price, rebalance, liquidate):
+    """Pure-Python implementation of the ranking pass."""
+    ratios = []
+    actions = []
+    for coll, debt, p, reb, liq in zip(colls, debts, price, rebalance, liquidate):
+        value = coll * p
+        if value != 0:
+            ratio = debt / value
+        elif debt > 0:
+            ratio = float("inf")
+        else:
+            ratio = float("nan")
+        ratios.append(ratio)
+        actions.append(2 if ratio >= liq else 1 if ratio >= reb else 0)
+    selected = [i for i, action in enumerate(actions) if action]
+    order = sorted(selected, key=lambda i: (actions[i], ratios[i]), reverse=True)
+    return ratios, actions, order
+
+
+class PositionIndex:
+    """
+    Positions keyed by (pool, position id).
+
+    `last_block` is the last block whose events have been indexed, so event
+    discovery resumes where it stopped. Positions touched by an event since
+    their last refresh are kept as pending so closed positions that are
+    reopened get refreshed again.
+
+    The index can be persisted between sessions with `to_dict()` and
+    `from_dict()`.
+
+    Example:
+        risky = client.position_index.query(health="rebalance", pool=constants.WSTETH_POOL)
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._positions: Dict[Tuple[str, int], PositionRecord] = {}
+        self._pending: Set[Tuple[str, int]] = set()
+        self._pool_thresholds: Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]] = {}
+        self.last_block: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def get(self, pool_address: str, position_id: int) -> Optional[PositionRecord]:
+        """Record for a position, if indexed."""
+        return self._positions.get(_key(pool_address, position_id))
+
+    def records(self) -> List[PositionRecord]:
+        """All indexed positions."""
+        with self._lock:
+            return list(self._positions.values())
+
+    def record_event(self, pool_address: str, position_id: int, block_number: int) -> bool:
+        """
+        Record that an event touched a position.
+
+        Returns:
+            bool: True if the position was not indexed before.
+        """
+        key = _key(pool_address, position_id)
+        with self._lock:
+            record = self._positions.get(key)
+            is_new = record is None
+            if is_new:
+                record = self._positions[key] = PositionRecord(pool_address, int(position_id))
+            if record.last_event_block is None or block_number > record.last_event_block:
+                record.last_event_block = block_number
+            self._pending.add(key)
+        return is_new
+
+    def update(self, record: PositionRecord):
+        """Store refreshed state for a position."""
+        key = _key(record.pool, record.position_id)
+        with self._lock:
+            self._positions[key] = record
+            self._pending.discard(key)
+
+    def record_pool_thresholds(self, pool_address: str, rebalance: Optional[Decimal], liquidate: Optional[Decimal]):
+        """Record a pool's rebalance and liquidation debt ratios."""
+        with self._lock:
+            self._pool_thresholds[pool_address.lower()] = (rebalance, liquidate)
+
+    def pool_thresholds(self) -> Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]]:
+        """(rebalance ratio, liquidation ratio) by lower-case pool address."""
+        with self._lock:
+            return dict(self._pool_thresholds)
+
+    def to_refresh(self) -> List[PositionRecord]:
+        """Open positions plus positions touched by an event since their last refresh."""
+        with self._lock:
+            return [
+                record for key, record in self._positions.items()
+                if record.is_open or key in self._pending
+            ]
+
+    def query(
+        self,
+        owner: Optional[str] = None,
+        pool: Optional[str] = None,
+        health: Optional[str] = None,
+        min_debt_ratio: Optional[Decimal] = None,
+        max_debt_ratio: Optional[Decimal] = None,
+        include_closed: bool = False
+    ) -> List[PositionRecord]:
+        """
+        Filter indexed positions.
+
+        Args:
+            owner: Only positions owned by this address.
+            pool: Only positions in this pool.
+            health: Only positions in this state ("healthy", "rebalance" or "liquidate").
+            min_debt_ratio: Only positions with at least this debt ratio.
+            max_debt_ratio: Only positions with at most this debt ratio.
+            include_closed: Include positions without collateral or debt.
+
+        Returns:
+            List[PositionRecord]: Matching positions, highest debt ratio first.
+        """
+        owner_key = owner.lower() if owner else None
+        pool_key = pool.lower() if pool else None
+        with self._lock:
+            records = list(self._positions.values())
+
+        matches = []
+        for record in records:
+            if not include_closed and not record.is_open:
+                continue
+            if owner_key is not None and (record.owner or "").lower() != owner_key:
+                continue
+            if pool_key is not None and record.pool.lower() != pool_key:
+                continue
+            if health is not None and record.health != health:
+                continue
+            if min_debt_ratio is not None and (record.debt_ratio is None or record.debt_ratio < min_debt_ratio):
+                continue
+            if max_debt_ratio is not None and (record.debt_ratio is None or record.debt_ratio > max_debt_ratio):
+                continue
+            matches.append(record)
+        matches.sort(key=lambda r: (r.debt_ratio is not None, r.debt_ratio or 0), reverse=True)
+        return matches
+
+    def clear(self):
+        """Forget all positions and restart event discovery."""
+        with self._lock:
+            self._positions.clear()
+            self._pending.clear()
+            self._pool_thresholds.clear()
+            self.last_block = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index to JSON-compatible data (Decimals as strings)."""
+        with self._lock:
+            positions = []
+            for key, record in self._positions.items():
+                data = asdict(record)
+                for field in ("collateral", "debt", "debt_ratio"):
+                    if data[field] is not None:
+                        data[field] = str(data[field])
+                data["pending"] = key in self._pending
+                positions.append(data)
+            thresholds = {
+                pool: [None if ratio is None else str(ratio) for ratio in ratios]
+                for pool, ratios in self._pool_thresholds.items()
+            }
+            return {"last_block": self.last_block, "positions": positions, "pool_thresholds": thresholds}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PositionIndex":
+        """Restore an index saved with `to_dict()`."""
+        index = cls()
+        index.last_block = data.get("last_block")
+        for item in data.get("positions", []):
+            item = dict(item)
+            pending = item.pop("pending", False)
+            for field in ("collateral", "debt", "debt_ratio"):
+                if item.get(field) is not None:
+                    item[field] = Decimal(item[field])
+            record = PositionRecord(**item)
+            key = _key(record.pool, record.position_id)
+            index._positions[key] = record
+            if pending:
+                index._pending.add(key)
+        for pool, ratios in data.get("pool_thresholds", {}).items():
+            index._pool_thresholds[pool] = tuple(None if ratio is None else Decimal(ratio) for ratio in ratios)
+        return index
@@ -0,0 +1,192 @@
+"""
+Offline projection of Curve-style gauge reward accrual.
+
+A gauge accrues each reward token into a per-token integral at
+`rate * 1e18 / totalSupply` per second until `period_finish`; an account's
+claimable amount grows by `balance * (integral - integral_for) / 1e18`.
+Once the reward data, total supply and the account's balance are read,
+claimable amounts at any later time follow from the same integer math as
+the gauge's `claimable_reward()` view, until a deposit, withdrawal,
+transfer, checkpoint or reward top-up changes the inputs.
+
+`RewardClaim` describes one claim planned by
+`ProtocolClient.plan_reward_claims()`.
+"""
+
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from . import utils
+
+
+@dataclass(frozen=True)
+class RewardAccrual:
+    """
+    Accrual state of one reward token, as stored by the gauge.
+
+    `stored_claimable` is the account's claimable amount already
+    checkpointed by the gauge (raw units); the rest accrues from the
+    integral.
+    """
+    token: str
+    decimals: int
+    period_finish: int
+    rate: int
+    last_update: int
+    integral: int
+    integral_for: int
+    stored_claimable: int
+
+    def integral_at(self, timestamp: int, total_supply: int) -> int:
+        """Reward integral at a timestamp, as `claimable_reward()` computes it."""
+        if total_supply == 0:
+            return self.integral
+        duration = max(min(timestamp, self.period_finish) - self.last_update, 0)
+        return self.integral + duration * self.rate * 10**18 // total_supply
+
+
+class GaugeRewardProjector:
+    """
+    Claimable rewards of one account in one gauge, projected from one snapshot.
+
+    The projection stays exact until the gauge's state changes. It is
+    marked stale at the earliest reward period end after the snapshot (a new
+    period can start with a different rate) and by `invalidate()`, which
+    `ProtocolClient.sync_gauge_reward_projectors()` calls when it sees a
+    gauge event.
+
+    Example:
+        projector = client.get_gauge_reward_projector(gauge, account)
+        later = projector.claimable_at(projector.timestamp + 3600)
+    """
+
+    def __init__(
+        self,
+        gauge: str,
+        account: str,
+        balance: int,
+        total_supply: int,
+        timestamp: int,
+        block_number: int,
+        rewards: Dict[str, RewardAccrual]
+    ):
+        """
+        Initialize the projector.
+
+        Args:
+            gauge: Gauge address.
+            account: Account address.
+            balance: Account's raw gauge balance.
+            total_supply: Gauge's raw total supply.
+            timestamp: Timestamp of the snapshot block.
+            block_number: Snapshot block number.
+            rewards: Accrual state by reward token address.
+        """
+        self.gauge = gauge
+        self.account = account
+        self.balance = balance
+        self.total_supply = total_supply
+        self.timestamp = timestamp
+        self.block_number = block_number
+        self.rewards = dict(rewards)
+        self._invalidated = False
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        gauge: str,
+        account: str,
+        balance: int,
+        total_supply: int,
+        timestamp: int,
+        block_number: int,
+        reward_data: Dict[str, tuple],
+        integrals_for: Dict[str, int],
+        claimable: Dict[str, int],
+        decimals: Dict[str, int]
+    ) -> "GaugeRewardProjector":
+        """
+        Build a projector from raw gauge reads taken in one block.
+
+        Args:
+            reward_data: `reward_data(token)` tuples (token, distributor,
+                        period_finish, rate, last_update, integral) by token.
+            integrals_for: `reward_integral_for(token, account)` by token.
+            claimable: `claimable_reward(account, token)` by token.
+            decimals: Reward token decimals by token.
+        """
+        rewards = {}
+        for token, data in reward_data.items():
+            accrual = RewardAccrual(
+                token=token,
+                decimals=decimals.get(token, 18),
+                period_finish=int(data[2]),
+                rate=int(data[3]),
+                last_update=int(data[4]),
+                integral=int(data[5]),
+                integral_for=int(integrals_for[token]),
+                stored_claimable=0,
+            )
+            # Split the claimable amount into its checkpointed part and the part still accruing
+            accrued = balance * (accrual.integral_at(timestamp, total_supply) - accrual.integral_for) // 10**18
+            rewards[token] = replace(accrual, stored_claimable=int(claimable[token]) - accrued)
+        return cls(gauge, account, balance, total_supply, timestamp, block_number, rewards)
+
+    @property
+    def valid_until(self) -> Optional[int]:
+        """Earliest reward period end after the snapshot, or None if no period is running."""
+        finishes = [r.period_finish for r in self.rewards.values() if r.period_finish > self.timestamp]
+        return min(finishes) if finishes else None
+
+    def invalidate(self):
+        """Mark the projection stale, e.g. after a gauge event."""
+        self._invalidated = True
+
+    def is_stale(self, timestamp: int) -> bool:
+        """Whether the projection may no longer match the gauge at a timestamp."""
+        if self._invalidated:
+            return True
+        valid_until = self.valid_until
+        return valid_until is not None and timestamp > valid_until
+
+    def raw_claimable_at(self, token: str, timestamp: int) -> int:
+        """Raw claimable amount of one reward token at a timestamp."""
+        accrual = self.rewards[token]
+        integral = accrual.integral_at(timestamp, self.total_supply)
+        return accrual.stored_claimable + self.balance * (integral - accrual.integral_for) // 10**18
+
+    def claimable_at(self, timestamp: int) -> Dict[str, Decimal]:
+        """Claimable amount of every reward token at a timestamp."""
+        return {
+            token: utils.wei_to_decimal(self.raw_claimable_at(token, timestamp), accrual.decimals)
+            for token, accrual in self.rewards.items()
+        }
+
+
+GAUGE_CLAIM = "gauge"
+CONVEX_VAULT_CLAIM = "convex_vault"
+REBALANCE_POOL_CLAIM = "rebalance_pool"
+
+
+@dataclass
+class RewardClaim:
+    """
+    One planned reward claim.
+
+    `value` is the claimable amounts priced in ETH (None when no reward token
+    has a price) and `gas_cost` the expected cost of the claim transaction in
+    ETH. `selected` tells whether the claim is worth sending; `reason`
+    explains a skipped claim. `account` is the account the claim was
+    planned (and its gas estimated) for.
+    """
+    kind: str
+    target: str
+    amounts: Dict[str, Decimal]
+    gas: int
+    gas_cost: Decimal
+    value: Optional[Decimal] = None
+    selected: bool = False
+    reason: Optional[str] = None
+    tokens: Optional[List[str]] = None
+    account: Optional[str] = None
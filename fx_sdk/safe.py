@@ -0,0 +1,102 @@
+"""
+Safe MultiSend encoding.
+
+A Safe executes several transactions in one `execTransaction` by
+delegatecalling MultiSend with the transactions packed back to back, each as
+`operation (uint8) | to (address) | value (uint256) | data length (uint256) | data`.
+The Safe transaction is signed as EIP-712 `SafeTx` data, hashed by
+`safe_transaction_hash()`.
+"""
+
+from typing import Any, Dict, List
+
+from eth_abi import encode
+from web3 import Web3
+
+from . import utils
+from .exceptions import FXProtocolError
+
+# Safe operation flags
+CALL = 0
+DELEGATE_CALL = 1
+
+# gasToken / refundReceiver of a Safe transaction without refunds
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+SAFE_TX_TYPEHASH = Web3.keccak(
+    text="SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,uint256 baseGas,"
+         "uint256 gasPrice,address gasToken,address refundReceiver,uint256 nonce)"
+)
+
+
+def _to_bytes(data: Any) -> bytes:
+    """Calldata from a hex string or bytes."""
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    if not data:
+        return b""
+    data = str(data)
+    return bytes.fromhex(data[2:] if data.startswith(("0x", "0X")) else data)
+
+
+def encode_multisend_transactions(transactions: List[Dict[str, Any]]) -> bytes:
+    """
+    Pack transactions into the `transactions` argument of MultiSend.multiSend().
+
+    Args:
+        transactions: Dicts with `to`, and optionally `value` (Wei), `data`
+                     and `operation` (CALL by default), e.g. the output of
+                     `build_*_transaction` methods.
+
+    Returns:
+        bytes: Packed transactions.
+
+    Raises:
+        FXProtocolError: If a transaction has no `to` address or an unknown operation.
+    """
+    packed = bytearray()
+    for i, tx in enumerate(transactions):
+        if not tx.get("to"):
+            raise FXProtocolError(f"Transaction {i} has no 'to' address; contract creation cannot be bundled")
+        operation = tx.get("operation", CALL)
+        if operation not in (CALL, DELEGATE_CALL):
+            raise FXProtocolError(f"Transaction {i} has unknown operation {operation}")
+        data = _to_bytes(tx.get("data"))
+        packed += operation.to_bytes(1, "big")
+        packed += bytes.fromhex(utils.to_checksum_address(tx["to"])[2:])
+        packed += int(tx.get("value") or 0).to_bytes(32, "big")
+        packed += len(data).to_bytes(32, "big")
+        packed += data
+    return bytes(packed)
+
+
+def safe_transaction_hash(domain_separator: bytes, safe_tx: Dict[str, Any], nonce: int) -> bytes:
+    """
+    EIP-712 hash of a Safe transaction, as `Safe.getTransactionHash()` computes it.
+
+    Args:
+        domain_separator: The Safe's `domainSeparator()`.
+        safe_tx: Dict with `to`, `value`, `data`, `operation`, `safeTxGas`,
+                `baseGas`, `gasPrice`, `gasToken` and `refundReceiver`.
+        nonce: The Safe's nonce for the transaction.
+
+    Returns:
+        bytes: The 32-byte hash the owners sign.
+    """
+    struct_hash = Web3.keccak(encode(
+        ["bytes32", "address", "uint256", "bytes32", "uint8", "uint256", "uint256", "uint256", "address", "address", "uint256"],
+        [
+            SAFE_TX_TYPEHASH,
+            utils.to_checksum_address(safe_tx["to"]),
+            int(safe_tx["value"]),
+            Web3.keccak(_to_bytes(safe_tx["data"])),
+            int(safe_tx["operation"]),
+            int(safe_tx["safeTxGas"]),
+            int(safe_tx["baseGas"]),
+            int(safe_tx["gasPrice"]),
+            utils.to_checksum_address(safe_tx["gasToken"]),
+            utils.to_checksum_address(safe_tx["refundReceiver"]),
+            int(nonce),
+        ],
+    ))
+    return bytes(Web3.keccak(b"\x19\x01" + bytes(domain_separator) + bytes(struct_hash)))
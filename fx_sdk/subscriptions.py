@@ -0,0 +1,181 @@
+"""
+Block subscriptions for the f(x) Protocol SDK.
+
+Streams `newHeads` notifications from a WebSocket endpoint on a background
+thread so the client can react to new blocks instead of polling.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Try to import optional dependencies
+try:
+    from websockets.sync.client import connect as ws_connect
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger("fx_sdk")
+
+# Header fields delivered as hex quantities that we expose as ints
+_QUANTITY_FIELDS = ("number", "timestamp", "baseFeePerGas", "gasLimit", "gasUsed")
+
+
+def is_websocket_url(url: Optional[str]) -> bool:
+    """Return True if the URL uses the ws:// or wss:// scheme."""
+    return bool(url) and url.lower().startswith(("ws://", "wss://"))
+
+
+def parse_block_header(header: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a raw `newHeads` header.
+
+    Args:
+        header: Header object as delivered by eth_subscription.
+
+    Returns:
+        Dict: The header with quantity fields converted to ints.
+    """
+    parsed = dict(header)
+    for field in _QUANTITY_FIELDS:
+        value = parsed.get(field)
+        if isinstance(value, str):
+            parsed[field] = int(value, 16)
+    return parsed
+
+
+class NewHeadsSubscription:
+    """
+    Background `eth_subscribe("newHeads")` listener.
+
+    Each new block header is normalized and passed to `on_head`. The
+    connection is re-established automatically if it drops; `on_disconnect`
+    is called each time it does, so consumers can stop trusting the last head.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        on_head: Callable[[Dict[str, Any]], None],
+        reconnect_delay: float = 1.0,
+        open_timeout: float = 10.0,
+        on_disconnect: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize the subscription.
+
+        Args:
+            ws_url: WebSocket RPC URL (ws:// or wss://).
+            on_head: Callback invoked with each parsed block header.
+            reconnect_delay: Seconds to wait before reconnecting after an error.
+            open_timeout: Seconds to wait for the WebSocket handshake.
+            on_disconnect: Optional callback invoked when the connection drops
+                          or cannot be opened.
+        """
+        if not is_websocket_url(ws_url):
+            raise ConfigurationError(f"newHeads subscriptions require a ws:// or wss:// URL, got {ws_url}")
+        if not WEBSOCKETS_AVAILABLE:
+            raise ConfigurationError("The 'websockets' package is required for block subscriptions.")
+
+        self.ws_url = ws_url
+        self.on_head = on_head
+        self.on_disconnect = on_disconnect
+        self.reconnect_delay = reconnect_delay
+        self.open_timeout = open_timeout
+        self.subscription_id: Optional[str] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the listener thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start listening on a daemon thread."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="fx-sdk-newheads", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop listening and close the connection."""
+        self._stop_event.set()
+        connection = self._connection
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Connection loop; reconnects until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                with ws_connect(self.ws_url, open_timeout=self.open_timeout) as connection:
+                    self._connection = connection
+                    connection.send(json.dumps({
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "eth_subscribe",
+                        "params": ["newHeads"]
+                    }))
+                    for message in connection:
+                        if self._stop_event.is_set():
+                            break
+                        self._handle_message(message)
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"newHeads subscription dropped: {e}. Reconnecting in {self.reconnect_delay}s.")
+            finally:
+                self._connection = None
+                self.subscription_id = None
+            self._notify_disconnect()
+            self._stop_event.wait(self.reconnect_delay)
+
+    def _notify_disconnect(self):
+        """Invoke the on_disconnect callback, if any."""
+        if self.on_disconnect is None:
+            return
+        try:
+            self.on_disconnect()
+        except Exception as e:
+            logger.warning(f"Disconnect listener failed: {e}")
+
+    def _handle_message(self, message: Any):
+        """Dispatch a raw WebSocket message."""
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring non-JSON subscription message: {message!r}")
+            return
+
+        if payload.get("id") == 1:
+            if "error" in payload:
+                raise ConfigurationError(f"eth_subscribe failed: {payload['error']}")
+            self.subscription_id = payload.get("result")
+            logger.debug(f"Subscribed to newHeads: {self.subscription_id}")
+            return
+
+        if payload.get("method") != "eth_subscription":
+            return
+        params = payload.get("params") or {}
+        header = params.get("result")
+        if not isinstance(header, dict):
+            return
+
+        try:
+            self.on_head(parse_block_header(header))
+        except Exception as e:
+            logger.warning(f"Block listener failed: {e}")
@@ -1,11 +1,24 @@
+import numbers
 from decimal import Decimal
-from typing import Union
+from typing import List, Sequence, Union
 from web3 import Web3
 
+# Try to import optional dependencies
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from . import numeric
+from .exceptions import ConfigurationError
+
 def wei_to_decimal(value: int, decimals: int = 18) -> Decimal:
     """
     Convert a Wei value to a human-readable Decimal.
     
+    The conversion is exact (it does not use the global 28-digit context).
+    
     Args:
         value: The value in Wei.
         decimals: The number of decimals for the token (default 18).
@@ -13,12 +26,101 @@ def wei_to_decimal(value: int, decimals: int = 18) -> Decimal:
     Returns:
         Decimal: The human-readable value.
     """
-    return Decimal(value) / Decimal(10**decimals)
+    return numeric.to_decimal(value, decimals)
+
+def wei_to_decimal_list(
+    values: Sequence[int],
+    decimals: Union[int, Sequence[int]] = 18
+) -> List[Decimal]:
+    """
+    Convert many Wei values to human-readable Decimals without rounding.
+    
+    Same result as calling wei_to_decimal() on each value; accepts per-value
+    decimals, e.g. a pool's coin decimals.
+    
+    Args:
+        values: The values in Wei.
+        decimals: Decimals shared by all values (any integer, including
+                  NumPy integers), or one per value.
+        
+    Returns:
+        List[Decimal]: The human-readable values, in order.
+    """
+    if isinstance(decimals, numbers.Integral):
+        return numeric.to_decimal_many(values, int(decimals))
+    if len(decimals) != len(values):
+        raise ValueError(f"Got {len(decimals)} decimals for {len(values)} values")
+    return [numeric.to_decimal(value, int(dec)) for value, dec in zip(values, decimals)]
+
+def wei_to_float_array(values: Sequence[int], decimals: Union[int, Sequence[int]] = 18):
+    """
+    Convert many Wei values to a NumPy float64 array.
+    
+    Values that fit in int64 are converted in one vectorized step; larger
+    uint256 values are converted individually first. Results carry float64
+    precision (about 15-16 significant digits), so use wei_to_decimal_list()
+    when exact values matter.
+    
+    Args:
+        values: The values in Wei (a sequence or NumPy integer array).
+        decimals: Decimals shared by all values, or one per value.
+        
+    Returns:
+        numpy.ndarray: float64 array of human-readable values.
+        
+    Raises:
+        ConfigurationError: If NumPy is not installed.
+    """
+    _require_numpy()
+    
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        raw = values.astype(np.float64)
+    else:
+        try:
+            raw = np.asarray(values, dtype=np.int64).astype(np.float64)
+        except OverflowError:
+            # uint256 values beyond int64: Python's int -> float is correctly rounded
+            raw = np.fromiter((float(value) for value in values), dtype=np.float64, count=len(values))
+    
+    if isinstance(decimals, numbers.Integral):
+        return raw / float(numeric.scale_factor(int(decimals)))
+    scales = np.asarray([float(numeric.scale_factor(int(dec))) for dec in decimals], dtype=np.float64)
+    if scales.shape != raw.shape:
+        raise ValueError(f"Got {len(scales)} decimals for {len(raw)} values")
+    return raw / scales
+
+def wei_to_decimal_array(values: Sequence[int], decimals: Union[int, Sequence[int]] = 18):
+    """
+    Convert many Wei values to a NumPy object array of exact Decimals.
+    
+    Args:
+        values: The values in Wei.
+        decimals: Decimals shared by all values, or one per value.
+        
+    Returns:
+        numpy.ndarray: object array of Decimals.
+        
+    Raises:
+        ConfigurationError: If NumPy is not installed.
+    """
+    _require_numpy()
+    
+    converted = wei_to_decimal_list([int(value) for value in values], decimals)
+    result = np.empty(len(converted), dtype=object)
+    result[:] = converted
+    return result
+
+def _require_numpy():
+    """Raise a ConfigurationError if NumPy is not installed."""
+    if not NUMPY_AVAILABLE:
+        raise ConfigurationError("The 'numpy' package is required for array conversions.")
 
 def decimal_to_wei(value: Union[int, float, Decimal, str], decimals: int = 18) -> int:
     """
     Convert a human-readable value to Wei.
     
+    Digits beyond `decimals` are truncated.
+    
     Args:
         value: The human-readable value.
         decimals: The number of decimals for the token (default 18).
@@ -26,7 +128,7 @@ def decimal_to_wei(value: Union[int, float, Decimal, str], decimals: int = 18) -
     Returns:
         int: The value in Wei.
     """
-    return int(Decimal(str(value)) * Decimal(10**decimals))
+    return numeric.to_raw(value, decimals)
 
 def format_balance(value: Decimal, symbol: str = "") -> str:
     """
@@ -0,0 +1,267 @@
+"""
+Offline veFXN voting power.
+
+veFXN follows Curve's VotingEscrow: a lock of `amount` FXN ending at `end`
+has slope `amount // MAX_LOCK_TIME` and voting power
+`slope * (end - t)` at time t, reaching zero at `end`. Once the locks are
+read, power at any future time can be computed without RPC calls.
+
+`GaugeSweep` holds gauge-controller weights read in one request and
+optimizes vote allocations offline.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import utils
+
+WEEK = 7 * 86400
+
+# veFXN maximum lock time (4 years)
+MAX_LOCK_TIME = 4 * 365 * 86400
+
+
+@dataclass(frozen=True)
+class VeLock:
+    """A veFXN lock: raw FXN amount (18 decimals) and unlock timestamp."""
+    amount: int
+    end: int
+
+    @property
+    def slope(self) -> int:
+        """Raw voting power lost per second."""
+        return self.amount // MAX_LOCK_TIME
+
+    def raw_power_at(self, timestamp: int) -> int:
+        """Raw voting power at a timestamp, as `balanceOf(account, timestamp)` returns it."""
+        if timestamp >= self.end:
+            return 0
+        return self.slope * (self.end - timestamp)
+
+    def power_at(self, timestamp: int) -> Decimal:
+        """Voting power at a timestamp."""
+        return utils.wei_to_decimal(self.raw_power_at(timestamp), 18)
+
+
+class VotingPowerCalculator:
+    """
+    Voting power for many accounts at many times, from locks read once.
+
+    `powers_at()` and `total_power_at()` are exact (integer arithmetic like
+    the contract). `power_matrix()` computes the whole accounts x timestamps
+    grid in one vectorized NumPy pass for analytics.
+
+    Example:
+        calculator = client.get_vefxn_power_calculator(accounts)
+        weeks = [now + i * WEEK for i in range(52)]
+        matrix = calculator.power_matrix(weeks)  # shape (len(accounts), 52)
+    """
+
+    def __init__(self, locks: Dict[str, VeLock]):
+        """
+        Initialize the calculator.
+
+        Args:
+            locks: Lock per account address.
+        """
+        self.locks = dict(locks)
+        self.accounts: List[str] = list(self.locks)
+
+    def power_at(self, account: str, timestamp: int) -> Decimal:
+        """Voting power of one account at a timestamp."""
+        return self.locks[account].power_at(timestamp)
+
+    def powers_at(self, timestamps: Sequence[int]) -> Dict[str, List[Decimal]]:
+        """
+        Exact voting power of every account at every timestamp.
+
+        Returns:
+            Dict mapping account to its powers, in timestamp order.
+        """
+        return {
+            account: utils.wei_to_decimal_list([lock.raw_power_at(t) for t in timestamps], 18)
+            for account, lock in self.locks.items()
+        }
+
+    def total_power_at(self, timestamp: int, accounts: Optional[Iterable[str]] = None) -> Decimal:
+        """Exact combined voting power of all (or the given) accounts at a timestamp."""
+        selected = self.accounts if accounts is None else accounts
+        return utils.wei_to_decimal(sum(self.locks[a].raw_power_at(timestamp) for a in selected), 18)
+
+    def power_matrix(self, timestamps: Sequence[int]):
+        """
+        Voting power of every account at every timestamp, as float64.
+
+        Rows follow `self.accounts` and columns follow `timestamps`.
+
+        Returns:
+            numpy.ndarray: Array of shape (accounts, timestamps).
+
+        Raises:
+            ConfigurationError: If NumPy is not installed.
+        """
+        utils._require_numpy()
+        np = utils.np
+        slopes = utils.wei_to_float_array([lock.slope for lock in self.locks.values()], 18)
+        ends = np.array([lock.end for lock in self.locks.values()], dtype=np.float64)
+        times = np.asarray(timestamps, dtype=np.float64)
+        remaining = np.clip(ends[:, None] - times[None, :], 0, None)
+        return slopes[:, None] * remaining
+
+
+# Full vote allocation in GaugeController basis points
+VOTE_POWER_BPS = 10000
+
+# A gauge vote cannot be changed for 10 days after it was cast
+WEIGHT_VOTE_DELAY = 10 * 86400
+
+
+@dataclass
+class GaugeVoteState:
+    """
+    One gauge in a gauge-controller sweep.
+
+    `weight` is the gauge's vote weight in veFXN and `relative_weight` its
+    share of emissions. The user fields describe the swept account's current
+    vote and its share of the gauge's working supply (None if unknown).
+    """
+    gauge: str
+    label: str
+    gauge_type: Optional[int] = None
+    weight: Optional[Decimal] = None
+    relative_weight: Optional[Decimal] = None
+    type_weight: Optional[Decimal] = None
+    user_power: int = 0
+    user_slope: int = 0
+    user_vote_end: int = 0
+    last_user_vote: int = 0
+    stake_share: Optional[Decimal] = None
+
+    def user_vote_locked(self, timestamp: int) -> bool:
+        """Whether the account's vote for this gauge cannot be changed yet."""
+        return self.last_user_vote + WEIGHT_VOTE_DELAY > timestamp
+
+
+@dataclass
+class VoteAllocation:
+    """
+    A vote allocation and its projected effect.
+
+    `votes` maps gauge label to basis points (out of 10000). Emission shares
+    are the fraction of all gauge emissions that would reach the account's
+    positions at the next epoch.
+    """
+    votes: Dict[str, int]
+    projected_emission_share: float
+    current_emission_share: float
+    locked: List[str]
+
+    def vote_changes(self, current: Dict[str, int]) -> List[Tuple[str, int]]:
+        """
+        Votes to cast, as (label, bps), decreases first.
+
+        The controller rejects a vote that would take the account above
+        10000 bps in total, so freed power must be released before it is
+        reassigned.
+        """
+        changes = [(label, bps) for label, bps in self.votes.items() if current.get(label, 0) != bps]
+        return sorted(changes, key=lambda change: change[1] - current.get(change[0], 0))
+
+
+@dataclass
+class GaugeSweep:
+    """
+    Gauge-controller state read in one request.
+
+    Everything needed to project emissions is held locally, so
+    `optimize_votes()` runs offline.
+    """
+    timestamp: int
+    total_weight: Optional[Decimal]
+    gauges: Dict[str, GaugeVoteState]
+    account: Optional[str] = None
+    lock: Optional[VeLock] = None
+    user_power_used: int = 0
+
+    @property
+    def next_epoch(self) -> int:
+        """Start of the next weekly epoch, when new votes take effect."""
+        return (self.timestamp // WEEK + 1) * WEEK
+
+    def current_votes(self) -> Dict[str, int]:
+        """The account's current votes in bps, by gauge label."""
+        return {label: state.user_power for label, state in self.gauges.items() if state.user_power}
+
+    def projected_emission_share(self, votes: Dict[str, int]) -> float:
+        """
+        Fraction of emissions reaching the account's positions if it voted `votes`.
+
+        The account's existing votes are replaced by `votes` (labels missing
+        from `votes` get 0 bps); other voters' weights are held at their
+        current values.
+        """
+        next_epoch = self.next_epoch
+        power = self.lock.raw_power_at(next_epoch) / 1e18 if self.lock else 0.0
+
+        total = float(self.total_weight or 0)
+        weighted = []
+        for label, state in self.gauges.items():
+            type_weight = float(state.type_weight) if state.type_weight is not None else 1.0
+            # Remove the account's current vote, which `votes` replaces
+            old_bias = state.user_slope * max(state.user_vote_end - next_epoch, 0) / 1e18
+            base = max(float(state.weight or 0) - old_bias, 0.0)
+            new = base + power * votes.get(label, 0) / VOTE_POWER_BPS
+            total += type_weight * (new - float(state.weight or 0))
+            weighted.append((type_weight * new, float(state.stake_share or 0)))
+
+        if total <= 0:
+            return 0.0
+        return sum(weight * share for weight, share in weighted) / total
+
+    def optimize_votes(self, exclude: Optional[Iterable[str]] = None) -> VoteAllocation:
+        """
+        Allocate the account's veFXN votes to maximize emissions to its positions.
+
+        Projected emissions are a ratio of linear functions of the vote
+        weights, so the optimum puts all free power on a single gauge (or
+        leaves it unused). Every choice is evaluated exactly; votes cast in
+        the last 10 days stay where they are.
+
+        Args:
+            exclude: Gauge labels not to vote for.
+
+        Returns:
+            VoteAllocation: The best allocation, in bps per gauge label.
+        """
+        excluded = set(exclude or [])
+        current = self.current_votes()
+        locked = {
+            label: state.user_power for label, state in self.gauges.items()
+            if state.user_power and state.user_vote_locked(self.timestamp)
+        }
+        # Power the account has on gauges outside the sweep stays allocated
+        elsewhere = max(self.user_power_used - sum(current.values()), 0)
+        free = VOTE_POWER_BPS - sum(locked.values()) - elsewhere
+
+        # Unlocked votes are reset to zero unless chosen again
+        base_votes = {label: 0 for label in current}
+        base_votes.update(locked)
+
+        best_votes = base_votes
+        best_share = self.projected_emission_share(base_votes)
+        for label in self.gauges:
+            if label in locked or label in excluded or free <= 0:
+                continue
+            votes = dict(base_votes)
+            votes[label] = free
+            share = self.projected_emission_share(votes)
+            if share > best_share:
+                best_votes, best_share = votes, share
+
+        return VoteAllocation(
+            votes=best_votes,
+            projected_emission_share=best_share,
+            current_emission_share=self.projected_emission_share(current),
+            locked=sorted(locked),
+        )
@@ -0,0 +1,85 @@
+"""
+Typed snapshots and threshold rules for streaming protocol metrics.
+"""
+
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class ProtocolMetricsSnapshot:
+    """
+    Protocol health metrics read in a single multicall at one block.
+
+    Any metric whose underlying call reverted is None.
+    """
+    block_number: int
+    timestamp: Optional[int] = None
+    treasury_base_nav: Optional[Decimal] = None
+    treasury_f_nav: Optional[Decimal] = None
+    treasury_x_nav: Optional[Decimal] = None
+    treasury_total_base_token: Optional[Decimal] = None
+    treasury_collateral_ratio: Optional[Decimal] = None
+    treasury_leverage_ratio: Optional[Decimal] = None
+    v1_f_nav: Optional[Decimal] = None
+    v1_x_nav: Optional[Decimal] = None
+    v1_collateral_ratio: Optional[Decimal] = None
+    peg_keeper_active: Optional[bool] = None
+    peg_keeper_debt_ceiling: Optional[Decimal] = None
+    peg_keeper_total_debt: Optional[Decimal] = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the metric values, excluding block metadata."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("block_number", "timestamp")
+        }
+
+
+@dataclass
+class MetricThreshold:
+    """
+    Invoke a callback when a snapshot metric crosses a bound.
+
+    The callback fires once when the metric moves outside [above, below]
+    and is re-armed when it returns inside.
+
+    Example:
+        MetricThreshold(
+            metric="v1_collateral_ratio",
+            below=Decimal("1.3"),
+            callback=lambda snapshot, rule: alert(snapshot.v1_collateral_ratio)
+        )
+    """
+    metric: str
+    callback: Callable[["ProtocolMetricsSnapshot", "MetricThreshold"], None]
+    below: Optional[Decimal] = None
+    above: Optional[Decimal] = None
+    breached: bool = False
+
+    def is_breached(self, snapshot: ProtocolMetricsSnapshot) -> bool:
+        """Whether the snapshot's metric is outside the configured bounds."""
+        value = getattr(snapshot, self.metric)
+        if value is None:
+            return False
+        if self.below is not None and value < self.below:
+            return True
+        if self.above is not None and value > self.above:
+            return True
+        return False
+
+    def check(self, snapshot: ProtocolMetricsSnapshot) -> bool:
+        """
+        Evaluate the rule against a snapshot, firing the callback on a new breach.
+
+        Returns:
+            bool: True if the callback fired.
+        """
+        breached = self.is_breached(snapshot)
+        fired = breached and not self.breached
+        self.breached = breached
+        if fired:
+            self.callback(snapshot, self)
+        return fired
@@ -15,6 +15,10 @@ setup(
         "eth-utils>=2.0.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        "ws": ["websockets>=11.0"],
+        "numpy": ["numpy>=1.20"],
+    },
     author="Christopher Stampar (@cstampar)",
     author_email="cstampar@me.com",
     description="A Pythonic SDK for f(x) Protocol",
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk Wei conversions.
+
+Reports the cost per million values of converting raw uint256 amounts with
+the per-value `utils.wei_to_decimal` loop and the bulk converters.
+
+Usage:
+    python tests/benchmark_conversions.py [--count 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import local development code
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk import utils
+
+
+def best_of(repeat, fn, values):
+    """Best wall-clock time of `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(values)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="values per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per converter (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    datasets = {
+        # Up to 10 million tokens at 18 decimals: mostly beyond int64
+        "balances": [rng.randrange(0, 10**25) for _ in range(args.count)],
+        # Values that fit in int64, which NumPy converts in one step
+        "small": [rng.randrange(0, 2**62) for _ in range(args.count)],
+    }
+
+    converters = [
+        ("wei_to_decimal loop", lambda values: [utils.wei_to_decimal(v, 18) for v in values]),
+        ("wei_to_decimal_list", lambda values: utils.wei_to_decimal_list(values, 18)),
+    ]
+    if utils.NUMPY_AVAILABLE:
+        converters += [
+            ("wei_to_float_array", lambda values: utils.wei_to_float_array(values, 18)),
+            ("wei_to_decimal_array", lambda values: utils.wei_to_decimal_array(values, 18)),
+        ]
+    else:
+        print("NumPy not installed; skipping array converters.\n")
+
+    scale = 1_000_000 / args.count
+    print(f"{'converter':<24}{'dataset':<12}{'s / 1M values':>14}")
+    for name, fn in converters:
+        for dataset, values in datasets.items():
+            seconds = best_of(args.repeat, fn, values) * scale
+            print(f"{name:<24}{dataset:<12}{seconds:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Shared Multicall3 stand-in for the batched read tests.
+"""
+
+from typing import Any, Callable, List, Optional
+
+from eth_abi import encode
+
+from fx_sdk.client import _abi_type_string
+from fx_sdk.exceptions import ContractCallError
+
+
+def encoded_multicall(
+    client,
+    answer: Callable[[Any], Any],
+    batches: Optional[List[Any]] = None,
+    record_block: bool = False
+) -> Callable[..., List[Any]]:
+    """
+    Multicall that, like aggregate3, encodes every call and ABI-decodes every answer.
+
+    Args:
+        client: ProtocolClient whose `_decode_call_result()` decodes the answers.
+        answer: Returns the raw answer for a bound contract function (None for
+               a failed call).
+        batches: Optional list that receives the function names of each batch.
+        record_block: Record (names, block_identifier) instead of just the names.
+
+    Returns:
+        A replacement for `client._multicall`.
+    """
+    def multicall(calls, block_identifier="latest", **kwargs):
+        if batches is not None:
+            names = [fn.fn_name for fn in calls]
+            batches.append((names, block_identifier) if record_block else names)
+        try:
+            for fn in calls:
+                fn._encode_transaction_data()
+        except Exception as e:
+            raise ContractCallError(f"Multicall failed: {e}")
+        results = []
+        for fn in calls:
+            result = answer(fn)
+            if result is None:
+                results.append(None)
+                continue
+            types = [_abi_type_string(output) for output in fn.abi["outputs"]]
+            data = encode(types, [result] if len(types) == 1 else list(result))
+            results.append(client._decode_call_result(fn, True, data))
+        return results
+    return multicall
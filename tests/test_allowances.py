@@ -0,0 +1,211 @@
+"""
+Test suite for the allowance cache.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from hexbytes import HexBytes
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import APPROVAL_EVENT_TOPIC, ProtocolClient
+from fx_sdk.exceptions import ContractCallError
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "b0" * 20)
+TOKEN_A = Web3.to_checksum_address("0x" + "e1" * 20)
+TOKEN_B = Web3.to_checksum_address("0x" + "e2" * 20)
+POOL = Web3.to_checksum_address("0x" + "b1" * 20)
+MAX = 2**256 - 1
+E18 = 10**18
+
+
+def _approval(token, owner, spender, value, block):
+    return {
+        "address": token,
+        "topics": [
+            HexBytes(APPROVAL_EVENT_TOPIC),
+            HexBytes(b"\x00" * 12 + bytes.fromhex(owner[2:])),
+            HexBytes(b"\x00" * 12 + bytes.fromhex(spender[2:])),
+        ],
+        "data": HexBytes(value.to_bytes(32, "big")),
+        "blockNumber": block,
+    }
+
+
+class FakeChain:
+    """Answers allowance, decimals and pool reads."""
+
+    def __init__(self):
+        self.batches = []
+        self.calls = []
+        self.allowances = {(TOKEN_A, POOL): 50 * E18, (TOKEN_B, POOL): MAX}
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self.answer(fn) for fn in calls]
+
+    def answer(self, fn):
+        self.calls.append(fn.fn_name)
+        if fn.fn_name == "allowance":
+            return self.allowances[(Web3.to_checksum_address(fn.address), fn.args[1])]
+        if fn.fn_name == "coins":
+            return [TOKEN_A, TOKEN_B][fn.args[0]]
+        if fn.fn_name == "token":
+            return POOL
+        if fn.fn_name == "decimals":
+            return 18
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+
+class TestAllowanceCache(unittest.TestCase):
+    """Test suite for load_allowances(), sync_allowance_cache() and the writers' use of them."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.block_number = 100
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        self.client.account = Mock()
+        self.client.address = ALICE
+        self.client.use_permit = False
+
+        self.sent = []
+
+        def send(contract_function, value=0, nonce=None, default_gas=None, wait=True):
+            self.sent.append((contract_function.fn_name, contract_function.args))
+            return "0x" + "ab" * 32
+
+        self.client._build_and_send_transaction = Mock(side_effect=send)
+
+    def _calls(self):
+        return patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                     side_effect=lambda fn, **kwargs: self.chain.answer(fn))
+
+    def _cached(self, token):
+        return self.client._allowance_cache.get((ALICE, token, POOL))
+
+    def test_load_in_one_multicall(self):
+        """All pairs are read in one batch and cached."""
+        allowances = self.client.load_allowances([(TOKEN_A, POOL), (TOKEN_B.lower(), POOL), (TOKEN_A, POOL)])
+
+        self.assertEqual(allowances, {(TOKEN_A, POOL): 50 * E18, (TOKEN_B, POOL): MAX})
+        self.assertEqual(self.chain.batches, [["allowance", "allowance"]])
+        self.assertEqual(self._cached(TOKEN_A), 50 * E18)
+        self.assertEqual(self.client._allowance_sync_block, 100)
+
+    def test_swap_uses_cache(self):
+        """A cached allowance is not re-read; a successful swap spends it."""
+        self.client.load_allowances([(TOKEN_A, POOL), (TOKEN_B, POOL)])
+        self.chain.calls.clear()
+
+        with self._calls():
+            self.client.curve_swap(POOL, TOKEN_A, TOKEN_B, 20, min_amount_out=19)
+            self.client.curve_swap(POOL, TOKEN_B, TOKEN_A, 20, min_amount_out=19)
+
+        self.assertNotIn("allowance", self.chain.calls)
+        self.assertEqual([name for name, _ in self.sent], ["exchange", "exchange"])
+        self.assertEqual(self._cached(TOKEN_A), 30 * E18)
+        # Unlimited allowances are not decremented
+        self.assertEqual(self._cached(TOKEN_B), MAX)
+
+    def test_approval_written_through(self):
+        """A short cached allowance is re-read, then set from the approval."""
+        self.client._allowance_cache[(ALICE, TOKEN_A, POOL)] = 5 * E18
+        self.chain.allowances[(TOKEN_A, POOL)] = 10 * E18
+
+        with self._calls():
+            self.client.curve_swap(POOL, TOKEN_A, TOKEN_B, 20, min_amount_out=19)
+
+        self.assertEqual([name for name, _ in self.sent], ["approve", "exchange"])
+        self.assertEqual(self._cached(TOKEN_A), 0)
+
+        with self._calls():
+            self.client.approve(TOKEN_A, POOL, "max")
+        self.assertEqual(self._cached(TOKEN_A), MAX)
+
+    def test_failed_write_forgets_entry(self):
+        """A write that may not have spent the allowance drops its entry."""
+        self.client.load_allowances([(TOKEN_A, POOL)])
+        self.client._build_and_send_transaction = Mock(side_effect=Exception("rejected"))
+
+        with self._calls(), self.assertRaises(ContractCallError):
+            self.client.curve_swap(POOL, TOKEN_A, TOKEN_B, 20, min_amount_out=19)
+
+        self.assertIsNone(self._cached(TOKEN_A))
+
+    def test_add_liquidity_checks_cache(self):
+        """Every deposited coin is checked against and spent from the cache."""
+        self.client.load_allowances([(TOKEN_A, POOL), (TOKEN_B, POOL)])
+
+        with self._calls():
+            self.client.curve_add_liquidity(POOL, [10, 0], min_lp_tokens=0)
+
+        self.assertEqual([name for name, _ in self.sent], ["add_liquidity"])
+        self.assertEqual(self._cached(TOKEN_A), 40 * E18)
+
+    def test_sync_from_approval_events(self):
+        """Cached entries touched by Approval events are re-read in one batch at the sync block."""
+        self.client.load_allowances([(TOKEN_A, POOL), (TOKEN_B, POOL)])
+        self.client.log_block_range = 10
+        self.mock_w3.eth.get_logs.side_effect = [
+            [_approval(TOKEN_A, ALICE, POOL, 7, 105), _approval(TOKEN_A, ALICE, POOL, 3, 108)],
+            [_approval(TOKEN_B, ALICE, BOB, 9, 112)],
+        ]
+        self.chain.allowances[(TOKEN_A, POOL)] = 3
+
+        updated = self.client.sync_allowance_cache(to_block=115)
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(self._cached(TOKEN_A), 3)
+        self.assertEqual(self.chain.batches[-1], ["allowance"])
+        self.assertEqual(self.client._multicall.call_args[1]["block_identifier"], 115)
+        self.assertEqual(self._cached(TOKEN_B), MAX)
+        self.assertNotIn((ALICE, TOKEN_B, BOB), self.client._allowance_cache)
+        self.assertEqual(self.client._allowance_sync_block, 115)
+
+        filters = [call[0][0] for call in self.mock_w3.eth.get_logs.call_args_list]
+        self.assertEqual([(f["fromBlock"], f["toBlock"]) for f in filters], [(101, 110), (111, 115)])
+        self.assertEqual(filters[0]["topics"], [APPROVAL_EVENT_TOPIC, ["0x" + "00" * 12 + ALICE[2:].lower()]])
+
+    def test_sync_after_silent_spend(self):
+        """An allowance spent by transferFrom() without an Approval event is not left at the approved value."""
+        self.client.load_allowances([(TOKEN_A, POOL)])
+        # approve() emits Approval(10), then the spender's transferFrom() uses 6 without an event
+        self.chain.allowances[(TOKEN_A, POOL)] = 4 * E18
+        self.mock_w3.eth.get_logs.return_value = [_approval(TOKEN_A, ALICE, POOL, 10 * E18, 105)]
+
+        self.assertEqual(self.client.sync_allowance_cache(to_block=110), 1)
+        self.assertEqual(self._cached(TOKEN_A), 4 * E18)
+
+    def test_sync_failure(self):
+        """Failed log queries leave the cursor in place."""
+        self.client.load_allowances([(TOKEN_A, POOL)])
+        self.mock_w3.eth.get_logs.side_effect = Exception("range too large")
+
+        with self.assertRaises(ContractCallError):
+            self.client.sync_allowance_cache(to_block=120)
+        self.assertEqual(self.client._allowance_sync_block, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
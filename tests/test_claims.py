@@ -0,0 +1,235 @@
+"""
+Test suite for the batch-aware reward claim scheduler.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from hexbytes import HexBytes
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.rewards import CONVEX_VAULT_CLAIM, GAUGE_CLAIM, REBALANCE_POOL_CLAIM, RewardClaim
+from fx_sdk.exceptions import ConfigurationError, ContractCallError, FXProtocolError
+from fx_sdk import constants
+from tests.fake_multicall import encoded_multicall
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "a2" * 20)
+GAUGE_A = Web3.to_checksum_address("0x" + "d1" * 20)
+GAUGE_B = Web3.to_checksum_address("0x" + "d2" * 20)
+GAUGE_EMPTY = Web3.to_checksum_address("0x" + "d3" * 20)
+VAULT = Web3.to_checksum_address("0x" + "c1" * 20)
+POOL = Web3.to_checksum_address("0x" + "b1" * 20)
+FXN = Web3.to_checksum_address(constants.FXN)
+WSTETH = Web3.to_checksum_address("0x7f39C581F595B53c5cb19bD0b3f8dA6c935E2Ca0")
+E18 = 10**18
+GWEI = 10**9
+
+
+class FakeChain:
+    """Answers claimable reads for gauges, a Convex vault and a rebalance pool."""
+
+    def __init__(self):
+        self.batches = []
+        self.gauge_tokens = {GAUGE_A: [FXN], GAUGE_B: [FXN, WSTETH], GAUGE_EMPTY: [FXN]}
+        self.claimable = {
+            (GAUGE_A, FXN): 50 * E18,
+            (GAUGE_B, FXN): E18 // 100,
+            (GAUGE_B, WSTETH): 0,
+            (GAUGE_EMPTY, FXN): 0,
+            (POOL, WSTETH): E18,
+        }
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self.answer(fn) for fn in calls]
+
+    def answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        if fn.fn_name == "getActiveRewardTokens":
+            return self.gauge_tokens[target]
+        if fn.fn_name == "claimable":
+            return self.claimable[(target, fn.args[1])]
+        if fn.fn_name == "earned":
+            return ([FXN], [2 * E18])
+        if fn.fn_name == "decimals":
+            return 18
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+
+class TestRewardClaims(unittest.TestCase):
+    """Test suite for plan_reward_claims() and send_reward_claims()."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.chain_id = 1
+        self.mock_w3.eth.get_transaction_count.return_value = 7
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        self.client._estimate_gas_batch = Mock(side_effect=lambda estimates: [100000] * len(estimates))
+        self.client.fee_oracle.get_fee_params = Mock(
+            return_value={"maxFeePerGas": 40 * GWEI, "maxPriorityFeePerGas": 2 * GWEI}
+        )
+        self.client.fee_oracle.get_base_fee = Mock(return_value=10 * GWEI)
+
+        self.client.account = Mock()
+        self.client.address = ALICE
+        self.sent = []
+
+        def send(tx):
+            self.sent.append(tx)
+            return HexBytes(bytes([len(self.sent)]) * 32)
+
+        self.client._send_built_transaction = Mock(side_effect=send)
+        self.client._wait_for_transaction_receipt = Mock(return_value=Mock(status=1))
+
+    def _plan(self, **kwargs):
+        return self.client.plan_reward_claims(
+            gauges=[GAUGE_A, GAUGE_B, GAUGE_EMPTY],
+            convex_vaults=[VAULT],
+            rebalance_pools={POOL: [WSTETH]},
+            **kwargs
+        )
+
+    def test_claimables_in_one_multicall(self):
+        """Cached token lists let every target be checked in one batch."""
+        self._plan()
+        self.chain.batches.clear()
+
+        plan = self._plan()
+
+        claim_batches = [batch for batch in self.chain.batches if "decimals" not in batch]
+        self.assertEqual(len(claim_batches), 1)
+        self.assertEqual([claim.kind for claim in plan],
+                         [GAUGE_CLAIM, GAUGE_CLAIM, GAUGE_CLAIM, CONVEX_VAULT_CLAIM, REBALANCE_POOL_CLAIM])
+        self.assertEqual(plan[1].amounts, {FXN: Decimal("0.01"), WSTETH: Decimal(0)})
+
+    def test_empty_claims_skipped(self):
+        """Targets with nothing claimable are not estimated or sent."""
+        plan = self._plan()
+
+        self.assertEqual(plan[2].reason, "nothing to claim")
+        self.assertFalse(plan[2].selected)
+        estimates = self.client._estimate_gas_batch.call_args[0][0]
+        self.assertEqual(len(estimates), 4)
+
+    def test_dust_below_gas_cost_skipped(self):
+        """Priced rewards worth less than gas at oracle fees are skipped."""
+        plan = self._plan(prices={FXN: "0.001", WSTETH: "1.1"})
+
+        # 100k gas at (10 + 2) gwei
+        self.assertEqual(plan[0].gas_cost, Decimal("0.0012"))
+        self.assertTrue(plan[0].selected)
+        self.assertEqual(plan[1].reason, "rewards worth less than gas")
+        self.assertTrue(plan[3].selected)
+        self.assertEqual(plan[4].value, Decimal("1.1"))
+
+    def test_unpriced_rewards_claimed(self):
+        """Without prices every non-empty claim is selected."""
+        plan = self._plan()
+
+        self.assertEqual([claim.selected for claim in plan], [True, True, False, True, True])
+        self.assertIsNone(plan[0].value)
+
+    def test_pipelined_with_local_nonces(self):
+        """Claims are sent back to back with sequential nonces and shared fees."""
+        plan = self._plan(prices={FXN: "0.001", WSTETH: "1.1"})
+
+        tx_hashes = self.client.send_reward_claims(plan)
+
+        self.assertEqual(len(tx_hashes), 3)
+        self.assertEqual([tx["nonce"] for tx in self.sent], [7, 8, 9])
+        self.assertEqual([tx["to"] for tx in self.sent], [GAUGE_A, VAULT, POOL])
+        self.assertTrue(all(tx["gas"] == 100000 and tx["maxFeePerGas"] == 40 * GWEI for tx in self.sent))
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with(ALICE, 'pending')
+        self.assertEqual(self.client._wait_for_transaction_receipt.call_count, 3)
+
+    def test_failed_send_stops_pipeline(self):
+        """Later claims are not sent behind a missing nonce."""
+        self.client._send_built_transaction = Mock(side_effect=[HexBytes(b"\x01" * 32), Exception("rejected")])
+
+        tx_hashes = self.client.send_reward_claims(self._plan())
+
+        self.assertEqual(len(tx_hashes), 1)
+        self.assertEqual(self.client._send_built_transaction.call_count, 2)
+
+    def test_reverted_claim_not_returned(self):
+        """Only successful claims are returned when waiting."""
+        self.client._wait_for_transaction_receipt = Mock(side_effect=[Mock(status=1), Mock(status=0)] * 2)
+
+        tx_hashes = self.client.send_reward_claims(self._plan())
+
+        self.assertEqual(len(tx_hashes), 2)
+
+    def test_send_requires_signer(self):
+        """Sending needs a private key or browser wallet."""
+        self.client.account = None
+        plan = [RewardClaim(kind=GAUGE_CLAIM, target=GAUGE_A, amounts={}, gas=1, gas_cost=Decimal(0), selected=True)]
+
+        with self.assertRaises(ConfigurationError):
+            self.client.send_reward_claims(plan)
+
+    def test_send_rejects_plan_for_other_account(self):
+        """A plan priced for another account is not sent from the connected wallet."""
+        plan = self._plan(account_address=BOB)
+
+        with self.assertRaises(FXProtocolError):
+            self.client.send_reward_claims(plan)
+        self.assertEqual(self.sent, [])
+
+    def test_claim_all_gauge_rewards(self):
+        """Only configured gauges with rewards are claimed."""
+        gauges = {"a": GAUGE_A, "empty": GAUGE_EMPTY}
+        with patch.object(constants, "GAUGES", gauges):
+            tx_hashes = self.client.claim_all_gauge_rewards(wait=False)
+
+        self.assertEqual(len(tx_hashes), 1)
+        self.assertEqual(self.sent[0]["to"], GAUGE_A)
+
+    def test_decoded_reward_tokens(self):
+        """Reward tokens decoded in lowercase are checksummed before being passed back."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain.answer, self.chain.batches))
+
+        self._plan()
+        plan = self._plan()
+
+        self.assertEqual([claim.reason for claim in plan if claim.reason], ["nothing to claim"])
+        self.assertEqual(plan[0].amounts, {FXN: Decimal(50)})
+        self.assertEqual(plan[3].amounts, {FXN: Decimal(2)})
+        self.assertEqual(self.client._gauge_reward_tokens_cache[GAUGE_B], [FXN, WSTETH])
+
+    def test_without_multicall(self):
+        """Claimable amounts are read one call at a time when Multicall3 fails."""
+        self.client._multicall = Mock(side_effect=ContractCallError("Multicall failed"))
+        self.client._token_decimals_cache.update({FXN: 18, WSTETH: 18})
+
+        with patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                   side_effect=lambda fn, **kwargs: self.chain.answer(fn)):
+            plan = self.client.plan_reward_claims(gauges=[GAUGE_A])
+
+        self.assertEqual(plan[0].amounts, {FXN: Decimal(50)})
+
+
+if __name__ == '__main__':
+    unittest.main()
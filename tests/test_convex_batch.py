@@ -0,0 +1,370 @@
+"""
+Test suite for batched Convex vault queries.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import threading
+import time
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient, MULTICALL3_ABI
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants
+from tests.fake_multicall import encoded_multicall
+
+VAULT_A = Web3.to_checksum_address("0x" + "a1" * 20)
+VAULT_B = Web3.to_checksum_address("0x" + "b2" * 20)
+VAULT_BAD = Web3.to_checksum_address("0x" + "c3" * 20)
+GAUGE = Web3.to_checksum_address("0x" + "d4" * 20)
+LP_TOKEN = Web3.to_checksum_address("0x" + "e5" * 20)
+FXN = Web3.to_checksum_address("0x365AccFCa291e7D3914637ABf1F7635dB165Bb09")
+USDC = Web3.to_checksum_address("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+OWNER = Web3.to_checksum_address("0x" + "11" * 20)
+
+
+class FakeChain:
+    """Answers multicall batches by function name and records each batch."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.batches = []
+        self.lock = threading.Lock()
+        self.vault_map = {37: VAULT_A, 36: VAULT_B}
+        self.balances = {VAULT_A: 10**18, VAULT_B: 5 * 10**17}
+        self.earned = {
+            VAULT_A: ([FXN, USDC], [2 * 10**18, 3 * 10**6]),
+            VAULT_B: ([FXN, USDC], [10**18, 10**6]),
+        }
+        self.decimals = {LP_TOKEN: 18, FXN: 18, USDC: 6}
+
+    def multicall(self, calls, **kwargs):
+        time.sleep(self.latency)
+        with self.lock:
+            self.batches.append([fn.fn_name for fn in calls])
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        if target == VAULT_BAD:
+            return None
+        if fn.fn_name == "vaultMap":
+            return self.vault_map.get(fn.args[0], "0x" + "0" * 40)
+        if fn.fn_name == "owner":
+            return OWNER
+        if fn.fn_name == "gaugeAddress":
+            return GAUGE
+        if fn.fn_name == "stakingToken":
+            return LP_TOKEN
+        if fn.fn_name == "decimals":
+            return self.decimals[target]
+        if fn.fn_name == "balanceOf":
+            return self.balances[fn.args[0]]
+        if fn.fn_name == "earned":
+            tokens, amounts = self.earned[target]
+            return [tokens, amounts]
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+
+class TestConvexVaultBatch(unittest.TestCase):
+    """Test suite for multicall-backed vault balance and reward batches."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+
+    def test_balances_batch(self):
+        """Balances are read in one multicall after vault fields are resolved."""
+        balances = self.client.get_vault_balances_batch([VAULT_A, VAULT_B])
+
+        self.assertEqual(balances, {VAULT_A: Decimal("1"), VAULT_B: Decimal("0.5")})
+        self.assertEqual(self.chain.batches[-1], ["balanceOf", "balanceOf"])
+        self.assertEqual(self.chain.batches[1], ["decimals"])  # one shared staking token
+
+    def test_vault_fields_cached(self):
+        """A second batch only reads balances."""
+        self.client.get_vault_balances_batch([VAULT_A, VAULT_B])
+        self.chain.batches.clear()
+
+        self.client.get_vault_balances_batch([VAULT_A, VAULT_B])
+
+        self.assertEqual(self.chain.batches, [["balanceOf", "balanceOf"]])
+
+    def test_invalid_vault_reports_zero(self):
+        """Invalid vaults get a zero balance like the per-vault path."""
+        balances = self.client.get_vault_balances_batch([VAULT_A, VAULT_BAD])
+
+        self.assertEqual(balances[VAULT_A], Decimal("1"))
+        self.assertEqual(balances[VAULT_BAD], Decimal("0"))
+
+    def test_balances_fall_back_without_multicall(self):
+        """If the multicall fails, vaults are queried individually."""
+        self.client._multicall = Mock(side_effect=ContractCallError("no multicall"))
+        self.client.get_convex_vault_balance = Mock(return_value=Decimal("7"))
+
+        balances = self.client.get_vault_balances_batch([VAULT_A])
+
+        self.assertEqual(balances, {VAULT_A: Decimal("7")})
+
+
+    def test_rewards_batch(self):
+        """earned() calls share one multicall and decimals are resolved per unique token."""
+        rewards = self.client.get_vault_rewards_batch([VAULT_A, VAULT_B])
+
+        self.assertEqual(rewards[VAULT_A]["token_addresses"], [FXN, USDC])
+        self.assertEqual(rewards[VAULT_A]["amounts"], {FXN: Decimal("2"), USDC: Decimal("3")})
+        self.assertEqual(rewards[VAULT_B]["amounts"], {FXN: Decimal("1"), USDC: Decimal("1")})
+        self.assertIn(["earned", "earned"], self.chain.batches)
+        self.assertIn(["decimals", "decimals"], self.chain.batches)
+
+    def test_rewards_decoded_addresses(self):
+        """Reward token keys are checksummed like get_convex_vault_rewards()."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+
+        rewards = self.client.get_vault_rewards_batch([VAULT_A])
+
+        self.assertEqual(rewards[VAULT_A]["token_addresses"], [FXN, USDC])
+        self.assertEqual(rewards[VAULT_A]["amounts"][FXN], Decimal("2"))
+
+    def test_rewards_decimals_cached(self):
+        """Repeated batches only call earned()."""
+        self.client.get_vault_rewards_batch([VAULT_A, VAULT_B])
+        self.chain.batches.clear()
+
+        self.client.get_vault_rewards_batch([VAULT_A, VAULT_B])
+
+        self.assertEqual(self.chain.batches, [["earned", "earned"]])
+
+    def test_rewards_invalid_vault(self):
+        """Invalid vaults get an empty rewards structure."""
+        rewards = self.client.get_vault_rewards_batch([VAULT_BAD])
+
+        self.assertEqual(rewards[VAULT_BAD], {"token_addresses": [], "amounts": {}})
+
+
+    def test_all_user_vaults_single_lookup(self):
+        """Vault discovery is one vaultMap multicall across all pools."""
+        vaults = self.client.get_all_user_vaults(OWNER)
+
+        self.assertEqual(len(self.chain.batches), 1)
+        self.assertEqual(vaults[37], VAULT_A)
+        self.assertEqual(vaults[36], VAULT_B)
+        self.assertIsNone(vaults[0])
+
+    def test_all_user_vaults_event_fallback(self):
+        """Failed registry lookups fall back to per-pool event queries."""
+        self.client._multicall = Mock(side_effect=ContractCallError("no multicall"))
+        self.client.get_convex_vault_address = Mock(
+            side_effect=lambda user, pool_id, from_block: VAULT_A if pool_id == 37 else None
+        )
+
+        vaults = self.client.get_all_user_vaults(OWNER, max_workers=4)
+
+        self.assertEqual(vaults[37], VAULT_A)
+        self.assertIsNone(vaults[36])
+
+    def test_user_vaults_summary(self):
+        """The summary combines discovery, balances and rewards in a few batches."""
+        summary = self.client.get_user_vaults_summary(OWNER)
+
+        self.assertEqual(summary["total_vaults"], 2)
+        self.assertEqual(summary["vaults"][37]["balance"], Decimal("1"))
+        self.assertEqual(summary["vaults"][36]["rewards"]["amounts"][USDC], Decimal("1"))
+        self.assertEqual(summary["vaults"][37]["pool_info"]["pool_id"], 37)
+        self.assertIsNone(summary["vaults"][0]["balance"])
+        self.assertEqual(len(self.chain.batches), 6)
+
+        self.chain.batches.clear()
+        self.client.get_user_vaults_summary(OWNER)
+        self.assertEqual(sorted(b[0] for b in self.chain.batches), ["balanceOf", "earned", "vaultMap"])
+
+    def test_user_vaults_summary_failed_reads(self):
+        """Unreadable vaults report None, not an empty vault; reward keys are checksummed."""
+        self.chain.vault_map[36] = VAULT_BAD
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+
+        summary = self.client.get_user_vaults_summary(OWNER)
+
+        self.assertIsNone(summary["vaults"][36]["balance"])
+        self.assertIsNone(summary["vaults"][36]["rewards"])
+        self.assertEqual(summary["vaults"][37]["balance"], Decimal("1"))
+        self.assertEqual(summary["vaults"][37]["rewards"]["amounts"][FXN], Decimal("2"))
+
+    def test_user_vaults_summary_overlaps_stages(self):
+        """Balance and reward pipelines run concurrently."""
+        self.chain.latency = 0.2
+        self.client.get_user_vaults_summary(OWNER)  # warm the caches
+        self.chain.batches.clear()
+
+        start = time.monotonic()
+        self.client.get_user_vaults_summary(OWNER)
+        elapsed = time.monotonic() - start
+
+        # vaultMap, then balanceOf and earned in parallel: ~2 latencies, not 3
+        self.assertEqual(len(self.chain.batches), 3)
+        self.assertLess(elapsed, 0.5)
+
+
+REWARD_POOL_A = Web3.to_checksum_address("0x" + "f1" * 20)
+REWARD_POOL_B = Web3.to_checksum_address("0x" + "f2" * 20)
+DEPOSIT_TOKEN = Web3.to_checksum_address("0x" + "f3" * 20)
+ZERO = "0x" + "0" * 40
+
+
+class FakeBoosterChain:
+    """Answers Booster poolInfo and BaseRewardPool calls in multicall batches."""
+
+    def __init__(self):
+        self.batches = []
+        self.pool_info = {
+            37: [LP_TOKEN, DEPOSIT_TOKEN, GAUGE, REWARD_POOL_A, ZERO, False],
+            36: [LP_TOKEN, DEPOSIT_TOKEN, GAUGE, REWARD_POOL_B, ZERO, True],
+            35: [LP_TOKEN, DEPOSIT_TOKEN, GAUGE, ZERO, ZERO, False],
+        }
+        self.total_supply = {REWARD_POOL_A: 250 * 10**18, REWARD_POOL_B: 10**18}
+        self.period_finish = {REWARD_POOL_A: 2000, REWARD_POOL_B: 500}
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        name = fn.fn_name
+        if name == "poolInfo":
+            return self.pool_info.get(fn.args[0])
+        if name == "getCurrentBlockTimestamp":
+            return 1000
+        if name == "totalSupply":
+            return self.total_supply[target]
+        if name == "stakingToken":
+            return DEPOSIT_TOKEN
+        if name == "rewardToken":
+            return USDC
+        if name == "rewardRate":
+            return 5 * 10**6
+        if name == "periodFinish":
+            return self.period_finish[target]
+        if name == "decimals":
+            return {DEPOSIT_TOKEN: 18, USDC: 6}[target]
+        raise AssertionError(f"Unexpected call {name}")
+
+
+class TestConvexPoolSweep(unittest.TestCase):
+    """Test suite for the poolInfo cache and batched pool sweeps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.client.multicall = Web3().eth.contract(address=constants.MULTICALL3, abi=MULTICALL3_ABI)
+        self.chain = FakeBoosterChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+
+    def test_overview(self):
+        """TVL and reward data are converted with cached token decimals."""
+        overview = self.client.get_convex_pools_overview([37, 36, 35])
+
+        self.assertEqual(overview[37]["tvl"], Decimal("250"))
+        self.assertEqual(overview[37]["reward_token"], USDC)
+        self.assertEqual(overview[37]["reward_rate"], Decimal("5"))
+        self.assertTrue(overview[37]["rewards_active"])
+        self.assertFalse(overview[36]["rewards_active"])
+        self.assertTrue(overview[36]["shutdown"])
+        self.assertIsNone(overview[35]["tvl"])
+        self.assertIsNone(overview[35]["base_reward_pool"])
+
+    def test_warm_sweep_is_one_multicall(self):
+        """Once poolInfo and reward pool tokens are cached, a sweep is one round-trip."""
+        self.client.get_convex_pools_overview([37, 36])
+        self.assertEqual(len(self.chain.batches), 3)
+
+        self.chain.batches.clear()
+        self.client.get_convex_pools_overview([37, 36])
+
+        self.assertEqual(len(self.chain.batches), 1)
+        self.assertNotIn("poolInfo", self.chain.batches[0])
+        self.assertNotIn("stakingToken", self.chain.batches[0])
+
+    def test_decimals_only_for_selected_pools(self):
+        """Tokens cached for other reward pools are not added to the decimals batch."""
+        # Decimals of FXN would be read (and fail) if pool 36's cached tokens were included
+        self.client.get_convex_pools_overview([36])
+        self.client._convex_reward_pool_cache[REWARD_POOL_B]["staking_token"] = FXN
+        self.client._token_decimals_cache.clear()
+
+        self.chain.batches.clear()
+        overview = self.client.get_convex_pools_overview([37], include_rewards=False)
+
+        self.assertEqual(self.chain.batches[-1], ["decimals"])
+        self.assertEqual(overview[37]["tvl"], Decimal("250"))
+
+    def test_pool_info_refresh_skips_shutdown_pools(self):
+        """Expired entries are re-read unless the pool is shut down."""
+        self.client.refresh_convex_pool_info([37, 36])
+        self.client.convex_pool_info_max_age = 0
+
+        self.chain.batches.clear()
+        shutdown = self.client.refresh_convex_pool_info([37, 36])
+
+        self.assertEqual(shutdown, {37: False, 36: True})
+        self.assertEqual(self.chain.batches, [["poolInfo"]])
+
+    def test_single_pool_reads_share_cache(self):
+        """Per-pool queries reuse cached poolInfo."""
+        self.client.refresh_convex_pool_info([37])
+        self.client._get_contract = Mock(side_effect=AssertionError("booster should not be called"))
+
+        self.assertEqual(self.client.get_convex_pool_gauge_address(37), GAUGE)
+
+    def test_refreshed_pool_info_checksummed(self):
+        """Cached poolInfo addresses from decoded results match the per-pool read."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+
+        self.client.refresh_convex_pool_info([37])
+
+        self.assertEqual(self.client._get_convex_pool_info_data(37)[:4], [LP_TOKEN, DEPOSIT_TOKEN, GAUGE, REWARD_POOL_A])
+        self.assertEqual(self.client.get_convex_pool_gauge_address(37), GAUGE)
+
+    def test_all_tvls(self):
+        """get_all_convex_pools_tvl() maps every registry pool through the sweep."""
+        self.client.get_convex_pools_overview = Mock(return_value={37: {"tvl": Decimal("250")}})
+
+        tvls = self.client.get_all_convex_pools_tvl()
+
+        self.assertEqual(tvls[37], Decimal("250"))
+        self.assertIsNone(tvls[36])
+        self.client.get_convex_pools_overview.assert_called_once_with(include_rewards=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,357 @@
+"""
+Test suite for batched Curve queries.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient, CURVE_GAUGE_MAX_REWARDS
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants
+from tests.fake_multicall import encoded_multicall
+
+ZERO = "0x" + "0" * 40
+USER = Web3.to_checksum_address("0x" + "11" * 20)
+GAUGE_A = Web3.to_checksum_address("0x" + "a1" * 20)
+GAUGE_B = Web3.to_checksum_address("0x" + "b2" * 20)
+LP_A = Web3.to_checksum_address("0x" + "c3" * 20)
+LP_B = Web3.to_checksum_address("0x" + "d4" * 20)
+POOL_A = Web3.to_checksum_address("0x" + "e5" * 20)
+CRV = Web3.to_checksum_address(constants.CRV_TOKEN)
+FXN = Web3.to_checksum_address("0x365AccFCa291e7D3914637ABf1F7635dB165Bb09")
+WETH = Web3.to_checksum_address("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+USDC = Web3.to_checksum_address("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+POOL_NG = Web3.to_checksum_address("0x" + "f6" * 20)
+
+CURVE_POOLS = {
+    "eth_fxn": {"pool_id": 6, "name": "ETH/FXN", "fx_gauge": GAUGE_A, "lp_token": LP_A},
+    "other": {"pool_id": 7, "name": "Other", "fx_gauge": GAUGE_B, "lp_token": LP_B},
+}
+
+
+class FakeCurveChain:
+    """Answers multicall batches for a small set of Curve gauges and pools."""
+
+    def __init__(self):
+        self.batches = []
+        self.balances = {GAUGE_A: 10 * 10**18, GAUGE_B: 0}
+        self.lp_tokens = {GAUGE_A: LP_A, GAUGE_B: LP_B}
+        self.reward_tokens = {GAUGE_A: [CRV, FXN], GAUGE_B: [CRV]}
+        self.claimable = {(GAUGE_A, CRV): 3 * 10**18, (GAUGE_A, FXN): 10**17}
+        self.pool_coins = {
+            POOL_A: [WETH, FXN],
+            # 4-coin stableswap-ng pool: no token(), it is its own LP token
+            POOL_NG: [FXN, USDC, WETH, CRV],
+        }
+        self.pool_balances = {
+            POOL_A: [5 * 10**18, 2000 * 10**18],
+            POOL_NG: [10**18, 2 * 10**6, 3 * 10**18, 4 * 10**18],
+        }
+        self.token_decimals = {USDC: 6}
+        self.total_supply = {GAUGE_A: 500 * 10**18, GAUGE_B: 80 * 10**18}
+        self.killed = {GAUGE_A: False, GAUGE_B: True}
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        name, args = fn.fn_name, fn.args
+        if name == "balanceOf":
+            return self.balances[target]
+        if name == "lp_token":
+            return self.lp_tokens[target]
+        if name == "reward_tokens":
+            tokens = self.reward_tokens[target]
+            return tokens[args[0]] if args[0] < len(tokens) else ZERO
+        if name == "get_pool_from_lp_token":
+            meta = target == Web3.to_checksum_address(constants.CURVE_META_REGISTRY)
+            return POOL_A if meta and args[0] == LP_A else ZERO
+        if name == "decimals":
+            return self.token_decimals.get(target, 18)
+        if name == "totalSupply":
+            return self.total_supply[target]
+        if name == "reward_count":
+            return len(self.reward_tokens[target])
+        if name == "is_killed":
+            return self.killed[target]
+        if name == "reward_data":
+            return (args[0], GAUGE_B, 1700000000, 10**15, 1690000000, 42)
+        if name == "claimable_reward":
+            return self.claimable[(target, args[1])]
+        if name == "token":
+            return LP_A if target == POOL_A else None
+        if name == "get_virtual_price":
+            return 101 * 10**16
+        if name == "A":
+            return 100
+        if name == "fee":
+            return 4000000
+        if name in ("coins", "balances"):
+            # Slots past the last coin revert, which multicall reports as None
+            values = (self.pool_coins if name == "coins" else self.pool_balances)[target]
+            return values[args[0]] if args[0] < len(values) else None
+        raise AssertionError(f"Unexpected call {name}")
+
+
+class TestCurvePositionsBatch(unittest.TestCase):
+    """Test suite for the two-phase Curve positions summary."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeCurveChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        self.client.get_curve_pools_from_registry = Mock(return_value=CURVE_POOLS)
+
+    def test_positions_summary(self):
+        """Only non-zero positions are returned, with rewards and pool info."""
+        summary = self.client.get_user_curve_positions_summary(user_address=USER)
+
+        self.assertEqual(summary["total_gauges"], 1)
+        self.assertEqual(summary["total_staked"], 10.0)
+        self.assertEqual(summary["total_rewards"], {CRV: 3.0, FXN: 0.1})
+
+        position = summary["positions"][0]
+        self.assertEqual(position["pool_key"], "eth_fxn")
+        self.assertEqual(position["pool_info"]["pool_address"], POOL_A)
+        self.assertEqual(position["pool_info"]["coins"], [WETH, FXN])
+        self.assertEqual(position["pool_info"]["balances_decimal"], [5.0, 2000.0])
+        self.assertEqual(position["pool_info"]["virtual_price_decimal"], 1.01)
+
+    def test_decoded_addresses(self):
+        """Reward keys and pool addresses from decoded results are checksummed, and stay batched."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+        self.client.get_user_curve_positions_summary(user_address=USER)
+
+        self.chain.batches.clear()
+        summary = self.client.get_user_curve_positions_summary(user_address=USER)
+
+        self.assertEqual(len(self.chain.batches), 2)
+        self.assertEqual(summary["total_rewards"], {CRV: 3.0, FXN: 0.1})
+        position = summary["positions"][0]
+        self.assertEqual(position["pool_info"]["pool_address"], POOL_A)
+        self.assertEqual(position["pool_info"]["coins"], [WETH, FXN])
+
+    def test_phase_two_only_covers_non_zero_positions(self):
+        """Rewards and pool info are only read for gauges with a balance."""
+        self.client.get_user_curve_positions_summary(user_address=USER)
+
+        phase_two = self.chain.batches[2]
+        self.assertEqual(phase_two.count("claimable_reward"), 2)
+        self.assertEqual(phase_two.count("get_virtual_price"), 1)
+
+    def test_round_trips(self):
+        """Cold summaries take four batches; cached ones take two."""
+        self.client.get_user_curve_positions_summary(user_address=USER)
+        self.assertEqual(len(self.chain.batches), 4)
+
+        self.chain.batches.clear()
+        self.client.get_user_curve_positions_summary(user_address=USER)
+        self.assertEqual(len(self.chain.batches), 2)
+        self.assertNotIn("get_pool_from_lp_token", self.chain.batches[0])
+
+    def test_without_pool_info(self):
+        """Pool lookups are skipped when pool info is not requested."""
+        summary = self.client.get_user_curve_positions_summary(user_address=USER, include_pool_info=False)
+
+        self.assertNotIn("pool_info", summary["positions"][0])
+        self.assertFalse(any("coins" in batch or "get_pool_from_lp_token" in batch for batch in self.chain.batches))
+
+    def test_falls_back_without_multicall(self):
+        """If the multicall fails, gauges are queried individually."""
+        self.client._multicall = Mock(side_effect=ContractCallError("no multicall"))
+        self.client.get_curve_gauge_balance = Mock(side_effect=[Decimal("4"), Decimal("0")])
+        self.client.get_curve_gauge_rewards = Mock(return_value={CRV: Decimal("1")})
+
+        summary = self.client.get_user_curve_positions_summary(user_address=USER, include_pool_info=False)
+
+        self.assertEqual(summary["total_staked"], 4.0)
+        self.assertEqual(summary["total_rewards"], {CRV: 1.0})
+
+
+class TestCurvePoolInfoBatch(unittest.TestCase):
+    """Test suite for the cached-layout Curve pool info query."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeCurveChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+
+    def test_two_coin_pool(self):
+        """Coins, balances and parameters match the serial query."""
+        info = self.client.get_curve_pool_info(POOL_A)
+
+        self.assertEqual(info["coins"], [WETH, FXN])
+        self.assertEqual(info["balances"], [5 * 10**18, 2000 * 10**18])
+        self.assertEqual(info["balances_decimal"], [5.0, 2000.0])
+        self.assertEqual(info["lp_token"], LP_A)
+        self.assertEqual(info["A"], 100)
+        self.assertEqual(info["fee"], 4000000)
+        self.assertEqual(info["virtual_price_decimal"], 1.01)
+
+    def test_four_coin_pool(self):
+        """Pools with more than two coins are discovered in full."""
+        info = self.client.get_curve_pool_info(POOL_NG)
+
+        self.assertEqual(info["coins"], [FXN, USDC, WETH, CRV])
+        self.assertEqual(info["decimals"], [18, 6, 18, 18])
+        self.assertEqual(info["balances_decimal"], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(info["lp_token"], POOL_NG)
+
+    def test_decoded_addresses(self):
+        """Coins and the LP token from decoded results match the serial query's checksummed addresses."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+
+        for _ in range(2):
+            info = self.client.get_curve_pool_info(POOL_A)
+            self.assertEqual(info["coins"], [WETH, FXN])
+            self.assertEqual(info["lp_token"], LP_A)
+
+    def test_layout_is_cached(self):
+        """Cold reads take two batches; later reads one, with dynamic fields only."""
+        self.client.get_curve_pool_info(POOL_NG)
+        self.assertEqual(len(self.chain.batches), 2)
+
+        self.chain.pool_balances[POOL_NG][0] = 7 * 10**18
+        self.chain.batches.clear()
+        info = self.client.get_curve_pool_info(POOL_NG)
+
+        self.assertEqual(len(self.chain.batches), 1)
+        self.assertEqual(
+            sorted(self.chain.batches[0]),
+            sorted(["get_virtual_price", "A", "fee"] + ["balances"] * 4)
+        )
+        self.assertEqual(info["balances_decimal"][0], 7.0)
+
+    def test_falls_back_without_multicall(self):
+        """If the multicall fails, fields are read one call at a time."""
+        self.client._multicall = Mock(side_effect=ContractCallError("no multicall"))
+        self.client._get_curve_pool_info_serial = Mock(return_value={"coins": []})
+
+        self.assertEqual(self.client.get_curve_pool_info(POOL_A), {"coins": []})
+        self.client._get_curve_pool_info_serial.assert_called_once_with(POOL_A)
+
+
+class TestCurveGaugeInfoBatch(unittest.TestCase):
+    """Test suite for the batched gauge metadata loader."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeCurveChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+
+    def test_gauge_infos(self):
+        """Each gauge gets the same fields as get_curve_gauge_info()."""
+        infos = self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+
+        info = infos[GAUGE_A]
+        self.assertEqual(info["lp_token"], LP_A)
+        self.assertEqual(info["total_supply_decimal"], 500.0)
+        self.assertEqual(info["reward_count"], 2)
+        self.assertEqual(info["reward_tokens"], [CRV, FXN])
+        self.assertFalse(info["is_killed"])
+        self.assertEqual(info["reward_data"][1]["token"], FXN)
+        self.assertEqual(info["reward_data"][1]["rate"], 10**15)
+        self.assertTrue(infos[GAUGE_B]["is_killed"])
+
+    def test_reward_lists_are_cached(self):
+        """Cold loads take two rounds plus decimals; warm loads read everything in one multicall."""
+        self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+        self.assertEqual(len(self.chain.batches), 3)
+        self.assertEqual(self.chain.batches[0].count("reward_tokens"), 2 * CURVE_GAUGE_MAX_REWARDS)
+        self.assertEqual(self.chain.batches[1].count("reward_data"), 3)
+
+        self.chain.batches.clear()
+        infos = self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+
+        self.assertEqual(len(self.chain.batches), 1)
+        self.assertNotIn("reward_tokens", self.chain.batches[0])
+        self.assertEqual(self.chain.batches[0].count("reward_data"), 3)
+        self.assertEqual(infos[GAUGE_A]["reward_tokens"], [CRV, FXN])
+
+    def test_new_reward_refreshes_list(self):
+        """A changed reward count re-reads only that gauge's token list."""
+        self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+        self.chain.reward_tokens[GAUGE_B] = [CRV, WETH]
+
+        self.chain.batches.clear()
+        infos = self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+
+        self.assertEqual(self.chain.batches[1], ["reward_tokens", "reward_tokens"])
+        self.assertEqual(infos[GAUGE_B]["reward_tokens"], [CRV, WETH])
+        self.assertEqual([d["token"] for d in infos[GAUGE_B]["reward_data"]], [CRV, WETH])
+
+    def test_decoded_reward_tokens(self):
+        """Decoded addresses are checksummed, so cached token lists stay batchable."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain._answer, self.chain.batches))
+        self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+
+        self.chain.batches.clear()
+        infos = self.client.get_curve_gauges_info_batch([GAUGE_A, GAUGE_B])
+
+        self.assertEqual(len(self.chain.batches), 1)
+        self.assertEqual(self.client._curve_gauge_meta_cache[GAUGE_A], {"lp_token": LP_A, "reward_tokens": [CRV, FXN]})
+        self.assertEqual(infos[GAUGE_A]["lp_token"], LP_A)
+        self.assertEqual(infos[GAUGE_A]["reward_tokens"], [CRV, FXN])
+        self.assertEqual(infos[GAUGE_A]["reward_data"][0]["distributor"], GAUGE_B)
+
+    def test_defaults_to_all_gauges(self):
+        """Without addresses, every gauge in constants.GAUGES is loaded."""
+        self.client._load_curve_gauge_infos = Mock(return_value={})
+
+        self.client.get_curve_gauges_info_batch()
+
+        gauges = self.client._load_curve_gauge_infos.call_args[0][0]
+        self.assertEqual(len(gauges), len(set(constants.GAUGES.values())))
+
+    def test_single_gauge_uses_loader(self):
+        """get_curve_gauge_info() shares the cached loader."""
+        info = self.client.get_curve_gauge_info(GAUGE_A)
+
+        self.assertEqual(info["reward_tokens"], [CRV, FXN])
+        self.assertIn(GAUGE_A, self.client._curve_gauge_meta_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
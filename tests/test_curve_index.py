@@ -0,0 +1,197 @@
+"""
+Test suite for the Curve registry index.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import json
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.curve_index import CurveRegistryIndex
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants
+
+ZERO = "0x" + "0" * 40
+LP_A = Web3.to_checksum_address("0x" + "c3" * 20)
+LP_B = Web3.to_checksum_address("0x" + "d4" * 20)
+POOL_A = Web3.to_checksum_address("0x" + "e5" * 20)
+POOL_B = Web3.to_checksum_address("0x" + "f6" * 20)
+GAUGE_A = Web3.to_checksum_address("0x" + "a1" * 20)
+GAUGE_B = Web3.to_checksum_address("0x" + "b2" * 20)
+WETH = Web3.to_checksum_address("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+FXN = Web3.to_checksum_address(constants.FXN)
+FXUSD = Web3.to_checksum_address(constants.FXUSD)
+
+CURVE_POOLS = {
+    "eth_fxn": {"pool_id": 6, "name": "ETH/FXN", "fx_gauge": GAUGE_A, "lp_token": LP_A},
+    "fxusd_fxn": {"pool_id": 7, "name": "fxUSD/FXN", "fx_gauge": GAUGE_B, "lp_token": LP_B},
+}
+
+
+class FakeRegistries:
+    """Answers Meta Registry and main registry calls in multicall batches."""
+
+    def __init__(self):
+        self.batches = []
+        # LP_B is only known to the main registry
+        self.meta_lp_pools = {LP_A: POOL_A}
+        self.registry_lp_pools = {LP_B: POOL_B}
+        self.gauges = {POOL_A: GAUGE_A, POOL_B: GAUGE_B}
+        self.coins = {POOL_A: [WETH, FXN], POOL_B: [FXUSD, FXN]}
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        meta = Web3.to_checksum_address(fn.address) == Web3.to_checksum_address(constants.CURVE_META_REGISTRY)
+        name, args = fn.fn_name, fn.args
+        if name == "get_pool_from_lp_token":
+            return (self.meta_lp_pools if meta else self.registry_lp_pools).get(args[0], ZERO)
+        if name == "get_gauge":
+            return self.gauges.get(args[0], ZERO)
+        if name == "get_gauges":
+            return [[self.gauges.get(args[0], ZERO)] + [ZERO] * 9, [0] * 10]
+        if name == "get_coins":
+            coins = self.coins.get(args[0], [])
+            return coins + [ZERO] * (8 - len(coins))
+        raise AssertionError(f"Unexpected call {name}")
+
+
+class TestCurveRegistryIndex(unittest.TestCase):
+    """Test suite for the index data structure."""
+
+    def test_lookups_distinguish_misses(self):
+        """A recorded miss is found (as None); unknown keys are not."""
+        index = CurveRegistryIndex()
+        index.record_lp_token(LP_A, POOL_A)
+        index.record_lp_token(LP_B, None)
+
+        self.assertEqual(index.pool_from_lp_token(LP_A.lower()), (True, POOL_A))
+        self.assertEqual(index.pool_from_lp_token(LP_B), (True, None))
+        self.assertEqual(index.pool_from_lp_token(POOL_B), (False, None))
+        self.assertEqual(index.lp_token_from_pool(POOL_A), (True, LP_A))
+        self.assertEqual(index.unresolved_lp_tokens([LP_A, LP_B, POOL_B]), [LP_B, POOL_B])
+
+    def test_pool_for_coins(self):
+        """Pairs resolve in either order, from recorded pairs or pool coins."""
+        index = CurveRegistryIndex()
+        index.record_coins(POOL_A, [WETH, FXN])
+        index.record_pair(FXUSD, FXN, POOL_B)
+
+        self.assertEqual(index.pool_for_coins(FXN, WETH), (True, POOL_A))
+        self.assertEqual(index.pool_for_coins(FXN, FXUSD), (True, POOL_B))
+        self.assertEqual(index.pool_for_coins(WETH, FXUSD), (False, None))
+
+    def test_round_trip(self):
+        """An index survives JSON serialization."""
+        index = CurveRegistryIndex()
+        index.record_lp_token(LP_A, POOL_A)
+        index.record_gauge(POOL_A, GAUGE_A)
+        index.record_coins(POOL_A, [WETH, FXN])
+        index.record_pair(FXUSD, FXN, None)
+
+        restored = CurveRegistryIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+        self.assertEqual(restored.pool_from_lp_token(LP_A), (True, POOL_A))
+        self.assertEqual(restored.gauge_from_pool(POOL_A), (True, GAUGE_A))
+        self.assertEqual(restored.coins_from_pool(POOL_A), (True, [WETH, FXN]))
+        self.assertEqual(restored.pool_for_coins(FXN, FXUSD), (True, None))
+        self.assertEqual(restored.pool_for_coins(WETH, FXN), (True, POOL_A))
+
+
+class TestClientRegistryIndex(unittest.TestCase):
+    """Test suite for registry lookups served from the index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.registries = FakeRegistries()
+        self.client._multicall = Mock(side_effect=self.registries.multicall)
+        self.client.get_curve_pools_from_registry = Mock(return_value=CURVE_POOLS)
+
+    def test_refresh_builds_index(self):
+        """The f(x) pool set is indexed in two multicalls."""
+        added = self.client.refresh_curve_registry_index()
+
+        self.assertEqual(added, 2)
+        self.assertEqual(len(self.registries.batches), 2)
+        index = self.client.curve_registry_index
+        self.assertEqual(index.pool_from_lp_token(LP_B), (True, POOL_B))
+        self.assertEqual(index.gauge_from_pool(POOL_A), (True, GAUGE_A))
+        self.assertEqual(index.coins_from_pool(POOL_B), (True, [FXUSD, FXN]))
+
+    def test_lookups_hit_index(self):
+        """After the first lookup, registry queries are answered locally."""
+        self.assertEqual(self.client.get_curve_pool_from_lp_token(LP_A), POOL_A)
+        self.assertEqual(self.client.get_curve_gauge_from_pool(POOL_B), GAUGE_B)
+        self.assertEqual(self.client.find_curve_pool(FXN, WETH), POOL_A)
+
+        self.assertEqual(len(self.registries.batches), 2)
+
+    def test_refresh_is_incremental(self):
+        """Refreshing only looks up LP tokens that are not indexed."""
+        self.registries.registry_lp_pools = {}
+        self.client.refresh_curve_registry_index()
+        self.assertEqual(self.client.curve_registry_index.pool_from_lp_token(LP_B), (True, None))
+
+        self.registries.registry_lp_pools = {LP_B: POOL_B}
+        self.registries.batches.clear()
+        added = self.client.refresh_curve_registry_index()
+
+        self.assertEqual(added, 1)
+        self.assertEqual(self.registries.batches[0], ["get_pool_from_lp_token"] * 2)
+        self.assertEqual(self.client.curve_registry_index.pool_from_lp_token(LP_B), (True, POOL_B))
+
+    def test_failed_load_is_retried(self):
+        """A failed first index load is retried once the backoff has passed, not on every lookup."""
+        self.client._multicall.side_effect = ContractCallError("Multicall failed")
+        self.client.refresh_curve_registry_index = Mock(wraps=self.client.refresh_curve_registry_index)
+        # Both lookups fall through to the (unreachable) registries
+        self.assertIsNone(self.client.find_curve_pool(FXN, WETH))
+        self.assertIsNone(self.client.find_curve_pool(FXN, FXUSD))
+        self.assertEqual(self.client.refresh_curve_registry_index.call_count, 1)
+        self.assertEqual(len(self.client.curve_registry_index), 0)
+
+        self.client._multicall.side_effect = self.registries.multicall
+        self.client._curve_registry_index_failed_at -= self.client.curve_registry_index_retry_delay
+        self.assertEqual(self.client.get_curve_gauge_from_pool(POOL_B), GAUGE_B)
+        self.assertEqual(self.client.refresh_curve_registry_index.call_count, 2)
+        self.assertEqual(len(self.registries.batches), 2)
+
+    def test_unindexed_lookup_is_recorded(self):
+        """Lookups outside the f(x) set query the registry once."""
+        other_lp = Web3.to_checksum_address("0x" + "77" * 20)
+        self.client._ensure_curve_registry_index()
+
+        meta_registry = MagicMock()
+        meta_registry.functions.get_pool_from_lp_token.return_value.call.return_value = POOL_A
+        self.client._get_contract = Mock(return_value=meta_registry)
+
+        self.assertEqual(self.client.get_curve_pool_from_lp_token(other_lp), POOL_A)
+        self.assertEqual(self.client.get_curve_pool_from_lp_token(other_lp), POOL_A)
+        self.assertEqual(meta_registry.functions.get_pool_from_lp_token.return_value.call.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
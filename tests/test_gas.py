@@ -0,0 +1,285 @@
+"""
+Test suite for the EIP-1559 fee oracle.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.gas import FeeOracle, GasProfileCache
+from fx_sdk.exceptions import ConfigurationError, ContractCallError, TransactionFailedError
+
+GWEI = 10**9
+
+FEE_HISTORY = {
+    "oldestBlock": 98,
+    "baseFeePerGas": [8 * GWEI, 9 * GWEI, 10 * GWEI, 16 * GWEI],
+    "reward": [
+        [1 * GWEI, 2 * GWEI, 5 * GWEI],
+        [1 * GWEI, 3 * GWEI, 6 * GWEI],
+        [2 * GWEI, 4 * GWEI, 7 * GWEI],
+    ],
+}
+
+
+class TestFeeOracle(unittest.TestCase):
+    """Test suite for FeeOracle."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.w3 = MagicMock()
+        self.w3.eth.fee_history.return_value = FEE_HISTORY
+        self.latest_block = 100
+        self.oracle = FeeOracle(self.w3, latest_block=lambda: self.latest_block)
+
+    def test_fees_by_urgency(self):
+        """Priority fee is the median reward; max fee adds base fee headroom."""
+        standard = self.oracle.get_fee_params("standard")
+        high = self.oracle.get_fee_params("high")
+        low = self.oracle.get_fee_params("low")
+
+        self.assertEqual(standard, {"maxFeePerGas": 24 * GWEI + 3 * GWEI, "maxPriorityFeePerGas": 3 * GWEI})
+        self.assertEqual(high, {"maxFeePerGas": 32 * GWEI + 6 * GWEI, "maxPriorityFeePerGas": 6 * GWEI})
+        self.assertEqual(low, {"maxFeePerGas": 18 * GWEI + 1 * GWEI, "maxPriorityFeePerGas": 1 * GWEI})
+
+    def test_sampled_once_per_block(self):
+        """The history is reused until a newer block is seen."""
+        self.oracle.get_fee_params("standard")
+        self.oracle.get_fee_params("high")
+        self.assertEqual(self.w3.eth.fee_history.call_count, 1)
+
+        self.latest_block = 101
+        self.oracle.get_fee_params("standard")
+        self.assertEqual(self.w3.eth.fee_history.call_count, 2)
+
+    def test_sample_expires_without_block_source(self):
+        """Without a block source the sample expires after max_age."""
+        oracle = FeeOracle(self.w3, max_age=12.0)
+
+        with patch('fx_sdk.gas.time.monotonic', side_effect=[0.0, 5.0, 20.0, 20.0]):
+            oracle.get_fee_params()
+            oracle.get_fee_params()
+            oracle.get_fee_params()
+
+        self.assertEqual(self.w3.eth.fee_history.call_count, 2)
+
+    def test_sample_expires_with_stalled_block_source(self):
+        """A block source that stops advancing does not pin the sample past max_age."""
+        oracle = FeeOracle(self.w3, max_age=12.0, latest_block=lambda: 100)
+
+        with patch('fx_sdk.gas.time.monotonic', side_effect=[0.0, 5.0, 20.0, 20.0]):
+            oracle.get_fee_params()
+            oracle.get_fee_params()
+            oracle.get_fee_params()
+
+        self.assertEqual(self.w3.eth.fee_history.call_count, 2)
+
+    def test_priority_fee_floor(self):
+        """Empty blocks do not produce a zero tip."""
+        self.w3.eth.fee_history.return_value = {"oldestBlock": 100, "baseFeePerGas": [GWEI, GWEI], "reward": [[0, 0, 0]]}
+        oracle = FeeOracle(self.w3, min_priority_fee=10**7)
+
+        self.assertEqual(oracle.get_fee_params("low")["maxPriorityFeePerGas"], 10**7)
+
+    def test_legacy_fallback(self):
+        """Nodes without eth_feeHistory fall back to gasPrice."""
+        self.w3.eth.fee_history.side_effect = Exception("method not found")
+        self.w3.eth.gas_price = 15 * GWEI
+
+        self.assertEqual(self.oracle.get_fee_params(), {"gasPrice": 15 * GWEI})
+
+    def test_no_fee_data(self):
+        """With no fee data at all a ContractCallError is raised instead of guessing."""
+        w3 = Mock()
+        w3.eth.fee_history.side_effect = Exception("method not found")
+        type(w3.eth).gas_price = property(Mock(side_effect=Exception("RPC down")))
+        oracle = FeeOracle(w3)
+
+        with self.assertRaises(ContractCallError):
+            oracle.get_fee_params()
+
+    def test_unknown_urgency(self):
+        """Unknown urgency levels are rejected."""
+        with self.assertRaises(ConfigurationError):
+            self.oracle.get_fee_params("instant")
+
+
+def _function_call(selector="0x3d18b912", args=(), address="0x" + "2" * 40):
+    """Bound contract function stand-in with the attributes profiles key on."""
+    function_call = MagicMock()
+    function_call.address = address
+    function_call.args = args
+    function_call._encode_transaction_data.return_value = selector + "00" * 32
+    function_call.build_transaction.side_effect = lambda params: dict(params, to=address, data=selector)
+    return function_call
+
+
+class TestGasProfileCache(unittest.TestCase):
+    """Test suite for GasProfileCache."""
+
+    def test_learned_limit_has_margin(self):
+        """The suggested limit is the largest recent gasUsed plus the margin."""
+        cache = GasProfileCache(margin=0.25, max_samples=2)
+        key = cache.key_for(_function_call())
+
+        self.assertIsNone(cache.get(key))
+        cache.record(key, 100000)
+        cache.record(key, 80000)
+        self.assertEqual(cache.get(key), 125000)
+
+        cache.record(key, 90000)  # oldest sample drops out
+        self.assertEqual(cache.get(key), 112500)
+
+    def test_key_includes_argument_shape(self):
+        """Dynamic argument lengths and selectors produce separate profiles."""
+        two_tokens = GasProfileCache.key_for(_function_call(args=(["0xa", "0xb"],)))
+        three_tokens = GasProfileCache.key_for(_function_call(args=(["0xa", "0xb", "0xc"],)))
+        other_selector = GasProfileCache.key_for(_function_call(selector="0xe6f1daf2", args=(["0xa", "0xb"],)))
+
+        self.assertNotEqual(two_tokens, three_tokens)
+        self.assertNotEqual(two_tokens, other_selector)
+        self.assertEqual(two_tokens, GasProfileCache.key_for(_function_call(args=(["0xc", "0xd"],))))
+
+
+class TestClientFees(unittest.TestCase):
+    """Test suite for fee integration in ProtocolClient."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.fee_history.return_value = FEE_HISTORY
+        self.mock_w3.eth.get_transaction_count.return_value = 3
+        self.mock_w3.eth.chain_id = 1
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+    def test_get_fee_estimates(self):
+        """Estimates are reported in gwei for each urgency level."""
+        estimates = self.client.get_fee_estimates()
+
+        self.assertEqual(estimates["base_fee_gwei"], Decimal(16))
+        self.assertEqual(estimates["standard"]["max_priority_fee_gwei"], Decimal(3))
+        self.assertEqual(estimates["high"]["max_fee_gwei"], Decimal(38))
+
+    def test_builders_use_eip1559_fees(self):
+        """Unsigned transactions carry maxFeePerGas instead of gasPrice."""
+        function_call = MagicMock()
+        function_call.estimate_gas.return_value = 100000
+        function_call.build_transaction.side_effect = lambda params: dict(params, to="0x" + "2" * 40, data="0x")
+
+        self.client.fee_urgency = "high"
+        tx = self.client._build_unsigned_transaction(function_call, from_address="0x" + "1" * 40)
+
+        self.assertEqual(tx["maxFeePerGas"], 38 * GWEI)
+        self.assertEqual(tx["maxPriorityFeePerGas"], 6 * GWEI)
+        self.assertIsNone(tx["gasPrice"])
+
+
+    def _enable_sending(self):
+        """Give the client a signer and successful receipts."""
+        self.client.account = Mock(key=b"\x01" * 32)
+        self.client.address = "0x" + "1" * 40
+        self.mock_w3.eth.account.sign_transaction.return_value = Mock(rawTransaction=b"raw")
+        self.mock_w3.eth.send_raw_transaction.return_value = Mock(hex=Mock(return_value="0xhash"))
+        self.mock_w3.eth.wait_for_transaction_receipt.return_value = Mock(status=1, gasUsed=80000)
+        self.client.gas_profiles = GasProfileCache(margin=0.25)
+
+    def test_send_learns_and_reuses_gas_profile(self):
+        """The first send estimates; later sends use the learned limit."""
+        self._enable_sending()
+        function_call = _function_call()
+        function_call.estimate_gas.return_value = 95000
+
+        self.client._build_and_send_transaction(function_call)
+        self.client._build_and_send_transaction(function_call)
+
+        function_call.estimate_gas.assert_called_once()
+        sent_gas = [c[0][0]["gas"] for c in self.mock_w3.eth.account.sign_transaction.call_args_list]
+        self.assertEqual(sent_gas, [95000, 100000])
+
+    def test_send_falls_back_when_cached_limit_rejected(self):
+        """A rejected cached limit is dropped and the send retried with a live estimate."""
+        self._enable_sending()
+        function_call = _function_call()
+        function_call.estimate_gas.return_value = 150000
+        key = GasProfileCache.key_for(function_call)
+        self.client.gas_profiles.record(key, 80000)
+        self.mock_w3.eth.send_raw_transaction.side_effect = [
+            Exception("intrinsic gas too low"),
+            Mock(hex=Mock(return_value="0xhash")),
+        ]
+
+        self.assertEqual(self.client._build_and_send_transaction(function_call), "0xhash")
+        function_call.estimate_gas.assert_called_once()
+        self.assertEqual(self.client.gas_profiles.get(key), 100000)
+
+    def test_send_not_retried_on_other_errors(self):
+        """Only gas-limit rejections are retried; e.g. a timeout after broadcast is not resent."""
+        self._enable_sending()
+        function_call = _function_call()
+        key = GasProfileCache.key_for(function_call)
+        self.client.gas_profiles.record(key, 80000)
+
+        for error in ("already known", "User rejected the request.", "HTTPSConnectionPool: Read timed out"):
+            self.mock_w3.eth.send_raw_transaction.reset_mock()
+            self.mock_w3.eth.send_raw_transaction.side_effect = Exception(error)
+            with self.assertRaises(TransactionFailedError):
+                self.client._build_and_send_transaction(function_call)
+            self.mock_w3.eth.send_raw_transaction.assert_called_once()
+        function_call.estimate_gas.assert_not_called()
+        self.assertEqual(self.client.gas_profiles.get(key), 100000)
+
+    def test_failed_receipt_drops_cached_limit(self):
+        """A reverted transaction sent with a cached limit forgets the profile."""
+        self._enable_sending()
+        function_call = _function_call()
+        key = GasProfileCache.key_for(function_call)
+        self.client.gas_profiles.record(key, 80000)
+        self.mock_w3.eth.wait_for_transaction_receipt.return_value = Mock(status=0, gasUsed=60000)
+
+        with self.assertRaises(TransactionFailedError):
+            self.client._build_and_send_transaction(function_call)
+        self.assertIsNone(self.client.gas_profiles.get(key))
+        # A revert below the limit is not an out-of-gas failure and is not resent
+        function_call.estimate_gas.assert_not_called()
+        self.mock_w3.eth.send_raw_transaction.assert_called_once()
+
+    def test_out_of_gas_on_cached_limit_resent(self):
+        """Running out of gas on a cached limit re-estimates and resends once on the next nonce."""
+        self._enable_sending()
+        function_call = _function_call()
+        function_call.estimate_gas.return_value = 150000
+        key = GasProfileCache.key_for(function_call)
+        self.client.gas_profiles.record(key, 80000)
+        self.mock_w3.eth.get_transaction_count.side_effect = [3, 4]
+        self.mock_w3.eth.wait_for_transaction_receipt.side_effect = [
+            Mock(status=0, gasUsed=100000),
+            Mock(status=1, gasUsed=120000),
+        ]
+
+        self.assertEqual(self.client._build_and_send_transaction(function_call), "0xhash")
+
+        sent = [c[0][0] for c in self.mock_w3.eth.account.sign_transaction.call_args_list]
+        self.assertEqual([(tx["nonce"], tx["gas"]) for tx in sent], [(3, 100000), (4, 150000)])
+        function_call.estimate_gas.assert_called_once()
+        self.assertEqual(self.client.gas_profiles.get(key), 150000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Test suite for the fixed-point numeric core.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk import numeric, utils
+from fx_sdk.numeric import FixedPoint, fixed_sum
+from fx_sdk.exceptions import ConfigurationError
+
+MAX_UINT256 = 2**256 - 1
+
+
+class TestConversions(unittest.TestCase):
+    """Test suite for exact raw <-> Decimal conversion."""
+
+    def test_to_decimal_is_exact(self):
+        """Values beyond 28 significant digits are not rounded."""
+        value = numeric.to_decimal(MAX_UINT256, 18)
+
+        self.assertEqual(numeric.to_raw(value, 18), MAX_UINT256)
+        self.assertEqual(str(value), "115792089237316195423570985008687907853269984665640564039457.584007913129639935")
+
+    def test_to_decimal_matches_division(self):
+        """Small values keep the same representation as plain division."""
+        self.assertEqual(str(numeric.to_decimal(10**18, 18)), "1")
+        self.assertEqual(str(numeric.to_decimal(1500, 3)), "1.5")
+        self.assertEqual(str(numeric.to_decimal(3 * 10**6, 6)), "3")
+        self.assertEqual(numeric.to_decimal(5, 0), Decimal(5))
+
+    def test_to_raw(self):
+        """Human-readable values convert exactly, truncating extra digits."""
+        self.assertEqual(numeric.to_raw("12345678901234567890.123456789012345678", 18),
+                         12345678901234567890123456789012345678)
+        self.assertEqual(numeric.to_raw(1.5, 6), 1500000)
+        self.assertEqual(numeric.to_raw(Decimal("0.1234567"), 6), 123456)
+        self.assertEqual(numeric.to_raw(7, 18), 7 * 10**18)
+
+    def test_utils_round_trip(self):
+        """utils conversions are lossless for any uint256."""
+        self.assertEqual(utils.decimal_to_wei(utils.wei_to_decimal(MAX_UINT256, 18), 18), MAX_UINT256)
+
+    def test_scale_factor(self):
+        """Scale factors come from the table and beyond it."""
+        self.assertEqual(numeric.scale_factor(6), 10**6)
+        self.assertEqual(numeric.scale_factor(80), 10**80)
+
+
+class TestFixedPoint(unittest.TestCase):
+    """Test suite for FixedPoint arithmetic."""
+
+    def test_sum_and_compare(self):
+        """Sums stay exact and compare with ints, Decimals and other amounts."""
+        total = fixed_sum([FixedPoint(10**17, 18)] * 3)
+
+        self.assertEqual(total.to_decimal(), Decimal("0.3"))
+        self.assertEqual(total, Decimal("0.3"))
+        self.assertGreater(total, FixedPoint(2, 1))
+        self.assertLess(total, 1)
+
+    def test_mixed_decimals(self):
+        """Amounts with different decimals are aligned."""
+        total = FixedPoint(1500000, 6) + FixedPoint(5 * 10**17, 18)
+
+        self.assertEqual(total.decimals, 18)
+        self.assertEqual(total.to_decimal(), Decimal("2"))
+        self.assertEqual(FixedPoint(1, 0), FixedPoint(10, 1))
+        self.assertEqual(hash(FixedPoint(1, 0)), hash(FixedPoint(10, 1)))
+
+    def test_mul_div_truncate(self):
+        """Products and quotients keep the left decimals and truncate toward zero."""
+        price = FixedPoint(2500 * 10**18, 18)
+        amount = FixedPoint(3 * 10**5, 6)
+
+        self.assertEqual((amount * price).to_decimal(), Decimal("750"))
+        self.assertEqual((FixedPoint(10, 0) / FixedPoint(3, 0)).raw, 3)
+        self.assertEqual((FixedPoint(-10, 0) / 3).raw, -3)
+        self.assertEqual(FixedPoint(5, 18) * 2, FixedPoint(10, 18))
+
+    def test_from_value_and_float(self):
+        """Amounts convert from human values and to floats."""
+        amount = FixedPoint.from_value("1.25", 6)
+
+        self.assertEqual(amount.raw, 1250000)
+        self.assertEqual(float(amount), 1.25)
+        self.assertEqual(str(amount), "1.25")
+        self.assertFalse(FixedPoint.zero())
+
+
+class TestBulkConversions(unittest.TestCase):
+    """Test suite for the bulk converters in utils."""
+
+    def test_decimal_list(self):
+        """Lists convert with shared or per-value decimals."""
+        self.assertEqual(utils.wei_to_decimal_list([10**18, MAX_UINT256], 18),
+                         [Decimal(1), numeric.to_decimal(MAX_UINT256, 18)])
+        self.assertEqual(utils.wei_to_decimal_list([2 * 10**6, 10**18], [6, 18]), [Decimal(2), Decimal(1)])
+
+    def test_decimal_list_length_mismatch(self):
+        """Per-value decimals must match the values."""
+        with self.assertRaises(ValueError):
+            utils.wei_to_decimal_list([1, 2], [18])
+
+    def test_arrays_require_numpy(self):
+        """Array converters report a missing NumPy clearly."""
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            with self.assertRaises(ConfigurationError):
+                utils.wei_to_float_array([1], 18)
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_float_array(self):
+        """Small and uint256-sized values convert to float64."""
+        small = utils.wei_to_float_array([15 * 10**17, 0], 18)
+        large = utils.wei_to_float_array([MAX_UINT256, 3 * 10**6], [18, 6])
+
+        self.assertEqual(small.tolist(), [1.5, 0.0])
+        self.assertAlmostEqual(large[0] / float(numeric.to_decimal(MAX_UINT256, 18)), 1.0)
+        self.assertEqual(large[1], 3.0)
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_numpy_integer_decimals(self):
+        """Decimals read into NumPy integers are shared decimals, not per-value ones."""
+        import numpy as np
+
+        self.assertEqual(utils.wei_to_decimal_list([10**18, 5 * 10**17], np.int64(18)), [Decimal(1), Decimal("0.5")])
+        self.assertEqual(utils.wei_to_decimal_list([2 * 10**6], np.array([6]))[0], Decimal(2))
+        self.assertEqual(utils.wei_to_float_array([3 * 10**6], np.uint8(6)).tolist(), [3.0])
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_decimal_array(self):
+        """Object arrays hold exact Decimals."""
+        result = utils.wei_to_decimal_array([MAX_UINT256], 18)
+
+        self.assertEqual(result.dtype, object)
+        self.assertEqual(result[0], numeric.to_decimal(MAX_UINT256, 18))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+"""
+Test suite for EIP-2612 permits.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from hexbytes import HexBytes
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.permit import PERMIT_TYPEHASH, permit_domain_separator, permit_typed_data
+from fx_sdk.exceptions import ConfigurationError, FXProtocolError
+
+OWNER = Account.from_key("0x" + "4c" * 32)
+FXUSD = Web3.to_checksum_address("0x085780639CC2cACd35E474e71f4d000e2405d8f6")
+PLAIN = Web3.to_checksum_address("0x" + "e1" * 20)
+DAI_STYLE = Web3.to_checksum_address("0x" + "e2" * 20)
+POOL = Web3.to_checksum_address("0x" + "b1" * 20)
+E18 = 10**18
+
+
+class FakeChain:
+    """Answers token and pool reads; only FXUSD supports EIP-2612."""
+
+    def __init__(self):
+        self.batches = []
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self.answer(fn) for fn in calls]
+
+    def answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        if fn.fn_name == "name":
+            return "f(x) USD"
+        if fn.fn_name == "version":
+            return "1" if target == FXUSD else None
+        if fn.fn_name == "DOMAIN_SEPARATOR":
+            if target == PLAIN:
+                return None
+            return permit_domain_separator("f(x) USD", "1", 1, target)
+        if fn.fn_name == "PERMIT_TYPEHASH":
+            return PERMIT_TYPEHASH if target == FXUSD else Web3.keccak(text="Permit(address holder)")
+        if fn.fn_name == "nonces":
+            return 5
+        if fn.fn_name == "coins":
+            return [FXUSD, PLAIN][fn.args[0]]
+        if fn.fn_name == "token":
+            return POOL
+        if fn.fn_name == "decimals":
+            return 18
+        if fn.fn_name == "allowance":
+            return 0
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+
+class TestPermits(unittest.TestCase):
+    """Test suite for permit signing and the writers' approval path."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.chain_id = 1
+        self.mock_w3.eth.get_transaction_count.return_value = 9
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        self.client.account = OWNER
+        self.client.address = OWNER.address
+
+        self.sent = []
+
+        def send(contract_function, value=0, nonce=None, default_gas=None, wait=True):
+            self.sent.append((contract_function.fn_name, Web3.to_checksum_address(contract_function.address),
+                              nonce, default_gas, wait))
+            return "0x" + "ab" * 32
+
+        self.client._build_and_send_transaction = Mock(side_effect=send)
+
+    def _calls(self):
+        return patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                     side_effect=lambda fn, **kwargs: self.chain.answer(fn))
+
+    def test_supports_permit(self):
+        """The domain is checked once; non-EIP-2612 permits are rejected."""
+        self.assertTrue(self.client.supports_permit(FXUSD))
+        self.assertTrue(self.client.supports_permit(FXUSD))
+        self.assertFalse(self.client.supports_permit(PLAIN))
+        self.assertFalse(self.client.supports_permit(DAI_STYLE))
+
+        self.assertEqual(len(self.chain.batches), 3)
+        self.assertEqual(self.chain.batches[0], ["name", "version", "DOMAIN_SEPARATOR", "PERMIT_TYPEHASH"])
+
+    def test_signature_recovers_to_owner(self):
+        """The permit is signed over the token's EIP-712 domain."""
+        with self._calls():
+            permit = self.client.sign_permit(FXUSD, POOL, 100, deadline=2_000_000_000)
+
+        self.assertEqual((permit["nonce"], permit["value"]), (5, 100 * E18))
+        signable = encode_typed_data(full_message=permit_typed_data(
+            "f(x) USD", "1", 1, FXUSD, OWNER.address, POOL, 100 * E18, 5, 2_000_000_000
+        ))
+        recovered = Account.recover_message(signable, vrs=(permit["v"], permit["r"], permit["s"]))
+        self.assertEqual(recovered, OWNER.address)
+
+    def test_sign_permit_errors(self):
+        """Signing needs a private key and an EIP-2612 token."""
+        with self.assertRaises(FXProtocolError):
+            self.client.sign_permit(PLAIN, POOL, "max")
+        self.client.account = None
+        with self.assertRaises(ConfigurationError):
+            self.client.sign_permit(FXUSD, POOL, "max")
+
+    def test_build_permit_transaction(self):
+        """Anyone can relay a signed permit."""
+        with self._calls():
+            permit = self.client.sign_permit(FXUSD, POOL, "max")
+        self.client._build_unsigned_transaction = Mock(return_value={})
+
+        self.client.build_permit_transaction(permit, from_address=POOL)
+
+        fn = self.client._build_unsigned_transaction.call_args[0][0]
+        self.assertEqual(fn.fn_name, "permit")
+        self.assertEqual(fn.args[:3], (OWNER.address, POOL, 2**256 - 1))
+
+    def test_swap_pipelines_permit(self):
+        """The swap follows the permit on the next nonce without awaiting it."""
+        with self._calls():
+            self.client.curve_swap(POOL, FXUSD, PLAIN, 10, min_amount_out=9)
+
+        self.assertEqual(self.sent, [
+            ("permit", FXUSD, 9, 100000, False),
+            ("exchange", POOL, 10, 300000, True),
+        ])
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with(OWNER.address, 'pending')
+
+    def test_add_liquidity_mixed_tokens(self):
+        """Tokens without permit are approved and awaited first."""
+        with self._calls():
+            self.client.curve_add_liquidity(POOL, [1, 2], min_lp_tokens=0)
+
+        self.assertEqual(self.sent, [
+            ("approve", PLAIN, None, None, True),
+            ("permit", FXUSD, 9, 100000, False),
+            ("add_liquidity", POOL, 10, 400000, True),
+        ])
+
+    def test_permit_disabled(self):
+        """With permits off, the approval is awaited and the swap estimated as usual."""
+        self.client.use_permit = False
+
+        with self._calls():
+            self.client.curve_swap(POOL, FXUSD, PLAIN, 10, min_amount_out=9)
+
+        self.assertEqual(self.sent, [
+            ("approve", FXUSD, None, None, True),
+            ("exchange", POOL, None, None, True),
+        ])
+
+
+class TestUnwaitedTransactions(unittest.TestCase):
+    """Test suite for the nonce, gas fallback and no-wait options of writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.address = OWNER.address
+        self.client.account = OWNER
+        self.client.fee_oracle.get_fee_params = Mock(return_value={"gasPrice": 10**9})
+        self.client._send_built_transaction = Mock(return_value=HexBytes(b"\x01" * 32))
+        self.client._wait_for_transaction_receipt = Mock()
+
+    def test_default_gas_when_estimate_reverts(self):
+        """A write behind a pending permit falls back to its default gas."""
+        fn = Mock()
+        fn.estimate_gas.side_effect = Exception("execution reverted: allowance")
+        fn.build_transaction.side_effect = lambda params: params
+
+        tx_hash = self.client._build_and_send_transaction(fn, nonce=12, default_gas=300000, wait=False)
+
+        self.assertEqual(tx_hash, (b"\x01" * 32).hex())
+        sent = self.client._send_built_transaction.call_args[0][0]
+        self.assertEqual((sent["nonce"], sent["gas"]), (12, 300000))
+        self.client._wait_for_transaction_receipt.assert_not_called()
+        self.mock_w3.eth.get_transaction_count.assert_not_called()
+
+    def test_default_gas_for_custom_allowance_error(self):
+        """OpenZeppelin 5's ERC20InsufficientAllowance revert also falls back."""
+        fn = Mock()
+        fn.estimate_gas.side_effect = Exception("execution reverted", "0xfb8f41b2" + "00" * 96)
+        fn.build_transaction.side_effect = lambda params: params
+
+        self.client._build_and_send_transaction(fn, nonce=12, default_gas=400000, wait=False)
+
+        self.assertEqual(self.client._send_built_transaction.call_args[0][0]["gas"], 400000)
+
+    def test_other_estimate_reverts_not_broadcast(self):
+        """A write that reverts for another reason fails at estimation instead of on-chain."""
+        fn = Mock()
+        fn.estimate_gas.side_effect = Exception("execution reverted: Exchange resulted in fewer coins than expected")
+
+        with self.assertRaises(FXProtocolError):
+            self.client._build_and_send_transaction(fn, nonce=12, default_gas=300000, wait=False)
+        self.client._send_built_transaction.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
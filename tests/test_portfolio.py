@@ -0,0 +1,207 @@
+"""
+Test suite for multi-account portfolio scans.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import threading
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.portfolio import PortfolioTable
+from fx_sdk.exceptions import ContractCallError, ConfigurationError, FXProtocolError
+from fx_sdk import constants, utils
+
+ACCOUNTS = [Web3.to_checksum_address("0x" + f"{i + 1:02x}" * 20) for i in range(10)]
+FXUSD = Web3.to_checksum_address(constants.FXUSD)
+USDC = Web3.to_checksum_address("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+BROKEN = Web3.to_checksum_address("0x" + "ee" * 20)
+VAULT = Web3.to_checksum_address("0x" + "a1" * 20)
+GAUGE = Web3.to_checksum_address("0x" + "d4" * 20)
+LP_TOKEN = Web3.to_checksum_address("0x" + "e5" * 20)
+ZERO = "0x" + "0" * 40
+BLOCK = 19_000_000
+
+
+class FakeChain:
+    """Answers multicall batches and rejects requests above `max_calls`."""
+
+    def __init__(self, max_calls=None):
+        self.max_calls = max_calls
+        self.batches = []
+        self.lock = threading.Lock()
+        self.decimals = {FXUSD: 18, USDC: 6, LP_TOKEN: 18}
+        # Account i holds i fxUSD and i * 10 USDC
+        self.balances = {}
+        for i, account in enumerate(ACCOUNTS):
+            self.balances[(FXUSD, account)] = i * 10**18
+            self.balances[(USDC, account)] = i * 10 * 10**6
+        self.balances[(GAUGE, VAULT)] = 25 * 10**17
+        self.vault_map = {(37, ACCOUNTS[1]): VAULT}
+
+    def multicall(self, calls, block_identifier="latest", **kwargs):
+        if self.max_calls is not None and len(calls) > self.max_calls:
+            raise ContractCallError("Multicall failed: gas limit exceeded")
+        with self.lock:
+            self.batches.append(([fn.fn_name for fn in calls], block_identifier))
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        if target == BROKEN:
+            return None
+        if fn.fn_name == "decimals":
+            return self.decimals[target]
+        if fn.fn_name == "balanceOf":
+            return self.balances[(target, fn.args[0])]
+        if fn.fn_name == "vaultMap":
+            return self.vault_map.get((fn.args[0], fn.args[1]), ZERO)
+        if fn.fn_name == "owner":
+            return ACCOUNTS[1]
+        if fn.fn_name == "gaugeAddress":
+            return GAUGE
+        if fn.fn_name == "stakingToken":
+            return LP_TOKEN
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+    def balance_batches(self):
+        """Batches that read account balances."""
+        return [batch for batch in self.batches if "decimals" not in batch[0]]
+
+
+class TestPortfolioScan(unittest.TestCase):
+    """Test suite for scan_portfolios() and scan_portfolios_table()."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.block_number = BLOCK
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        self.tokens = {"fxUSD": FXUSD, "USDC": USDC}
+
+    def test_chunks_fit_gas_cap(self):
+        """The account x token matrix is split into whole-account chunks under the gas cap."""
+        rows = dict(self.client.scan_portfolios(
+            ACCOUNTS, tokens=self.tokens, gas_cap=7 * 10_000, gas_per_call=10_000
+        ))
+
+        # 7 calls fit, so 3 accounts (6 calls) per chunk
+        sizes = sorted(len(names) for names, _ in self.chain.balance_batches())
+        self.assertEqual(sizes, [2, 6, 6, 6])
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[ACCOUNTS[4]], {"fxUSD": Decimal(4), "USDC": Decimal(40)})
+
+    def test_reads_are_pinned_to_one_block(self):
+        """Every chunk reads the block resolved at the start of the scan."""
+        table = self.client.scan_portfolios_table(ACCOUNTS, tokens=self.tokens, gas_cap=20_000)
+
+        self.assertEqual(table.block_number, BLOCK)
+        self.assertEqual({block for _, block in self.chain.balance_batches()}, {BLOCK})
+
+    def test_rejected_chunk_is_split(self):
+        """A request above the provider's real limit is retried in halves."""
+        self.chain.max_calls = 4
+
+        rows = dict(self.client.scan_portfolios(ACCOUNTS[:4], tokens=self.tokens, gas_cap=80_000))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[ACCOUNTS[3]]["USDC"], Decimal(30))
+        self.assertTrue(all(len(names) <= 4 for names, _ in self.chain.balance_batches()))
+
+    def test_single_account_failure_raises(self):
+        """An account whose reads cannot be executed at all is an error."""
+        self.chain.max_calls = 1
+
+        with self.assertRaises(ContractCallError):
+            list(self.client.scan_portfolios(ACCOUNTS[:2], tokens=self.tokens))
+
+    def test_vault_pools(self):
+        """Convex vaults are looked up per account and read from the vault's gauge."""
+        table = self.client.scan_portfolios_table(ACCOUNTS[:3], tokens={"fxUSD": FXUSD}, vault_pools=[37])
+
+        self.assertEqual(table.labels, ["fxUSD", "fxusd_stability_fxn"])
+        self.assertEqual(table.row(ACCOUNTS[1])["fxusd_stability_fxn"], Decimal("2.5"))
+        self.assertEqual(table.row(ACCOUNTS[2])["fxusd_stability_fxn"], Decimal(0))
+
+    def test_failed_reads_are_none(self):
+        """A reverted balance is None, not zero, and is skipped in totals."""
+        table = self.client.scan_portfolios_table(ACCOUNTS[:3], tokens={"fxUSD": FXUSD}, gauges=[BROKEN])
+
+        self.assertEqual(table.columns[BROKEN], [None, None, None])
+        self.assertEqual(table.totals(), {"fxUSD": Decimal(3), BROKEN: Decimal(0)})
+        self.assertEqual(sorted(table.to_dict()["account"]), sorted(ACCOUNTS[:3]))
+
+    def test_accounts_are_consumed_lazily(self):
+        """Rows stream out before the account iterable is exhausted."""
+        consumed = []
+
+        def accounts():
+            for account in ACCOUNTS:
+                consumed.append(account)
+                yield account
+
+        scan = self.client.scan_portfolios(accounts(), tokens=self.tokens, gas_cap=20_000, max_workers=1)
+        next(scan)
+        scan.close()
+
+        self.assertLess(len(consumed), len(ACCOUNTS))
+
+    def test_duplicate_labels_rejected(self):
+        """Labels must identify one column each."""
+        with self.assertRaises(FXProtocolError):
+            list(self.client.scan_portfolios(ACCOUNTS, tokens=[FXUSD], gauges={FXUSD: GAUGE}))
+
+
+class TestPortfolioTable(unittest.TestCase):
+    """Test suite for the columnar result table."""
+
+    def test_columns(self):
+        """Rows are stored column by column."""
+        table = PortfolioTable(["fxUSD", "USDC"], block_number=1)
+        table.extend([(ACCOUNTS[0], {"fxUSD": Decimal(1)}), (ACCOUNTS[1], {"fxUSD": Decimal(2), "USDC": Decimal(3)})])
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.columns["fxUSD"], [Decimal(1), Decimal(2)])
+        self.assertEqual(table.columns["USDC"], [None, Decimal(3)])
+        self.assertEqual(table.to_dict()["account"], ACCOUNTS[:2])
+
+    def test_to_numpy_requires_numpy(self):
+        """Array output reports a missing NumPy clearly."""
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            with self.assertRaises(ConfigurationError):
+                PortfolioTable(["fxUSD"]).to_numpy()
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_to_numpy(self):
+        """Failed reads become NaN."""
+        table = PortfolioTable(["fxUSD"])
+        table.extend([(ACCOUNTS[0], {"fxUSD": Decimal("1.5")}), (ACCOUNTS[1], {})])
+
+        column = table.to_numpy()["fxUSD"]
+        self.assertEqual(column[0], 1.5)
+        self.assertTrue(column[1] != column[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,337 @@
+"""
+Test suite for the Pool Manager position index.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient, POSITION_EVENT_TOPICS
+from fx_sdk.positions import PositionIndex, PositionRecord, classify_health, rank_candidates
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants, utils
+from tests.fake_multicall import encoded_multicall
+
+POOL_A = Web3.to_checksum_address(constants.WSTETH_POOL)
+POOL_B = Web3.to_checksum_address(constants.AAVE_FUNDING_POOL)
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "b2" * 20)
+ORACLE_A = Web3.to_checksum_address("0x" + "0a" * 20)
+ORACLE_B = Web3.to_checksum_address("0x" + "0b" * 20)
+ZERO_ADDRESS = "0x" + "0" * 40
+E18 = 10**18
+
+
+def make_log(pool, position_id, block_number, topic=POSITION_EVENT_TOPICS[0]):
+    """A raw Pool Manager log with (pool, position) in the indexed topics."""
+    return {
+        "topics": [
+            bytes.fromhex(topic[2:]),
+            bytes(12) + bytes.fromhex(pool[2:]),
+            position_id.to_bytes(32, "big"),
+        ],
+        "blockNumber": block_number,
+    }
+
+
+class FakePools:
+    """Answers position reads in multicall batches."""
+
+    def __init__(self):
+        self.batches = []
+        self.positions = {
+            (POOL_A, 1): (10 * E18, 5 * E18, E18 // 2, ALICE),
+            (POOL_A, 2): (2 * E18, 18 * E18 // 10, 9 * E18 // 10, BOB),
+            (POOL_B, 1): (E18, 96 * E18 // 100, 96 * E18 // 100, ALICE),
+            (POOL_B, 2): (0, 0, 0, BOB),
+        }
+        self.ratios = {"getRebalanceRatios": [88 * E18 // 100, 25 * E18 // 1000], "getLiquidateRatios": [95 * E18 // 100, 4 * E18 // 100]}
+        self.oracles = {POOL_A: ORACLE_A, POOL_B: ORACLE_B}
+        self.prices = {ORACLE_A: E18, ORACLE_B: E18}
+
+    def multicall(self, calls, block_identifier="latest", **kwargs):
+        self.batches.append(([fn.fn_name for fn in calls], block_identifier))
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        if fn.fn_name in self.ratios:
+            return self.ratios[fn.fn_name]
+        if fn.fn_name == "priceOracle":
+            return self.oracles[Web3.to_checksum_address(fn.address)]
+        if fn.fn_name == "getLiquidatePrice":
+            return self.prices[Web3.to_checksum_address(fn.address)]
+        colls, debts, ratio, owner = self.positions[(Web3.to_checksum_address(fn.address), fn.args[0])]
+        if fn.fn_name == "getPosition":
+            return [colls, debts]
+        if fn.fn_name == "getPositionDebtRatio":
+            return ratio
+        if fn.fn_name == "ownerOf":
+            return owner
+        raise AssertionError(f"Unexpected call {fn.fn_name}")
+
+
+class TestPositionIndex(unittest.TestCase):
+    """Test suite for the index data structure."""
+
+    def test_health_classification(self):
+        """Debt ratios are compared with the rebalance and liquidation thresholds."""
+        self.assertEqual(classify_health(Decimal("0.5"), Decimal("0.88"), Decimal("0.95")), "healthy")
+        self.assertEqual(classify_health(Decimal("0.9"), Decimal("0.88"), Decimal("0.95")), "rebalance")
+        self.assertEqual(classify_health(Decimal("0.95"), Decimal("0.88"), Decimal("0.95")), "liquidate")
+        self.assertIsNone(classify_health(None, Decimal("0.88"), Decimal("0.95")))
+
+    def test_closed_positions_refresh_when_touched(self):
+        """Closed positions are skipped until a new event touches them."""
+        index = PositionIndex()
+        index.update(PositionRecord(POOL_A, 1, owner=ALICE, collateral=Decimal(0), debt=Decimal(0)))
+        self.assertEqual(index.to_refresh(), [])
+
+        self.assertFalse(index.record_event(POOL_A.lower(), 1, 100))
+        self.assertEqual(len(index.to_refresh()), 1)
+
+    def test_round_trip(self):
+        """An index survives JSON serialization."""
+        index = PositionIndex()
+        index.last_block = 123
+        index.update(PositionRecord(POOL_A, 1, owner=ALICE, collateral=Decimal("1.5"), debt=Decimal(1),
+                                    debt_ratio=Decimal("0.6"), health="healthy", block_number=120))
+        index.record_event(POOL_B, 7, 121)
+
+        restored = PositionIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+        self.assertEqual(restored.last_block, 123)
+        self.assertEqual(restored.get(POOL_A, 1).collateral, Decimal("1.5"))
+        self.assertEqual(len(restored.to_refresh()), 2)
+
+
+class TestClientPositionIndex(unittest.TestCase):
+    """Test suite for event discovery, batched refresh and queries."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.block_number = 1000
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.pools = FakePools()
+        self.client._multicall = Mock(side_effect=self.pools.multicall)
+        self.client.log_block_range = 400
+        self.logs = [
+            make_log(POOL_A, 1, 10),
+            make_log(POOL_A, 2, 450),
+            make_log(POOL_B, 1, 460),
+            make_log(POOL_B, 2, 900),
+            make_log(POOL_A, 2, 950, topic=POSITION_EVENT_TOPICS[1]),
+        ]
+        self.mock_w3.eth.get_logs = Mock(side_effect=self._get_logs)
+
+    def _get_logs(self, params):
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    def test_sync_is_incremental(self):
+        """Events are read in block ranges and later syncs resume after the last block."""
+        self.assertEqual(self.client.sync_position_index(), 4)
+        self.assertEqual(self.mock_w3.eth.get_logs.call_count, 3)
+        self.assertEqual(self.client.position_index.last_block, 1000)
+        params = self.mock_w3.eth.get_logs.call_args_list[0][0][0]
+        self.assertEqual(params["topics"], [list(POSITION_EVENT_TOPICS)])
+
+        self.logs.append(make_log(POOL_B, 3, 1100))
+        self.mock_w3.eth.get_logs.reset_mock()
+        self.assertEqual(self.client.sync_position_index(to_block=1200), 1)
+        self.assertEqual(self.mock_w3.eth.get_logs.call_args_list[0][0][0]["fromBlock"], 1001)
+
+    def test_sync_failure_keeps_progress(self):
+        """A failing range raises after earlier ranges are recorded."""
+        self.mock_w3.eth.get_logs = Mock(side_effect=[self.logs[:1], Exception("range too large")])
+
+        with self.assertRaises(ContractCallError):
+            self.client.sync_position_index()
+
+        self.assertEqual(self.client.position_index.last_block, 399)
+        self.assertEqual(len(self.client.position_index), 1)
+
+    def test_refresh_in_one_batch(self):
+        """All open positions and pool thresholds are read in one pinned multicall."""
+        self.client.sync_position_index()
+
+        self.assertEqual(self.client.refresh_positions(), 4)
+        self.assertEqual(len(self.pools.batches), 1)
+        names, block = self.pools.batches[0]
+        self.assertEqual(block, 1000)
+        self.assertEqual(names.count("getPosition"), 4)
+
+        position = self.client.position_index.get(POOL_A, 2)
+        self.assertEqual(position.owner, BOB)
+        self.assertEqual(position.collateral, Decimal(2))
+        self.assertEqual(position.debt_ratio, Decimal("0.9"))
+        self.assertEqual(position.health, "rebalance")
+        self.assertEqual(position.block_number, 1000)
+
+        # The closed position is not read again
+        self.pools.batches.clear()
+        self.assertEqual(self.client.refresh_positions(), 3)
+
+    def test_decoded_owner_checksummed(self):
+        """Owners decoded from multicall results match ownerOf().call()."""
+        self.client.sync_position_index()
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.pools._answer, self.pools.batches, record_block=True))
+
+        self.client.refresh_positions()
+
+        self.assertEqual(self.client.position_index.get(POOL_A, 2).owner, BOB)
+        self.assertEqual(self.client.position_index.get(POOL_A, 1).owner, ALICE)
+
+    def test_queries(self):
+        """Positions are filtered by owner, pool, health and debt ratio."""
+        self.client.sync_position_index()
+        self.client.refresh_positions()
+
+        alice = self.client.get_indexed_positions(owner=ALICE.lower())
+        self.assertEqual([(p.pool, p.position_id) for p in alice], [(POOL_B, 1), (POOL_A, 1)])
+        self.assertEqual([p.position_id for p in self.client.get_indexed_positions(health="liquidate")], [1])
+        self.assertEqual(len(self.client.get_indexed_positions(pool_address=POOL_A, min_debt_ratio="0.6")), 1)
+        self.assertEqual(len(self.client.get_indexed_positions(owner=BOB)), 1)
+        self.assertEqual(len(self.client.get_indexed_positions(owner=BOB, include_closed=True)), 2)
+
+    def test_refresh_without_multicall(self):
+        """Positions are read one call at a time when Multicall3 fails."""
+        self.client.sync_position_index()
+        self.client._multicall = Mock(side_effect=ContractCallError("Multicall failed"))
+
+        with patch('web3.contract.contract.ContractFunction.call',
+                   autospec=True, side_effect=lambda fn, **kwargs: self.pools._answer(fn)):
+            self.assertEqual(self.client.refresh_positions(), 4)
+
+        self.assertEqual(self.client.position_index.get(POOL_B, 1).health, "liquidate")
+
+
+
+class TestPositionCandidates(unittest.TestCase):
+    """Test suite for the liquidation/rebalance candidate engine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.block_number = 1000
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.pools = FakePools()
+        self.client._multicall = Mock(side_effect=self.pools.multicall)
+        self.mock_w3.eth.get_logs = Mock(return_value=[
+            make_log(POOL_A, 1, 10), make_log(POOL_A, 2, 20), make_log(POOL_B, 1, 30), make_log(POOL_B, 2, 40),
+        ])
+        self.client.build_transactions_batch = Mock(
+            side_effect=lambda requests, from_address=None: [{"nonce": i} for i in range(len(requests))]
+        )
+
+    def ranked(self, **kwargs):
+        return [(c.action, c.pool, c.position_id) for c in self.client.find_position_candidates(**kwargs)]
+
+    def test_ranking(self):
+        """Liquidations rank before rebalances; healthy positions are excluded."""
+        expected = [("liquidate", POOL_B, 1), ("rebalance", POOL_A, 2)]
+
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            self.assertEqual(self.ranked(build_transactions=False), expected)
+        if utils.NUMPY_AVAILABLE:
+            self.assertEqual(self.ranked(sync=False, build_transactions=False), expected)
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_vectorized_matches_python(self):
+        """The NumPy and Python passes agree, including zero collateral."""
+        records = [
+            PositionRecord(POOL_A, i, collateral=Decimal(c), debt=Decimal(d))
+            for i, (c, d) in enumerate([(10, 5), (2, "1.8"), (1, "0.96"), (0, 1), (0, 0), (4, 4)])
+        ]
+        prices = {POOL_A.lower(): Decimal(1)}
+        thresholds = {POOL_A.lower(): (Decimal("0.88"), Decimal("0.95"))}
+
+        vectorized = rank_candidates(records, prices, thresholds)
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            python = rank_candidates(records, prices, thresholds)
+
+        self.assertEqual([(c.position_id, c.action) for c in vectorized], [(c.position_id, c.action) for c in python])
+        self.assertEqual(vectorized[0].position_id, 3)
+
+    def test_price_override(self):
+        """A price drop makes more positions liquidatable."""
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            ranked = self.ranked(prices={POOL_A: "0.5"}, build_transactions=False)
+
+        self.assertEqual(ranked, [("liquidate", POOL_A, 2), ("liquidate", POOL_A, 1), ("liquidate", POOL_B, 1)])
+
+    def test_implied_price_fallback(self):
+        """Without oracle prices, the price implied by on-chain debt ratios is used."""
+        self.pools.oracles = {POOL_A: ZERO_ADDRESS, POOL_B: ZERO_ADDRESS}
+
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            candidates = self.client.find_position_candidates(build_transactions=False)
+
+        self.assertEqual([c.position_id for c in candidates], [1, 2])
+        self.assertAlmostEqual(candidates[0].price, 1.0)
+
+    def test_transactions_for_top_candidates(self):
+        """Only the top candidates get a prebuilt transaction, built in one batch."""
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            candidates = self.client.find_position_candidates(top_n=1, from_address=ALICE)
+
+        requests = self.client.build_transactions_batch.call_args[0][0]
+        self.assertEqual(requests, [("build_liquidate_position_transaction",
+                                     {"pool_address": POOL_B, "position_id": 1, "receiver": None,
+                                      "max_fxusd": Decimal("0.9696"), "max_stable": 0})])
+        self.assertEqual(candidates[0].transaction, {"nonce": 0})
+        self.assertIsNone(candidates[1].transaction)
+
+    def test_rebalance_builder_uses_position_overload(self):
+        """Position rebalances do not resolve to the tick overload."""
+        self.client._build_unsigned_transaction = Mock(return_value={})
+
+        self.client.build_rebalance_position_transaction(POOL_A, 2, from_address=ALICE)
+
+        function_call = self.client._build_unsigned_transaction.call_args[0][0]
+        self.assertEqual(function_call.abi["inputs"][2]["type"], "uint32")
+        self.assertEqual(function_call.args[2], 2)
+
+    def test_builders_encode_caps(self):
+        """The fxUSD and stable caps reach the encoded call instead of zero."""
+        self.client._build_unsigned_transaction = Mock(return_value={})
+
+        self.client.build_rebalance_position_transaction(POOL_A, 2, from_address=ALICE, max_fxusd="1.5")
+        self.client.build_liquidate_position_transaction(POOL_B, 1, receiver=BOB, from_address=ALICE,
+                                                         max_fxusd=Decimal("0.9696"), max_stable=2)
+
+        rebalance, liquidate = [call[0][0] for call in self.client._build_unsigned_transaction.call_args_list]
+        self.assertEqual(rebalance.args, (POOL_A, ALICE, 2, 15 * E18 // 10, 0))
+        self.assertEqual(liquidate.fn_name, "liquidate")
+        self.assertEqual(liquidate.args, (POOL_B, BOB, 1, 9696 * E18 // 10000, 2 * E18))
+        self.assertEqual(liquidate.abi["inputs"][3]["name"], "maxFxUSD")
+
+
+if __name__ == '__main__':
+    unittest.main()
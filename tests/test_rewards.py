@@ -0,0 +1,287 @@
+"""
+Test suite for the offline gauge reward-accrual projector.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import MULTICALL3_ABI, TRANSFER_EVENT_TOPIC, ProtocolClient
+from fx_sdk.rewards import GaugeRewardProjector
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants
+from tests.fake_multicall import encoded_multicall
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+GAUGE_A = Web3.to_checksum_address("0x" + "d1" * 20)
+GAUGE_B = Web3.to_checksum_address("0x" + "d2" * 20)
+FXN = Web3.to_checksum_address(constants.FXN)
+CRV = Web3.to_checksum_address("0xD533a949740bb3306d119CC777fa900bA034cd52")
+LP_TOKEN = Web3.to_checksum_address("0x" + "e5" * 20)
+NOW = 1_700_000_000
+BLOCK = 19_000_000
+E18 = 10**18
+
+
+class FakeGauge:
+    """Curve LiquidityGaugeV6 reward accounting."""
+
+    def __init__(self, tokens):
+        self.total_supply = 1000 * E18
+        self.balances = {ALICE: 10 * E18}
+        # token -> [distributor, period_finish, rate, last_update, integral]
+        self.rewards = {token: [ALICE, NOW + 7 * 86400, 3 * E18 // 7, NOW - 86400, 5 * E18] for token in tokens}
+        self.integral_for = {(token, ALICE): E18 for token in tokens}
+        self.claimable = {(token, ALICE): 7 * E18 for token in tokens}
+
+    def integral(self, token, timestamp):
+        _, period_finish, rate, last_update, integral = self.rewards[token]
+        if self.total_supply:
+            integral += (min(timestamp, period_finish) - last_update) * rate * E18 // self.total_supply
+        return integral
+
+    def claimable_reward(self, user, token, timestamp):
+        new = self.balances.get(user, 0) * (self.integral(token, timestamp) - self.integral_for[(token, user)]) // E18
+        return self.claimable[(token, user)] + new
+
+    def checkpoint(self, user, timestamp):
+        """What a deposit or withdrawal does before changing balances."""
+        for token, data in self.rewards.items():
+            integral = self.integral(token, timestamp)
+            data[3], data[4] = min(timestamp, data[1]), integral
+            self.claimable[(token, user)] = self.claimable_reward(user, token, timestamp)
+            self.integral_for[(token, user)] = integral
+
+
+class FakeChain:
+    """Answers multicall batches from fake gauges at the current time."""
+
+    def __init__(self):
+        self.now = NOW
+        self.block = BLOCK
+        self.gauges = {GAUGE_A: FakeGauge([FXN, CRV]), GAUGE_B: FakeGauge([FXN])}
+        self.batches = []
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self.answer(fn) for fn in calls]
+
+    def answer(self, fn):
+        name = fn.fn_name
+        if name == "getBlockNumber":
+            return self.block
+        if name == "getCurrentBlockTimestamp":
+            return self.now
+        if name == "decimals":
+            return 18
+        gauge = self.gauges[Web3.to_checksum_address(fn.address)]
+        if name == "totalSupply":
+            return gauge.total_supply
+        if name == "balanceOf":
+            return gauge.balances.get(fn.args[0], 0)
+        if name == "reward_count":
+            return len(gauge.rewards)
+        if name == "reward_data":
+            return (fn.args[0], *gauge.rewards[fn.args[0]])
+        if name == "reward_integral_for":
+            return gauge.integral_for[(fn.args[0], fn.args[1])]
+        if name == "claimable_reward":
+            return gauge.claimable_reward(fn.args[0], fn.args[1], self.now)
+        raise AssertionError(f"Unexpected call {name}")
+
+
+class TestGaugeRewardProjector(unittest.TestCase):
+    """Test suite for reward snapshots, projections and re-syncs."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.client.multicall = self.client.w3.eth.contract(address=constants.MULTICALL3, abi=MULTICALL3_ABI)
+        self.chain = FakeChain()
+        self.client._multicall = Mock(side_effect=self.chain.multicall)
+        for gauge_address, gauge in self.chain.gauges.items():
+            self.client._curve_gauge_meta_cache[gauge_address] = {
+                "lp_token": LP_TOKEN,
+                "reward_tokens": list(gauge.rewards),
+            }
+        self.logs = []
+        self.mock_w3.eth.get_logs = Mock(side_effect=self._get_logs)
+        self.mock_w3.eth.get_block = Mock(side_effect=lambda block: {"number": self.chain.block, "timestamp": self.chain.now})
+
+    def _get_logs(self, params):
+        addresses = {a.lower() for a in params["address"]}
+        return [
+            log for log in self.logs
+            if log["address"].lower() in addresses and params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]
+        ]
+
+    def _advance(self, seconds, blocks=None):
+        self.chain.now += seconds
+        self.chain.block += blocks if blocks is not None else seconds // 12
+
+    def test_snapshot_in_one_multicall(self):
+        """All gauges and reward tokens are read in one batch (plus decimals once)."""
+        projectors = self.client.get_gauge_reward_projectors([GAUGE_A, GAUGE_B], ALICE)
+
+        reward_batches = [batch for batch in self.chain.batches if "claimable_reward" in batch]
+        self.assertEqual(len(reward_batches), 1)
+        self.assertEqual(reward_batches[0].count("claimable_reward"), 3)
+        projector = projectors[GAUGE_A]
+        self.assertEqual((projector.timestamp, projector.block_number), (NOW, BLOCK))
+        self.assertEqual(projector.raw_claimable_at(FXN, NOW), self.chain.gauges[GAUGE_A].claimable_reward(ALICE, FXN, NOW))
+
+    def test_lowercase_cached_tokens(self):
+        """Lowercase reward tokens from decoded results are checksummed before the snapshot."""
+        self.client._multicall = Mock(side_effect=encoded_multicall(self.client, self.chain.answer, self.chain.batches))
+        self.client._curve_gauge_meta_cache[GAUGE_A]["reward_tokens"] = [FXN.lower(), CRV.lower()]
+
+        projector = self.client.get_gauge_reward_projector(GAUGE_A, ALICE)
+
+        self.assertEqual(set(projector.rewards), {FXN, CRV})
+        self.assertEqual(projector.raw_claimable_at(CRV, NOW), self.chain.gauges[GAUGE_A].claimable_reward(ALICE, CRV, NOW))
+
+    def test_projection_matches_gauge(self):
+        """Projected amounts equal what claimable_reward() would return later."""
+        projector = self.client.get_gauge_reward_projector(GAUGE_A, ALICE)
+        batches = len(self.chain.batches)
+        gauge = self.chain.gauges[GAUGE_A]
+
+        for offset in (1, 3600, 3 * 86400 + 17, 30 * 86400):
+            self.assertEqual(projector.raw_claimable_at(CRV, NOW + offset), gauge.claimable_reward(ALICE, CRV, NOW + offset))
+        self.assertEqual(len(self.chain.batches), batches)
+
+        claimable = projector.claimable_at(NOW + 86400)
+        self.assertEqual(set(claimable), {FXN, CRV})
+        self.assertIsInstance(claimable[FXN], Decimal)
+
+    def test_period_end_marks_stale(self):
+        """Accrual stops at period_finish, where the projection needs a re-sync."""
+        projector = self.client.get_gauge_reward_projector(GAUGE_A, ALICE)
+        period_finish = NOW + 7 * 86400
+
+        self.assertEqual(projector.valid_until, period_finish)
+        self.assertFalse(projector.is_stale(period_finish))
+        self.assertTrue(projector.is_stale(period_finish + 1))
+        self.assertEqual(projector.raw_claimable_at(FXN, period_finish), projector.raw_claimable_at(FXN, period_finish + 86400))
+
+    def test_sync_without_events_keeps_projectors(self):
+        """Without events, a sync costs only the log queries."""
+        projectors = self.client.get_gauge_reward_projectors([GAUGE_A, GAUGE_B], ALICE)
+        batches = len(self.chain.batches)
+        self._advance(3600)
+
+        synced = self.client.sync_gauge_reward_projectors(projectors)
+
+        self.assertEqual(len(self.chain.batches), batches)
+        self.assertIs(synced[GAUGE_A], projectors[GAUGE_A])
+        self.assertEqual(self.mock_w3.eth.get_logs.call_count, 2)
+
+    def test_checkpoint_event_resyncs_gauge(self):
+        """Only the gauge with a new event is read again, and tracks the new state."""
+        projectors = self.client.get_gauge_reward_projectors([GAUGE_A, GAUGE_B], ALICE)
+        self._advance(3600)
+        gauge = self.chain.gauges[GAUGE_A]
+        gauge.checkpoint(ALICE, self.chain.now)
+        gauge.balances[ALICE] += 90 * E18
+        gauge.total_supply += 90 * E18
+        self.logs.append({"address": GAUGE_A, "topics": [], "blockNumber": self.chain.block})
+        self._advance(60)
+
+        synced = self.client.sync_gauge_reward_projectors(projectors)
+
+        self.assertIsNot(synced[GAUGE_A], projectors[GAUGE_A])
+        self.assertIs(synced[GAUGE_B], projectors[GAUGE_B])
+        self.assertEqual(self.chain.batches[-1].count("claimable_reward"), 2)
+        later = self.chain.now + 86400
+        self.assertEqual(synced[GAUGE_A].raw_claimable_at(FXN, later), gauge.claimable_reward(ALICE, FXN, later))
+
+    def test_reward_top_up_resyncs_gauge(self):
+        """A reward token transfer into a gauge invalidates its projection."""
+        projectors = self.client.get_gauge_reward_projectors([GAUGE_A, GAUGE_B], ALICE)
+        self._advance(3600)
+        topic = "0x" + "00" * 12 + GAUGE_B[2:].lower()
+        self.logs.append({"address": FXN, "topics": [TRANSFER_EVENT_TOPIC, ALICE, bytes.fromhex(topic[2:])],
+                          "blockNumber": self.chain.block})
+
+        synced = self.client.sync_gauge_reward_projectors(projectors)
+
+        self.assertIsNot(synced[GAUGE_B], projectors[GAUGE_B])
+        self.assertIs(synced[GAUGE_A], projectors[GAUGE_A])
+        token_query = self.mock_w3.eth.get_logs.call_args_list[1][0][0]
+        self.assertEqual(token_query["topics"][:2], [TRANSFER_EVENT_TOPIC, None])
+        self.assertIn(topic, token_query["topics"][2])
+
+    def test_added_reward_token_refreshes_list(self):
+        """A stale cached token list is reloaded before projecting."""
+        self.client._curve_gauge_meta_cache[GAUGE_B] = {"lp_token": LP_TOKEN, "reward_tokens": []}
+        self.client.get_curve_gauges_info_batch = Mock(return_value={
+            GAUGE_B: {"lp_token": LP_TOKEN, "reward_tokens": [FXN]}
+        })
+
+        projector = self.client.get_gauge_reward_projector(GAUGE_B, ALICE)
+
+        self.assertEqual(list(projector.rewards), [FXN])
+
+    def test_without_multicall(self):
+        """Reads fall back to one call each, pinned to one block."""
+        self.client._multicall = Mock(side_effect=ContractCallError("Multicall failed"))
+        self.client._token_decimals_cache.update({FXN: 18, CRV: 18})
+        self.mock_w3.eth.block_number = BLOCK
+
+        with patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                   side_effect=lambda fn, **kwargs: self.chain.answer(fn)) as call:
+            projector = self.client.get_gauge_reward_projector(GAUGE_A, ALICE)
+
+        self.assertEqual({c.kwargs["block_identifier"] for c in call.call_args_list}, {BLOCK})
+        self.assertEqual(projector.raw_claimable_at(FXN, NOW), self.chain.gauges[GAUGE_A].claimable_reward(ALICE, FXN, NOW))
+
+
+class TestProjectorMath(unittest.TestCase):
+    """Test suite for the projection without a client."""
+
+    def test_empty_gauge_does_not_accrue(self):
+        """With zero total supply the integral stays put, as in the gauge."""
+        projector = GaugeRewardProjector.from_snapshot(
+            gauge=GAUGE_A, account=ALICE, balance=0, total_supply=0, timestamp=NOW, block_number=BLOCK,
+            reward_data={FXN: (FXN, ALICE, NOW + 100, E18, NOW - 100, 0)},
+            integrals_for={FXN: 0}, claimable={FXN: 5}, decimals={FXN: 18},
+        )
+
+        self.assertEqual(projector.raw_claimable_at(FXN, NOW + 50), 5)
+
+    def test_finished_period_is_not_stale(self):
+        """Without a running period only an event can change the amounts."""
+        projector = GaugeRewardProjector.from_snapshot(
+            gauge=GAUGE_A, account=ALICE, balance=E18, total_supply=E18, timestamp=NOW, block_number=BLOCK,
+            reward_data={FXN: (FXN, ALICE, NOW - 100, E18, NOW - 100, 0)},
+            integrals_for={FXN: 0}, claimable={FXN: 0}, decimals={FXN: 18},
+        )
+
+        self.assertIsNone(projector.valid_until)
+        self.assertFalse(projector.is_stale(NOW + 10**6))
+        projector.invalidate()
+        self.assertTrue(projector.is_stale(NOW))
+
+
+if __name__ == '__main__':
+    unittest.main()
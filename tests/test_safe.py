@@ -0,0 +1,187 @@
+"""
+Test suite for Safe MultiSend bundling.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from eth_account.messages import encode_typed_data
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import MULTICALL3_ABI, ProtocolClient
+from fx_sdk.safe import CALL, DELEGATE_CALL, ZERO_ADDRESS, encode_multisend_transactions
+from fx_sdk.exceptions import FXProtocolError
+from fx_sdk import constants
+
+SAFE = Web3.to_checksum_address("0x" + "5a" * 20)
+TOKEN = Web3.to_checksum_address("0x" + "11" * 20)
+VAULT = Web3.to_checksum_address("0x" + "22" * 20)
+LIB = Web3.to_checksum_address("0x" + "33" * 20)
+MULTISEND_SELECTOR = Web3.keccak(text="multiSend(bytes)")[:4].hex()
+
+
+def _decode(packed):
+    """Unpack MultiSend transactions into (operation, to, value, data) tuples."""
+    entries = []
+    offset = 0
+    while offset < len(packed):
+        operation = packed[offset]
+        to = Web3.to_checksum_address(packed[offset + 1:offset + 21])
+        value = int.from_bytes(packed[offset + 21:offset + 53], "big")
+        length = int.from_bytes(packed[offset + 53:offset + 85], "big")
+        data = packed[offset + 85:offset + 85 + length]
+        entries.append((operation, to, value, data))
+        offset += 85 + length
+    return entries
+
+
+class TestMultiSendEncoding(unittest.TestCase):
+    """Test suite for the packed transaction encoding."""
+
+    def test_packed_layout(self):
+        """Each entry is operation, to, value, length and data back to back."""
+        packed = encode_multisend_transactions([
+            {"to": TOKEN, "value": 0, "data": "0x095ea7b3" + "00" * 64, "gas": 50000, "nonce": 3},
+            {"to": VAULT.lower(), "value": 10**18, "data": b"\xd0\xe3\x0d\xb0"},
+            {"to": LIB, "data": "0x", "operation": DELEGATE_CALL},
+        ])
+
+        self.assertEqual(_decode(packed), [
+            (CALL, TOKEN, 0, bytes.fromhex("095ea7b3" + "00" * 64)),
+            (CALL, VAULT, 10**18, b"\xd0\xe3\x0d\xb0"),
+            (DELEGATE_CALL, LIB, 0, b""),
+        ])
+
+    def test_contract_creation_rejected(self):
+        """Entries without a target cannot be bundled."""
+        with self.assertRaises(FXProtocolError):
+            encode_multisend_transactions([{"to": None, "data": "0x60"}])
+
+
+class TestSafeMultiSendTransaction(unittest.TestCase):
+    """Test suite for build_safe_multisend_transaction()."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.client.multicall = self.client.w3.eth.contract(address=constants.MULTICALL3, abi=MULTICALL3_ABI)
+        self.transactions = [
+            {"to": TOKEN, "value": 0, "data": "0x095ea7b3", "gas": 50000, "nonce": 3, "chainId": 1},
+            {"to": VAULT, "value": 2 * 10**17, "data": "0xd0e30db0", "gas": 90000, "nonce": 4, "chainId": 1},
+        ]
+
+    def _inner(self, safe_tx):
+        data = bytes.fromhex(safe_tx["data"][2:])
+        self.assertEqual(data[:4].hex(), MULTISEND_SELECTOR)
+        # multiSend(bytes): offset, length, packed bytes
+        length = int.from_bytes(data[36:68], "big")
+        return _decode(data[68:68 + length])
+
+    def test_bundle(self):
+        """The Safe delegatecalls MultiSendCallOnly; inner values are summed."""
+        safe_tx = self.client.build_safe_multisend_transaction(self.transactions)
+
+        self.assertEqual(safe_tx["to"], Web3.to_checksum_address(constants.SAFE_MULTISEND_CALL_ONLY))
+        self.assertEqual(safe_tx["operation"], DELEGATE_CALL)
+        self.assertEqual(safe_tx["value"], 0)
+        self.assertEqual(safe_tx["total_value"], 2 * 10**17)
+        self.assertEqual(safe_tx["transaction_count"], 2)
+        self.assertEqual((safe_tx["gasToken"], safe_tx["refundReceiver"]), (ZERO_ADDRESS, ZERO_ADDRESS))
+        self.assertEqual(self._inner(safe_tx), [
+            (CALL, TOKEN, 0, bytes.fromhex("095ea7b3")),
+            (CALL, VAULT, 2 * 10**17, bytes.fromhex("d0e30db0")),
+        ])
+        self.assertNotIn("safe_tx_hash", safe_tx)
+
+    def test_delegate_call_uses_full_multisend(self):
+        """Delegatecall entries need MultiSend, not MultiSendCallOnly."""
+        transactions = self.transactions + [{"to": LIB, "data": "0x", "operation": DELEGATE_CALL}]
+
+        safe_tx = self.client.build_safe_multisend_transaction(transactions)
+
+        self.assertEqual(safe_tx["to"], Web3.to_checksum_address(constants.SAFE_MULTISEND))
+        with self.assertRaises(FXProtocolError):
+            self.client.build_safe_multisend_transaction(transactions, call_only=True)
+
+    def test_invalid_bundles(self):
+        """Empty bundles and bundles across chains are rejected."""
+        with self.assertRaises(FXProtocolError):
+            self.client.build_safe_multisend_transaction([])
+        with self.assertRaises(FXProtocolError):
+            self.client.build_safe_multisend_transaction([self.transactions[0], dict(self.transactions[1], chainId=10)])
+
+    def test_safe_tx_hash(self):
+        """The hash to sign matches EIP-712 SafeTx encoding, from one multicall."""
+        typed_data = {
+            "types": {
+                "EIP712Domain": [
+                    {"name": "chainId", "type": "uint256"},
+                    {"name": "verifyingContract", "type": "address"},
+                ],
+                "SafeTx": [
+                    {"name": "to", "type": "address"},
+                    {"name": "value", "type": "uint256"},
+                    {"name": "data", "type": "bytes"},
+                    {"name": "operation", "type": "uint8"},
+                    {"name": "safeTxGas", "type": "uint256"},
+                    {"name": "baseGas", "type": "uint256"},
+                    {"name": "gasPrice", "type": "uint256"},
+                    {"name": "gasToken", "type": "address"},
+                    {"name": "refundReceiver", "type": "address"},
+                    {"name": "nonce", "type": "uint256"},
+                ],
+            },
+            "primaryType": "SafeTx",
+            "domain": {"chainId": 1, "verifyingContract": SAFE},
+        }
+        unsigned = self.client.build_safe_multisend_transaction(self.transactions)
+        typed_data["message"] = {
+            key: unsigned[key]
+            for key in ("to", "value", "data", "operation", "safeTxGas", "baseGas", "gasPrice", "gasToken", "refundReceiver")
+        }
+        typed_data["message"]["nonce"] = 42
+        signable = encode_typed_data(full_message=typed_data)
+
+        batches = []
+
+        def multicall(calls, **kwargs):
+            batches.append([fn.fn_name for fn in calls])
+            answers = {"nonce": 42, "domainSeparator": signable.header, "getEthBalance": 10**18}
+            return [answers[fn.fn_name] for fn in calls]
+
+        self.client._multicall = Mock(side_effect=multicall)
+        safe_tx = self.client.build_safe_multisend_transaction(self.transactions, safe_address=SAFE)
+
+        self.assertEqual(batches, [["nonce", "domainSeparator", "getEthBalance"]])
+        self.assertEqual(safe_tx["safe_nonce"], 42)
+        expected = Web3.keccak(b"\x19" + signable.version + signable.header + signable.body)
+        self.assertEqual(safe_tx["safe_tx_hash"], Web3.to_hex(expected))
+
+    def test_low_safe_balance_warns(self):
+        """A Safe that cannot cover the bundled value is reported."""
+        self.client._multicall = Mock(return_value=[0, b"\x00" * 32, 10**17])
+
+        with self.assertLogs("fx_sdk", level="WARNING"):
+            self.client.build_safe_multisend_transaction(self.transactions, safe_address=SAFE)
+
+
+if __name__ == '__main__':
+    unittest.main()
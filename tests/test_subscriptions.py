@@ -0,0 +1,220 @@
+"""
+Test suite for newHeads subscriptions and block-pinned caching.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.subscriptions import NewHeadsSubscription, parse_block_header, is_websocket_url
+from fx_sdk.exceptions import ConfigurationError
+
+
+class TestBlockSubscription(unittest.TestCase):
+    """Test suite for newHeads-driven cache invalidation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rpc_url = "https://eth.llamarpc.com"
+
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url=self.rpc_url)
+
+        self.client.v1_market = MagicMock()
+        self.client.v1_market.functions.getNav.return_value.call.return_value = [10**18, 2 * 10**18]
+
+    def _fake_subscribe(self, block_number=100):
+        """Pretend a subscription is running and has delivered a head."""
+        self.client._head_subscription = Mock()
+        self.client._on_new_head({"number": block_number})
+
+    def test_no_cache_without_subscription(self):
+        """Without a subscription every read goes to the node."""
+        self.client.get_v1_nav()
+        self.client.get_v1_nav()
+
+        self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 2)
+
+    def test_cache_pinned_to_block(self):
+        """Reads are cached within a block and invalidated by a new head."""
+        self._fake_subscribe(100)
+
+        first = self.client.get_v1_nav()
+        second = self.client.get_v1_nav()
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 1)
+
+        self.client._on_new_head({"number": 101})
+        self.client.get_v1_nav()
+        self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 2)
+
+    def test_cached_values_are_copies(self):
+        """Mutating a returned dict does not corrupt the cache."""
+        self._fake_subscribe(100)
+
+        nav = self.client.get_v1_nav()
+        nav["fETH_NAV"] = None
+
+        self.assertIsNotNone(self.client.get_v1_nav()["fETH_NAV"])
+
+    def test_stale_head_reads_from_node(self):
+        """A head older than max_head_age is ignored until a fresh one arrives."""
+        self._fake_subscribe(100)
+        self.client._latest_head_at -= self.client.max_head_age + 1
+        self.mock_w3.eth.block_number = 123
+
+        self.client.get_v1_nav()
+        self.client.get_v1_nav()
+
+        self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 2)
+        self.assertEqual(self.client.latest_block_number, 123)
+        self.assertIsNone(self.client.fee_oracle.latest_block())
+
+    def test_dropped_connection_reads_from_node(self):
+        """When the WebSocket drops, the last head and the block cache are dropped with it."""
+        drop = threading.Event()
+
+        class FakeConnection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def send(self, message):
+                pass
+
+            def close(self):
+                drop.set()
+
+            def __iter__(self):
+                yield json.dumps({"jsonrpc": "2.0", "method": "eth_subscription",
+                                  "params": {"result": {"number": "0x64"}}})
+                drop.wait(5)
+                raise ConnectionError("connection closed")
+
+        connect = Mock(side_effect=[FakeConnection()] + [OSError("refused")] * 100)
+        with patch("fx_sdk.subscriptions.WEBSOCKETS_AVAILABLE", True), \
+                patch("fx_sdk.subscriptions.ws_connect", connect, create=True):
+            self.client.start_block_subscription("wss://node.example")
+            try:
+                self._wait_until(lambda: self.client._latest_head is not None)
+                self.client.get_v1_nav()
+                self.client.get_v1_nav()
+                self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 1)
+
+                drop.set()
+                self._wait_until(lambda: self.client._latest_head is None)
+                self.client.get_v1_nav()
+                self.assertEqual(self.client.v1_market.functions.getNav.return_value.call.call_count, 2)
+            finally:
+                self.client.stop_block_subscription()
+
+    def _wait_until(self, predicate, timeout=5.0):
+        """Poll until the subscription thread has made `predicate` true."""
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "timed out waiting for the subscription thread")
+            time.sleep(0.01)
+
+    def test_block_listeners(self):
+        """Registered listeners receive each head."""
+        heads = []
+        self.client.add_block_listener(heads.append)
+
+        self._fake_subscribe(100)
+        self.client._on_new_head({"number": 101})
+
+        self.assertEqual([h["number"] for h in heads], [100, 101])
+        self.assertEqual(self.client.latest_block_number, 101)
+
+    def test_receipt_wait_falls_back_to_polling(self):
+        """Without a subscription, Web3's polling wait is used."""
+        self.mock_w3.eth.wait_for_transaction_receipt.return_value = {"status": 1}
+
+        receipt = self.client._wait_for_transaction_receipt("0xabc", timeout=5)
+
+        self.assertEqual(receipt, {"status": 1})
+        self.mock_w3.eth.wait_for_transaction_receipt.assert_called_once()
+
+    def test_receipt_wait_is_event_driven(self):
+        """With a subscription, the receipt is re-checked when a block arrives."""
+        self._fake_subscribe(100)
+        self.mock_w3.eth.get_transaction_receipt.side_effect = [
+            TransactionNotFound("pending"),
+            {"status": 1},
+        ]
+
+        timer = threading.Timer(0.05, self.client._on_new_head, args=({"number": 101},))
+        timer.start()
+        try:
+            receipt = self.client._wait_for_transaction_receipt("0xabc", timeout=5)
+        finally:
+            timer.cancel()
+
+        self.assertEqual(receipt, {"status": 1})
+        self.assertEqual(self.mock_w3.eth.get_transaction_receipt.call_count, 2)
+        self.mock_w3.eth.wait_for_transaction_receipt.assert_not_called()
+
+
+class TestNewHeadsSubscription(unittest.TestCase):
+    """Test suite for the newHeads message handling."""
+
+    def test_requires_websocket_url(self):
+        """HTTP URLs are rejected."""
+        with self.assertRaises(ConfigurationError):
+            NewHeadsSubscription("https://eth.llamarpc.com", Mock())
+
+    def test_is_websocket_url(self):
+        """ws and wss schemes are recognized."""
+        self.assertTrue(is_websocket_url("wss://node.example"))
+        self.assertTrue(is_websocket_url("ws://localhost:8546"))
+        self.assertFalse(is_websocket_url("http://localhost:8545"))
+        self.assertFalse(is_websocket_url(None))
+
+    def test_parse_block_header(self):
+        """Quantity fields are converted to ints."""
+        header = parse_block_header({"number": "0x10", "timestamp": "0x5", "hash": "0xabc"})
+
+        self.assertEqual(header["number"], 16)
+        self.assertEqual(header["timestamp"], 5)
+        self.assertEqual(header["hash"], "0xabc")
+
+    def test_handle_messages(self):
+        """Subscription confirmations and notifications are dispatched."""
+        on_head = Mock()
+        subscription = NewHeadsSubscription("wss://node.example", on_head)
+
+        subscription._handle_message(json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0xsub"}))
+        subscription._handle_message(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "eth_subscription",
+            "params": {"subscription": "0xsub", "result": {"number": "0x2a"}}
+        }))
+
+        self.assertEqual(subscription.subscription_id, "0xsub")
+        on_head.assert_called_once_with({"number": 42})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Test suite for batched unsigned transaction building.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient
+from fx_sdk.exceptions import FXProtocolError
+from fx_sdk import constants
+
+
+class TestTransactionBatch(unittest.TestCase):
+    """Test suite for build_transactions_batch()."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rpc_url = "https://eth.llamarpc.com"
+        self.sender = "0x1234567890123456789012345678901234567890"
+        self.pool = "0x2222222222222222222222222222222222222222"
+
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+        self.mock_w3.eth.fee_history.return_value = {
+            "oldestBlock": 100,
+            "baseFeePerGas": [10 * 10**9, 20 * 10**9],
+            "reward": [[10**9, 2 * 10**9, 3 * 10**9]],
+        }
+        self.mock_w3.eth.chain_id = 1
+        self.mock_w3.eth.get_transaction_count.return_value = 7
+        self.mock_w3.batch_requests = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url=self.rpc_url)
+
+        harvest = self.mock_w3.eth.contract.return_value.functions.harvest.return_value
+        harvest.build_transaction.side_effect = lambda params: dict(params, to=self.pool, data="0x4641257d")
+        self.harvest = harvest
+
+    def _requests(self, count):
+        return [("build_harvest_pool_manager_transaction", {"pool_address": self.pool})] * count
+
+    def test_shared_lookups_and_sequential_nonces(self):
+        """Fee, chain id and nonce are fetched once; nonces increment locally."""
+        batch = self.mock_w3.batch_requests.return_value.__enter__.return_value
+        batch.execute.return_value = [90000, 91000, 92000]
+
+        txs = self.client.build_transactions_batch(self._requests(3), from_address=self.sender)
+
+        self.assertEqual([tx["nonce"] for tx in txs], [7, 8, 9])
+        self.assertEqual([tx["gas"] for tx in txs], [90000, 91000, 92000])
+        self.assertTrue(all(tx["maxFeePerGas"] == 32 * 10**9 and tx["chainId"] == 1 for tx in txs))
+        self.mock_w3.eth.fee_history.assert_called_once()
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with(
+            Web3.to_checksum_address(self.sender), 'pending'
+        )
+        self.assertEqual(batch.add.call_count, 3)
+        self.harvest.estimate_gas.assert_called()
+
+    def test_batch_failure_falls_back_to_individual_estimates(self):
+        """A failed batch is retried per call, using default gas on revert."""
+        self.mock_w3.batch_requests.return_value.__enter__.return_value.execute.side_effect = Exception("revert")
+        self.harvest.estimate_gas.side_effect = [
+            None, None,  # calls queued on the failed batch
+            120000, Exception("revert"),
+        ]
+
+        txs = self.client.build_transactions_batch(self._requests(2), from_address=self.sender)
+
+        self.assertEqual([tx["gas"] for tx in txs], [120000, 200000])
+        self.assertEqual([tx["nonce"] for tx in txs], [7, 8])
+
+    def test_unknown_builder(self):
+        """Only build_* methods can be batched."""
+        with self.assertRaises(FXProtocolError):
+            self.client.build_transactions_batch([("approve", {})], from_address=self.sender)
+
+    def test_single_builder_unchanged(self):
+        """Outside a batch, builders still perform their own lookups."""
+        self.harvest.estimate_gas.return_value = 100000
+
+        tx = self.client.build_harvest_pool_manager_transaction(self.pool, from_address=self.sender)
+
+        self.assertEqual(tx["gas"], 100000)
+        self.assertEqual(tx["nonce"], 7)
+        self.mock_w3.batch_requests.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
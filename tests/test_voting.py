@@ -0,0 +1,323 @@
+"""
+Test suite for the offline veFXN voting power calculator.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import MULTICALL3_ABI, ProtocolClient
+from fx_sdk.voting import (
+    MAX_LOCK_TIME, WEEK, GaugeSweep, GaugeVoteState, VeLock, VoteAllocation, VotingPowerCalculator
+)
+from fx_sdk.exceptions import ConfigurationError, ContractCallError
+from fx_sdk import constants, utils
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "b2" * 20)
+CAROL = Web3.to_checksum_address("0x" + "c3" * 20)
+NOW = 1_700_000_000
+E18 = 10**18
+GAUGE_A = Web3.to_checksum_address("0x" + "d1" * 20)
+GAUGE_B = Web3.to_checksum_address("0x" + "d2" * 20)
+GAUGE_C = Web3.to_checksum_address("0x" + "d3" * 20)
+
+
+class TestVeLock(unittest.TestCase):
+    """Test suite for the lock decay math."""
+
+    def test_linear_decay(self):
+        """Power falls linearly to zero at the unlock time."""
+        lock = VeLock(amount=MAX_LOCK_TIME * E18, end=NOW + 100 * WEEK)
+
+        self.assertEqual(lock.power_at(NOW + 99 * WEEK), Decimal(WEEK))
+        self.assertEqual(lock.power_at(NOW + 100 * WEEK), Decimal(0))
+        self.assertEqual(lock.power_at(NOW + 200 * WEEK), Decimal(0))
+
+    def test_matches_contract_rounding(self):
+        """The slope is truncated like the contract's integer division."""
+        lock = VeLock(amount=E18, end=NOW + MAX_LOCK_TIME)
+
+        self.assertEqual(lock.slope, E18 // MAX_LOCK_TIME)
+        self.assertEqual(lock.raw_power_at(NOW), (E18 // MAX_LOCK_TIME) * MAX_LOCK_TIME)
+        self.assertLess(lock.raw_power_at(NOW), E18)
+
+
+class TestVotingPowerCalculator(unittest.TestCase):
+    """Test suite for batched power calculations."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calculator = VotingPowerCalculator({
+            ALICE: VeLock(amount=MAX_LOCK_TIME * E18, end=NOW + 10 * WEEK),
+            BOB: VeLock(amount=2 * MAX_LOCK_TIME * E18, end=NOW + 2 * WEEK),
+            CAROL: VeLock(amount=0, end=0),
+        })
+        self.times = [NOW, NOW + WEEK, NOW + 5 * WEEK]
+
+    def test_powers_at(self):
+        """Every account is evaluated at every timestamp."""
+        powers = self.calculator.powers_at(self.times)
+
+        self.assertEqual(powers[ALICE], [Decimal(10 * WEEK), Decimal(9 * WEEK), Decimal(5 * WEEK)])
+        self.assertEqual(powers[BOB], [Decimal(4 * WEEK), Decimal(2 * WEEK), Decimal(0)])
+        self.assertEqual(powers[CAROL], [Decimal(0)] * 3)
+
+    def test_total_power(self):
+        """Totals are exact and can be restricted to some accounts."""
+        self.assertEqual(self.calculator.total_power_at(NOW), Decimal(14 * WEEK))
+        self.assertEqual(self.calculator.total_power_at(NOW, [BOB]), Decimal(4 * WEEK))
+
+    def test_matrix_requires_numpy(self):
+        """The vectorized grid reports a missing NumPy clearly."""
+        with patch.object(utils, "NUMPY_AVAILABLE", False):
+            with self.assertRaises(ConfigurationError):
+                self.calculator.power_matrix(self.times)
+
+    @unittest.skipUnless(utils.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_matrix_matches_exact(self):
+        """The vectorized grid matches the exact powers."""
+        matrix = self.calculator.power_matrix(self.times)
+        powers = self.calculator.powers_at(self.times)
+
+        self.assertEqual(matrix.shape, (3, 3))
+        for row, account in enumerate(self.calculator.accounts):
+            for col in range(3):
+                self.assertAlmostEqual(matrix[row, col], float(powers[account][col]), places=6)
+
+
+class TestClientVeFXNLocks(unittest.TestCase):
+    """Test suite for reading locks in a batch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        # Real contract objects (no provider needed) so calls carry names and args
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.client.vefxn = self.client._get_contract("vefxn", constants.VEFXN)
+        self.locks = {ALICE: (5 * E18, NOW + WEEK), BOB: (0, 0)}
+        self.batches = []
+
+        def multicall(calls, **kwargs):
+            self.batches.append([fn.fn_name for fn in calls])
+            return [self.locks.get(fn.args[0]) for fn in calls]
+
+        self.client._multicall = Mock(side_effect=multicall)
+
+    def test_locks_in_one_multicall(self):
+        """Unique accounts are read in one batch."""
+        calculator = self.client.get_vefxn_power_calculator([ALICE, BOB, ALICE.lower()])
+
+        self.assertEqual(self.batches, [["locked", "locked"]])
+        self.assertEqual(calculator.locks[ALICE], VeLock(5 * E18, NOW + WEEK))
+        self.assertEqual(calculator.power_at(BOB, NOW), Decimal(0))
+
+    def test_failed_lock_raises(self):
+        """A lock that cannot be read is an error, not zero power."""
+        with self.assertRaises(ContractCallError):
+            self.client.get_vefxn_locks([CAROL])
+
+    def test_without_multicall(self):
+        """Locks are read one by one when Multicall3 fails."""
+        self.client._multicall = Mock(side_effect=ContractCallError("Multicall failed"))
+
+        with patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                   side_effect=lambda fn, **kwargs: self.locks[fn.args[0]]):
+            locks = self.client.get_vefxn_locks([ALICE, BOB])
+
+        self.assertEqual(locks[ALICE].amount, 5 * E18)
+
+
+class FakeController:
+    """Answers gauge-controller, veFXN and gauge reads for a sweep."""
+
+    def __init__(self):
+        self.batches = []
+        self.weights = {GAUGE_A: 100 * E18, GAUGE_B: 300 * E18, GAUGE_C: 600 * E18}
+        self.votes = {GAUGE_B: (E18 // 100, 2500, NOW + 52 * WEEK)}
+        self.last_votes = {GAUGE_B: NOW - 30 * 86400}
+        # Curve-style gauges A and C, f(x)-style gauge B
+        self.working = {GAUGE_A: (10 * E18, 100 * E18), GAUGE_B: (0, 50 * E18), GAUGE_C: (E18, 1000 * E18)}
+
+    def multicall(self, calls, **kwargs):
+        self.batches.append([fn.fn_name for fn in calls])
+        return [self._answer(fn) for fn in calls]
+
+    def _answer(self, fn):
+        target = Web3.to_checksum_address(fn.address)
+        name = fn.fn_name
+        if name == "getCurrentBlockTimestamp":
+            return NOW
+        if name == "get_total_weight":
+            return sum(self.weights.values()) * E18
+        if name == "n_gauge_types":
+            return 1
+        if name == "get_type_weight":
+            return E18 if fn.args[0] == 0 else 0
+        if name == "get_gauge_weight":
+            return self.weights[fn.args[0]]
+        if name == "gauge_relative_weight":
+            return self.weights[fn.args[0]] * E18 // sum(self.weights.values())
+        if name == "gauge_types":
+            return 0
+        if name == "vote_user_power":
+            return sum(vote[1] for vote in self.votes.values())
+        if name == "locked":
+            return (MAX_LOCK_TIME * 1000 * E18, NOW + 100 * WEEK)
+        if name == "vote_user_slopes":
+            return self.votes.get(fn.args[1], (0, 0, 0))
+        if name == "last_user_vote":
+            return self.last_votes.get(fn.args[1], 0)
+        curve_style = target != GAUGE_B
+        balance, supply = self.working[target]
+        if name in ("working_balances", "working_supply"):
+            if not curve_style:
+                return None
+            return balance if name == "working_balances" else supply
+        if name in ("workingBalanceOf", "workingSupply"):
+            if curve_style:
+                return None
+            return balance if name == "workingBalanceOf" else supply
+        if name in ("balanceOf", "totalSupply"):
+            return 1
+        raise AssertionError(f"Unexpected call {name}")
+
+
+class TestGaugeSweep(unittest.TestCase):
+    """Test suite for the gauge-controller sweep and vote optimizer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.w3.eth.contract = Web3().eth.contract
+        self.client.vefxn = self.client._get_contract("vefxn", constants.VEFXN)
+        self.client.gauge_controller = self.client._get_contract("gauge_controller", constants.GAUGE_CONTROLLER)
+        self.client.multicall = self.client.w3.eth.contract(address=constants.MULTICALL3, abi=MULTICALL3_ABI)
+        self.fake = FakeController()
+        self.client._multicall = Mock(side_effect=self.fake.multicall)
+        self.gauges = {"a": GAUGE_A, "b": GAUGE_B, "c": GAUGE_C}
+
+    def test_sweep_in_one_request(self):
+        """Weights, relative weights, types and account data come from one batch."""
+        sweep = self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE)
+
+        self.assertEqual(len(self.fake.batches), 1)
+        self.assertEqual(sweep.timestamp, NOW)
+        self.assertEqual(sweep.total_weight, Decimal(1000))
+        self.assertEqual(sweep.gauges["c"].weight, Decimal(600))
+        self.assertEqual(sweep.gauges["c"].relative_weight, Decimal("0.6"))
+        self.assertEqual(sweep.gauges["a"].type_weight, Decimal(1))
+        self.assertEqual(sweep.gauges["a"].stake_share, Decimal("0.1"))
+        self.assertEqual(sweep.gauges["b"].stake_share, Decimal(0))
+        self.assertEqual(sweep.current_votes(), {"b": 2500})
+        self.assertEqual(sweep.lock, VeLock(MAX_LOCK_TIME * 1000 * E18, NOW + 100 * WEEK))
+
+    def test_sweep_without_account(self):
+        """Gauge data alone skips vote and stake reads."""
+        sweep = self.client.get_gauge_controller_sweep([GAUGE_A])
+
+        self.assertNotIn("vote_user_slopes", self.fake.batches[0])
+        self.assertIsNone(sweep.gauges[GAUGE_A].stake_share)
+
+    def test_sweep_without_multicall(self):
+        """Reads fall back to one call each when Multicall3 fails."""
+        self.client._multicall = Mock(side_effect=ContractCallError("Multicall failed"))
+
+        with patch('web3.contract.contract.ContractFunction.call', autospec=True,
+                   side_effect=lambda fn, **kwargs: self.fake._answer(fn)):
+            sweep = self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE)
+
+        self.assertEqual(sweep.gauges["a"].weight, Decimal(100))
+
+    def test_optimizer_moves_votes_to_staked_gauge(self):
+        """All power goes to the gauge paying the account the most, offline."""
+        sweep = self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE)
+        allocation = sweep.optimize_votes()
+
+        self.assertEqual(len(self.fake.batches), 1)
+        self.assertEqual(allocation.votes, {"a": 10000, "b": 0})
+        self.assertGreater(allocation.projected_emission_share, allocation.current_emission_share)
+        self.assertEqual(allocation.vote_changes(sweep.current_votes()), [("b", 0), ("a", 10000)])
+
+    def test_recent_votes_stay_locked(self):
+        """Votes cast in the last 10 days are not moved."""
+        self.fake.last_votes[GAUGE_B] = NOW - 86400
+        sweep = self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE)
+        allocation = sweep.optimize_votes()
+
+        self.assertEqual(allocation.locked, ["b"])
+        self.assertEqual(allocation.votes, {"a": 7500, "b": 2500})
+
+    def test_excluded_gauges(self):
+        """Excluded gauges are never voted for."""
+        self.fake.working[GAUGE_C] = (500 * E18, 1000 * E18)
+        self.assertEqual(
+            self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE).optimize_votes().votes,
+            {"b": 0, "c": 10000}
+        )
+
+        sweep = self.client.get_gauge_controller_sweep(self.gauges, account_address=ALICE)
+        allocation = sweep.optimize_votes(exclude=["c"])
+
+        # Voting for "a" would dilute the larger stake in "c"
+        self.assertEqual(allocation.votes, {"b": 0})
+
+
+class TestGaugeSweepMath(unittest.TestCase):
+    """Test suite for the offline projection."""
+
+    def test_vote_replaces_existing_bias(self):
+        """The account's current vote is removed before the new one is added."""
+        lock = VeLock(amount=MAX_LOCK_TIME * 100 * E18, end=NOW + 100 * WEEK)
+        next_epoch = (NOW // WEEK + 1) * WEEK
+        bias = lock.raw_power_at(next_epoch)
+        sweep = GaugeSweep(
+            timestamp=NOW,
+            total_weight=Decimal(bias) / E18,
+            gauges={"a": GaugeVoteState(
+                gauge=GAUGE_A, label="a", weight=Decimal(bias) / E18, type_weight=Decimal(1),
+                user_power=10000, user_slope=lock.slope, user_vote_end=lock.end,
+                stake_share=Decimal(1),
+            )},
+            lock=lock,
+        )
+
+        self.assertAlmostEqual(sweep.projected_emission_share({"a": 10000}), 1.0)
+        self.assertEqual(sweep.projected_emission_share({"a": 0}), 0.0)
+
+    def test_vote_changes_order(self):
+        """Decreases are cast before increases."""
+        allocation = VoteAllocation(votes={"a": 6000, "b": 0, "c": 4000}, projected_emission_share=0.0,
+                                    current_emission_share=0.0, locked=[])
+
+        self.assertEqual(allocation.vote_changes({"b": 5000, "c": 5000}),
+                         [("b", 0), ("c", 4000), ("a", 6000)])
+
+
+if __name__ == '__main__':
+    unittest.main()
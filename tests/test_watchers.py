@@ -0,0 +1,203 @@
+"""
+Test suite for multicall reads and the protocol metrics watcher.
+
+Tests use mocking to avoid requiring actual blockchain connections.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+from eth_abi import encode
+from web3 import Web3
+
+# Add parent directory to path to import local development code
+# Must be first to override installed package
+local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if local_path not in sys.path:
+    sys.path.insert(0, local_path)
+
+from fx_sdk.client import ProtocolClient, PROTOCOL_METRICS_ABI
+from fx_sdk.watchers import ProtocolMetricsSnapshot, MetricThreshold
+from fx_sdk.exceptions import ContractCallError
+from fx_sdk import constants
+
+
+def _metrics_results(block_number, collateral_ratio=2 * 10**18):
+    """Raw multicall results in the order get_protocol_metrics_snapshot() requests them."""
+    return [
+        block_number, 1700000000,
+        [10**18, 10**18, 2 * 10**18], 1000 * 10**18, collateral_ratio, 3 * 10**18,
+        [10**18, 2 * 10**18], collateral_ratio,
+        True, 5000 * 10**18, None,
+    ]
+
+
+class TestMulticall(unittest.TestCase):
+    """Test suite for Multicall3 encoding and decoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client.multicall = MagicMock()
+        # Use a real contract object (no provider needed) for ABI encoding
+        self.market = Web3().eth.contract(address=constants.MARKET_PROXY, abi=PROTOCOL_METRICS_ABI)
+
+    def test_multicall_decodes_results(self):
+        """Results are decoded per call, single outputs are unwrapped and reverts are None."""
+        aggregate3 = self.client.multicall.functions.aggregate3
+        aggregate3.return_value.call.return_value = [
+            (True, encode(["uint256", "uint256"], [1, 2])),
+            (True, encode(["uint256"], [7])),
+            (False, b""),
+        ]
+
+        results = self.client._multicall([
+            self.market.functions.getNav(),
+            self.market.functions.collateralRatio(),
+            self.market.functions.totalDebt(),
+        ])
+
+        self.assertEqual(results, [[1, 2], 7, None])
+        payload = aggregate3.call_args[0][0]
+        self.assertEqual(len(payload), 3)
+        self.assertEqual(payload[0][0], Web3.to_checksum_address(constants.MARKET_PROXY))
+        self.assertTrue(payload[0][1])
+
+    def test_multicall_checksums_addresses(self):
+        """Addresses, also in arrays and structs, come back checksummed like .call()."""
+        token = Web3.to_checksum_address("0x" + "ab" * 20)
+        other = Web3.to_checksum_address("0x" + "cd" * 20)
+        abi = [
+            {"inputs": [], "name": "token", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+            {"inputs": [], "name": "tokens", "outputs": [{"name": "", "type": "address[]"}], "stateMutability": "view", "type": "function"},
+            {"inputs": [], "name": "info", "outputs": [
+                {"name": "", "type": "tuple", "components": [
+                    {"name": "token", "type": "address"}, {"name": "amount", "type": "uint256"},
+                ]},
+                {"name": "", "type": "tuple[]", "components": [
+                    {"name": "token", "type": "address"}, {"name": "amount", "type": "uint256"},
+                ]},
+            ], "stateMutability": "view", "type": "function"},
+        ]
+        target = Web3().eth.contract(address=token, abi=abi)
+        self.client.multicall.functions.aggregate3.return_value.call.return_value = [
+            (True, encode(["address"], [token.lower()])),
+            (True, encode(["address[]"], [[token.lower(), other.lower()]])),
+            (True, encode(["(address,uint256)", "(address,uint256)[]"], [(other.lower(), 5), [(token.lower(), 6)]])),
+        ]
+
+        results = self.client._multicall([target.functions.token(), target.functions.tokens(), target.functions.info()])
+
+        self.assertEqual(results, [token, [token, other], [(other, 5), [(token, 6)]]])
+
+    def test_multicall_chunks_requests(self):
+        """Large batches are split into several aggregate3 requests."""
+        aggregate3 = self.client.multicall.functions.aggregate3
+        aggregate3.return_value.call.side_effect = lambda **kwargs: [
+            (True, encode(["uint256"], [1]))
+        ] * len(aggregate3.call_args[0][0])
+
+        results = self.client._multicall(
+            [self.market.functions.totalDebt() for _ in range(5)],
+            chunk_size=2
+        )
+
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(aggregate3.call_count, 3)
+
+    def test_multicall_error(self):
+        """Transport errors are wrapped in ContractCallError."""
+        self.client.multicall.functions.aggregate3.return_value.call.side_effect = Exception("RPC down")
+
+        with self.assertRaises(ContractCallError):
+            self.client._multicall([self.market.functions.totalDebt()])
+
+
+class TestProtocolMetricsWatcher(unittest.TestCase):
+    """Test suite for protocol metric snapshots and the streaming watcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_w3 = Mock(spec=Web3)
+        self.mock_w3.is_connected = Mock(return_value=True)
+        self.mock_w3.is_address = Mock(return_value=True)
+        self.mock_w3.eth = MagicMock()
+
+        with patch('fx_sdk.client.Web3', return_value=self.mock_w3):
+            self.client = ProtocolClient(rpc_url="https://eth.llamarpc.com")
+
+        self.client._multicall = Mock()
+
+    def test_snapshot(self):
+        """All metrics come from one multicall and are converted to Decimal."""
+        self.client._multicall.return_value = _metrics_results(100)
+
+        snapshot = self.client.get_protocol_metrics_snapshot()
+
+        self.client._multicall.assert_called_once()
+        self.assertEqual(len(self.client._multicall.call_args[0][0]), 11)
+        self.assertEqual(snapshot.block_number, 100)
+        self.assertEqual(snapshot.treasury_x_nav, Decimal("2"))
+        self.assertEqual(snapshot.v1_collateral_ratio, Decimal("2"))
+        self.assertTrue(snapshot.peg_keeper_active)
+        self.assertIsNone(snapshot.peg_keeper_total_debt)
+
+    def test_snapshot_without_block_number(self):
+        """A failed block number read raises ContractCallError."""
+        self.client._multicall.return_value = _metrics_results(None)
+
+        with self.assertRaises(ContractCallError):
+            self.client.get_protocol_metrics_snapshot()
+
+    @patch('fx_sdk.client.time.sleep')
+    def test_watch_skips_unchanged(self, mock_sleep):
+        """Repeated blocks and unchanged metrics are not yielded."""
+        self.client._multicall.side_effect = [
+            _metrics_results(100),
+            _metrics_results(100),
+            _metrics_results(101),
+            _metrics_results(102, collateral_ratio=15 * 10**17),
+        ]
+
+        snapshots = list(self.client.watch_protocol_metrics(poll_interval=0, max_snapshots=2))
+
+        self.assertEqual([s.block_number for s in snapshots], [100, 102])
+        self.assertEqual(snapshots[1].v1_collateral_ratio, Decimal("1.5"))
+
+    @patch('fx_sdk.client.time.sleep')
+    def test_watch_thresholds(self, mock_sleep):
+        """Threshold callbacks fire once per breach and re-arm on recovery."""
+        callback = Mock()
+        rule = MetricThreshold("v1_collateral_ratio", callback=callback, below=Decimal("1.3"))
+        self.client._multicall.side_effect = [
+            _metrics_results(100, collateral_ratio=12 * 10**17),
+            _metrics_results(101, collateral_ratio=11 * 10**17),
+            _metrics_results(102, collateral_ratio=2 * 10**18),
+            _metrics_results(103, collateral_ratio=12 * 10**17),
+        ]
+
+        list(self.client.watch_protocol_metrics(thresholds=[rule], poll_interval=0, max_snapshots=4))
+
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(callback.call_args_list[0][0][0].block_number, 100)
+        self.assertEqual(callback.call_args_list[1][0][0].block_number, 103)
+
+    def test_threshold_ignores_missing_metric(self):
+        """A metric whose call reverted never counts as breached."""
+        rule = MetricThreshold("peg_keeper_total_debt", callback=Mock(), above=Decimal("0"))
+
+        self.assertFalse(rule.check(ProtocolMetricsSnapshot(block_number=1)))
+        rule.callback.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()